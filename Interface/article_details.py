@@ -0,0 +1,99 @@
+"""
+Carga sob demanda dos detalhes de um artigo (resumo, link e afiliações).
+
+As listas da UI guardam só o cabeçalho de cada artigo (título, autores, DOI,
+publicação); o resumo e o link são buscados quando o artigo é expandido pela
+primeira vez (ver `ArticleListModel`), ou em lote quando todos são necessários
+(salvar no banco, filtro textual).
+
+ - `RecordStoreDetails`: resultados da busca atual, lidos do armazenamento
+   local de registros do coletor (processing/collectors/record_store.py);
+ - `DatabaseDetails`: artigos já salvos, lidos da tabela 'articles' por id.
+"""
+
+from typing import Dict, List, Optional
+
+# Campos carregados só ao expandir o artigo
+DETAIL_KEYS = ('resumo', 'link')
+# Detalhes opcionais (nem toda origem os tem), também fora do cabeçalho
+OPTIONAL_DETAIL_KEYS = ('afiliacoes',)
+
+
+def header_only(article: Dict) -> Dict:
+    """Cópia do artigo sem os campos de detalhe."""
+    return {k: v for k, v in article.items() if k not in DETAIL_KEYS + OPTIONAL_DETAIL_KEYS}
+
+
+def has_details(article: Dict) -> bool:
+    return all(key in article for key in DETAIL_KEYS)
+
+
+class RecordStoreDetails:
+    """Detalhes de resultados da busca, lidos do armazenamento local pelo PMID."""
+
+    def __init__(self, store=None, platform: str = 'PubMed'):
+        if store is None:
+            from processing.collectors.record_store import get_default_store
+            store = get_default_store()
+        self.store = store
+        self.platform = platform
+
+    @staticmethod
+    def _detail(record: Dict) -> Dict:
+        return {
+            'resumo': record.get('abstract', record.get('resumo', '')),
+            'link': record.get('url', ''),
+            'afiliacoes': record.get('affiliations', []),
+        }
+
+    def load(self, article: Dict) -> Dict:
+        return self.load_many([article]).get(article.get('pmid'), {})
+
+    def load_many(self, articles: List[Dict]) -> Dict[str, Dict]:
+        """Detalhes por PMID; artigos ausentes do armazenamento ficam de fora."""
+        pmids = [a.get('pmid') for a in articles if a.get('pmid')]
+        if self.store is None or not pmids:
+            return {}
+        # Sem prazo de validade: é o mesmo registro que acabou de ser exibido
+        records = self.store.get_many(self.platform, pmids, max_age=float('inf'))
+        return {pmid: self._detail(record) for pmid, record in records.items()}
+
+    def merge(self, articles: List[Dict]) -> List[Dict]:
+        """Artigos completos (cabeçalho + detalhes), numa única leitura do armazenamento."""
+        details = self.load_many([a for a in articles if not has_details(a)])
+        return [{**a, **details.get(a.get('pmid'), {})} for a in articles]
+
+
+class DatabaseDetails:
+    """Detalhes de artigos salvos, lidos do banco pelo id."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def load(self, article: Dict) -> Dict:
+        return self.load_many([article]).get(article.get('id'), {})
+
+    def load_many(self, articles: List[Dict]) -> Dict[int, Dict]:
+        if self.db_manager is None:
+            return {}
+        ids = [a['id'] for a in articles if a.get('id') is not None]
+        try:
+            details = self.db_manager.read_article_details(ids)
+            for article_id, affiliations in self.db_manager.read_article_affiliations(ids).items():
+                if article_id in details:
+                    details[article_id]['afiliacoes'] = affiliations
+            return details
+        except Exception as e:
+            print(f"[AVISO] Erro ao carregar detalhes dos artigos: {e}")
+            return {}
+
+    def merge(self, articles: List[Dict]) -> List[Dict]:
+        details = self.load_many([a for a in articles if not has_details(a)])
+        return [{**a, **details.get(a.get('id'), {})} for a in articles]
+
+
+def merge_details(articles: List[Dict], source: Optional[object]) -> List[Dict]:
+    """Completa os artigos com os detalhes de `source` (se houver)."""
+    if source is None:
+        return articles
+    return source.merge(articles)
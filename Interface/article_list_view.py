@@ -0,0 +1,339 @@
+"""
+Lista de artigos em modelo/visão (QListView + QAbstractListModel + delegate).
+
+Substitui o `ArticleListItem` (um QFrame com ~10 QLabels por artigo, cada
+item conectado ao clique de todos os outros). Aqui a lista guarda só os
+dicionários dos artigos; o delegate desenha apenas as linhas visíveis e o
+estado expandido/recolhido fica no modelo (uma linha expandida por vez).
+
+Os artigos podem trazer só o cabeçalho: resumo e link são pedidos à
+`detail_source` (ver Interface/article_details.py) na primeira vez que a linha
+é expandida, e ficam guardados no modelo.
+
+Uso:
+    self.article_view = ArticleListView(empty_text="Nenhum artigo encontrado.")
+    self.article_view.set_articles(artigos)      # troca a lista inteira
+    self.article_view.append_articles(lote)      # resultados parciais
+    self.article_view.set_detail_source(DatabaseDetails(db_manager))
+"""
+
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, QUrl, Signal
+from PySide6.QtGui import QColor, QDesktopServices, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+
+from Interface.article_details import has_details
+
+CINZA_FUNDO = "#f7f7f7"
+BRANCO_PADRAO = "white"
+
+# Papéis do modelo
+ArticleRole = Qt.UserRole + 1
+ExpandedRole = Qt.UserRole + 2
+DetailRole = Qt.UserRole + 3
+
+# Geometria do item (mesmas medidas do antigo ArticleListItem)
+_PAD_X = 10
+_PAD_Y = 8
+_AUTHORS_WIDTH = 200
+_ARROW_WIDTH = 20
+_LABEL_WIDTH = 100
+_GAP = 5
+_HEADER_LINES = 2
+
+
+class ArticleListModel(QAbstractListModel):
+    """Modelo com os artigos (dicionários da UI), a linha expandida e os detalhes já carregados."""
+
+    def __init__(self, articles: Optional[List[Dict]] = None, parent=None, detail_source=None):
+        super().__init__(parent)
+        self._articles = list(articles or [])
+        self._expanded_row = -1
+        self.detail_source = detail_source
+        self._details: Dict[int, Dict] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._articles)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._articles):
+            return None
+        article = self._articles[index.row()]
+        if role == Qt.DisplayRole:
+            return article.get("titulo", "N/A")
+        if role == Qt.ToolTipRole:
+            return article.get("autores", "")
+        if role == ArticleRole:
+            return article
+        if role == ExpandedRole:
+            return index.row() == self._expanded_row
+        if role == DetailRole:
+            return self.details(index.row())
+        return None
+
+    def details(self, row: int) -> Dict:
+        """Artigo completo da linha; os detalhes são carregados só no primeiro pedido."""
+        article = self._articles[row]
+        if self.detail_source is None or has_details(article):
+            return article
+        if row not in self._details:
+            self._details[row] = {**article, **self.detail_source.load(article)}
+        return self._details[row]
+
+    def article(self, row: int) -> Dict:
+        return self._articles[row]
+
+    def articles(self) -> List[Dict]:
+        return self._articles
+
+    def set_articles(self, articles: List[Dict]):
+        self.beginResetModel()
+        self._articles = list(articles)
+        self._expanded_row = -1
+        self._details.clear()
+        self.endResetModel()
+
+    def append_articles(self, articles: List[Dict]):
+        if not articles:
+            return
+        first = len(self._articles)
+        self.beginInsertRows(QModelIndex(), first, first + len(articles) - 1)
+        self._articles.extend(articles)
+        self.endInsertRows()
+
+    def toggle_expanded(self, row: int) -> List[int]:
+        """Expande `row` (recolhendo a anterior) ou a recolhe. Retorna as linhas alteradas."""
+        changed = [r for r in (self._expanded_row, row) if r >= 0]
+        self._expanded_row = -1 if row == self._expanded_row else row
+        for r in set(changed):
+            index = self.index(r)
+            self.dataChanged.emit(index, index, [ExpandedRole])
+        return sorted(set(changed))
+
+
+class ArticleItemDelegate(QStyledItemDelegate):
+    """Desenha o cabeçalho (título, autores, seta) e, se expandido, os detalhes."""
+
+    header_clicked = Signal(QModelIndex)
+
+    def __init__(self, view: QListView, detail_footer: str = ""):
+        super().__init__(view)
+        self._view = view
+        self.detail_footer = detail_footer
+        self.title_font = QFont("Arial", 10)
+        self.title_font.setBold(True)
+        self.authors_font = QFont("Arial", 9)
+        self.detail_font = QFont("Arial", 9)
+        self.label_font = QFont("Arial", 9)
+        self.label_font.setBold(True)
+        self.footer_font = QFont("Arial", 8)
+        self.footer_font.setItalic(True)
+
+    # --- Geometria -------------------------------------------------------
+
+    def _header_height(self) -> int:
+        lines = max(QFontMetrics(self.title_font).lineSpacing(),
+                    QFontMetrics(self.authors_font).lineSpacing()) * _HEADER_LINES
+        return lines + 2 * _PAD_Y
+
+    def _item_width(self) -> int:
+        return max(self._view.viewport().width() - 2 * self._view.spacing(), 2 * _LABEL_WIDTH)
+
+    @staticmethod
+    def _detail_fields(article: Dict):
+        fields = [
+            ("ID DOI", article.get("doi", "N/A") or "N/A", False),
+            ("Publicação", article.get("publicacao", "N/A") or "N/A", False),
+            ("Link", article.get("link", "N/A") or "N/A", bool(article.get("link"))),
+        ]
+        if article.get("afiliacoes"):
+            fields.append(("Afiliações", "\n".join(article["afiliacoes"]), False))
+        return fields
+
+    def _layout(self, rect: QRect, article: Dict, expanded: bool) -> Dict:
+        """Retângulos de cada parte do item; usados tanto para desenhar quanto para cliques."""
+        header = QRect(rect.left(), rect.top(), rect.width(), self._header_height())
+        inner = header.adjusted(_PAD_X, _PAD_Y, -_PAD_X, -_PAD_Y)
+        arrow = QRect(inner.right() - _ARROW_WIDTH + 1, inner.top(), _ARROW_WIDTH, inner.height())
+        authors = QRect(arrow.left() - _GAP - _AUTHORS_WIDTH, inner.top(), _AUTHORS_WIDTH, inner.height())
+        title = QRect(inner.left(), inner.top(), max(authors.left() - _GAP - inner.left(), 0), inner.height())
+        parts = {'header': header, 'title': title, 'authors': authors, 'arrow': arrow,
+                 'fields': [], 'link': None, 'detail': None}
+        if not expanded:
+            return parts
+
+        wrap = Qt.TextWordWrap
+        detail_fm = QFontMetrics(self.detail_font)
+        label_fm = QFontMetrics(self.label_font)
+        x = rect.left() + _PAD_X
+        width = rect.width() - 2 * _PAD_X
+        value_x = x + _LABEL_WIDTH + _GAP
+        value_width = max(width - _LABEL_WIDTH - _GAP, 1)
+        y = header.bottom() + 1 + _PAD_X
+
+        for label, value, is_link in self._detail_fields(article):
+            height = max(detail_fm.boundingRect(QRect(0, 0, value_width, 0), wrap, value).height(),
+                         label_fm.lineSpacing())
+            value_rect = QRect(value_x, y, value_width, height)
+            parts['fields'].append((QRect(x, y, _LABEL_WIDTH, height), value_rect, label, value))
+            if is_link:
+                parts['link'] = value_rect
+            y += height + _GAP
+
+        parts['resumo_label'] = QRect(x, y, width, label_fm.lineSpacing())
+        y += label_fm.lineSpacing() + _GAP
+        resumo = article.get("resumo") or "Resumo não disponível."
+        resumo_height = detail_fm.boundingRect(QRect(0, 0, width, 0), wrap, resumo).height()
+        parts['resumo'] = QRect(x, y, width, resumo_height)
+        parts['resumo_text'] = resumo
+        y += resumo_height + _GAP
+
+        if self.detail_footer:
+            footer_height = QFontMetrics(self.footer_font).lineSpacing()
+            parts['footer'] = QRect(x, y, width, footer_height)
+            y += footer_height + _GAP
+
+        parts['detail'] = QRect(rect.left(), header.bottom() + 1, rect.width(), y + _PAD_X - _GAP - header.bottom() - 1)
+        return parts
+
+    def sizeHint(self, option, index):
+        width = self._item_width()
+        if not index.data(ExpandedRole):
+            # Altura fixa recolhida: o QListView não mede texto das linhas fora da tela
+            return QSize(width, self._header_height())
+        parts = self._layout(QRect(0, 0, width, 0), index.data(DetailRole), True)
+        return QSize(width, parts['detail'].bottom() + 1)
+
+    # --- Desenho ---------------------------------------------------------
+
+    @staticmethod
+    def _elided(fm: QFontMetrics, text: str, rect: QRect, lines: int) -> str:
+        """Corta o texto para caber em `lines` linhas (aproximação por largura total)."""
+        budget = rect.width() * lines - fm.averageCharWidth() * 4 * lines
+        return fm.elidedText(text, Qt.ElideRight, max(budget, rect.width()))
+
+    def paint(self, painter: QPainter, option, index):
+        expanded = bool(index.data(ExpandedRole))
+        # Linhas recolhidas usam só o cabeçalho; os detalhes são lidos ao expandir
+        article = index.data(DetailRole if expanded else ArticleRole)
+        rect = option.rect
+        parts = self._layout(rect, article, expanded)
+        wrap_flags = Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor("#ddd")))
+        painter.setBrush(QColor(BRANCO_PADRAO))
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 5, 5)
+
+        painter.setPen(QColor("black"))
+        painter.setFont(self.title_font)
+        title = article.get("titulo", "N/A") or "N/A"
+        painter.drawText(parts['title'], wrap_flags,
+                         self._elided(QFontMetrics(self.title_font), title, parts['title'], _HEADER_LINES))
+
+        painter.setFont(self.authors_font)
+        authors = f'Autores: {article.get("autores", "N/A")}'
+        painter.drawText(parts['authors'], wrap_flags,
+                         self._elided(QFontMetrics(self.authors_font), authors, parts['authors'], _HEADER_LINES))
+        painter.drawText(parts['arrow'], Qt.AlignCenter, "▲" if expanded else "▼")
+
+        detail = parts['detail']
+        if detail is not None:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(CINZA_FUNDO))
+            painter.drawRoundedRect(detail.adjusted(1, 0, -2, -2), 5, 5)
+            painter.setPen(QPen(QColor("#ccc")))
+            painter.drawLine(detail.left(), detail.top(), detail.right(), detail.top())
+
+            for label_rect, value_rect, label, value in parts['fields']:
+                painter.setPen(QColor("black"))
+                painter.setFont(self.label_font)
+                painter.drawText(label_rect, Qt.AlignLeft | Qt.AlignTop, f"{label}:")
+                painter.setFont(self.detail_font)
+                if value_rect is parts['link']:
+                    painter.setPen(option.palette.link().color())
+                painter.drawText(value_rect, wrap_flags, value)
+
+            painter.setPen(QColor("black"))
+            painter.setFont(self.label_font)
+            painter.drawText(parts['resumo_label'], Qt.AlignLeft | Qt.AlignTop, "Resumo:")
+            painter.setFont(self.detail_font)
+            painter.drawText(parts['resumo'], wrap_flags, parts['resumo_text'])
+
+            if 'footer' in parts:
+                painter.setFont(self.footer_font)
+                painter.drawText(parts['footer'], Qt.AlignRight | Qt.AlignTop, self.detail_footer)
+        painter.restore()
+
+    # --- Cliques ---------------------------------------------------------
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return super().editorEvent(event, model, option, index)
+        expanded = bool(index.data(ExpandedRole))
+        article = index.data(DetailRole if expanded else ArticleRole)
+        parts = self._layout(option.rect, article, expanded)
+        pos = event.position().toPoint()
+        if parts['header'].contains(pos):
+            self.header_clicked.emit(index)
+            return True
+        if parts['link'] is not None and parts['link'].contains(pos):
+            QDesktopServices.openUrl(QUrl(article.get("link", "")))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ArticleListView(QListView):
+    """QListView de artigos expansíveis; só as linhas visíveis são desenhadas."""
+
+    def __init__(self, parent=None, empty_text: str = "Nenhum artigo encontrado.", detail_footer: str = ""):
+        super().__init__(parent)
+        self.empty_text = empty_text
+        self.article_model = ArticleListModel(parent=self)
+        self.article_delegate = ArticleItemDelegate(self, detail_footer=detail_footer)
+        self.setModel(self.article_model)
+        self.setItemDelegate(self.article_delegate)
+        self.article_delegate.header_clicked.connect(self._toggle_row)
+
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.Adjust)
+        # Listas longas são dispostas em lotes, sem travar a abertura da janela
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSpacing(5)
+        self.setMouseTracking(True)
+        self.setStyleSheet(f"QListView {{ background-color: {CINZA_FUNDO}; border: none; }}")
+
+    def set_articles(self, articles: List[Dict]):
+        self.article_model.set_articles(articles)
+
+    def append_articles(self, articles: List[Dict]):
+        self.article_model.append_articles(articles)
+
+    def set_detail_source(self, source):
+        """Origem do resumo/link dos artigos que chegam só com o cabeçalho."""
+        self.article_model.detail_source = source
+
+    def _toggle_row(self, index: QModelIndex):
+        for row in self.article_model.toggle_expanded(index.row()):
+            self.article_delegate.sizeHintChanged.emit(self.article_model.index(row))
+        self.scrollTo(index)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Largura mudou: a altura do item expandido (texto quebrado) muda junto
+        self.scheduleDelayedItemsLayout()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.article_model.rowCount() == 0 and self.empty_text:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("gray"))
+            painter.setFont(QFont("Arial", 12))
+            painter.drawText(self.viewport().rect().adjusted(0, 20, 0, 0),
+                             Qt.AlignHCenter | Qt.AlignTop, self.empty_text)
+            painter.end()
@@ -8,6 +8,9 @@ from PySide6.QtGui import QFont, QCursor
 from PySide6.QtCore import Qt, QDate
 from database.db_manager import DatabaseManager
 from database.models import AffiliationVariation
+from processing.term_registry import get_term_registry
+from processing.collectors import registry
+from Interface.defaults import DEFAULT_CONFIG
 
 # --- Definições de Cores ---
 AZUL_NEXUS = "#3b5998"
@@ -15,13 +18,6 @@ CINZA_FUNDO = "#f7f7f7"
 BRANCO_PADRAO = "white"
 VERMELHO_EXCLUIR = "#dc3545"
 
-# Dados padrão para o padrão de busca
-DEFAULT_CONFIG = {
-    'platforms': ['Scielo', 'PubMed', 'Lilacs'],
-    'date_start': '01/01/2021',
-    'date_end': QDate.currentDate().toString("dd/MM/yyyy"),
-    'search_terms': []  # Será preenchido do banco de dados
-}
 
 # --- Widget Customizado para a Linha de Termo de Busca ---
 
@@ -154,7 +150,7 @@ class ConfigWindow(QMainWindow):
         content_vbox.addWidget(QLabel('Banco de dados'))
         self.platform_hbox = QHBoxLayout()
         self.platform_buttons = {}
-        platforms = ['Scielo', 'PubMed', 'Lilacs', 'Capes Periódicos']
+        platforms = registry.platforms()
         
         for platform in platforms:
             btn = QPushButton(platform)
@@ -355,6 +351,7 @@ class ConfigWindow(QMainWindow):
                 
                 # Insere no banco de dados
                 self.db.create_affiliation_variation(new_variation)
+                get_term_registry().invalidate("HC-UFPE")
                 self.new_term_input.clear()
                 self.populate_search_terms()
                 print(f"[OK] Termo adicionado: {new_term}")
@@ -374,6 +371,7 @@ class ConfigWindow(QMainWindow):
             if self.db:
                 success = self.db.delete_affiliation_variation(term_id)
                 if success:
+                    get_term_registry().invalidate("HC-UFPE")
                     self.populate_search_terms()
                     print(f"[OK] Termo removido (ID: {term_id})")
                     return True
@@ -412,6 +410,7 @@ class ConfigWindow(QMainWindow):
                 
                 success = self.db.update_affiliation_variation(variation)
                 if success:
+                    get_term_registry().invalidate("HC-UFPE")
                     self.populate_search_terms()
                     print(f"[OK] Termo atualizado: '{new_term}'")
                     return True
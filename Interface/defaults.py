@@ -0,0 +1,18 @@
+"""
+Padrão de busca da interface (plataformas, período e termos).
+
+Fica fora de config_window.py para que a janela principal o use sem
+importar a janela de configuração e o banco na abertura.
+"""
+
+from PySide6.QtCore import QDate
+
+from processing.collectors import registry
+
+# Dados padrão para o padrão de busca
+DEFAULT_CONFIG = {
+    'platforms': registry.platforms(),
+    'date_start': '01/01/2021',
+    'date_end': QDate.currentDate().toString("dd/MM/yyyy"),
+    'search_terms': []  # Será preenchido do banco de dados
+}
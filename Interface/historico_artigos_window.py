@@ -4,139 +4,18 @@ from PySide6.QtWidgets import (
     QScrollArea, QSpacerItem, QSizePolicy
 )
 from PySide6.QtGui import QFont, QCursor, QPixmap
-from PySide6.QtCore import Qt, Signal, QRect, QDate
+from PySide6.QtCore import Qt, Signal, QRect, QDate, QTimer
+
+from database.fulltext import ArticleTextIndex
+from Interface.article_details import DatabaseDetails
+from Interface.article_list_view import ArticleListView
+from processing.collectors import registry
 
 # --- Definições de Cores ---
 AZUL_NEXUS = "#3b5998"
 CINZA_FUNDO = "#f7f7f7"
 BRANCO_PADRAO = "white"
 
-# ====================================================================
-# WIDGET COPIADO/ADAPTADO: ArticleListItem para uso neste módulo
-# ====================================================================
-
-class ArticleListItem(QFrame):
-    """
-    Cópia/Adaptação do ArticleListItem da ResultsWindow,
-    necessário para exibir os artigos do Histórico de forma expansível.
-    """
-    item_clicked = Signal(int)
-
-    # CORREÇÃO: Removido search_date_str, pois não é necessário aqui
-    def __init__(self, article_data, parent=None): 
-        super().__init__(parent)
-        self.article_data = article_data
-        self.is_expanded = False
-        self.article_id = article_data.get("id", 0)
-        
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setFrameShadow(QFrame.Raised)
-        self.setStyleSheet("border: 1px solid #ddd; border-radius: 5px; margin-bottom: 5px; background-color: white;")
-        
-        self.main_layout = QVBoxLayout(self)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-        
-        self._setup_header_row()
-        self._setup_detail_content()
-        
-        self.detail_widget.setVisible(False)
-        
-    def _setup_header_row(self):
-        """Cria a linha que mostra Título, Autores e o ícone de expansão (Layout Estável)."""
-        header_widget = QWidget()
-        header_hbox = QHBoxLayout(header_widget)
-        header_hbox.setContentsMargins(10, 8, 10, 8)
-        
-        # 1. Título do Artigo
-        title_label = QLabel(f'<b>{self.article_data.get("titulo", "N/A")}</b>')
-        title_label.setCursor(QCursor(Qt.PointingHandCursor))
-        title_label.setFont(QFont("Arial", 10))
-        title_label.setWordWrap(True)
-        header_hbox.addWidget(title_label, 1) 
-        
-        # 2. Autores (Largura Fixa)
-        authors_label = QLabel(f'Autores: {self.article_data.get("autores", "N/A")}')
-        authors_label.setFixedWidth(200) 
-        authors_label.setFont(QFont("Arial", 9))
-        authors_label.setWordWrap(True)
-        header_hbox.addWidget(authors_label)
-        
-        # 3. Ícone de Expansão
-        self.expand_icon = QLabel("▼")
-        self.expand_icon.setFixedWidth(20)
-        header_hbox.addWidget(self.expand_icon)
-        
-        self.main_layout.addWidget(header_widget)
-        self.header_widget = header_widget
-
-    def _setup_detail_content(self):
-        """Cria o widget com os detalhes (Resumo, DOI, Link) que será expandido."""
-        self.detail_widget = QFrame()
-        self.detail_widget.setStyleSheet(f"background-color: {CINZA_FUNDO}; padding: 10px; border-top: 1px solid #ccc; border-bottom-left-radius: 5px; border-bottom-right-radius: 5px;")
-        detail_layout = QGridLayout(self.detail_widget)
-        detail_layout.setSpacing(5)
-        
-        def add_detail_row(layout, row, label_text, value_text):
-            label = QLabel(f'<b>{label_text}:</b>')
-            label.setFixedWidth(100)
-            value = QLabel(value_text)
-            value.setOpenExternalLinks(True) 
-            value.setWordWrap(True)
-            layout.addWidget(label, row, 0, Qt.AlignTop)
-            layout.addWidget(value, row, 1)
-
-        add_detail_row(detail_layout, 0, "ID DOI", self.article_data.get("doi", "N/A"))
-        
-        # CORREÇÃO DA PUBLICAÇÃO: Assume que a chave 'publicacao' está formatada corretamente no DBManager.
-        add_detail_row(detail_layout, 1, "Publicação", self.article_data.get("publicacao", "N/A"))
-        
-        add_detail_row(detail_layout, 2, "Link", f'<a href="{self.article_data.get("link", "#")}">{self.article_data.get("link", "N/A")}</a>')
-        
-        resumo_label = QLabel('<b>Resumo:</b>')
-        detail_layout.addWidget(resumo_label, 3, 0, 1, 2, Qt.AlignTop)
-        resumo_text = QLabel(self.article_data.get("resumo", "Resumo não disponível."))
-        resumo_text.setWordWrap(True)
-        detail_layout.addWidget(resumo_text, 4, 0, 1, 2)
-        
-        # --- CAMPO REMOVIDO: Data da Pesquisa (Não é necessário aqui) ---
-        # data_pesquisa_label = QLabel(f'<i>Data da Pesquisa: {self.search_date_str}</i>')
-        # data_pesquisa_label.setFont(QFont("Arial", 8))
-        # data_pesquisa_label.setAlignment(Qt.AlignRight)
-        # detail_layout.addWidget(data_pesquisa_label, 5, 0, 1, 2, Qt.AlignRight)
-
-        self.main_layout.addWidget(self.detail_widget)
-
-    def mousePressEvent(self, event):
-        if self.header_widget.geometry().contains(event.pos()):
-            self.item_clicked.emit(self.article_id) 
-            self._toggle_expansion()
-        else:
-            super().mousePressEvent(event)
-
-    def _handle_item_clicked(self, clicked_id):
-        if clicked_id != self.article_id and self.is_expanded:
-            self.collapse()
-
-    def _toggle_expansion(self):
-        if self.is_expanded:
-            self.collapse()
-        else:
-            self.expand()
-
-    def expand(self):
-        self.detail_widget.setVisible(True)
-        self.expand_icon.setText("▲")
-        self.is_expanded = True
-        
-    def collapse(self):
-        self.detail_widget.setVisible(False)
-        self.expand_icon.setText("▼")
-        self.is_expanded = False
-        
-# ====================================================================
-# FIM DA CLASSE ARTICLELISTITEM ADAPTADA
-# ====================================================================
 
 class HistoricoArtigosWindow(QMainWindow):
     """
@@ -161,7 +40,13 @@ class HistoricoArtigosWindow(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
         
-        self.article_list_items = [] 
+
+        # Filtro textual: FTS5 do banco (via HistoryWindow.db_manager) ou índice em memória
+        self._text_index = None
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self.apply_text_filter)
         
         self._setup_header()
         self._setup_content()
@@ -208,21 +93,23 @@ class HistoricoArtigosWindow(QMainWindow):
     def _setup_content(self):
         content_hbox = QHBoxLayout()
         
-        # 1. Área de Rolagem para Artigos (Esquerda)
-        results_scroll_area = QScrollArea()
-        results_scroll_area.setWidgetResizable(True)
-        
-        results_list_widget = QWidget()
-        results_list_widget.setStyleSheet(f"background-color: {CINZA_FUNDO};")
-        self.results_vbox = QVBoxLayout(results_list_widget)
-        self.results_vbox.setSpacing(5) 
-        self.results_vbox.setContentsMargins(10, 10, 10, 10)
-        
+        # 1. Filtro + Área de Rolagem para Artigos (Esquerda)
+        left_vbox = QVBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar por título, resumo ou autores...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setStyleSheet("padding: 6px; border: 1px solid gray; border-radius: 4px;")
+        self.filter_input.textChanged.connect(lambda _text: self._filter_timer.start())
+        left_vbox.addWidget(self.filter_input)
+
+        # Lista modelo/visão: só as linhas visíveis são desenhadas
+        self.article_view = ArticleListView(empty_text="Nenhum artigo validado encontrado nesta consulta.")
+        # Os artigos vêm só com o cabeçalho (read_articles_for_search); resumo/link são lidos ao expandir
+        self.article_view.set_detail_source(DatabaseDetails(getattr(self.parent_window, 'db_manager', None)))
         self.populate_article_list()
-
-        results_scroll_area.setWidget(results_list_widget)
+        left_vbox.addWidget(self.article_view, 1)
         
-        content_hbox.addWidget(results_scroll_area, 3) 
+        content_hbox.addLayout(left_vbox, 3) 
         
         # 2. Painel de Estatísticas (Direita) - Layout ResultsWindow
         stats_frame = QFrame()
@@ -233,37 +120,44 @@ class HistoricoArtigosWindow(QMainWindow):
 
         self.main_layout.addLayout(content_hbox, 1) 
 
-    def populate_article_list(self):
-        """Popula a lista de artigos usando ArticleListItem e gerenciando expansão."""
-        
-        # Limpar layout anterior
-        while self.results_vbox.count() > 0:
-            item = self.results_vbox.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        self.article_list_items = []
-        
-        if not self.articles:
-            no_results_label = QLabel("Nenhum artigo validado encontrado nesta consulta.")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            self.results_vbox.addWidget(no_results_label)
-            self.results_vbox.addStretch(1)
+    def reset_filter(self):
+        """Limpa o filtro textual (chamado quando a lista de artigos é trocada)."""
+        self._text_index = None
+        self.filter_input.blockSignals(True)
+        self.filter_input.clear()
+        self.filter_input.blockSignals(False)
+
+    def apply_text_filter(self):
+        """Mostra só os artigos que casam com o texto do filtro, por relevância (bm25)."""
+        text = self.filter_input.text().strip()
+        if not text:
+            self.populate_article_list()
             return
 
-        for article in self.articles:
-            # CORREÇÃO: Agora o __init__ do ArticleListItem não precisa de search_date_str
-            item = ArticleListItem(article)
-            
-            # Gerenciamento de expansão (Colapsa outros itens)
-            for existing_item in self.article_list_items:
-                item.item_clicked.connect(existing_item._handle_item_clicked)
-                existing_item.item_clicked.connect(item._handle_item_clicked)
-            
-            self.article_list_items.append(item)
-            self.results_vbox.addWidget(item)
-        
-        self.results_vbox.addStretch(1)
+        db_manager = getattr(self.parent_window, 'db_manager', None)
+        if db_manager is not None:
+            try:
+                by_id = {a.get('id'): a for a in self.articles}
+                hits = db_manager.search_articles_fulltext(text, limit=max(len(by_id), 1), status='VALIDADO')
+                self.populate_article_list([by_id[h['id']] for h in hits if h['id'] in by_id])
+                return
+            except Exception as e:
+                print(f"[AVISO] Busca textual no BD falhou, filtrando em memória: {e}")
+
+        if self._text_index is None:
+            self._text_index = ArticleTextIndex(self.articles)
+        hits = self._text_index.search(text)
+        self.populate_article_list([self.articles[pos] for pos, _snippet in hits])
+
+    def populate_article_list(self, articles=None):
+        """Exibe os artigos na lista (modelo/visão; expansão controlada pelo delegate).
+
+        Args:
+            articles: Subconjunto a exibir (ex.: resultado do filtro); padrão: todos.
+        """
+        if articles is None:
+            articles = self.articles
+        self.article_view.set_articles(articles)
 
 
     def _setup_stats_panel(self, frame):
@@ -279,31 +173,22 @@ class HistoricoArtigosWindow(QMainWindow):
         stats_layout.addWidget(title_label, 0, 0, 1, 2) 
 
         # --- Cálculo dinâmico ---
-        platform_counts = {
-            "Total:": len(self.articles),
-            "PubMed:": 0,
-            "Scielo:": 0,
-            "Lilacs:": 0,
-            "Capes Periódicos:": 0
-        }
-        
+        # plataformas com coletor registrado (processing/collectors/registry.py)
+        platform_counts = {platform: 0 for platform in registry.platforms()}
+
         for article in self.articles:
             publicacao = article.get("publicacao", "")
-            platform_name = "Desconhecido"
             if "(" in publicacao and ")" in publicacao:
                 platform_name = publicacao.split("(")[-1].rstrip(")")
-            
-            if platform_name in platform_counts:
-                platform_counts[platform_name] += 1
-            elif 'Capes' in platform_name:
-                 platform_counts['Capes Periódicos'] += 1
+                if platform_name in platform_counts:
+                    platform_counts[platform_name] += 1
         # ------------------------
-        
+
         row = 1
-        platform_labels = ["Total:", "PubMed:", "Scielo:", "Lilacs:", "Capes Periódicos:"]
-        
-        for label_text in platform_labels:
-            count = platform_counts.get(label_text, platform_counts.get(label_text.rstrip(':'), 0))
+        rows = [("Total:", len(self.articles))]
+        rows += [(f"{platform}:", count) for platform, count in platform_counts.items()]
+
+        for label_text, count in rows:
             stats_layout.addWidget(QLabel(label_text), row, 0)
             input_field = QLineEdit(str(count))
             input_field.setReadOnly(True)
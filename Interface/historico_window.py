@@ -10,6 +10,7 @@ from datetime import datetime # ESSENCIAL: Para parsear o formato de data do DB
 
 # Adicionamos a importação da nova janela
 from Interface.historico_artigos_window import HistoricoArtigosWindow 
+from Interface.paging import ScrollPager
 from database.db_manager import DatabaseManager
 from database.models import Article # Necessário para tipagem ou referência
 
@@ -18,6 +19,9 @@ AZUL_NEXUS = "#3b5998"
 CINZA_FUNDO = "#f7f7f7"
 BRANCO_PADRAO = "white"
 
+# Consultas lidas do banco por vez; as seguintes chegam ao rolar a lista
+HISTORY_PAGE_SIZE = 100
+
 # ====================================================================
 # DADOS SIMULADOS REMOVIDOS PARA USO APENAS DO BANCO DE DADOS
 # ====================================================================
@@ -218,7 +222,9 @@ class HistoryWindow(QMainWindow):
             print(f"[AVISO] Erro ao inicializar DatabaseManager: {e}")
             self.db_manager = None
 
-        # Carregar histórico do BD 
+        # Carregar histórico do BD (primeira página; cursor da seguinte em _next_cursor)
+        self._next_cursor = None
+        self.no_entries_label = None
         if self.db_manager:
             try:
                 self.all_history_data = self._load_history_from_database()
@@ -318,6 +324,7 @@ class HistoryWindow(QMainWindow):
 
         self.scroll_area.setWidget(self.content_widget)
         self.main_layout.addWidget(self.scroll_area, 1) 
+        self.pager = ScrollPager(self.scroll_area, self.load_more_history)
 
     def populate_history_list(self, filtered_data=None):
         """Preenche a lista visual com os registros de histórico de consultas."""
@@ -330,25 +337,52 @@ class HistoryWindow(QMainWindow):
                 del item
 
         data_to_display = filtered_data if filtered_data is not None else self.all_history_data
+        self.no_entries_label = None
+        # espaçador final primeiro: os itens são inseridos antes dele (ver _add_history_item)
+        self.history_vbox.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
         if not data_to_display:
-            no_entries_label = QLabel("Nenhuma pesquisa bem-sucedida registrada no período.")
-            no_entries_label.setAlignment(Qt.AlignCenter)
-            self.history_vbox.addWidget(no_entries_label)
+            self.no_entries_label = QLabel("Nenhuma pesquisa bem-sucedida registrada no período.")
+            self.no_entries_label.setAlignment(Qt.AlignCenter)
+            self.history_vbox.insertWidget(0, self.no_entries_label)
         else:
             for entry in sorted(data_to_display, key=lambda x: x['data_pesquisa'], reverse=True):
-                item = HistoryListItem(entry, history_window_instance=self, parent=self)
-                self.history_vbox.addWidget(item)
+                self._add_history_item(entry)
 
-        self.history_vbox.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+        # as páginas seguintes do banco chegam ao rolar até o fim
+        self.pager.reset(exhausted=self._next_cursor is None)
+
+    def _add_history_item(self, entry):
+        """Cria o HistoryListItem e o insere antes do espaçador final da lista."""
+        item = HistoryListItem(entry, history_window_instance=self, parent=self)
+        self.history_vbox.insertWidget(self.history_vbox.count() - 1, item)
+
+    def load_more_history(self):
+        """Acrescenta a próxima página à lista (chamado pelo ScrollPager). False quando acabou."""
+        if self._next_cursor is None or not self.db_manager:
+            return False
+        new_entries = self._load_history_from_database()
+        self.all_history_data.extend(new_entries)
+
+        start_date = self.date_start_input.date()
+        end_date = self.date_end_input.date()
+        visible = [item for item in new_entries if start_date <= item['data_pesquisa'] <= end_date]
+        if visible and self.no_entries_label is not None:
+            self.no_entries_label.deleteLater()
+            self.no_entries_label = None
+        for entry in visible:
+            self._add_history_item(entry)
+        return self._next_cursor is not None
 
     def _load_history_from_database(self):
-        """Carrega o histórico de buscas do banco e transforma no formato esperado pela UI."""
+        """Carrega a próxima página do histórico do banco e transforma no formato esperado pela UI."""
         if not getattr(self, 'db_manager', None):
             return []
 
         try:
-            searches = self.db_manager.read_search_history(limit=200)
+            page = self.db_manager.read_search_history_page(page_size=HISTORY_PAGE_SIZE, cursor=self._next_cursor)
+            self._next_cursor = page.next_cursor
+            searches = page.items
             ui_entries = []
             for s in searches:
                 date_q = QDate.currentDate() # Default em caso de falha de parse
@@ -386,6 +420,7 @@ class HistoryWindow(QMainWindow):
         except Exception as e:
             # Captura o erro fatal se for uma falha de comunicação com o DB ou estrutura
             print(f"[ERRO FATAL NO DB] Falha ao carregar searches (Verifique o db_manager!): {e}")
+            self._next_cursor = None
             return []
 
     def filter_history_list(self):
@@ -417,6 +452,7 @@ class HistoryWindow(QMainWindow):
             self.artigos_window.articles = articles
             self.artigos_window.query_term = query_term
             self.artigos_window.setWindowTitle(f'Nexus - Artigos da Consulta: {query_term}')
+            self.artigos_window.reset_filter()
             self.artigos_window.populate_article_list()
 
         self.artigos_window.show()
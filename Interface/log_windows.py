@@ -7,12 +7,16 @@ from PySide6.QtGui import QFont, QCursor, QColor
 from PySide6.QtCore import Qt, Signal, QDate, QRect
 import time 
 from database.db_manager import DatabaseManager
+from Interface.paging import ScrollPager
 
 # --- Definições de Cores ---
 AZUL_NEXUS = "#3b5998"
 CINZA_FUNDO = "#f7f7f7"
 BRANCO_PADRAO = "white"
 
+# Erros lidos do banco por vez; os seguintes chegam ao rolar a lista
+ERROR_PAGE_SIZE = 100
+
 # --- Dados Simulados de Erros (Histórico Completo) ---
 # Dados fictícios completos para visualização correta
 SIMULATED_FULL_ERRORS = [
@@ -251,27 +255,13 @@ class ErrorLogWindow(QMainWindow):
             print(f"[AVISO] Erro ao inicializar DatabaseManager (ErrorLogWindow): {e}")
             self.db_manager = None
 
+        # cursor da próxima página do log no banco (None: não há mais, ou a lista veio pronta)
+        self._next_cursor = None
         if errors is not None:
             self.all_error_data = errors
         elif self.db_manager:
             try:
-                db_errors = self.db_manager.read_error_logs(limit=200)
-                # converter para o formato esperado pelo UI
-                self.all_error_data = [
-                    {
-                        'id': e.id,
-                        'termo_busca': e.search_term,
-                        'titulo': e.article_title,
-                        'autores': '',
-                        'doi': e.article_doi,
-                        'data_log': QDate(e.error_date.year, e.error_date.month, e.error_date.day) if e.error_date else QDate.currentDate(),
-                        'publicacao_ano': '',
-                        'publicacao_plataforma': e.platform or '',
-                        'link': '',
-                        'resumo': e.error_reason,
-                        'tipo_erro': e.error_type
-                    } for e in db_errors
-                ]
+                self.all_error_data = self._load_error_page()
             except Exception as ex:
                 print(f"[AVISO] Erro ao carregar erros do BD: {ex}")
                 self.all_error_data = SIMULATED_FULL_ERRORS
@@ -283,6 +273,7 @@ class ErrorLogWindow(QMainWindow):
         self.main_layout = QVBoxLayout(self.central_widget)
         
         self.log_list_items = []
+        self.no_errors_label = None
 
         self._setup_header()
         self._setup_date_filter() # FILTRO DE DATA
@@ -353,6 +344,72 @@ class ErrorLogWindow(QMainWindow):
 
         self.scroll_area.setWidget(self.content_widget)
         self.main_layout.addWidget(self.scroll_area, 1) 
+        self.pager = ScrollPager(self.scroll_area, self.load_more_errors)
+
+    @staticmethod
+    def _error_to_ui(e):
+        """Converte um ErrorLog do banco para o formato esperado pela UI."""
+        return {
+            'id': e.id,
+            'termo_busca': e.search_term,
+            'titulo': e.article_title,
+            'autores': '',
+            'doi': e.article_doi,
+            'data_log': QDate(e.error_date.year, e.error_date.month, e.error_date.day) if e.error_date else QDate.currentDate(),
+            'publicacao_ano': '',
+            'publicacao_plataforma': e.platform or '',
+            'link': '',
+            'resumo': e.error_reason,
+            'tipo_erro': e.error_type
+        }
+
+    def _load_error_page(self):
+        """Lê a próxima página do log de erros (mais recentes primeiro)."""
+        page = self.db_manager.read_error_logs_page(page_size=ERROR_PAGE_SIZE, cursor=self._next_cursor)
+        self._next_cursor = page.next_cursor
+        return [self._error_to_ui(e) for e in page.items]
+
+    def load_more_errors(self):
+        """Acrescenta a próxima página à lista (chamado pelo ScrollPager). False quando acabou."""
+        if self._next_cursor is None or not self.db_manager:
+            return False
+        try:
+            new_errors = self._load_error_page()
+        except Exception as ex:
+            print(f"[AVISO] Erro ao carregar erros do BD: {ex}")
+            self._next_cursor = None
+            return False
+        self.all_error_data.extend(new_errors)
+
+        start_date = self.date_start_input.date()
+        end_date = self.date_end_input.date()
+        visible = [item for item in new_errors if start_date <= item['data_log'] <= end_date]
+        if visible and self.no_errors_label is not None:
+            self.no_errors_label.deleteLater()
+            self.no_errors_label = None
+        for error in visible:
+            self._add_log_item(error)
+        return self._next_cursor is not None
+
+    def _add_log_item(self, error):
+        """Cria o LogListItem e o insere antes do espaçador final da lista."""
+        item = LogListItem(error) 
+        
+        if self.parent_search_window:
+            # CONEXÃO: Se a janela pai existe, conectamos os sinais de ação
+            try:
+                item.add_term_to_config.connect(self.parent_search_window.add_search_term_from_log)
+                item.mark_as_valid.connect(self.parent_search_window.mark_article_valid_from_log)
+            except AttributeError:
+                pass
+
+        # Gerenciamento de expansão (Colapsa outros itens)
+        for existing_item in self.log_list_items:
+            item.item_clicked.connect(existing_item._handle_item_clicked)
+            existing_item.item_clicked.connect(item._handle_item_clicked)
+
+        self.log_list_items.append(item) 
+        self.errors_vbox.insertWidget(self.errors_vbox.count() - 1, item)
         
     def populate_error_list(self, filtered_data=None):
         """Popula a lista de erros, aplicando o filtro de dados, se houver."""
@@ -367,32 +424,20 @@ class ErrorLogWindow(QMainWindow):
 
         data_to_display = filtered_data if filtered_data is not None else self.all_error_data
         self.log_list_items = []
+        self.no_errors_label = None
+        # espaçador final primeiro: os itens são inseridos antes dele (ver _add_log_item)
+        self.errors_vbox.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
         if not data_to_display:
-            no_errors_label = QLabel("Nenhum erro registrado neste log para o período selecionado.")
-            no_errors_label.setAlignment(Qt.AlignCenter)
-            self.errors_vbox.addWidget(no_errors_label)
+            self.no_errors_label = QLabel("Nenhum erro registrado neste log para o período selecionado.")
+            self.no_errors_label.setAlignment(Qt.AlignCenter)
+            self.errors_vbox.insertWidget(0, self.no_errors_label)
         else:
             for error in sorted(data_to_display, key=lambda x: x['data_log'], reverse=True):
-                item = LogListItem(error) 
-                
-                if self.parent_search_window:
-                    # CONEXÃO: Se a janela pai existe, conectamos os sinais de ação
-                    try:
-                        item.add_term_to_config.connect(self.parent_search_window.add_search_term_from_log)
-                        item.mark_as_valid.connect(self.parent_search_window.mark_article_valid_from_log)
-                    except AttributeError:
-                        pass
-
-                # Gerenciamento de expansão (Colapsa outros itens)
-                for existing_item in self.log_list_items:
-                    item.item_clicked.connect(existing_item._handle_item_clicked)
-                    item.item_clicked.connect(existing_item._handle_item_clicked) 
-
-                self.log_list_items.append(item) 
-                self.errors_vbox.addWidget(item)
-        
-        self.errors_vbox.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+                self._add_log_item(error)
+
+        # as páginas seguintes do banco chegam ao rolar até o fim
+        self.pager.reset(exhausted=self._next_cursor is None)
 
     def filter_log_list(self):
         """Filtra a lista de logs com base nas datas selecionadas."""
@@ -5,19 +5,16 @@ from PySide6.QtWidgets import (
     QSpacerItem, QSizePolicy, QButtonGroup, QDateEdit, QMessageBox
 )
 from PySide6.QtGui import QFont, QIcon, QPixmap 
-from PySide6.QtCore import Qt, QEvent, QRect, QDate
+from PySide6.QtCore import Qt, QEvent, QRect, QDate, QThread, QTimer, Signal
 
-# Importações de outras janelas e dados simulados
-# Assumindo que estas importações estão corretas de acordo com a sua estrutura de pastas
-from Interface.results_window import ResultsWindow
-from Interface.config_window import ConfigWindow, DEFAULT_CONFIG 
-from Interface.log_windows import ErrorLogWindow 
-from Interface.historico_window import HistoryWindow 
-
-# Importações para busca com termos padrão
-from processing.search_helper import get_search_terms_for_affiliation, format_search_query_for_pubmed
-from database.db_manager import DatabaseManager 
-from database.models import SearchHistory
+# Só o necessário para a primeira pintura: as outras janelas, o worker de
+# busca e o banco são importados no primeiro uso (e pré-carregados em segundo
+# plano logo após a pintura, ver Interface/startup.py)
+from Interface.defaults import DEFAULT_CONFIG
+from Interface.startup import start_warm_up
+from processing.collectors import registry
+import config
+from datetime import datetime
 
 
 import sys
@@ -49,6 +46,9 @@ class SearchWindow(QMainWindow):
     """
     Janela principal da aplicação (Tela de Busca).
     """
+    # Emitido uma vez, logo após a primeira pintura da janela
+    first_painted = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Nexus Pesquisa HC-UFPE - Tela de Busca')
@@ -73,14 +73,15 @@ class SearchWindow(QMainWindow):
         self.log_window = None 
         self.history_window = None 
         self.is_menu_open = False
+        self.search_thread = None  # QThread da busca em andamento
+        self.search_worker = None
+        self._pending_search = None
+        self._first_paint_done = False
         
         # --- INTEGRAÇÃO COM BANCO DE DADOS ---
-        try:
-            self.db_manager = DatabaseManager()
-            print("[OK] DatabaseManager inicializado na SearchWindow")
-        except Exception as e:
-            print(f"[AVISO] Erro ao inicializar DatabaseManager: {e}")
-            self.db_manager = None
+        # Criado no primeiro uso (propriedade db_manager)
+        self._db_manager = None
+        self._db_manager_failed = False
         
         self.default_search_config = DEFAULT_CONFIG.copy()
         self.current_search_scope = 'Tema'
@@ -100,7 +101,31 @@ class SearchWindow(QMainWindow):
         
         self.installEventFilter(self)
         self.apply_default_config(self.default_search_config, initial=True)
-        # self._update_stats_display_from_database() 
+
+    @property
+    def db_manager(self):
+        """DatabaseManager criado no primeiro uso; None se o banco estiver indisponível."""
+        if self._db_manager is None and not self._db_manager_failed:
+            try:
+                from database.db_manager import DatabaseManager
+                self._db_manager = DatabaseManager()
+                print("[OK] DatabaseManager inicializado na SearchWindow")
+            except Exception as e:
+                print(f"[AVISO] Erro ao inicializar DatabaseManager: {e}")
+                self._db_manager_failed = True
+        return self._db_manager
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            # depois que o quadro chega à tela: avisa e pré-carrega o restante
+            QTimer.singleShot(0, self._after_first_paint)
+
+    def _after_first_paint(self):
+        self.first_painted.emit()
+        start_warm_up()
+        self._update_stats_display_from_database()
 
     # --- MÉTODOS DE CONTROLE DE MENU (Omitidos para brevidade) ---
     def toggle_menu(self):
@@ -274,7 +299,8 @@ class SearchWindow(QMainWindow):
         self.filtro_layout.addWidget(QLabel('Banco de dados'))
         self.db_hbox = QHBoxLayout()
         self.platform_buttons = {}
-        platforms = ['Scielo', 'PubMed', 'Lilacs', 'Capes Periódicos']
+        # plataformas com coletor registrado (processing/collectors/registry.py)
+        platforms = registry.platforms()
         for platform in platforms:
             btn = QPushButton(platform)
             btn.setProperty('platform', platform)
@@ -348,7 +374,7 @@ class SearchWindow(QMainWindow):
         self.total_input.setReadOnly(True)
         self.total_input.setStyleSheet(f"background-color: {CINZA_FUNDO}; border: 1px solid gray; padding: 5px;")
         self.stats_layout.addWidget(self.total_input, 1, 1)
-        platforms = ['PubMed', 'Scielo', 'Lilacs', 'Capes Periódicos']
+        platforms = registry.platforms()
         self.platform_stat_inputs = {}
         for i, platform in enumerate(platforms, 2): 
             self.stats_layout.addWidget(QLabel(f'{platform}:'), i, 0)
@@ -360,45 +386,26 @@ class SearchWindow(QMainWindow):
         self.stats_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), len(platforms) + 2, 0) 
 
     def _update_stats_display_from_database(self):
-        """Carrega estatísticas do BD: total de artigos e quantidade por plataforma."""
-        # Este método não será chamado na inicialização, apenas após uma busca.
+        """Carrega estatísticas do BD: total de artigos e quantidade por plataforma.
+
+        Os números vêm da tabela agregada `stats` (leitura única, exata em
+        qualquer tamanho de banco): chamado após a primeira pintura e ao fim
+        de cada busca.
+        """
         if not self.db_manager:
-            print("[AVISO] Estatísticas simuladas - DatabaseManager não disponível")
-            # Fallback para dados simulados
-            total = 500
-            stats = {
-                'PubMed': 250,
-                'Scielo': 150,
-                'Lilacs': 75,
-                'Capes Periódicos': 25
-            }
-        else:
-            try:
-                db_stats = self.db_manager.get_stats()
-                total = db_stats.get('articles_total', 0)
-                # Para exibir por plataforma usamos uma aproximação: artigos validados totais
-                stats = {
-                    'PubMed': db_stats.get('articles_validated', 0),
-                    'Scielo': 0,
-                    'Lilacs': 0,
-                    'Capes Periódicos': 0
-                }
-                print(f"[OK] Estatísticas carregadas do BD: {total} artigos no total")
-            except Exception as e:
-                print(f"[AVISO] Erro ao carregar estatísticas do BD: {e}")
-                # Fallback para simulados
-                total = 500
-                stats = {
-                    'PubMed': 250,
-                    'Scielo': 150,
-                    'Lilacs': 75,
-                    'Capes Periódicos': 25
-                }
-            
-        self.total_input.setText(str(total))
-        for platform, count in stats.items():
-            if platform in self.platform_stat_inputs:
-                self.platform_stat_inputs[platform].setText(str(count))
+            print("[AVISO] Estatísticas indisponíveis - DatabaseManager não disponível")
+            return
+        try:
+            db_stats = self.db_manager.get_stats()
+        except Exception as e:
+            print(f"[AVISO] Erro ao carregar estatísticas do BD: {e}")
+            return
+
+        self.total_input.setText(str(db_stats.get('articles_total', 0)))
+        by_platform = db_stats.get('articles_by_platform', {})
+        for platform, input_field in self.platform_stat_inputs.items():
+            input_field.setText(str(by_platform.get(platform, 0)))
+        print(f"[OK] Estatísticas carregadas do BD: {db_stats.get('articles_total', 0)} artigos no total")
 
     def _setup_footer(self):
         footer_hbox = QHBoxLayout() 
@@ -487,11 +494,25 @@ class SearchWindow(QMainWindow):
 
     # --- Métodos de Ação e Navegação (Omitidos para brevidade) ---
     def iniciar_busca(self):
-        """Inicia a busca de artigos usando termos cadastrados na BD."""
+        """Inicia a busca de artigos usando termos cadastrados na BD.
+
+        A coleta roda num QThread (Interface/search_worker.py), que consulta
+        todas as plataformas selecionadas ao mesmo tempo (core/orchestrator.py):
+        a janela de resultados abre na hora e recebe o progresso, os artigos
+        parciais e as plataformas que falharam enquanto as demais respondem.
+        """
+        if self.search_thread is not None:
+            print("[AVISO] Já existe uma busca em andamento")
+            return
+
         search_term_manual = self.search_term_input.text().strip()
         self.default_search_config['date_start'] = self.date_start_input.date().toString("dd/MM/yyyy")
         self.default_search_config['date_end'] = self.date_end_input.date().toString("dd/MM/yyyy")
         
+        from processing.search_helper import get_search_terms_for_affiliation, get_pubmed_query_for_affiliation
+        from processing.validation import get_affiliation_matcher
+        from Interface.search_worker import SearchWorker
+
         if search_term_manual:
             # Usuário digitou um termo manualmente
             term_used = search_term_manual
@@ -501,8 +522,8 @@ class SearchWindow(QMainWindow):
             try:
                 default_terms = get_search_terms_for_affiliation("HC-UFPE")
                 if default_terms:
-                    # Formatar como query PubMed (ex: ("termo1" OR "termo2" OR ...))
-                    term_used = format_search_query_for_pubmed(default_terms)
+                    # Query PubMed (ex: ("termo1" OR "termo2" OR ...)), memoizada no registro de termos
+                    term_used = get_pubmed_query_for_affiliation("HC-UFPE")
                     print(f"🔍 Usando {len(default_terms)} variações de afiliação para busca automática")
                 else:
                     # Fallback para termos configurados
@@ -515,57 +536,113 @@ class SearchWindow(QMainWindow):
         
         print(f"[OK] Iniciando busca: Termo='{term_used[:50]}...' | Plataformas: {platforms_used}")
         print(f"[OK] Período: {self.default_search_config['date_start']} a {self.default_search_config['date_end']}")
-        
-        # Coletar artigos reais da(s) plataforma(s) selecionada(s).
-        articles = []
-        if 'PubMed' in platforms_used:
+
+        self._pending_search = {'term': term_used, 'platforms': platforms_used}
+
+        if not platforms_used:
+            self._finish_search([])
+            return
+
+        # Os termos são resolvidos aqui (registro em memória): o worker não acessa o banco
+        if search_term_manual:
+            pub_terms = [search_term_manual]
+        else:
             try:
-                from processing.collectors.pubmed import search_by_affiliation
+                pub_terms = get_search_terms_for_affiliation("HC-UFPE")
+            except Exception:
+                pub_terms = []
 
-                if search_term_manual:
-                    pub_terms = [search_term_manual]
-                else:
-                    try:
-                        pub_terms = get_search_terms_for_affiliation("HC-UFPE")
-                    except Exception:
-                        pub_terms = []
-
-                pub_results = search_by_affiliation(pub_terms,
-                                                    date_start=self.default_search_config['date_start'],
-                                                    date_end=self.default_search_config['date_end'],
-                                                    max_results=200)
-
-                for idx, r in enumerate(pub_results, start=1):
-                    mapped = {
-                        'id': idx,
-                        'titulo': r.get('title', r.get('titulo', 'N/A')),
-                        'autores': r.get('authors', r.get('autores', '')),
-                        'doi': r.get('doi', ''),
-                        'publicacao': f"{r.get('publication_date','N/A')} (PubMed)",
-                        'link': r.get('url', ''),
-                        'resumo': r.get('abstract', r.get('resumo', '')),
-                        'status': 'NOVO'
-                    }
-                    articles.append(mapped)
-
-                print(f"[OK] PubMed: {len(pub_results)} artigos encontrados e mapeados")
-            except Exception as e:
-                print(f"[AVISO] Erro ao consultar PubMed: {e}")
+        # Validação pelas afiliações dos autores (matcher memoizado no registro de termos)
+        try:
+            matcher = get_affiliation_matcher("HC-UFPE")
+        except Exception as e:
+            print(f"[AVISO] Validação de afiliação indisponível: {e}")
+            matcher = None
+
+        self.open_results_window([])
+        self.results_window.search_started()
+
+        thread = QThread(self)
+        worker = SearchWorker(pub_terms,
+                              date_start=self.default_search_config['date_start'],
+                              date_end=self.default_search_config['date_end'],
+                              max_results=config.PUBMED_MAX_RESULTS,
+                              platforms=platforms_used,
+                              matcher=matcher)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.results_window.show_search_progress)
+        worker.partial_results.connect(self.results_window.append_articles)
+        worker.platform_finished.connect(self.results_window.show_platform_result)
+        worker.platform_finished.connect(self._platform_finished)
+        worker.finished.connect(self._finish_search)
+        worker.failed.connect(self._search_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(self._search_thread_finished)
+
+        self.search_thread = thread
+        self.search_worker = worker
+        thread.start()
+
+    def cancel_search(self):
+        """Pede ao worker que pare; os artigos já coletados continuam na janela de resultados."""
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            print("[OK] Cancelamento da busca solicitado")
+
+    def _platform_finished(self, platform, count, error):
+        """Plataforma que falhou ou estourou o prazo vai para o log de erros (na thread da interface)."""
+        if not error or not self.db_manager:
+            return
+        from database.models import ErrorLog
+        pending = self._pending_search or {}
+        try:
+            self.db_manager.create_error_log(ErrorLog(
+                error_type="Erro de Coleta",
+                search_term=pending.get('term', '')[:500],
+                platform=platform,
+                error_reason=error,
+                error_date=datetime.now(),
+            ))
+        except Exception as e:
+            print(f"[AVISO] Erro ao registrar falha da plataforma {platform}: {e}")
+
+    def _search_failed(self, message):
+        """A busca parou com erro: os artigos parciais já exibidos ficam e a mensagem aparece."""
+        partial = self.results_window.articles if self.results_window is not None else []
+        self._save_search_history(len(partial))
+        if self.results_window is not None:
+            self.results_window.search_failed(message)
+
+    def _search_thread_finished(self):
+        self.search_thread.deleteLater()
+        self.search_thread = None
+        self.search_worker = None
+
+    def _finish_search(self, articles):
+        """Recebe o resultado final (na thread da interface), grava o histórico e atualiza os resultados."""
+        cancelled = self.search_worker is not None and self.search_worker.is_cancelled
+        self._save_search_history(len(articles))
+
+        if self.results_window is None or self.search_worker is None:
+            self.open_results_window(articles)
+            return
+        self.results_window.set_articles(articles)
+        self.results_window.search_finished(cancelled)
 
-        # Se nenhuma plataforma retornou artigos, usar dados simulados como fallback
-        if not articles:
-            # Não use SIMULATED_VALIDATED_ARTICLES se não for importada! Use lista vazia para simulação.
-            articles = [] 
-        
-        # Determinar contagem final
-        results_total = len(articles)
+    def _save_search_history(self, results_total):
+        """Grava a busca pendente no histórico com `results_total` resultados."""
+        pending = self._pending_search or {}
 
         # --- SALVAR BUSCA NO BD ---
-        if self.db_manager:
+        if pending and self.db_manager:
+            from database.models import SearchHistory
             try:
                 search_obj = SearchHistory(
-                    search_term=term_used,
-                    platforms=",".join(platforms_used),
+                    search_term=pending['term'],
+                    platforms=",".join(pending['platforms']),
                     date_start=self.default_search_config['date_start'],
                     date_end=self.default_search_config['date_end'],
                     
@@ -577,16 +654,16 @@ class SearchWindow(QMainWindow):
             except Exception as e:
                 print(f"[AVISO] Erro ao salvar busca no BD: {e}")
                 self.current_search_id = None
-        
-        self.open_results_window(articles)
+        self._pending_search = None
+        self._update_stats_display_from_database()
 
     def open_results_window(self, articles):
         """Abre a janela de Resultados e esconde a janela atual."""
         if not self.results_window:
+            from Interface.results_window import ResultsWindow
             self.results_window = ResultsWindow(parent=self, articles=articles)
         else:
-            self.results_window.articles = articles
-            self.results_window.populate_article_list()
+            self.results_window.set_articles(articles)
             
         self.hide() 
         self.results_window.show()
@@ -594,6 +671,7 @@ class SearchWindow(QMainWindow):
     def open_history_window(self):
         """Abre a janela de Histórico Geral."""
         if not self.history_window:
+            from Interface.historico_window import HistoryWindow
             self.history_window = HistoryWindow(parent=self) 
         self.history_window.show()
         self.hide()
@@ -601,6 +679,7 @@ class SearchWindow(QMainWindow):
     def open_config_window(self):
         """Abre a janela de Configuração."""
         if not self.config_window:
+            from Interface.config_window import ConfigWindow
             self.config_window = ConfigWindow(parent=self)
             self.config_window.current_config = self.default_search_config.copy()
         
@@ -613,34 +692,12 @@ class SearchWindow(QMainWindow):
     def open_log_window(self):
         """Cria e mostra a janela de Histórico GERAL de Erros."""
         if self.log_window is None:
-            errors_from_db = []
-            if self.db_manager:
-                try:
-                    errors_from_db = self.db_manager.read_error_logs()
-                    errors_from_db = [
-                        {
-                            'id': e.id,
-                            'termo_busca': e.search_term,
-                            'titulo': e.article_title,
-                            'autores': '',
-                            'doi': e.article_doi,
-                            'data_log': QDate(e.error_date.year, e.error_date.month, e.error_date.day) if e.error_date else QDate.currentDate(),
-                            'publicacao_ano': '',
-                            'publicacao_plataforma': e.platform or '',
-                            'link': '',
-                            'resumo': e.error_reason,
-                            'tipo_erro': e.error_type
-                        } for e in errors_from_db
-                    ]
-                    print(f"[OK] {len(errors_from_db)} erros carregados do BD")
-                except Exception as e:
-                    print(f"[AVISO] Erro ao carregar erros do BD: {e}")
-            
-            self.log_window = ErrorLogWindow(parent=self, errors=errors_from_db if errors_from_db else None)
+            from Interface.log_windows import ErrorLogWindow
+            # a janela lê o log do banco em páginas, conforme a lista é rolada
+            self.log_window = ErrorLogWindow(parent=self)
             self.log_window.setWindowTitle("Nexus - Histórico de Erros de Execução")
             self.log_window.title_label.setText('Histórico de Erros e Falhas')
             self.log_window.destroyed.connect(self._reset_log_window)
-            self.log_window.log_list_items = [] 
             
         self.log_window.show()
         self.hide() 
@@ -650,10 +707,14 @@ class SearchWindow(QMainWindow):
         self.log_window = None
     
     def closeEvent(self, event):
-        """Fecha a conexão com o BD quando a janela é fechada."""
-        if self.db_manager:
+        """Cancela a busca em andamento e fecha a conexão com o BD quando a janela é fechada."""
+        if self.search_thread is not None:
+            self.cancel_search()
+            self.search_thread.quit()
+            self.search_thread.wait()
+        if self._db_manager:  # sem criar o gerenciador só para fechá-lo
             try:
-                self.db_manager.close()
+                self._db_manager.close()
                 print("[OK] Conexão com BD fechada")
             except Exception as e:
                 print(f"[AVISO] Erro ao fechar BD: {e}")
@@ -0,0 +1,56 @@
+"""
+Carregamento incremental de listas longas ao rolar (histórico e log de erros).
+
+As janelas leem a primeira página do banco (`DatabaseManager.read_*_page`)
+e registram um `ScrollPager` na área de rolagem: quando a barra chega perto
+do fim, ou quando a lista ainda não preenche a área visível, o pager chama
+`load_more`, que lê a página seguinte e acrescenta os itens.
+
+`load_more` retorna False quando não há mais páginas; a partir daí o pager
+para de chamar até `reset()`.
+"""
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class ScrollPager(QObject):
+    """Chama `load_more()` quando a rolagem de `scroll_area` se aproxima do fim."""
+
+    def __init__(self, scroll_area, load_more, threshold: int = 200):
+        super().__init__(scroll_area)
+        self.scroll_area = scroll_area
+        self.load_more = load_more
+        self.threshold = threshold
+        self._loading = False
+        self._exhausted = False
+        bar = scroll_area.verticalScrollBar()
+        bar.valueChanged.connect(self._check)
+        # a lista cresceu ou a janela mudou de tamanho: talvez ainda falte preencher
+        bar.rangeChanged.connect(lambda _min, _max: self._schedule())
+
+    def reset(self, exhausted: bool = False):
+        """Recomeça (ex.: lista recarregada); `exhausted=True` se a primeira página já foi a última."""
+        self._exhausted = exhausted
+        self._schedule()
+
+    def _schedule(self):
+        # depois do layout: o range da barra só é atualizado no próximo ciclo
+        QTimer.singleShot(0, self._check)
+
+    def _check(self, *_):
+        if self._loading or self._exhausted:
+            return
+        bar = self.scroll_area.verticalScrollBar()
+        if bar.maximum() - bar.value() > self.threshold:
+            return
+        self._loading = True
+        try:
+            self._exhausted = not self.load_more()
+        except Exception as e:
+            print(f"[AVISO] Falha ao carregar a próxima página: {e}")
+            self._exhausted = True
+        finally:
+            self._loading = False
+        if not self._exhausted:
+            # os itens novos podem não ter preenchido a área (ex.: fora do filtro de datas)
+            self._schedule()
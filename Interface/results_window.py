@@ -6,11 +6,16 @@ from PySide6.QtWidgets import (
     QScrollArea, QSpacerItem, QSizePolicy, QButtonGroup
 )
 from PySide6.QtGui import QFont, QCursor, QPixmap
-from PySide6.QtCore import Qt, Signal, QRect, QDate
+from PySide6.QtCore import Qt, Signal, QRect, QDate, QTimer
 
 # Importações de outras janelas e dados simulados
 from database.db_manager import DatabaseManager
+from database.fulltext import ArticleTextIndex
 from database.models import Article
+from processing.collectors import registry
+from Interface.article_details import RecordStoreDetails, merge_details
+from Interface.article_list_view import ArticleListView
+from Interface.search_worker import stage_label
 
 # --- DEFINIÇÕES/CONSTANTES (Mantenha as suas aqui) ---
 AZUL_NEXUS = "#3b5998"
@@ -22,127 +27,6 @@ VERMELHO_ERRO = "#c53929"
 # A ResultsWindow deve confiar que o parent (SearchWindow) 
 # fornecerá o caminho correto via parent_window.resource_path.
 
-# --- Widget Customizado para a Linha de Artigo (Expansível) ---
-
-class ArticleListItem(QFrame):
-    """Representa um item na lista de artigos que pode ser expandido."""
-    
-    item_clicked = Signal(int)
-
-    def __init__(self, article_data, parent=None):
-        super().__init__(parent)
-        self.article_data = article_data
-        self.is_expanded = False
-        self.article_id = article_data["id"]
-        
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setFrameShadow(QFrame.Raised)
-        self.setStyleSheet("border: 1px solid #ddd; border-radius: 5px; margin-bottom: 5px; background-color: white;")
-        
-        self.main_layout = QVBoxLayout(self)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-        
-        self._setup_header_row()
-        self._setup_detail_content()
-        
-        self.detail_widget.setVisible(False)
-        
-    def _setup_header_row(self):
-        """Cria a linha que mostra Título, Autores e o ícone de expansão, com larguras fixas."""
-        header_widget = QWidget()
-        header_hbox = QHBoxLayout(header_widget)
-        header_hbox.setContentsMargins(10, 8, 10, 8)
-        
-        # 1. Título do Artigo (Ocupa o espaço restante)
-        title_label = QLabel(f'<b>{self.article_data.get("titulo", "N/A")}</b>')
-        title_label.setCursor(QCursor(Qt.PointingHandCursor))
-        title_label.setFont(QFont("Arial", 10))
-        title_label.setWordWrap(True)
-        header_hbox.addWidget(title_label, 1) 
-        
-        # 2. Autores (Largura Fixa para estabilidade)
-        authors_label = QLabel(f'Autores: {self.article_data.get("autores", "N/A")}')
-        authors_label.setFixedWidth(200) 
-        authors_label.setFont(QFont("Arial", 9))
-        authors_label.setWordWrap(True)
-        header_hbox.addWidget(authors_label)
-        
-        # 3. Ícone de Expansão (Largura Fixa Mínima)
-        self.expand_icon = QLabel("▼")
-        self.expand_icon.setFixedWidth(20)
-        header_hbox.addWidget(self.expand_icon)
-        
-        self.main_layout.addWidget(header_widget)
-        self.header_widget = header_widget
-
-    def _setup_detail_content(self):
-        """Cria o widget com os detalhes (Resumo, DOI, Link) que será expandido."""
-        self.detail_widget = QFrame()
-        self.detail_widget.setStyleSheet(f"background-color: {CINZA_FUNDO}; padding: 10px; border-top: 1px solid #ccc; border-bottom-left-radius: 5px; border-bottom-right-radius: 5px;")
-        detail_layout = QGridLayout(self.detail_widget)
-        detail_layout.setSpacing(5)
-        
-        def add_detail_row(layout, row, label_text, value_text):
-            label = QLabel(f'<b>{label_text}:</b>')
-            label.setFixedWidth(100)
-            value = QLabel(value_text)
-            value.setOpenExternalLinks(True) 
-            value.setWordWrap(True)
-            layout.addWidget(label, row, 0, Qt.AlignTop)
-            layout.addWidget(value, row, 1)
-
-        add_detail_row(detail_layout, 0, "ID DOI", self.article_data.get("doi", "N/A"))
-        add_detail_row(detail_layout, 1, "Publicação", self.article_data.get("publicacao", "N/A"))
-        add_detail_row(detail_layout, 2, "Link", f'<a href="{self.article_data.get("link", "#")}">{self.article_data.get("link", "N/A")}</a>')
-        
-        resumo_label = QLabel('<b>Resumo:</b>')
-        detail_layout.addWidget(resumo_label, 3, 0, 1, 2, Qt.AlignTop)
-        resumo_text = QLabel(self.article_data.get("resumo", "Resumo não disponível."))
-        resumo_text.setWordWrap(True)
-        detail_layout.addWidget(resumo_text, 4, 0, 1, 2)
-        
-        data_pesquisa_label = QLabel('<i>Data da Pesquisa: (Simulado)</i>')
-        data_pesquisa_label.setFont(QFont("Arial", 8))
-        data_pesquisa_label.setAlignment(Qt.AlignRight)
-        detail_layout.addWidget(data_pesquisa_label, 5, 0, 1, 2, Qt.AlignRight)
-
-        self.main_layout.addWidget(self.detail_widget)
-
-
-    def mousePressEvent(self, event):
-        """Sobrescreve o evento de clique para expandir/colapsar."""
-        if self.header_widget.geometry().contains(event.pos()):
-            self.item_clicked.emit(self.article_id) 
-            self._toggle_expansion()
-        else:
-            super().mousePressEvent(event)
-
-    def _handle_item_clicked(self, clicked_id):
-        """Recebe o sinal do clique. Colapsa se outro item foi clicado."""
-        if clicked_id != self.article_id and self.is_expanded:
-            self.collapse()
-
-    def _toggle_expansion(self):
-        """Alterna o estado de expansão."""
-        if self.is_expanded:
-            self.collapse()
-        else:
-            self.expand()
-
-    def expand(self):
-        """Expande o widget de detalhes."""
-        self.detail_widget.setVisible(True)
-        self.expand_icon.setText("▲")
-        self.is_expanded = True
-        
-    def collapse(self):
-        """Colapsa o widget de detalhes."""
-        self.detail_widget.setVisible(False)
-        self.expand_icon.setText("▼")
-        self.is_expanded = False
-# --- FIM DO CÓDIGO DA CLASSE ArticleListItem ---
-
 
 class ResultsWindow(QMainWindow):
     def __init__(self, parent=None, articles=None):
@@ -172,7 +56,18 @@ class ResultsWindow(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
         
-        self.article_list_items = []
+        self.stats_fields = {}
+        # Resultados da busca chegam só com o cabeçalho; resumo/link vêm do armazenamento local
+        self.article_details = RecordStoreDetails()
+        self.search_running = False
+        self.platform_failures = {}
+
+        # Filtro textual (FTS5 em memória sobre os resultados ainda não salvos)
+        self._text_index = None
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self.apply_text_filter)
 
         self._setup_header()
         self._setup_content()
@@ -205,22 +100,36 @@ class ResultsWindow(QMainWindow):
     def _setup_content(self):
         content_hbox = QHBoxLayout()
         
-        # 1. Área de Rolagem para Artigos (Esquerda)
-        results_scroll_area = QScrollArea()
-        results_scroll_area.setWidgetResizable(True)
-        
-        results_list_widget = QWidget()
-        results_list_widget.setStyleSheet(f"background-color: {CINZA_FUNDO};")
-        self.results_vbox = QVBoxLayout(results_list_widget)
-        self.results_vbox.setSpacing(5) 
-        self.results_vbox.setContentsMargins(10, 10, 10, 10)
-        
+        # 1. Filtro + Área de Rolagem para Artigos (Esquerda)
+        left_vbox = QVBoxLayout()
+
+        # Andamento da busca em segundo plano (oculto fora de uma busca)
+        progress_hbox = QHBoxLayout()
+        self.search_status_label = QLabel('')
+        self.search_status_label.setStyleSheet("color: #555; padding: 4px;")
+        progress_hbox.addWidget(self.search_status_label, 1)
+        self.cancel_search_button = QPushButton('Cancelar busca')
+        self.cancel_search_button.setStyleSheet(f"background-color: {VERMELHO_ERRO}; color: {BRANCO_PADRAO}; padding: 4px 10px; border-radius: 4px;")
+        self.cancel_search_button.clicked.connect(self.cancel_search)
+        self.cancel_search_button.hide()
+        progress_hbox.addWidget(self.cancel_search_button)
+        left_vbox.addLayout(progress_hbox)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar por título, resumo ou autores...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setStyleSheet("padding: 6px; border: 1px solid gray; border-radius: 4px;")
+        self.filter_input.textChanged.connect(lambda _text: self._filter_timer.start())
+        left_vbox.addWidget(self.filter_input)
+
+        # Lista modelo/visão: só as linhas visíveis são desenhadas
+        self.article_view = ArticleListView(empty_text="Nenhum artigo validado encontrado.",
+                                            detail_footer="Data da Pesquisa: (Simulado)")
+        self.article_view.set_detail_source(self.article_details)
         self.populate_article_list()
-
-        self.results_vbox.addStretch(1) 
-        results_scroll_area.setWidget(results_list_widget)
+        left_vbox.addWidget(self.article_view, 1)
         
-        content_hbox.addWidget(results_scroll_area, 3) 
+        content_hbox.addLayout(left_vbox, 3) 
         
         # 2. Painel de Estatísticas (Direita)
         self.stats_frame = QFrame()
@@ -231,43 +140,106 @@ class ResultsWindow(QMainWindow):
 
         self.main_layout.addLayout(content_hbox, 1) 
 
-    def populate_article_list(self):
-        """Popula a lista de artigos e conecta os sinais de expansão/colapso."""
-        
-        # Limpar layout anterior
-        while self.results_vbox.count() > 0:
-            item = self.results_vbox.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.spacerItem() is not None:
-                del item 
-
-        self.article_list_items = []
-
-        if not self.articles:
-            no_results_label = QLabel("Nenhum artigo validado encontrado.")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            no_results_label.setFont(QFont("Arial", 12))
-            no_results_label.setStyleSheet("color: gray; padding: 20px;")
-            self.results_vbox.addWidget(no_results_label)
+    def apply_text_filter(self):
+        """Mostra só os artigos que casam com o texto do filtro, por relevância."""
+        text = self.filter_input.text().strip()
+        if not text:
+            self.populate_article_list()
             return
+        if self._text_index is None:
+            # O filtro também cobre o resumo: carrega os detalhes de todos numa leitura só
+            self._text_index = ArticleTextIndex(merge_details(self.articles, self.article_details))
+        hits = self._text_index.search(text)
+        self.populate_article_list([self.articles[pos] for pos, _snippet in hits])
+
+    def search_started(self):
+        """Prepara a janela para receber os resultados de uma busca em andamento."""
+        self.search_running = True
+        self.platform_failures = {}
+        self.set_articles([])
+        self.search_status_label.setText("Buscando artigos...")
+        self.cancel_search_button.setEnabled(True)
+        self.cancel_search_button.show()
+
+    def show_search_progress(self, stage, done, total):
+        """Atualiza o texto de andamento (sinal `progress` do SearchWorker)."""
+        label = stage_label(stage)
+        self.search_status_label.setText(f"{label}: {done} de {total}" if total else f"{label}: {done}")
+
+    def show_platform_result(self, platform, count, error):
+        """Registra o fim de uma plataforma (sinal `platform_finished`); falhas aparecem no resumo final."""
+        if error:
+            self.platform_failures[platform] = error
+            self.search_status_label.setText(f"{platform}: {error}")
+        else:
+            self.search_status_label.setText(f"{platform}: {count} artigo(s)")
+
+    def search_finished(self, cancelled=False):
+        self.search_running = False
+        self.cancel_search_button.hide()
+        status = "Busca cancelada" if cancelled else "Busca concluída"
+        text = f"{status}: {len(self.articles)} artigo(s)"
+        if self.platform_failures:
+            text += " | Sem resultado de: " + "; ".join(f"{p} ({e})" for p, e in self.platform_failures.items())
+        self.search_status_label.setText(text)
+
+    def search_failed(self, message):
+        """Fim da busca com erro (sinal `failed`): os artigos parciais continuam na lista."""
+        self.search_running = False
+        self.cancel_search_button.hide()
+        received = len(self.articles)
+        self.search_status_label.setText(f"Busca interrompida: {message} | {received} artigo(s) recebido(s)")
+        QMessageBox.warning(self, "Erro na busca",
+                            f"A busca foi interrompida por um erro:\n{message}\n\n"
+                            f"Os {received} artigo(s) já recebidos foram mantidos.")
+
+    def cancel_search(self):
+        """Cancela a busca em andamento; os artigos já recebidos são mantidos."""
+        if self.search_running and self.parent_window and hasattr(self.parent_window, 'cancel_search'):
+            self.cancel_search_button.setEnabled(False)
+            self.search_status_label.setText("Cancelando busca...")
+            self.parent_window.cancel_search()
+
+    def append_articles(self, articles):
+        """Acrescenta um lote de resultados parciais sem reconstruir a lista inteira."""
+        if not articles:
+            return
+        self.articles.extend(articles)
+        self._reset_text_index()
+        self._update_stats_panel()
+        if self.filter_input.text().strip():
+            self._filter_timer.start()
+            return
+        self.article_view.append_articles(articles)
+
+    def set_articles(self, articles):
+        """Substitui os resultados exibidos (ex.: lista final da busca)."""
+        self.articles = articles
+        self._reset_text_index()
+        self._update_stats_panel()
+        if self.filter_input.text().strip():
+            self.apply_text_filter()
+        else:
+            self.populate_article_list()
 
-        for article in self.articles:
-            item = ArticleListItem(article)
-            
-            for existing_item in self.article_list_items:
-                item.item_clicked.connect(existing_item._handle_item_clicked)
-                existing_item.item_clicked.connect(item._handle_item_clicked)
-            
-            self.article_list_items.append(item)
-            self.results_vbox.addWidget(item) 
-            
-        self.results_vbox.addStretch(1)
+    def _reset_text_index(self):
+        if self._text_index is not None:
+            self._text_index.close()
+            self._text_index = None
+
+    def populate_article_list(self, articles=None):
+        """Exibe os artigos na lista (modelo/visão; expansão controlada pelo delegate).
 
+        Args:
+            articles: Subconjunto a exibir (ex.: resultado do filtro); padrão: todos.
+        """
+        if articles is None:
+            articles = self.articles
+        self.article_view.set_articles(articles)
 
     def _setup_stats_panel(self, frame):
         """
-        Configura o painel de estatísticas, calculando os valores reais.
+        Configura o painel de estatísticas; os valores vêm de `_compute_stats`.
         """
         stats_layout = QGridLayout(frame)
         
@@ -277,34 +249,7 @@ class ResultsWindow(QMainWindow):
         title_label.setFont(font)
         stats_layout.addWidget(title_label, 0, 0, 1, 2) 
         
-        # --- Cálculo dinâmico das estatísticas ---
-        platform_counts = {
-            "PubMed": 0,
-            "Scielo": 0,
-            "Lilacs": 0,
-            "Capes Periódicos": 0
-        }
-        total_articles = len(self.articles)
-        
-        for article in self.articles:
-            # Extrai o nome da plataforma da string de publicação (ex: "2023-05 (Scielo)" -> "Scielo")
-            publicacao = article.get("publicacao", "")
-            if "(" in publicacao and ")" in publicacao:
-                platform_name = publicacao.split("(")[-1].rstrip(")")
-                # A capitalização deve corresponder às chaves
-                if platform_name in platform_counts:
-                    platform_counts[platform_name] += 1
-                elif platform_name == 'Capes Periódicos': 
-                    platform_counts['Capes Periódicos'] += 1
-        
-        stats_data = {
-            "Total:": total_articles,
-            "PubMed:": platform_counts["PubMed"],
-            "Scielo:": platform_counts["Scielo"],
-            "Lilacs:": platform_counts["Lilacs"],
-            "Capes Periódicos:": platform_counts["Capes Periódicos"]
-        }
-        # ----------------------------------------------------
+        stats_data = self._compute_stats()
 
         row = 1
         for label, count in stats_data.items():
@@ -313,10 +258,35 @@ class ResultsWindow(QMainWindow):
             input_field.setReadOnly(True)
             input_field.setStyleSheet(f"background-color: {CINZA_FUNDO}; border: 1px solid gray; padding: 5px;")
             stats_layout.addWidget(input_field, row, 1)
+            self.stats_fields[label] = input_field
             row += 1
 
         stats_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), row, 0) 
         
+    def _compute_stats(self):
+        """Conta os artigos por plataforma (a partir de `self.articles`)."""
+        # plataformas com coletor registrado (processing/collectors/registry.py)
+        platform_counts = {platform: 0 for platform in registry.platforms()}
+
+        for article in self.articles:
+            # Extrai o nome da plataforma da string de publicação (ex: "2023-05 (Scielo)" -> "Scielo")
+            publicacao = article.get("publicacao", "")
+            if "(" in publicacao and ")" in publicacao:
+                platform_name = publicacao.split("(")[-1].rstrip(")")
+                if platform_name in platform_counts:
+                    platform_counts[platform_name] += 1
+
+        stats_data = {"Total:": len(self.articles)}
+        for platform, count in platform_counts.items():
+            stats_data[f"{platform}:"] = count
+        return stats_data
+
+    def _update_stats_panel(self):
+        """Atualiza os números do painel (ex.: a cada lote de resultados parciais)."""
+        for label, count in self._compute_stats().items():
+            if label in self.stats_fields:
+                self.stats_fields[label].setText(str(count))
+
     def _setup_footer(self):
         footer_hbox = QHBoxLayout()
         
@@ -390,7 +360,8 @@ class ResultsWindow(QMainWindow):
         self.current_log_window = None
 
     def return_to_search(self):
-        """Fecha esta janela e exibe a janela pai (SearchWindow)."""
+        """Fecha esta janela e exibe a janela pai (SearchWindow); cancela a busca em andamento."""
+        self.cancel_search()
         self.close()
         if self.parent_window:
             self.parent_window.show()
@@ -417,49 +388,28 @@ class ResultsWindow(QMainWindow):
             return
 
         try:
-            saved_count = 0
-            skipped_count = 0
-            for article in self.articles:
-                # Extrair platform e doi
+            art_objs = []
+            for article in merge_details(self.articles, self.article_details):
+                # Extrair platform (formato "data (Plataforma)"); DOI/URL 'N/A'/'#' são normalizados no BD
                 platform = article.get("publicacao", "").split("(")[-1].rstrip(")") if "(" in article.get("publicacao", "") else "Desconhecido"
-                doi = article.get("doi", "") or ""
-
-                # Verificação de duplicata:
-                existing = None
-                try:
-                    # CORREÇÃO CRÍTICA SECUNDÁRIA: O db_manager precisa da conexão ativa para rodar estes métodos
-                    if doi:
-                        existing = self.db_manager.read_article_by_platform_and_doi(platform, doi)
-                    else:
-                        url = article.get("link", "") or ""
-                        url = url.strip()
-                        if url:
-                            existing = self.db_manager.read_article_by_platform_and_url(platform, url)
-                except Exception as e:
-                    # Este erro pode ocorrer se a função read_article não gerencia a conexão interna
-                    print(f"[AVISO] Erro ao checar duplicatas (pode ser problema de conexão interna): {e}")
-
-                if existing:
-                    skipped_count += 1
-                    key = doi if doi else (article.get('link','') or 'N/A')
-                    print(f"[AVISO] Artigo ({key}) já existe na plataforma {platform} (ID {existing.id}) — pulando inserção")
-                    continue
-
-                art_obj = Article(
+                # data de publicação (ano), usada também no agrupamento de duplicatas entre plataformas
+                published = article.get("publicacao", "").split(" (")[0].strip()
+                art_objs.append(Article(
                     title=article.get("titulo", "N/A"),
                     authors=article.get("autores", "N/A"),
-                    doi=doi,
+                    doi=article.get("doi", "") or "",
                     platform=platform,
+                    publication_date=published if published not in ("", "N/A", "None") else None,
                     abstract=article.get("resumo", "N/A"),
                     url=article.get("link", "N/A"),
-                    status=article.get("status", "NOVO")
-                )
-                # CORREÇÃO CRÍTICA SECUNDÁRIA: O db_manager precisa da conexão ativa para create_article
-                article_id = self.db_manager.create_article(art_obj) 
-                
-                if article_id:
-                    saved_count += 1
-                    print(f"[OK] Artigo '{article.get('titulo')[:50]}...' salvo com ID {article_id}")
+                    status=article.get("status", "NOVO"),
+                    affiliations=article.get("afiliacoes") or []
+                ))
+
+            # Inserção em lote: uma transação, duplicatas descartadas pelo próprio SQL
+            counts = self.db_manager.bulk_upsert_articles(art_objs)
+            saved_count = counts['inserted']
+            skipped_count = counts['skipped']
 
             # Mensagens para o usuário
             QMessageBox.information(self, "Sucesso", f"{saved_count} artigo(s) salvo(s). {skipped_count} duplicata(s) ignorada(s).")
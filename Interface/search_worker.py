@@ -0,0 +1,174 @@
+"""
+Worker de busca executado fora da thread da interface.
+
+`SearchWindow.iniciar_busca` chamava o coletor PubMed diretamente na thread
+do Qt, congelando a janela durante todas as idas e vindas ao NCBI. Aqui a
+coleta roda num `QThread`, pelo orquestrador (core/orchestrator.py), que
+consulta as plataformas selecionadas ao mesmo tempo; a interface recebe
+sinais de progresso, os artigos parciais (a cada lote, já sem duplicatas),
+o resultado de cada plataforma e o resultado final, e pode cancelar a busca
+a qualquer momento.
+
+Uso (na thread da interface):
+    thread = QThread(self)
+    worker = SearchWorker(pub_terms, date_start, date_end, max_results, platforms=['PubMed'])
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.partial_results.connect(results_window.append_articles)
+    worker.finished.connect(thread.quit)
+    ...
+    thread.start()
+    worker.cancel()   # thread-safe: pode ser chamado direto da interface
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from Interface.article_details import header_only
+from processing.collectors import registry
+from processing.collectors.progress import SearchHooks
+
+# Texto exibido para cada etapa informada pelos coletores
+STAGE_LABELS = {
+    'ids': "IDs encontrados",
+    'batches': "Lotes buscados",
+    'articles': "Artigos processados",
+}
+
+
+def stage_label(stage: str) -> str:
+    """'PubMed:ids' (etapa informada pelo orquestrador) -> 'PubMed - IDs encontrados'."""
+    platform, _, name = stage.rpartition(':')
+    label = STAGE_LABELS.get(name, name)
+    return f"{platform} - {label}" if platform else label
+
+
+def to_ui_article(record: Dict, idx: int, platform: str = 'PubMed', status: str = 'NOVO') -> Dict:
+    """Converte um artigo do coletor no dicionário usado pelas janelas (chaves em Português)."""
+    platform = record.get('platform') or platform
+    return {
+        'id': idx,
+        'pmid': record.get('pmid'),
+        'titulo': record.get('title', record.get('titulo', 'N/A')),
+        'autores': record.get('authors', record.get('autores', '')),
+        'doi': record.get('doi', ''),
+        'publicacao': f"{record.get('publication_date', 'N/A')} ({platform})",
+        'link': record.get('url', ''),
+        'resumo': record.get('abstract', record.get('resumo', '')),
+        'afiliacoes': record.get('affiliations', []),
+        # mesmo grupo: provável mesmo trabalho em outra plataforma (core/orchestrator.py)
+        'grupo': record.get('cluster_id'),
+        'status': status
+    }
+
+
+class SearchWorker(QObject):
+    """Executa a busca nas plataformas selecionadas e informa o andamento por sinais Qt.
+
+    Não acessa o banco de dados: a conexão SQLite do DatabaseManager pertence
+    à thread da interface, que grava o histórico ao receber `finished`.
+
+    Com o armazenamento local de registros ativo, os artigos emitidos levam só
+    o cabeçalho dos artigos do PubMed; resumo e link são lidos de lá ao
+    expandir (RecordStoreDetails).
+
+    Com um `matcher` (AffiliationMatcher), cada lote é validado pelas afiliações
+    dos autores ao chegar: artigos com alguma variação cadastrada saem como
+    'VALIDADO', os demais como 'NOVO'.
+    """
+    progress = Signal(str, int, int)   # etapa, concluídos, total
+    partial_results = Signal(list)     # artigos (formato da UI) de um lote
+    platform_finished = Signal(str, int, str)  # plataforma, artigos novos, erro ('' se ok)
+    finished = Signal(list)            # todos os artigos, na ordem final
+    failed = Signal(str)
+
+    def __init__(self, pub_terms: List[str], date_start: str, date_end: str,
+                 max_results: int, platforms: Optional[List[str]] = None, matcher=None,
+                 timeouts: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.matcher = matcher
+        self.platforms = list(platforms) if platforms is not None else ['PubMed']
+        self.timeouts = timeouts
+        self.pub_terms = pub_terms
+        self.date_start = date_start
+        self.date_end = date_end
+        self.max_results = max_results
+        self.outcome = None
+        self._cancel_event = threading.Event()
+        self._partial_count = 0
+        self._headers_only = False
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Pede o cancelamento; a coleta para ao fim do lote em andamento."""
+        self._cancel_event.set()
+
+    def _to_ui(self, records: List[Dict], start: int) -> List[Dict]:
+        if self.matcher is not None:
+            statuses = ['VALIDADO' if result.valid else 'NOVO' for result in self.matcher.validate_batch(records)]
+        else:
+            statuses = ['NOVO'] * len(records)
+        articles = [to_ui_article(r, idx, status=status)
+                    for idx, (r, status) in enumerate(zip(records, statuses), start=start)]
+        if self._headers_only:
+            # só os do PubMed (PMID) podem ser relidos do armazenamento local
+            articles = [header_only(a) if a.get('pmid') else a for a in articles]
+        return articles
+
+    def _on_batch(self, records: List[Dict]):
+        start = self._partial_count + 1
+        self._partial_count += len(records)
+        self.partial_results.emit(self._to_ui(records, start))
+
+    def _platform_done(self, result):
+        if result.ok:
+            print(f"[OK] {result.platform}: {result.added} artigos ({result.duplicates} duplicados, "
+                  f"{result.grouped} parecidos com outros) "
+                  f"em {result.elapsed:.1f}s")
+        else:
+            print(f"[AVISO] {result.platform}: {result.error}")
+        self.platform_finished.emit(result.platform, result.added, result.error or '')
+
+    @Slot()
+    def run(self):
+        try:
+            from core.orchestrator import run_search
+            from processing.collectors.record_store import get_default_store
+
+            self._headers_only = get_default_store() is not None
+            hooks = SearchHooks(progress=self.progress.emit, on_batch=self._on_batch,
+                                cancel_event=self._cancel_event)
+            self.outcome = run_search(self.pub_terms, self.platforms,
+                                      date_range=(self.date_start, self.date_end),
+                                      max_results=self.max_results,
+                                      timeouts=self.timeouts,
+                                      hooks=hooks,
+                                      on_platform_done=self._platform_done)
+            articles = self._to_ui(self.outcome.articles, 1)
+
+            status = "cancelada" if self.is_cancelled else "concluída"
+            print(f"[OK] Busca ({status}): {len(articles)} artigos de {len(self.platforms)} plataforma(s) "
+                  f"em {self.outcome.elapsed:.1f}s")
+            if self.platforms:
+                # pool HTTP e cache compartilhados por todos os coletores do registro
+                from processing.collectors.pubmed import connection_stats, cache_stats
+                for stats in (p.stats() for p in registry.loaded_collectors()):
+                    print(f"[OK] Coletor {stats['platform']}: {stats['searches']} busca(s), "
+                          f"{stats['records']} registros em {stats['batches']} lotes, {stats['errors']} erro(s)")
+                http_stats = connection_stats()
+                print(f"[OK] Conexões HTTP: {http_stats['connections_created']} criadas, "
+                      f"{http_stats['connections_reused']} reutilizadas ({http_stats['requests']} requisições)")
+                http_cache = cache_stats()
+                if http_cache:
+                    print(f"[OK] Cache HTTP: {http_cache['hits']} respostas do cache, "
+                          f"{http_cache['misses']} buscadas na rede")
+        except Exception as e:
+            print(f"[AVISO] Erro ao executar a busca: {e}")
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(articles)
@@ -0,0 +1,147 @@
+"""
+Abertura da interface: pré-carregamento em segundo plano e medição do tempo
+até a primeira pintura da janela principal.
+
+A janela principal (Interface/main_window.py) só importa o necessário para
+se desenhar; as janelas secundárias, o worker de busca e o banco são
+importados na primeira vez que são usados. Depois da primeira pintura,
+`start_warm_up` importa esses módulos e prepara o banco
+(`database.bootstrap`) numa thread, para que já estejam carregados no
+primeiro clique.
+
+O efeito no tempo até a primeira pintura ainda não foi medido (nem com
+Python nem no executável do PyInstaller): rode a medição abaixo antes e
+depois de mudar a abertura e compare as medianas.
+
+Medição (benchmark):
+    python -m Interface.startup --runs 5
+    python -m Interface.startup --runs 5 --frozen dist/NEXUS_PESQUISA.exe
+
+Cada execução abre a aplicação com NEXUS_STARTUP_BENCHMARK=<arquivo>; a
+aplicação grava o instante da primeira pintura e fecha. O tempo inclui a
+partida do interpretador (ou a extração do executável do PyInstaller).
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import config
+
+# Importados em segundo plano após a primeira pintura (na ordem de uso provável)
+WARMUP_MODULES = (
+    'Interface.search_worker',
+    'Interface.results_window',
+    'Interface.config_window',
+    'Interface.historico_window',
+    'Interface.log_windows',
+    'processing.search_helper',
+    'processing.validation',
+)
+
+
+def warm_up(seed: bool = True) -> Dict[str, float]:
+    """Prepara o banco e importa os módulos adiados. Retorna os tempos (ms) de cada etapa."""
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        from database import bootstrap
+        bootstrap(seed=seed)
+    except Exception as e:
+        print(f"[AVISO] Pré-carregamento do banco falhou: {e}")
+    timings['database'] = (time.perf_counter() - started) * 1000
+    for name in WARMUP_MODULES:
+        step = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[AVISO] Pré-carregamento de {name} falhou: {e}")
+        timings[name] = (time.perf_counter() - step) * 1000
+    total = (time.perf_counter() - started) * 1000
+    print(f"[OK] Pré-carregamento concluído em {total:.0f} ms")
+    return timings
+
+
+def start_warm_up() -> Optional[threading.Thread]:
+    """Inicia `warm_up` numa thread (None se desativado por GUI_WARMUP=0)."""
+    if not config.GUI_WARMUP:
+        return None
+    thread = threading.Thread(target=warm_up, name="gui-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# ==================== MEDIÇÃO ====================
+
+def record_first_paint(window, app, started: float):
+    """Com NEXUS_STARTUP_BENCHMARK definido, grava a primeira pintura de `window` e fecha a aplicação."""
+    target = config.STARTUP_BENCHMARK_FILE
+    if not target:
+        return
+
+    def painted():
+        sample = {
+            'painted_at': time.time(),
+            'in_process_ms': (time.perf_counter() - started) * 1000,
+            'frozen': bool(getattr(sys, 'frozen', False)),
+        }
+        with open(target, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(sample) + "\n")
+        app.quit()
+
+    window.first_painted.connect(painted)
+
+
+def _measure(command: List[str], runs: int, cwd: str) -> List[Dict]:
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "startup.jsonl")
+            env = dict(os.environ, NEXUS_STARTUP_BENCHMARK=out, GUI_WARMUP='0')
+            launched = time.time()
+            subprocess.run(command, cwd=cwd, env=env, timeout=120, check=False)
+            if not os.path.exists(out):
+                print(f"[AVISO] Execução sem registro de pintura: {' '.join(command)}")
+                continue
+            with open(out, encoding='utf-8') as f:
+                sample = json.loads(f.readline())
+        sample['first_paint_ms'] = (sample['painted_at'] - launched) * 1000
+        samples.append(sample)
+    return samples
+
+
+def _report(label: str, samples: List[Dict]):
+    if not samples:
+        print(f"{label}: sem amostras")
+        return
+    total = statistics.median(s['first_paint_ms'] for s in samples)
+    inside = statistics.median(s['in_process_ms'] for s in samples)
+    print(f"{label}: primeira pintura em {total:.0f} ms (mediana de {len(samples)}; "
+          f"{inside:.0f} ms dentro do processo)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Tempo até a primeira pintura da SearchWindow")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--frozen', help="executável gerado pelo PyInstaller (NEXUS_PESQUISA.spec)")
+    args = parser.parse_args(argv)
+
+    root = str(config.BASE_DIR)
+    print("=" * 60)
+    print("MEDIÇÃO: tempo até a primeira pintura da SearchWindow")
+    print("=" * 60)
+    _report("Python", _measure([sys.executable, "__main__.py"], args.runs, root))
+    if args.frozen:
+        _report("PyInstaller", _measure([os.path.abspath(args.frozen)], args.runs, root))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,13 @@ SITE_PACKAGES_PATH = 'C:\\Users\\Tiago Renan\\Documents\\TIAGO\\Faculdade\\ADS_U
 
 datas = [('interface/imagens', 'interface/imagens')]
 binaries = []
-hiddenimports = []
+# Módulos importados por nome (texto) e invisíveis à análise do PyInstaller:
+# coletores do registro (processing/collectors/registry.py)
+hiddenimports = [
+    'processing.collectors.scielo',
+    'processing.collectors.pubmed',
+    'processing.collectors.other_bases',
+]
 
 # Tentativa de coletar automaticamente todas as dependências do PySide6
 tmp_ret = collect_all('PySide6')
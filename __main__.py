@@ -1,14 +1,23 @@
 import sys
+import time
+
+_STARTED = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication
 # Certifique-se de que o caminho de importação está correto
 from Interface.main_window import SearchWindow
+from Interface.startup import record_first_paint
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    
-    # Cria e exibe a janela principal (Tela de Busca)
+
+    # Cria e exibe a janela principal (Tela de Busca). O banco (esquema e
+    # dados padrão) é preparado em segundo plano após a primeira pintura.
     main_window = SearchWindow()
+    main_window.first_painted.connect(
+        lambda: print(f"[OK] Janela principal pintada em {(time.perf_counter() - _STARTED) * 1000:.0f} ms"))
+    record_first_paint(main_window, app, _STARTED)
     main_window.show()
     
     # Inicia o loop de eventos da aplicação
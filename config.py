@@ -53,3 +53,74 @@ def sqlite_path_from_url(url: str) -> str:
 		return url
 
 	return str(BASE_DIR / 'nexus_pesquisa.db')
+
+
+# --- Conexões SQLite (database/connection.py) ---
+# WAL deixa as leituras da interface correrem junto com as gravações da coleta;
+# com WAL, synchronous=NORMAL é seguro e evita um fsync a cada commit.
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+# Leitura mapeada em memória (bytes) e cache de páginas (negativo = KiB).
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', str(-64 * 1024)))
+SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+# Segundos que um escritor espera pelo outro antes de "database is locked".
+SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', '5'))
+
+
+# --- Interface (Interface/startup.py) ---
+# GUI_WARMUP=0 desliga o pré-carregamento em segundo plano após a primeira pintura.
+GUI_WARMUP = os.environ.get('GUI_WARMUP', '1') != '0'
+# Arquivo onde a aplicação grava o tempo até a primeira pintura e fecha (medição).
+STARTUP_BENCHMARK_FILE = os.environ.get('NEXUS_STARTUP_BENCHMARK') or None
+
+
+# --- Coletores (E-utilities do NCBI / PubMed) ---
+# Chave de API opcional do NCBI: eleva o limite de 3 para 10 requisições/s.
+NCBI_API_KEY = os.environ.get('NCBI_API_KEY') or None
+
+# Número de lotes efetch executados em paralelo pelo coletor PubMed.
+# O limitador de taxa continua valendo para todas as threads somadas.
+PUBMED_MAX_WORKERS = int(os.environ.get('PUBMED_MAX_WORKERS', '4'))
+
+# Teto de registros coletados do PubMed por busca na interface (modo history
+# server, que pagina o conjunto de resultados no próprio NCBI).
+PUBMED_MAX_RESULTS = int(os.environ.get('PUBMED_MAX_RESULTS', '2000'))
+
+# --- Coletor SciELO (processing/collectors/scielo.py) ---
+# Páginas buscadas em paralelo e requisições por segundo (somando as threads).
+SCIELO_MAX_WORKERS = int(os.environ.get('SCIELO_MAX_WORKERS', '4'))
+SCIELO_RATE = float(os.environ.get('SCIELO_RATE', '5'))
+
+# --- Coletor LILACS (portal da BVS, processing/collectors/other_bases.py) ---
+LILACS_MAX_WORKERS = int(os.environ.get('LILACS_MAX_WORKERS', '2'))
+LILACS_RATE = float(os.environ.get('LILACS_RATE', '2'))
+
+# --- Orquestrador de buscas (core/orchestrator.py) ---
+# Tempo limite, em segundos, de cada plataforma numa busca; ao estourar, a
+# plataforma é reportada como falha e os artigos já recebidos são mantidos.
+SEARCH_PLATFORM_TIMEOUT = float(os.environ.get('SEARCH_PLATFORM_TIMEOUT', '300'))
+
+# --- Pool de conexões HTTP dos coletores (processing/collectors/http_pool.py) ---
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '10'))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '30'))
+HTTP_POOL_MAX_IDLE_PER_HOST = int(os.environ.get('HTTP_POOL_MAX_IDLE_PER_HOST', '8'))
+
+# --- Cache em disco das respostas HTTP (processing/collectors/response_cache.py) ---
+# HTTP_CACHE_OFFLINE=1 ativa o modo "somente cache": nenhuma requisição vai à rede.
+HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', '1') != '0'
+HTTP_CACHE_OFFLINE = os.environ.get('HTTP_CACHE_OFFLINE', '0') == '1'
+HTTP_CACHE_PATH = os.environ.get('HTTP_CACHE_PATH', str(BASE_DIR / 'nexus_http_cache.db'))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('HTTP_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+# TTLs em segundos: esearch muda conforme novos artigos são indexados (curto);
+# um registro efetch por PMID praticamente não muda (longo).
+HTTP_CACHE_TTL_ESEARCH = float(os.environ.get('HTTP_CACHE_TTL_ESEARCH', str(6 * 3600)))
+HTTP_CACHE_TTL_EFETCH = float(os.environ.get('HTTP_CACHE_TTL_EFETCH', str(30 * 86400)))
+HTTP_CACHE_TTL_DEFAULT = float(os.environ.get('HTTP_CACHE_TTL_DEFAULT', str(86400)))
+
+# --- Registros já coletados (processing/collectors/record_store.py) ---
+# Buscas repetidas só baixam os PMIDs inéditos ou coletados há mais de
+# RECORD_STORE_MAX_AGE segundos (padrão: 30 dias).
+RECORD_STORE_ENABLED = os.environ.get('RECORD_STORE_ENABLED', '1') != '0'
+RECORD_STORE_PATH = os.environ.get('RECORD_STORE_PATH', str(BASE_DIR / 'nexus_records.db'))
+RECORD_STORE_MAX_AGE = float(os.environ.get('RECORD_STORE_MAX_AGE', str(30 * 86400)))
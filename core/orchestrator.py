@@ -1,25 +1,248 @@
-# Arquivo: core/orchestrator.py
+"""
+Orquestrador de buscas em várias plataformas.
+
+`run_search` dispara o coletor de cada plataforma selecionada ao mesmo tempo
+(uma thread por plataforma) e junta as saídas num único fluxo sem
+duplicatas: o tempo total fica próximo ao da plataforma mais lenta, não à
+soma de todas.
+
+ - Cada plataforma tem seu tempo limite (config.SEARCH_PLATFORM_TIMEOUT ou
+   `timeouts[plataforma]`); ao estourar, o coletor recebe o pedido de
+   cancelamento e os artigos que ele já tinha entregado são mantidos.
+ - Falhas são parciais: uma plataforma com erro, sem coletor ou fora do
+   prazo aparece em `SearchOutcome.failed`, e as demais seguem normalmente.
+ - Artigos repetidos (mesmo DOI normalizado, ou o mesmo registro da mesma
+   plataforma) entram uma única vez, na ordem em que chegaram. Títulos só
+   parecidos (MinHash, com autor e ano compatíveis; ver processing/dedup.py)
+   podem ser trabalhos distintos: esses artigos ficam no resultado e recebem
+   o mesmo 'cluster_id' do artigo parecido que chegou antes.
+
+As plataformas e seus coletores vêm do registro
+(processing/collectors/registry.py). Contrato de um coletor
+(`CollectorPlugin.collect`):
+    coletor(terms, date_start, date_end, max_results, hooks) -> List[Dict]
+com os mesmos dicionários do coletor PubMed e os ganchos de
+`processing.collectors.progress` (lotes parciais e cancelamento).
+
+Uso:
+    outcome = run_search(["HC UFPE"], ['PubMed', 'Scielo'], ("01/01/2020", "31/12/2024"))
+    for falha in outcome.failed:
+        print(falha.platform, falha.error)
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+from processing.collectors import registry
+from processing.collectors.progress import NO_HOOKS, SearchHooks
+from processing.dedup import DedupIndex
+
+Collector = Callable[..., List[Dict]]
+
+# Intervalo para verificar o cancelamento da busca enquanto as plataformas respondem
+_POLL_INTERVAL = 0.1
 
-# A GUI espera essa função para a integração
-def run_search(search_term=None, platforms=None, date_range=None):
-    """
-    Função stub (temporária) para a integração da GUI.
-    Quando implementada, fará a busca real.
-    """
-    print(f"Orquestrador chamado: Buscar '{search_term}' nas plataformas {platforms}")
-    # Retorna 0 resultados por enquanto, para evitar erros de tipo
-    return 0
 
+def _registered_collector(platform: str) -> Optional[Collector]:
+    """Coletor da plataforma no registro (importado sob demanda), ou None."""
+    plugin = registry.get_collector(platform)
+    return plugin.collect if plugin is not None else None
 
-# Módulo de Orquestração - Core
-# Este arquivo conteria a lógica para iniciar a coleta de dados.
 
-# Função de busca simulada
-def run_search(term, platforms, date_range):
+@dataclass
+class PlatformResult:
+    """Resultado de uma plataforma na busca."""
+    platform: str
+    received: int = 0     # artigos entregues pelo coletor
+    added: int = 0        # artigos novos no resultado final
+    duplicates: int = 0   # já vistos (mesmo DOI ou mesmo registro), descartados
+    grouped: int = 0      # mantidos, mas parecidos com um anterior (mesmo cluster_id)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SearchOutcome:
+    """Artigos sem duplicatas e o resultado de cada plataforma."""
+    articles: List[Dict] = field(default_factory=list)
+    platforms: Dict[str, PlatformResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> List[PlatformResult]:
+        return [r for r in self.platforms.values() if not r.ok]
+
+    @property
+    def partial(self) -> bool:
+        """True se ao menos uma plataforma falhou ou não terminou no prazo."""
+        return bool(self.failed)
+
+
+class _Merger:
+    """Junta os lotes das plataformas (threads distintas) descartando duplicatas exatas.
+
+    Cada artigo entregue leva 'cluster_id': artigos com o mesmo valor são
+    (provavelmente) o mesmo trabalho em plataformas diferentes.
     """
-    Simula a execução da busca e retorna resultados.
-    No futuro, este método orquestrará a chamada aos crawlers.
+
+    def __init__(self, results: Dict[str, PlatformResult], emit: Callable[[List[Dict]], None]):
+        self.results = results
+        self.emit = emit
+        self.articles: List[Dict] = []
+        self._index = DedupIndex()
+        self._closed = set()
+        self._lock = threading.Lock()
+
+    def add(self, platform: str, records: List[Dict]):
+        result = self.results[platform]
+        with self._lock:
+            if platform in self._closed:
+                return
+            fresh = []
+            for record in records:
+                result.received += 1
+                match = self._index.resolve_match(record)
+                if match.exact:
+                    result.duplicates += 1
+                    continue
+                if not match.is_new:
+                    # só o título é parecido: pode ser outro trabalho, então fica (agrupado)
+                    result.grouped += 1
+                record['cluster_id'] = match.cluster
+                fresh.append(record)
+            result.added += len(fresh)
+            self.articles.extend(fresh)
+            # entregue sob o lock: a ordem dos lotes parciais é a ordem final
+            self.emit(fresh)
+
+    def close(self, platform: str):
+        """Ignora o que a plataforma ainda entregar (prazo vencido)."""
+        with self._lock:
+            self._closed.add(platform)
+
+
+class _PlatformFeed:
+    """Ganchos de uma plataforma: lotes vão ao merger e o progresso leva o nome da plataforma."""
+
+    def __init__(self, platform: str, merger: _Merger, hooks: SearchHooks):
+        self.platform = platform
+        self.merger = merger
+        self._delivered: Dict[int, Dict] = {}  # id -> registro (a referência mantém o id válido)
+        progress = None
+        if hooks.progress is not None:
+            progress = lambda stage, done, total: hooks.progress(f"{platform}:{stage}", done, total)
+        self.hooks = SearchHooks(progress=progress, on_batch=self._on_batch,
+                                 cancel_event=threading.Event())
+
+    def _on_batch(self, records: List[Dict]):
+        self._delivered.update((id(r), r) for r in records)
+        self.merger.add(self.platform, records)
+
+    def finish(self, records: List[Dict]):
+        """Resultado final do coletor: só o que não veio pelos lotes parciais."""
+        self.merger.add(self.platform, [r for r in records if id(r) not in self._delivered])
+
+
+def _platform_timeout(platform: str, timeouts: Optional[Dict[str, float]]) -> float:
+    if timeouts and platform in timeouts:
+        return timeouts[platform]
+    return config.SEARCH_PLATFORM_TIMEOUT
+
+
+def run_search(terms, platforms: Sequence[str], date_range: Optional[Tuple[str, str]] = None,
+               max_results: Optional[int] = None, timeouts: Optional[Dict[str, float]] = None,
+               hooks: Optional[SearchHooks] = None, collectors: Optional[Dict[str, Collector]] = None,
+               on_platform_done: Optional[Callable[[PlatformResult], None]] = None) -> SearchOutcome:
+    """Busca `terms` em todas as `platforms` ao mesmo tempo.
+
+    Args:
+        terms: lista de termos de afiliação (ou query pronta, como no coletor PubMed)
+        platforms: nomes das plataformas, como na interface ('PubMed', 'Scielo', ...)
+        date_range: (início, fim) no formato 'dd/MM/yyyy' (opcional)
+        max_results: teto por plataforma (padrão: config.PUBMED_MAX_RESULTS)
+        timeouts: tempo limite em segundos por plataforma (padrão:
+            config.SEARCH_PLATFORM_TIMEOUT)
+        hooks: progresso, lotes parciais já sem duplicatas e cancelamento da
+            busca inteira
+        collectors: {plataforma: coletor} no lugar do registro (ex.: testes)
+        on_platform_done: chamado quando cada plataforma termina, falha ou
+            estoura o prazo
+
+    Returns:
+        SearchOutcome com os artigos sem duplicatas e o resultado por plataforma.
     """
-    # Dados simulados para o frontend
-    print(f"Executando busca real/simulada para: {term}")
-    return [] # Retorna uma lista vazia ou os artigos reais
+    hooks = hooks or NO_HOOKS
+    lookup = _registered_collector if collectors is None else collectors.get
+    date_start, date_end = date_range or (None, None)
+    if max_results is None:
+        max_results = config.PUBMED_MAX_RESULTS
+
+    platforms = list(dict.fromkeys(platforms))
+    outcome = SearchOutcome(platforms={p: PlatformResult(p) for p in platforms})
+    merger = _Merger(outcome.platforms, hooks.emit)
+    start = time.monotonic()
+
+    def done(result: PlatformResult):
+        result.elapsed = time.monotonic() - start
+        if on_platform_done is not None:
+            on_platform_done(result)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(platforms)),
+                                  thread_name_prefix='orchestrator')
+    pending = {}
+    for platform in platforms:
+        collector = lookup(platform)
+        if collector is None:
+            outcome.platforms[platform].error = "coletor indisponível"
+            done(outcome.platforms[platform])
+            continue
+        feed = _PlatformFeed(platform, merger, hooks)
+        future = executor.submit(collector, terms, date_start, date_end, max_results, feed.hooks)
+        pending[future] = (feed, start + _platform_timeout(platform, timeouts))
+
+    try:
+        while pending:
+            if hooks.cancelled:
+                # os coletores param ao fim do lote atual e devolvem o que já têm
+                for feed, _deadline in pending.values():
+                    feed.hooks.cancel_event.set()
+            next_deadline = min(deadline for _feed, deadline in pending.values())
+            timeout = max(0.0, min(next_deadline - time.monotonic(), _POLL_INTERVAL))
+            finished, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                feed, _deadline = pending.pop(future)
+                result = outcome.platforms[feed.platform]
+                try:
+                    feed.finish(future.result() or [])
+                except Exception as e:
+                    result.error = str(e) or type(e).__name__
+                done(result)
+
+            now = time.monotonic()
+            for future, (feed, deadline) in list(pending.items()):
+                if now < deadline:
+                    continue
+                # a thread não pode ser interrompida: pede o cancelamento e segue sem ela
+                feed.hooks.cancel_event.set()
+                merger.close(feed.platform)
+                del pending[future]
+                result = outcome.platforms[feed.platform]
+                result.timed_out = True
+                result.error = f"tempo limite de {_platform_timeout(feed.platform, timeouts):g}s excedido"
+                done(result)
+    finally:
+        executor.shutdown(wait=False)
+
+    outcome.articles = merger.articles
+    outcome.elapsed = time.monotonic() - start
+    return outcome
@@ -0,0 +1,205 @@
+"""
+Testes do orquestrador de buscas (coletores simulados e, nas falhas de rede, os
+coletores registrados contra o servidor local).
+
+Uso:
+    python -m core.test_orchestrator
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from core.orchestrator import run_search
+from processing.collectors import http_pool, pubmed, record_store, response_cache, scielo
+from processing.collectors.progress import SearchHooks
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.stub_server import StubHTTPServer, eutils_routes
+
+
+def _article(n, platform, doi=None, title=None):
+    return {'title': title or f"Artigo {n}", 'doi': doi if doi is not None else f"10.5555/orq.{n}",
+            'platform': platform, 'publication_date': "2023", 'url': f"https://exemplo/{platform}/{n}"}
+
+
+def _slow_collector(platform, numbers, delay, batches=2):
+    """Coletor que entrega `numbers` em lotes, dormindo `delay` no total."""
+    def collect(terms, date_start, date_end, max_results, hooks):
+        records = [_article(n, platform) for n in numbers]
+        size = max(1, len(records) // batches)
+        collected = []
+        for i in range(0, len(records), size):
+            if hooks.cancelled:
+                break  # como o coletor PubMed: devolve o que já coletou
+            time.sleep(delay / batches)
+            hooks.emit(records[i:i + size])
+            collected.extend(records[i:i + size])
+        return collected
+    return collect
+
+
+def test_latency_follows_slowest_platform():
+    collectors = {
+        'PubMed': _slow_collector('PubMed', range(0, 50), 0.3),
+        'Scielo': _slow_collector('Scielo', range(50, 100), 0.3),
+        'Lilacs': _slow_collector('Lilacs', range(100, 150), 0.4),
+    }
+    start = time.perf_counter()
+    outcome = run_search(["HC UFPE"], list(collectors), collectors=collectors)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n   3 plataformas (0.3s + 0.3s + 0.4s): {elapsed:.2f}s")
+    assert len(outcome.articles) == 150 and not outcome.partial
+    assert elapsed < 0.75  # soma seria 1.0s
+    assert [outcome.platforms[p].added for p in collectors] == [50, 50, 50]
+
+
+def test_partial_failures_and_timeouts_are_reported():
+    def broken(terms, date_start, date_end, max_results, hooks):
+        raise ConnectionError("servidor indisponível")
+
+    def hangs(terms, date_start, date_end, max_results, hooks):
+        hooks.emit([_article(900, 'Capes Periódicos')])
+        hooks.cancel_event.wait(5)  # só volta quando o orquestrador cancela
+        return [_article(901, 'Capes Periódicos')]
+
+    collectors = {'PubMed': _slow_collector('PubMed', range(10), 0.1),
+                  'Scielo': broken, 'Capes Periódicos': hangs}
+    finished = []
+    start = time.perf_counter()
+    outcome = run_search(["HC UFPE"], ['PubMed', 'Scielo', 'Lilacs', 'Capes Periódicos'],
+                         collectors=collectors, timeouts={'Capes Periódicos': 0.3},
+                         on_platform_done=lambda r: finished.append(r.platform))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert outcome.partial
+    assert {r.platform for r in outcome.failed} == {'Scielo', 'Lilacs', 'Capes Periódicos'}
+    assert outcome.platforms['Scielo'].error == "servidor indisponível"
+    assert outcome.platforms['Lilacs'].error == "coletor indisponível"
+    capes = outcome.platforms['Capes Periódicos']
+    assert capes.timed_out and capes.added == 1  # o lote entregue antes do prazo fica
+    assert outcome.platforms['PubMed'].ok and outcome.platforms['PubMed'].added == 10
+    assert len(outcome.articles) == 11
+    assert sorted(finished) == sorted(outcome.platforms)
+
+
+def test_merge_drops_exact_duplicates_and_groups_similar_titles():
+    def pubmed(terms, date_start, date_end, max_results, hooks):
+        records = [_article(1, 'PubMed', doi="10.1000/ABC"),
+                   _article(2, 'PubMed', doi="N/A", title="Sepse em UTI neonatal"),
+                   _article(3, 'PubMed')]
+        hooks.emit(records[:2])
+        return records  # o terceiro só vem no resultado final
+
+    def scielo(terms, date_start, date_end, max_results, hooks):
+        time.sleep(0.05)
+        records = [_article(10, 'Scielo', doi="https://doi.org/10.1000/abc"),
+                   _article(11, 'Scielo', doi="", title="Sepse em UTI Neonatal."),
+                   _article(12, 'Scielo')]
+        hooks.emit(records)
+        return records
+
+    streamed = []
+    outcome = run_search(["HC UFPE"], ['PubMed', 'Scielo'],
+                         collectors={'PubMed': pubmed, 'Scielo': scielo},
+                         hooks=SearchHooks(on_batch=streamed.extend))
+
+    assert streamed == outcome.articles
+    # o DOI igual é descartado; o título só parecido fica, no mesmo grupo do PubMed 2
+    assert [a['url'].rsplit('/', 1)[1] for a in outcome.articles] == ['1', '2', '3', '11', '12']
+    by_url = {a['url'].rsplit('/', 1)[1]: a['cluster_id'] for a in outcome.articles}
+    assert by_url['11'] == by_url['2'] and len(set(by_url.values())) == 4
+    assert outcome.platforms['Scielo'].duplicates == 1 and outcome.platforms['Scielo'].grouped == 1
+    assert outcome.platforms['Scielo'].received == 3
+
+
+def test_distinct_records_of_one_platform_are_never_merged():
+    title = "Mortalidade neonatal em unidade de terapia intensiva do Recife: parte {}"
+
+    def pubmed(terms, date_start, date_end, max_results, hooks):
+        return [{'title': title.format(part), 'authors': "Silva A", 'doi': "", 'pmid': pmid,
+                 'platform': 'PubMed', 'publication_date': "2023",
+                 'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"}
+                for pmid, part in (("1", "I"), ("2", "II"), ("1", "I"))]
+
+    outcome = run_search(["HC UFPE"], ['PubMed'], collectors={'PubMed': pubmed})
+
+    # o PMID repetido é o mesmo registro; PMIDs diferentes são artigos diferentes
+    assert [a['pmid'] for a in outcome.articles] == ["1", "2"]
+    assert outcome.articles[0]['cluster_id'] != outcome.articles[1]['cluster_id']
+    assert outcome.platforms['PubMed'].duplicates == 1
+
+
+def test_cancel_stops_every_platform():
+    collectors = {p: _slow_collector(p, range(i * 100, i * 100 + 100), 2.0, batches=20)
+                  for i, p in enumerate(['PubMed', 'Scielo'])}
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    start = time.perf_counter()
+    outcome = run_search(["HC UFPE"], list(collectors), collectors=collectors,
+                         hooks=SearchHooks(cancel_event=cancel))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert 0 < len(outcome.articles) < 200
+    assert not outcome.partial  # cancelar não é falha: cada plataforma devolve o que tem
+
+
+@contextmanager
+def _collectors_at(pubmed_base, scielo_base):
+    """Aponta os coletores registrados para `*_base` (pool novo, sem cache nem armazenamento)."""
+    originals = (pubmed.PUBMED_EUTILS_BASE, pubmed._rate_limiter, scielo.SCIELO_SEARCH_BASE,
+                 scielo._rate_limiter, http_pool._default_pool)
+    original_cache = response_cache.set_default_cache(None)
+    original_store = record_store.set_default_store(None)
+    pubmed.PUBMED_EUTILS_BASE, scielo.SCIELO_SEARCH_BASE = pubmed_base, scielo_base
+    pubmed._rate_limiter, scielo._rate_limiter = TokenBucket(50.0), TokenBucket(50.0)
+    http_pool._default_pool = http_pool.ConnectionPool()
+    try:
+        yield
+    finally:
+        http_pool._default_pool.close()
+        (pubmed.PUBMED_EUTILS_BASE, pubmed._rate_limiter, scielo.SCIELO_SEARCH_BASE,
+         scielo._rate_limiter, http_pool._default_pool) = originals
+        response_cache.set_default_cache(original_cache)
+        record_store.set_default_store(original_store)
+
+
+def test_collector_network_failures_reach_the_platform_result():
+    # porta fechada: o servidor sobe só para reservar um endereço e é desligado
+    with StubHTTPServer({}) as server:
+        down = server.base_url
+    with _collectors_at(down, down):
+        outage = run_search(["HC UFPE"], ['PubMed', 'Scielo'], max_results=100)
+
+    assert {r.platform for r in outage.failed} == {'PubMed', 'Scielo'}
+    assert all(r.received == 0 for r in outage.platforms.values())
+
+    # a 2ª página do history server falha: a 1ª fica e o erro aparece
+    with StubHTTPServer(eutils_routes(total_hits=600, fail_once=[pubmed.PUBMED_HISTORY_PAGE_SIZE])) as server:
+        with _collectors_at(server.base_url, down):
+            broken = run_search(["HC UFPE"], ['PubMed'], max_results=600)
+
+    result = broken.platforms['PubMed']
+    print(f"\n   PubMed fora do ar: {outage.platforms['PubMed'].error}")
+    print(f"   Página com falha: {result.error}")
+    assert "500" in result.error
+    assert result.received == pubmed.PUBMED_HISTORY_PAGE_SIZE == len(broken.articles)
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: orquestrador de buscas")
+    print("=" * 60)
+    test_latency_follows_slowest_platform()
+    test_partial_failures_and_timeouts_are_reported()
+    test_merge_drops_exact_duplicates_and_groups_similar_titles()
+    test_distinct_records_of_one_platform_are_never_merged()
+    test_cancel_stops_every_platform()
+    test_collector_network_failures_reach_the_platform_result()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
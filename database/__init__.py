@@ -2,11 +2,15 @@
 Módulo de Database do NEXUS Pesquisa.
 Expõe as classes principais para importação.
 
-Ao importar este módulo, os dados padrão de afiliações são carregados
-automaticamente na primeira execução (idempotente).
+Importar o pacote não abre o banco: o ponto de entrada chama
+`bootstrap(seed=True)`, que prepara o esquema e carrega os dados padrão de
+afiliações (idempotente) uma vez por processo.
 """
 
 from .db_manager import DatabaseManager, get_db
+from .connection import ConnectionProvider, get_provider
+from .bootstrap import bootstrap
+from .pagination import Page
 from .models import AffiliationVariation, Article, SearchHistory, ErrorLog
 from .queries import SearchQueries, QueryBuilder
 from .seed_data import seed_affiliation_variations
@@ -14,6 +18,10 @@ from .seed_data import seed_affiliation_variations
 __all__ = [
     'DatabaseManager',
     'get_db',
+    'ConnectionProvider',
+    'get_provider',
+    'bootstrap',
+    'Page',
     'AffiliationVariation',
     'Article',
     'SearchHistory',
@@ -22,15 +30,3 @@ __all__ = [
     'QueryBuilder',
     'seed_affiliation_variations',
 ]
-
-# Carregar dados padrão automaticamente na primeira importação
-def _initialize_default_data():
-    """Carrega dados padrão de afiliação na primeira execução."""
-    try:
-        with DatabaseManager() as db:
-            seed_affiliation_variations(db)
-    except Exception as e:
-        print(f"[AVISO] Nao foi possivel carregar dados padrao: {e}")
-
-# Executar na primeira importação
-_initialize_default_data()
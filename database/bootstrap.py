@@ -0,0 +1,105 @@
+"""
+Preparação do banco (esquema e dados padrão), uma vez por processo.
+
+Antes, `import database` abria o banco e carregava os dados padrão, e cada
+`DatabaseManager()` repetia os CREATE TABLE e a verificação das migrações.
+Agora o ponto de entrada chama `bootstrap(seed=True)` uma vez; os
+gerenciadores chamam `bootstrap(caminho)`, que depois da primeira vez é só a
+consulta a um conjunto em memória.
+
+A versão do esquema em `PRAGMA user_version` decide o trabalho: um banco já
+em `SCHEMA_VERSION` custa uma única consulta; um banco novo ou antigo recebe
+as tabelas e as migrações pendentes (database/schema.py).
+
+O conjunto em memória só evita repetir a preparação; quem garante o esquema
+é a primeira conexão de cada provedor, que confere `user_version` de novo.
+Assim um segundo banco ':memory:' (aberto depois que o primeiro fechou) ou um
+arquivo apagado e recriado durante a execução recebem as tabelas. ':memory:'
+nunca entra no conjunto: cada provedor é um banco novo.
+
+Uso:
+    from database import bootstrap
+    bootstrap(seed=True)     # no início da aplicação (__main__.py)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+
+import config
+
+from .connection import MEMORY_PATH, acquire_provider, get_provider, provider_key, release_provider
+from .schema import SCHEMA_VERSION, apply_migrations, create_base_tables, get_schema_version
+
+_ready: Dict[str, int] = {}    # caminho -> versão do esquema já preparada neste processo
+_seeded: Set[str] = set()
+_lock = threading.Lock()
+
+
+def resolve_db_path(db_path: Optional[str] = None) -> str:
+    """Caminho do banco: o informado, o da DATABASE_URL ou nexus_pesquisa.db na raiz."""
+    if db_path is not None:
+        return db_path
+    database_url = getattr(config, 'DATABASE_URL', None)
+    if database_url and config.is_sqlite_url(database_url):
+        return config.sqlite_path_from_url(database_url)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, "nexus_pesquisa.db")
+
+
+def bootstrap(db_path: Optional[str] = None, seed: bool = False) -> int:
+    """Prepara o esquema do banco (uma vez por processo). Retorna a versão do esquema.
+
+    Args:
+        seed: também carrega as variações de afiliação padrão (se a tabela
+            ainda não tiver as do HC-UFPE).
+    """
+    path = resolve_db_path(db_path)
+    key = provider_key(path)
+    get_provider(path).on_first_connection = _ensure_schema
+    version = _ready.get(key)
+    if version is None:
+        version = _prepare_schema(path, key)
+    if seed and key not in _seeded:
+        _seed(path, key)
+    return version
+
+
+def _prepare_schema(path: str, key: str) -> int:
+    with _lock:
+        if key in _ready:
+            return _ready[key]
+        started = time.perf_counter()
+        provider = acquire_provider(path)
+        try:
+            version = _ensure_schema(provider.connection())
+        finally:
+            release_provider(provider)
+        # migração que falhou é tentada de novo pelo próximo gerenciador
+        if version >= SCHEMA_VERSION and path != MEMORY_PATH:
+            _ready[key] = version
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"[OK] Banco de dados inicializado em: {path} (esquema v{version}, {elapsed:.0f} ms)")
+        return version
+
+
+def _ensure_schema(connection) -> int:
+    """Confere o esquema na primeira conexão de um provedor (uma consulta se já estiver pronto)."""
+    version = get_schema_version(connection)
+    if version < SCHEMA_VERSION:
+        create_base_tables(connection)
+        version = apply_migrations(connection)
+    return version
+
+
+def _seed(path: str, key: str):
+    from .db_manager import DatabaseManager
+    from .seed_data import seed_affiliation_variations
+
+    try:
+        with DatabaseManager(path) as db:
+            seed_affiliation_variations(db)
+        _seeded.add(key)
+    except Exception as e:
+        print(f"[AVISO] Nao foi possivel carregar dados padrao: {e}")
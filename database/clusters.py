@@ -0,0 +1,92 @@
+"""
+Agrupamento de artigos duplicados entre plataformas (tabela `article_clusters`).
+
+Cada artigo gravado recebe a impressão digital de `processing/dedup.py` e um
+`cluster_id`: o id do primeiro artigo gravado daquele trabalho. O mesmo
+trabalho coletado no PubMed e na SciELO fica em duas linhas de `articles`
+(uma por plataforma) com o mesmo cluster_id.
+
+Um artigo novo é resolvido sem percorrer a tabela: uma busca pelo DOI
+normalizado (índice) e uma pelas chaves de faixa LSH do título
+(`article_cluster_bands`, chave primária), seguidas da comparação com os
+poucos candidatos encontrados.
+"""
+
+import sqlite3
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .queries import SearchQueries
+
+
+def _find_cluster(cursor: sqlite3.Cursor, fp, bands) -> Optional[int]:
+    from processing.dedup import Fingerprint, is_same_work, source_key, unpack_signature
+
+    if fp.doi:
+        row = cursor.execute(SearchQueries.ARTICLE_CLUSTER_BY_DOI, (fp.doi,)).fetchone()
+        if row is not None:
+            return row[0]
+    if not bands:
+        return None
+    marks = ",".join("?" * len(bands))
+    # candidatos com mais faixas em comum primeiro
+    # plataforma e URL (id do registro na plataforma) vêm do próprio artigo
+    cursor.execute(SearchQueries.ARTICLE_CLUSTER_CANDIDATES.format(marks=marks), bands)
+    for cluster_id, doi, title_key, author_key, year, signature, platform, url in cursor.fetchall():
+        other = Fingerprint(doi, title_key, author_key, year, unpack_signature(signature),
+                            platform=(platform or '').strip().casefold(), source_id=source_key(url))
+        if is_same_work(fp, other):
+            return cluster_id
+    return None
+
+
+def find_article_cluster(cursor: sqlite3.Cursor, record: Any) -> Optional[int]:
+    """cluster_id de um artigo gravado que seja o mesmo trabalho de `record`, ou None."""
+    from processing.dedup import fingerprint
+    fp = fingerprint(record)
+    return _find_cluster(cursor, fp, fp.bands)
+
+
+def assign_article_clusters(cursor: sqlite3.Cursor, items: Iterable[Tuple[int, Any]]) -> Dict[int, int]:
+    """Agrupa artigos recém-gravados. Não faz commit.
+
+    Args:
+        items: (id do artigo, artigo) — dicionário ou Article com título,
+            autores, DOI e data de publicação.
+
+    Returns:
+        {id do artigo: cluster_id}; cluster_id == id para o primeiro do grupo.
+    """
+    from processing.dedup import fingerprint, pack_signature
+
+    clusters = {}
+    for article_id, record in items:
+        fp = fingerprint(record)
+        bands = fp.bands
+        cluster_id = _find_cluster(cursor, fp, bands)
+        if cluster_id is None:
+            cluster_id = article_id
+        cursor.execute("""
+            INSERT OR REPLACE INTO article_clusters
+            (article_id, cluster_id, doi_key, title_key, author_key, year, signature)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (article_id, cluster_id, fp.doi, fp.title_key, fp.author_key, fp.year,
+              pack_signature(fp.signature)))
+        cursor.executemany("INSERT OR IGNORE INTO article_cluster_bands (band_key, article_id) VALUES (?, ?)",
+                           [(key, article_id) for key in bands])
+        clusters[article_id] = cluster_id
+    return clusters
+
+
+def rebuild_article_clusters(cursor: sqlite3.Cursor) -> int:
+    """Refaz o agrupamento de todos os artigos, em ordem de id. Não faz commit."""
+    cursor.execute("DELETE FROM article_cluster_bands")
+    cursor.execute("DELETE FROM article_clusters")
+    # plataforma e URL entram na impressão digital: registros distintos da mesma
+    # plataforma não podem ser agrupados (ver processing/dedup.py)
+    rows = cursor.connection.execute(
+        "SELECT id, title, authors, doi, publication_date, platform, url FROM articles ORDER BY id"
+    ).fetchall()
+    items = [(row[0], {'title': row[1], 'authors': row[2], 'doi': row[3], 'publication_date': row[4],
+                       'platform': row[5], 'url': row[6]})
+             for row in rows]
+    return len(assign_article_clusters(cursor, items))
@@ -0,0 +1,177 @@
+"""
+Conexões SQLite por thread, com os pragmas de desempenho aplicados.
+
+Cada janela da interface criava seu `DatabaseManager` com uma conexão própria
+no modo padrão (rollback journal): uma gravação grande travava as leituras
+das outras janelas, e a conexão não podia ser usada por outra thread.
+
+`ConnectionProvider` entrega a cada thread a sua conexão ao arquivo (criada
+na primeira vez e reaproveitada depois), já com:
+
+ - journal_mode=WAL: leitores não esperam o escritor e vice-versa;
+ - synchronous=NORMAL: seguro com WAL, sem fsync a cada commit;
+ - mmap_size, cache_size e temp_store: leitura mapeada em memória, cache de
+   páginas maior e tabelas temporárias em memória;
+ - busy_timeout: dois escritores simultâneos esperam a vez em vez de falhar.
+
+Os valores vêm de config.py (SQLITE_*). Todos os `DatabaseManager` do mesmo
+arquivo compartilham o provedor (`get_provider`); ele é fechado quando o
+último gerenciador fecha.
+
+Uso:
+    provider = get_provider("nexus_pesquisa.db")
+    conn = provider.connection()        # a conexão desta thread
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import config
+
+MEMORY_PATH = ':memory:'
+
+
+def default_pragmas() -> Dict[str, object]:
+    """Pragmas aplicados a cada conexão, na ordem (lidos do config)."""
+    return {
+        'journal_mode': config.SQLITE_JOURNAL_MODE,
+        'synchronous': config.SQLITE_SYNCHRONOUS,
+        'mmap_size': config.SQLITE_MMAP_SIZE,
+        'cache_size': config.SQLITE_CACHE_SIZE,
+        'temp_store': config.SQLITE_TEMP_STORE,
+        'busy_timeout': int(config.SQLITE_BUSY_TIMEOUT * 1000),
+    }
+
+
+class ConnectionProvider:
+    """Uma conexão por thread para um arquivo SQLite."""
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, object]] = None):
+        self.db_path = db_path
+        self.pragmas = default_pragmas() if pragmas is None else dict(pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # thread -> conexão: close_all() alcança as conexões de todas as threads
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._shared: Optional[sqlite3.Connection] = None  # ':memory:' é um banco por conexão
+        self._users = 0
+        self.opened = 0
+        # chamado com a primeira conexão do provedor (database/bootstrap.py confere o esquema)
+        self.on_first_connection: Optional[Callable[[sqlite3.Connection], None]] = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self.db_path == MEMORY_PATH
+
+    def _open(self) -> sqlite3.Connection:
+        # cada conexão só é usada pela sua thread; check_same_thread=False
+        # permite que close_all() a feche de outra thread
+        conn = sqlite3.connect(self.db_path, timeout=config.SQLITE_BUSY_TIMEOUT,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Retorna resultados como dicionários
+        for name, value in self.pragmas.items():
+            if self.in_memory and name in ('journal_mode', 'mmap_size'):
+                continue
+            conn.execute(f"PRAGMA {name} = {value}").fetchall()
+        if self.opened == 0 and self.on_first_connection is not None:
+            try:
+                self.on_first_connection(conn)
+            except Exception:
+                conn.close()
+                raise
+        self.opened += 1
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual (aberta na primeira chamada)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            if self.in_memory:
+                if self._shared is None:
+                    self._shared = self._open()
+                conn = self._shared
+            else:
+                self._discard_dead_threads()
+                conn = self._open()
+                self._connections[threading.get_ident()] = (threading.current_thread(), conn)
+        self._local.conn = conn
+        return conn
+
+    def _discard_dead_threads(self):
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                conn.close()
+                del self._connections[ident]
+
+    def release(self):
+        """Fecha a conexão da thread atual (ex.: ao fim de um worker)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn is not self._shared:
+                self._connections.pop(threading.get_ident(), None)
+                conn.close()
+
+    def close_all(self):
+        """Fecha as conexões de todas as threads."""
+        with self._lock:
+            connections = [conn for _thread, conn in self._connections.values()]
+            if self._shared is not None:
+                connections.append(self._shared)
+            self._connections.clear()
+            self._shared = None
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'open': len(self._connections) + (self._shared is not None),
+                    'opened': self.opened, 'users': self._users}
+
+
+_providers: Dict[str, ConnectionProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def provider_key(db_path: str) -> str:
+    return db_path if db_path == MEMORY_PATH else os.path.abspath(db_path)
+
+
+def get_provider(db_path: str) -> ConnectionProvider:
+    """Provedor compartilhado do arquivo (sem registrar um usuário)."""
+    key = provider_key(db_path)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = _providers[key] = ConnectionProvider(db_path)
+        return provider
+
+
+def acquire_provider(db_path: str) -> ConnectionProvider:
+    """Provedor do arquivo para um novo usuário (um `DatabaseManager`)."""
+    key = provider_key(db_path)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = _providers[key] = ConnectionProvider(db_path)
+        provider._users += 1
+        return provider
+
+
+def release_provider(provider: ConnectionProvider):
+    """Devolve o provedor; o último usuário fecha as conexões."""
+    with _providers_lock:
+        provider._users -= 1
+        if provider._users > 0:
+            return
+        key = provider_key(provider.db_path)
+        if _providers.get(key) is provider:
+            del _providers[key]
+    provider.close_all()
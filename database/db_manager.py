@@ -4,13 +4,82 @@ Responsável por todas as operações CRUD com o banco de dados SQLite.
 """
 
 import sqlite3
-import os
 from datetime import datetime, date # Importado 'date' para tipagem, 'datetime' para parse
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Union
 from .models import AffiliationVariation, Article, SearchHistory, ErrorLog
+from .fulltext import to_fts_query
+from .queries import SearchQueries
+from .schema import ensure_article_unique_keys, has_articles_fulltext
+from .bootstrap import bootstrap, resolve_db_path
+from .pagination import Page, decode_cursor, encode_cursor
+from .clusters import assign_article_clusters, find_article_cluster
+from .connection import acquire_provider, release_provider
+
+# Valores que a UI usa para "sem DOI/URL" e que não podem servir de chave de duplicata
+_PLACEHOLDER_KEYS = {'', 'N/A', 'NA', '#', '-', 'NONE', 'NULL'}
+
+_ARTICLE_INSERT_COLUMNS = """
+    INSERT INTO articles
+    (title, authors, doi, platform, publication_date, abstract, url, status, collected_at, created_at)
+"""
+
+# Com os índices únicos (migração 2 de schema.py): o próprio SQLite descarta as duplicatas
+_BULK_INSERT_SQL = _ARTICLE_INSERT_COLUMNS + """
+    VALUES (:title, :authors, :doi, :platform, :publication_date, :abstract, :url, :status,
+            :collected_at, :created_at)
+    ON CONFLICT DO NOTHING
+"""
+
+# Sem os índices (banco com duplicatas antigas): mesma regra via NOT EXISTS
+_BULK_INSERT_NOT_EXISTS_SQL = _ARTICLE_INSERT_COLUMNS + """
+    SELECT :title, :authors, :doi, :platform, :publication_date, :abstract, :url, :status,
+           :collected_at, :created_at
+    WHERE NOT EXISTS (
+        SELECT 1 FROM articles
+        WHERE platform = :platform
+          AND ((:doi <> '' AND doi = :doi)
+               OR (:doi = '' AND :url <> '' AND (doi IS NULL OR doi = '') AND url = :url))
+    )
+"""
+
+
+def _clean_article_key(value) -> str:
+    """Normaliza DOI/URL: remove espaços e converte marcadores ('N/A', '#') em ''."""
+    if value is None:
+        return ''
+    value = str(value).strip()
+    return '' if value.upper() in _PLACEHOLDER_KEYS else value
+
 
-# Leitura centralizada da configuração (preparação para DATABASE_URL)
-import config
+def _clean_affiliations(value) -> List[str]:
+    """Afiliações distintas, com espaços normalizados (aceita lista ou texto separado por ';')."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(';')
+    cleaned = (" ".join(str(text).split()) for text in value)
+    return list(dict.fromkeys(text for text in cleaned if text))
+
+
+def _parse_date(value) -> Optional[datetime]:
+    """Data gravada como DD/MM/YYYY ou ISO 8601; None se vazia ou inválida."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, '%d/%m/%Y')
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+
+def _iso(value) -> Optional[str]:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
 
 
 class DatabaseManager:
@@ -22,100 +91,52 @@ class DatabaseManager:
     def __init__(self, db_path: str = None):
         """
         Inicializa o gerenciador de BD.
-        """
-        if db_path is None:
-            database_url = getattr(config, 'DATABASE_URL', None)
-            if database_url and config.is_sqlite_url(database_url):
-                db_path = config.sqlite_path_from_url(database_url)
-            else:
-                project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                db_path = os.path.join(project_root, "nexus_pesquisa.db")
 
-        self.db_path = db_path
+        Não executa SQL: o esquema é preparado por `bootstrap` (uma vez por
+        processo) e a conexão da thread só é aberta no primeiro uso.
+        """
+        self.db_path = resolve_db_path(db_path)
         self._using_sqlite = True
-        self.connection = None
-        self._initialize_db()
-
-    def _initialize_db(self):
-        """Cria as tabelas se não existirem."""
-        self.connect()
-        cursor = self.connection.cursor()
-
-        # Tabela de Variações de Afiliação
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS affiliation_variations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                original_text TEXT NOT NULL,
-                normalized_text TEXT NOT NULL,
-                institution TEXT NOT NULL,
-                platform TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Tabela de Artigos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                authors TEXT,
-                doi TEXT,
-                platform TEXT NOT NULL,
-                publication_date TEXT,
-                abstract TEXT,
-                url TEXT,
-                status TEXT DEFAULT 'NOVO',
-                collected_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Tabela de Histórico de Buscas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS search_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                search_term TEXT NOT NULL,
-                platforms TEXT,
-                date_start TEXT,
-                date_end TEXT,
-                results_count INTEGER DEFAULT 0,
-                search_date TEXT
-            )
-        """)
-        # NOTA: O campo search_date foi alterado para TEXT para refletir o formato
-        # usado no INSERT e evitar conflitos.
-
-        # Tabela de Histórico de Erros
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS error_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                error_type TEXT NOT NULL,
-                search_term TEXT,
-                article_title TEXT,
-                article_doi TEXT,
-                platform TEXT,
-                error_reason TEXT,
-                error_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        self.connection.commit()
-        print(f"[OK] Banco de dados inicializado em: {self.db_path}")
+        # conexões por thread (database/connection.py), abertas no primeiro uso
+        self._provider = acquire_provider(self.db_path)
+        self._article_keys: Optional[bool] = None
+        self._fulltext: Optional[bool] = None
+        # Esquema: uma vez por processo (database/bootstrap.py); depois, só a consulta ao cache
+        bootstrap(self.db_path)
+
+    @property
+    def _article_keys_enabled(self) -> bool:
+        """Chaves únicas de artigos ativas (verificado uma vez por gerenciador)."""
+        if self._article_keys is None:
+            self._article_keys = ensure_article_unique_keys(self.connection)
+            if not self._article_keys:
+                print("[AVISO] Artigos duplicados no banco: índices únicos (platform, doi/url) não criados")
+        return self._article_keys
+
+    @property
+    def _fulltext_enabled(self) -> bool:
+        if self._fulltext is None:
+            self._fulltext = has_articles_fulltext(self.connection)
+        return self._fulltext
+
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """Conexão da thread atual (WAL e pragmas do config); None após `close`."""
+        if self._provider is None:
+            return None
+        return self._provider.connection()
 
     def connect(self):
         """Conecta ao banco de dados."""
-        if self.connection is None:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Retorna resultados como dicionários
+        if self._provider is None:
+            self._provider = acquire_provider(self.db_path)
         return self.connection
 
     def close(self):
-        """Fecha a conexão com o banco."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Fecha a conexão com o banco (as conexões só fecham com o último gerenciador)."""
+        if self._provider is not None:
+            provider, self._provider = self._provider, None
+            release_provider(provider)
 
     def __enter__(self):
         """Context manager: entrada."""
@@ -168,7 +189,7 @@ class DatabaseManager:
     def read_all_affiliation_variations(self) -> List[AffiliationVariation]:
         """Lê todas as variações de afiliação."""
         cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM affiliation_variations ORDER BY created_at DESC")
+        cursor.execute(SearchQueries.AFFILIATION_ALL)
         rows = cursor.fetchall()
         
         variations = []
@@ -187,10 +208,7 @@ class DatabaseManager:
     def read_affiliation_variations_by_institution(self, institution: str) -> List[AffiliationVariation]:
         """Lê variações de afiliação filtradas por instituição."""
         cursor = self.connection.cursor()
-        cursor.execute(
-            "SELECT * FROM affiliation_variations WHERE institution = ? ORDER BY created_at DESC",
-            (institution,)
-        )
+        cursor.execute(SearchQueries.AFFILIATION_BY_INSTITUTION, (institution,))
         rows = cursor.fetchall()
         
         variations = []
@@ -244,27 +262,192 @@ class DatabaseManager:
     # ==================== CRUD: ARTICLES ====================
 
     def create_article(self, article: Article) -> int:
-        """Cria um novo artigo."""
+        """Cria um novo artigo.
+
+        Se já existir artigo com a mesma chave (platform + DOI, ou platform + URL
+        quando não há DOI), nada é inserido e o ID existente é retornado.
+        """
+        row = self._article_row(article, datetime.now().isoformat())
         cursor = self.connection.cursor()
-        cursor.execute("""
-            INSERT INTO articles 
-            (title, authors, doi, platform, publication_date, abstract, url, status, collected_at, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            article.title,
-            article.authors,
-            article.doi,
-            article.platform,
-            article.publication_date,
-            article.abstract,
-            article.url,
-            article.status,
-            article.collected_at or datetime.now().isoformat(),
-            article.created_at or datetime.now().isoformat()
-        ))
+        try:
+            cursor.execute(_ARTICLE_INSERT_COLUMNS + """
+                VALUES (:title, :authors, :doi, :platform, :publication_date, :abstract, :url, :status,
+                        :collected_at, :created_at)
+            """, row)
+        except sqlite3.IntegrityError:
+            self.connection.rollback()
+            existing = (self.read_article_by_platform_and_doi(row['platform'], row['doi'])
+                        or self.read_article_by_platform_and_url(row['platform'], row['url']))
+            if existing is None:
+                raise
+            print(f"[AVISO] Artigo já existe (ID {existing.id}): {article.title[:50]}...")
+            return existing.id
+        article_id = cursor.lastrowid
+        self._link_affiliations(cursor, [(article_id, row['affiliations'])])
+        assign_article_clusters(cursor, [(article_id, row)])
         self.connection.commit()
         print(f"[OK] Artigo criado: {article.title[:50]}...")
-        return cursor.lastrowid
+        return article_id
+
+    @staticmethod
+    def _article_row(article: Union[Article, Dict[str, Any]], now: str) -> Dict[str, Any]:
+        """Converte um Article (ou dict com as mesmas chaves) em parâmetros nomeados."""
+        get = article.get if isinstance(article, dict) else (lambda key, default=None: getattr(article, key, default))
+        return {
+            'title': get('title') or '',
+            'authors': get('authors') or '',
+            'doi': _clean_article_key(get('doi')),
+            'platform': get('platform') or 'Desconhecido',
+            'publication_date': _iso(get('publication_date')),
+            'abstract': get('abstract') or '',
+            'url': _clean_article_key(get('url')),
+            'status': get('status') or 'NOVO',
+            'collected_at': _iso(get('collected_at')) or now,
+            'created_at': _iso(get('created_at')) or now,
+            # não é coluna de 'articles': gravada em article_affiliations
+            'affiliations': _clean_affiliations(get('affiliations')),
+        }
+
+    def bulk_upsert_articles(self, articles: Iterable[Union[Article, Dict[str, Any]]]) -> Dict[str, int]:
+        """Insere artigos em lote, numa única transação, ignorando duplicatas.
+
+        A detecção de duplicatas é feita pelo próprio SQL (`ON CONFLICT DO
+        NOTHING` contra os índices únicos platform+DOI / platform+URL), inclusive
+        entre artigos repetidos dentro do mesmo lote. DOI/URL com marcadores
+        como 'N/A' ou '#' são gravados vazios.
+
+        Args:
+            articles: Objetos Article ou dicionários com as mesmas chaves
+                ('title', 'authors', 'doi', 'platform', 'url', ...).
+
+        Returns:
+            {'inserted': n, 'skipped': m}
+        """
+        now = datetime.now().isoformat()
+        rows = [self._article_row(article, now) for article in articles]
+        if not rows:
+            return {'inserted': 0, 'skipped': 0}
+
+        sql = _BULK_INSERT_SQL if self._article_keys_enabled else _BULK_INSERT_NOT_EXISTS_SQL
+        article_ids = []  # (id do artigo, linha, inserida?)
+        with self.connection:  # commit único (rollback em caso de erro)
+            cursor = self.connection.cursor()
+            for row in rows:
+                # cada linha diz se foi inserida: outra conexão pode gravar artigos
+                # durante o lote, então os ids novos não formam um intervalo contíguo
+                # (rowcount não conta as escritas dos gatilhos, ex.: FTS)
+                cursor.execute(sql, row)
+                if cursor.rowcount == 1:
+                    article_ids.append((cursor.lastrowid, row, True))
+                elif row['affiliations']:
+                    article_ids.append((self._existing_article_id(cursor, row), row, False))
+            if any(row['affiliations'] for row in rows):
+                self._link_affiliations(cursor, [(article_id, row['affiliations'])
+                                                 for article_id, row, _is_new in article_ids
+                                                 if article_id is not None and row['affiliations']])
+            # duplicatas entre plataformas: cada artigo novo entra num grupo (article_clusters)
+            assign_article_clusters(cursor, [(article_id, row) for article_id, row, is_new in article_ids if is_new])
+        inserted = sum(1 for _article_id, _row, is_new in article_ids if is_new)
+        skipped = len(rows) - inserted
+        print(f"[OK] {inserted} artigos inseridos em lote; {skipped} duplicatas ignoradas")
+        return {'inserted': inserted, 'skipped': skipped}
+
+    @staticmethod
+    def _existing_article_id(cursor, row: Dict[str, Any]) -> Optional[int]:
+        """Id do artigo já gravado com a chave da linha descartada (DOI ou URL), ou None."""
+        if row['doi']:
+            found = cursor.execute(SearchQueries.ARTICLE_ID_BY_PLATFORM_AND_DOI, (row['platform'], row['doi'])).fetchone()
+        elif row['url']:
+            found = cursor.execute(SearchQueries.ARTICLE_ID_BY_PLATFORM_AND_URL, (row['platform'], row['url'])).fetchone()
+        else:
+            found = None
+        return found[0] if found else None
+
+    def _link_affiliations(self, cursor, links: List[tuple]):
+        """Grava os textos de afiliação (uma vez cada) e os liga aos artigos. Não faz commit."""
+        texts = list(dict.fromkeys(text for _article_id, affiliations in links for text in affiliations))
+        if not texts:
+            return
+        cursor.executemany("INSERT OR IGNORE INTO affiliation_texts (text) VALUES (?)", [(t,) for t in texts])
+        text_ids = {}
+        for start in range(0, len(texts), 500):
+            chunk = texts[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT id, text FROM affiliation_texts WHERE text IN ({marks})", chunk)
+            text_ids.update((text, text_id) for text_id, text in cursor.fetchall())
+        cursor.executemany(
+            "INSERT OR IGNORE INTO article_affiliations (article_id, affiliation_id) VALUES (?, ?)",
+            [(article_id, text_ids[text]) for article_id, affiliations in links for text in affiliations],
+        )
+
+    def read_article_affiliations(self, article_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """Afiliações dos autores de cada artigo ({id: [textos]})."""
+        ids = list(dict.fromkeys(article_ids))
+        result: Dict[int, List[str]] = {}
+        cursor = self.connection.cursor()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT aa.article_id, t.text
+                FROM article_affiliations aa
+                JOIN affiliation_texts t ON t.id = aa.affiliation_id
+                WHERE aa.article_id IN ({marks})
+                ORDER BY aa.article_id, t.id
+            """, chunk)
+            for article_id, text in cursor.fetchall():
+                result.setdefault(article_id, []).append(text)
+        return result
+
+    def read_affiliation_links(self, status: Optional[str] = None) -> List[tuple]:
+        """(article_id, affiliation_id, texto) de todos os artigos (ou dos que têm `status`).
+
+        Base da validação em lote: cada texto distinto aparece com o mesmo
+        affiliation_id em todos os artigos que o compartilham.
+        """
+        cursor = self.connection.cursor()
+        if status:
+            cursor.execute(SearchQueries.AFFILIATION_LINKS_BY_STATUS, (status,))
+        else:
+            # todos os vínculos: a leitura completa da tabela é inevitável
+            cursor.execute("""
+                SELECT aa.article_id, aa.affiliation_id, t.text
+                FROM article_affiliations aa
+                JOIN affiliation_texts t ON t.id = aa.affiliation_id
+            """)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def update_articles_status(self, article_ids: Iterable[int], new_status: str) -> int:
+        """Atualiza o status de vários artigos numa transação. Retorna quantos mudaram."""
+        params = [(new_status, article_id) for article_id in dict.fromkeys(article_ids)]
+        if not params:
+            return 0
+        with self.connection:
+            cursor = self.connection.executemany("UPDATE articles SET status = ? WHERE id = ?", params)
+            return cursor.rowcount
+
+    # ==================== DUPLICATAS ENTRE PLATAFORMAS ====================
+
+    def find_article_cluster(self, article: Union[Article, Dict[str, Any]]) -> Optional[int]:
+        """Grupo (cluster_id) de um artigo já gravado que seja o mesmo trabalho, ou None.
+
+        Não grava nada: serve para resolver artigos que ainda estão chegando.
+        """
+        return find_article_cluster(self.connection.cursor(), article)
+
+    def read_article_cluster(self, cluster_id: int) -> List[dict]:
+        """Artigos do grupo (o mesmo trabalho em plataformas diferentes), no formato da UI."""
+        cursor = self.connection.cursor()
+        cursor.execute(SearchQueries.ARTICLE_CLUSTER_MEMBERS, (cluster_id,))
+        return [self._article_ui_dict(row) for row in cursor.fetchall()]
+
+    def read_duplicate_clusters(self) -> List[dict]:
+        """Grupos com mais de um artigo: cluster_id, título, quantidade e plataformas."""
+        cursor = self.connection.cursor()
+        cursor.execute(SearchQueries.ARTICLES_DUPLICATES)
+        return [{'cluster_id': row['cluster_id'], 'title': row['title'],
+                 'duplicates': row['duplicates'], 'platforms': row['platforms'].split(',')}
+                for row in cursor.fetchall()]
 
     def read_articles_by_status(self, status: str) -> List[dict]: # Mudança no tipo de retorno para dict
         """
@@ -272,36 +455,115 @@ class DatabaseManager:
         com chaves em Português para a UI.
         """
         cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM articles WHERE status = ? ORDER BY created_at DESC", (status,))
+        cursor.execute(SearchQueries.ARTICLES_BY_STATUS, (status,))
         rows = cursor.fetchall()
         
         def safe_iso_parse(dt_str):
             # Função auxiliar (pode estar definida globalmente no db_manager)
             return datetime.fromisoformat(dt_str) if dt_str else None
         
-        articles_data = [] # Lista para armazenar dicionários
-        
-        for row in rows:
-            # CORREÇÃO: Mapeia o objeto de banco de dados (row) diretamente para o dicionário da UI (Português)
-            articles_data.append({
-                'id': row['id'], 
-                'titulo': row['title'],
-                'autores': row['authors'] or 'N/A',
-                'doi': row['doi'] or 'N/A',
-                # Concatena a data de publicação e a plataforma
-                'publicacao': f"{row['publication_date']} ({row['platform']})", 
-                'resumo': row['abstract'] or 'Resumo indisponível.',
-                'link': row['url'] or '#',
-                'status': row['status']
-            })
-        return articles_data # Retorna a lista de dicionários!
+        # CORREÇÃO: Mapeia o objeto de banco de dados (row) diretamente para o dicionário da UI (Português)
+        return [self._article_ui_dict(row) for row in rows] # Retorna a lista de dicionários!
+
+    def read_article_headers_by_status(self, status: str) -> List[dict]:
+        """
+        Como `read_articles_by_status`, mas só com os campos do cabeçalho da
+        lista (sem resumo e link). Os detalhes de um artigo são lidos por
+        `read_article_details` quando ele é expandido na UI.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(SearchQueries.ARTICLE_HEADERS_BY_STATUS, (status,))
+        return [self._article_header_dict(row) for row in cursor.fetchall()]
+
+    def read_article_headers_page(self, status: str, page_size: int = 200,
+                                  cursor: Optional[str] = None) -> Page:
+        """Uma página de `read_article_headers_by_status` (mais recentes primeiro) e o cursor da seguinte."""
+        return self._read_page(SearchQueries.ARTICLE_HEADERS_PAGE, SearchQueries.ARTICLE_HEADERS_PAGE_AFTER,
+                               (status,), ('created_at', 'id'), page_size, cursor, self._article_header_dict)
+
+    def read_article_details(self, article_ids: Iterable[int]) -> Dict[int, dict]:
+        """Resumo e link dos artigos informados, por id (chaves da UI: 'resumo', 'link')."""
+        ids = list(dict.fromkeys(article_ids))
+        details = {}
+        cursor = self.connection.cursor()
+        # Lotes abaixo do limite de parâmetros do SQLite
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            cursor.execute(SearchQueries.ARTICLE_DETAILS.format(marks=marks), chunk)
+            details.update((row['id'], self._article_detail_dict(row)) for row in cursor.fetchall())
+        return details
+
+    @staticmethod
+    def _article_header_dict(row) -> dict:
+        """Campos do cabeçalho de um artigo na lista da UI (chaves em Português)."""
+        return {
+            'id': row['id'],
+            'titulo': row['title'],
+            'autores': row['authors'] or 'N/A',
+            'doi': row['doi'] or 'N/A',
+            # Concatena a data de publicação e a plataforma
+            'publicacao': f"{row['publication_date']} ({row['platform']})",
+            'status': row['status']
+        }
+
+    @staticmethod
+    def _article_detail_dict(row) -> dict:
+        """Campos exibidos só com o artigo expandido (resumo e link)."""
+        return {
+            'resumo': row['abstract'] or 'Resumo indisponível.',
+            'link': row['url'] or '#',
+        }
+
+    @classmethod
+    def _article_ui_dict(cls, row) -> dict:
+        """Converte uma linha de 'articles' no dicionário usado pela UI (chaves em Português)."""
+        return {**cls._article_header_dict(row), **cls._article_detail_dict(row)}
+
+    def search_articles_fulltext(self, query: str, limit: int = 50, offset: int = 0,
+                                 status: Optional[str] = None) -> List[dict]:
+        """Busca textual em título, resumo e autores, ordenada por relevância (bm25).
+
+        Usa o índice FTS5 `articles_fts`; cada palavra digitada precisa aparecer
+        (a última vale como prefixo) e acentos são ignorados. Sem FTS5 no
+        SQLite, recai em LIKE sobre título/resumo (sem ranking).
+
+        Returns:
+            Dicionários no formato da UI (como `read_articles_by_status`) com
+            as chaves extras 'snippet' (trecho com o termo entre colchetes) e 'rank'.
+        """
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return []
+        cursor = self.connection.cursor()
+        if self._fulltext_enabled:
+            if status:
+                cursor.execute(SearchQueries.ARTICLES_FULLTEXT_BY_STATUS, (fts_query, status, limit, offset))
+            else:
+                cursor.execute(SearchQueries.ARTICLES_FULLTEXT, (fts_query, limit, offset))
+        else:
+            like = f"%{query.strip()}%"
+            sql = "SELECT *, 0 AS rank, '' AS snippet FROM articles WHERE (title LIKE ? OR abstract LIKE ?)"
+            params = [like, like]
+            if status:
+                sql += " AND status = ?"
+                params.append(status)
+            cursor.execute(sql + " ORDER BY created_at DESC LIMIT ? OFFSET ?", (*params, limit, offset))
+
+        results = []
+        for row in cursor.fetchall():
+            article = self._article_ui_dict(row)
+            article['snippet'] = row['snippet']
+            article['rank'] = row['rank']
+            results.append(article)
+        return results
 
     def read_article_by_platform_and_doi(self, platform: str, doi: str) -> Optional[Article]:
         """Procura um artigo pelo par (platform, doi)."""
         if not doi:
             return None
         cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM articles WHERE platform = ? AND doi = ? LIMIT 1", (platform, doi))
+        cursor.execute(SearchQueries.ARTICLE_BY_PLATFORM_AND_DOI, (platform, doi))
         row = cursor.fetchone()
         if not row:
             return None
@@ -328,7 +590,7 @@ class DatabaseManager:
         if not url:
             return None
         cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM articles WHERE platform = ? AND url = ? LIMIT 1", (platform, url))
+        cursor.execute(SearchQueries.ARTICLE_BY_PLATFORM_AND_URL, (platform, url))
         row = cursor.fetchone()
         if not row:
             return None
@@ -387,57 +649,42 @@ class DatabaseManager:
 
     def read_search_history(self, limit: int = 50) -> List[SearchHistory]:
         """
-        Lê o histórico de buscas.
-        
-        CORREÇÃO: Implementa o parse manual para o formato DD/MM/YYYY, 
-        que causava o erro Invalid isoformat string.
+        Lê o histórico de buscas (as `limit` mais recentes).
+
+        Datas em DD/MM/YYYY ou ISO 8601 (ver `_parse_date`). Para percorrer o
+        histórico inteiro, use `read_search_history_page`.
         """
         cursor = self.connection.cursor()
-        cursor.execute("""
-            SELECT * FROM search_history 
-            ORDER BY search_date DESC 
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-        
-        def parse_date_safely(date_str):
-            if date_str:
-                if isinstance(date_str, datetime):
-                    return date_str # Já é um objeto datetime
-                
-                # 1. Tenta parsear o formato DD/MM/YYYY (Formato problemático do seu DB)
-                try:
-                    return datetime.strptime(date_str, '%d/%m/%Y')
-                except ValueError:
-                    # 2. Tenta parsear o formato ISO 8601 (Formato esperado do Python)
-                    try:
-                        return datetime.fromisoformat(date_str)
-                    except ValueError:
-                        # 3. Falha e retorna None
-                        return None
-            return None
+        cursor.execute(SearchQueries.SEARCH_HISTORY_RECENT, (limit,))
+        return [self._search_history_from_row(row) for row in cursor.fetchall()]
 
-        searches = []
-        for row in rows:
-            searches.append(SearchHistory(
-                id=row['id'],
-                search_term=row['search_term'],
-                platforms=row['platforms'],
-                # Aplica o parse em todos os campos de data
-                date_start=parse_date_safely(row['date_start']),
-                date_end=parse_date_safely(row['date_end']),
-                results_count=row['results_count'],
-                search_date=parse_date_safely(row['search_date'])
-            ))
-        return searches
+    def read_search_history_page(self, page_size: int = 100, cursor: Optional[str] = None) -> Page:
+        """Uma página do histórico de buscas (mais recentes primeiro) e o cursor da seguinte."""
+        return self._read_page(SearchQueries.SEARCH_HISTORY_PAGE, SearchQueries.SEARCH_HISTORY_PAGE_AFTER,
+                               (), ('search_date', 'id'), page_size, cursor, self._search_history_from_row)
 
-    def read_articles_for_search(self, search_id: int) -> List[Article]:
+    @staticmethod
+    def _search_history_from_row(row) -> SearchHistory:
+        return SearchHistory(
+            id=row['id'],
+            search_term=row['search_term'],
+            platforms=row['platforms'],
+            # Aplica o parse em todos os campos de data
+            date_start=_parse_date(row['date_start']),
+            date_end=_parse_date(row['date_end']),
+            results_count=row['results_count'],
+            search_date=_parse_date(row['search_date'])
+        )
+
+    def read_articles_for_search(self, search_id: int) -> List[dict]:
         """
         Lê todos os artigos validados (VALIDADO) como fallback para
         uma consulta de histórico específica, já que o esquema do DB não tem 'search_id'
         na tabela 'articles'.
+
+        Retorna só os cabeçalhos; resumo e link vêm de `read_article_details`.
         """
-        return self.read_articles_by_status('VALIDADO')
+        return self.read_article_headers_by_status('VALIDADO')
     
     # ==================== CRUD: ERROR LOGS ====================
 
@@ -463,62 +710,85 @@ class DatabaseManager:
         return cursor.lastrowid
 
     def read_error_logs(self, limit: int = 50) -> List[ErrorLog]:
-        """Lê o histórico de erros."""
+        """Lê o histórico de erros (os `limit` mais recentes; ver `read_error_logs_page`)."""
         cursor = self.connection.cursor()
-        cursor.execute("""
-            SELECT * FROM error_logs 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-        
+        cursor.execute(SearchQueries.ERROR_LOGS_RECENT, (limit,))
+        return [self._error_log_from_row(row) for row in cursor.fetchall()]
+
+    def read_error_logs_page(self, page_size: int = 100, cursor: Optional[str] = None) -> Page:
+        """Uma página do log de erros (mais recentes primeiro) e o cursor da seguinte."""
+        return self._read_page(SearchQueries.ERROR_LOGS_PAGE, SearchQueries.ERROR_LOGS_PAGE_AFTER,
+                               (), ('created_at', 'id'), page_size, cursor, self._error_log_from_row)
+
+    @staticmethod
+    def _error_log_from_row(row) -> ErrorLog:
         def safe_iso_parse(dt_str):
             return datetime.fromisoformat(dt_str) if dt_str else None
-            
-        errors = []
-        for row in rows:
-            errors.append(ErrorLog(
-                id=row['id'],
-                error_type=row['error_type'],
-                search_term=row['search_term'],
-                article_title=row['article_title'],
-                article_doi=row['article_doi'],
-                platform=row['platform'],
-                error_reason=row['error_reason'],
-                error_date=safe_iso_parse(row['error_date']),
-                created_at=safe_iso_parse(row['created_at'])
-            ))
-        return errors
+
+        return ErrorLog(
+            id=row['id'],
+            error_type=row['error_type'],
+            search_term=row['search_term'],
+            article_title=row['article_title'],
+            article_doi=row['article_doi'],
+            platform=row['platform'],
+            error_reason=row['error_reason'],
+            error_date=safe_iso_parse(row['error_date']),
+            created_at=safe_iso_parse(row['created_at'])
+        )
+
+    # ==================== PAGINAÇÃO ====================
+
+    def _read_page(self, first_sql: str, after_sql: str, params: tuple, key_columns: tuple,
+                   page_size: int, cursor: Optional[str], convert) -> Page:
+        """Página por chave: `after_sql` recebe `params`, os valores do cursor e o limite.
+
+        Lê uma linha a mais que `page_size` para saber se há página seguinte.
+        """
+        if page_size < 1:
+            raise ValueError("page_size deve ser positivo")
+        if cursor is None:
+            rows = self.connection.execute(first_sql, (*params, page_size + 1)).fetchall()
+        else:
+            after = decode_cursor(cursor, len(key_columns))
+            rows = self.connection.execute(after_sql, (*params, *after, page_size + 1)).fetchall()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(*(rows[-1][column] for column in key_columns))
+        return Page([convert(row) for row in rows], next_cursor)
 
     # ==================== UTILITÁRIOS ====================
 
     def get_stats(self) -> Dict[str, Any]:
-        """Retorna estatísticas gerais do banco de dados."""
-        cursor = self.connection.cursor()
-        
-        cursor.execute("SELECT COUNT(*) as count FROM affiliation_variations")
-        aff_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM articles")
-        articles_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM articles WHERE status = 'VALIDADO'")
-        validated_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM search_history")
-        searches_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM error_logs")
-        errors_count = cursor.fetchone()['count']
-        
+        """Retorna estatísticas gerais do banco de dados.
+
+        Lê a tabela agregada `stats` (mantida por gatilhos, migração 6): o
+        custo não depende do número de artigos. Além dos totais, traz os
+        artigos por plataforma, status e ano de publicação.
+        """
+        tables: Dict[str, int] = {}
+        groups: Dict[str, Dict[str, int]] = {'platform': {}, 'status': {}, 'year': {}}
+        for row in self.connection.execute(SearchQueries.STATS_ROLLUP):
+            target = tables if row['scope'] == 'table' else groups[row['scope']]
+            target[row['key']] = row['count']
+
         return {
-            'affiliation_variations': aff_count,
-            'articles_total': articles_count,
-            'articles_validated': validated_count,
-            'searches': searches_count,
-            'errors': errors_count
+            'affiliation_variations': tables.get('affiliation_variations', 0),
+            'articles_total': tables.get('articles', 0),
+            'articles_validated': groups['status'].get('VALIDADO', 0),
+            'searches': tables.get('search_history', 0),
+            'errors': tables.get('error_logs', 0),
+            'articles_by_platform': groups['platform'],
+            'articles_by_status': groups['status'],
+            'articles_by_year': groups['year'],
         }
 
+    def get_stat(self, scope: str, key: str) -> int:
+        """Uma contagem de `stats` (ex.: ('platform', 'PubMed')); 0 se não houver."""
+        row = self.connection.execute(SearchQueries.STATS_COUNT, (scope, key)).fetchone()
+        return row['count'] if row else 0
+
     def clear_database(self):
         """[AVISO] Limpa TODAS as tabelas. Use com cuidado!"""
         cursor = self.connection.cursor()
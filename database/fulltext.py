@@ -0,0 +1,68 @@
+"""
+Busca textual (FTS5) sobre título, resumo e autores dos artigos.
+
+- `to_fts_query(texto)`: converte o que o usuário digitou numa consulta FTS5
+  segura (cada palavra entre aspas, a última como prefixo), sem expor a
+  sintaxe do MATCH (AND/OR/NEAR, aspas, parênteses) a erros de digitação.
+- `ArticleTextIndex`: índice FTS5 em memória para listas de artigos que ainda
+  não estão no banco (ex.: resultados da busca atual na ResultsWindow).
+
+Os artigos salvos são indexados pela tabela `articles_fts` (migração 3 de
+`database/schema.py`) e consultados por `DatabaseManager.search_articles_fulltext`.
+"""
+
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Chaves dos dicionários de artigo usados pela UI
+_UI_COLUMNS = ('titulo', 'resumo', 'autores')
+
+
+def to_fts_query(text: str) -> str:
+    """'hosp clinicas' -> '"hosp" "clinicas"*' (todas as palavras, a última como prefixo)."""
+    words = _WORD.findall(text or '')
+    if not words:
+        return ''
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class ArticleTextIndex:
+    """Índice FTS5 em memória sobre uma lista de artigos (dicionários da UI)."""
+
+    def __init__(self, articles: List[Dict]):
+        self._conn = sqlite3.connect(':memory:')
+        self._conn.execute("""
+            CREATE VIRTUAL TABLE docs USING fts5(
+                titulo, resumo, autores,
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        self._conn.executemany(
+            "INSERT INTO docs(rowid, titulo, resumo, autores) VALUES (?, ?, ?, ?)",
+            [(pos, *(str(article.get(col) or '') for col in _UI_COLUMNS))
+             for pos, article in enumerate(articles)],
+        )
+
+    def search(self, text: str, limit: int = -1) -> List[Tuple[int, str]]:
+        """Posições dos artigos que casam com `text`, por relevância, com trecho destacado."""
+        query = to_fts_query(text)
+        if not query:
+            return []
+        rows = self._conn.execute(
+            """
+            SELECT rowid, snippet(docs, -1, '[', ']', '…', 12)
+            FROM docs WHERE docs MATCH ?
+            ORDER BY bm25(docs, 10.0, 1.0, 2.0)
+            LIMIT ?
+            """,
+            (query, limit),
+        ).fetchall()
+        return [(rowid, snippet) for rowid, snippet in rows]
+
+    def close(self):
+        self._conn.close()
@@ -3,9 +3,9 @@ Modelos de dados para o NEXUS Pesquisa.
 Define as estruturas das tabelas principais do banco de dados.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -42,6 +42,8 @@ class Article:
     status: str = "NOVO"  # NOVO, VALIDADO, REJEITADO
     collected_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
+    # Afiliações distintas dos autores (tabela article_affiliations)
+    affiliations: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -0,0 +1,54 @@
+"""
+Paginação por chave (keyset) das listagens do DatabaseManager.
+
+Cada página é lida a partir da última linha da anterior, pelas colunas
+indexadas da ordenação (ex.: `(search_date, id) < (?, ?)`), e não por
+OFFSET: o custo de uma página não cresce com a posição na lista, e linhas
+gravadas durante a leitura não fazem a lista pular ou repetir registros.
+
+O cursor de continuação é um texto opaco para quem chama; basta devolvê-lo
+na próxima chamada.
+
+Uso:
+    page = db.read_search_history_page(page_size=100)
+    while True:
+        mostrar(page.items)
+        if not page.has_more:
+            break
+        page = db.read_search_history_page(page_size=100, cursor=page.next_cursor)
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class Page(Generic[T]):
+    """Uma página de resultados e o cursor para a seguinte (None na última)."""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Cursor opaco com os valores de ordenação da última linha da página."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Valores de um cursor de `encode_cursor`; ValueError se inválido."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"Cursor de paginação inválido: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Cursor de paginação inválido: {cursor!r}")
+    return values
@@ -25,6 +25,17 @@ class SearchQueries:
     ORDER BY count DESC
     """
 
+    AFFILIATION_ALL = """
+    SELECT * FROM affiliation_variations
+    ORDER BY created_at DESC
+    """
+
+    AFFILIATION_BY_INSTITUTION = """
+    SELECT * FROM affiliation_variations
+    WHERE institution = ?
+    ORDER BY created_at DESC
+    """
+
     AFFILIATION_BY_PLATFORM = """
     SELECT * FROM affiliation_variations 
     WHERE platform = ?
@@ -40,32 +51,145 @@ class SearchQueries:
     ORDER BY publication_date DESC
     """
 
+    ARTICLES_BY_STATUS = """
+    SELECT * FROM articles
+    WHERE status = ?
+    ORDER BY created_at DESC
+    """
+
+    ARTICLE_BY_PLATFORM_AND_DOI = """
+    SELECT * FROM articles WHERE platform = ? AND doi = ? LIMIT 1
+    """
+
+    ARTICLE_BY_PLATFORM_AND_URL = """
+    SELECT * FROM articles WHERE platform = ? AND url = ? LIMIT 1
+    """
+
+    # {marks}: um '?' por id (lotes abaixo do limite de parâmetros do SQLite)
+    ARTICLE_DETAILS = """
+    SELECT id, abstract, url FROM articles WHERE id IN ({marks})
+    """
+
     ARTICLES_COUNT_BY_STATUS = """
     SELECT status, COUNT(*) as count 
     FROM articles 
     GROUP BY status
     """
 
+    # Paginação por chave (database/pagination.py): ordem (created_at, id) do índice
+    # idx_articles_status_created; a página seguinte parte da última linha da anterior
+    ARTICLE_HEADERS_PAGE = """
+    SELECT id, title, authors, doi, publication_date, platform, status, created_at
+    FROM articles
+    WHERE status = ?
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+    """
+
+    ARTICLE_HEADERS_PAGE_AFTER = """
+    SELECT id, title, authors, doi, publication_date, platform, status, created_at
+    FROM articles
+    WHERE status = ? AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+    """
+
     ARTICLES_SEARCH_BY_TITLE = """
     SELECT * FROM articles 
     WHERE title LIKE ? OR abstract LIKE ?
     ORDER BY created_at DESC
     """
 
+    # Lista da UI: só o cabeçalho; resumo/link são lidos ao expandir o artigo
+    ARTICLE_HEADERS_BY_STATUS = """
+    SELECT id, title, authors, doi, publication_date, platform, status
+    FROM articles
+    WHERE status = ?
+    ORDER BY created_at DESC
+    """
+
+    ARTICLE_ID_BY_PLATFORM_AND_DOI = """
+    SELECT id FROM articles WHERE platform = ? AND doi = ? ORDER BY id LIMIT 1
+    """
+
+    ARTICLE_ID_BY_PLATFORM_AND_URL = """
+    SELECT id FROM articles WHERE platform = ? AND url = ? ORDER BY id LIMIT 1
+    """
+
+    # Afiliações dos autores (migração 4): validação em lote por texto distinto
+    AFFILIATION_LINKS_BY_STATUS = """
+    SELECT aa.article_id, aa.affiliation_id, t.text
+    FROM articles a
+    JOIN article_affiliations aa ON aa.article_id = a.id
+    JOIN affiliation_texts t ON t.id = aa.affiliation_id
+    WHERE a.status = ?
+    ORDER BY aa.article_id
+    """
+
+    # Busca textual (FTS5): ranking bm25 com pesos título > autores > resumo.
+    # O parâmetro de MATCH deve vir de database.fulltext.to_fts_query().
+    ARTICLES_FULLTEXT = """
+    SELECT articles.*,
+           bm25(articles_fts, 10.0, 1.0, 2.0) AS rank,
+           snippet(articles_fts, -1, '[', ']', '…', 12) AS snippet
+    FROM articles_fts
+    JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+    """
+
+    ARTICLES_FULLTEXT_BY_STATUS = """
+    SELECT articles.*,
+           bm25(articles_fts, 10.0, 1.0, 2.0) AS rank,
+           snippet(articles_fts, -1, '[', ']', '…', 12) AS snippet
+    FROM articles_fts
+    JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH ? AND articles.status = ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+    """
+
     ARTICLES_BY_DOI = """
     SELECT * FROM articles 
     WHERE doi = ? 
     LIMIT 1
     """
 
+    # Grupos de duplicatas entre plataformas (migração 5, database/clusters.py)
     ARTICLES_DUPLICATES = """
-    SELECT title, COUNT(*) as duplicates 
-    FROM articles 
-    GROUP BY title 
-    HAVING duplicates > 1 
+    SELECT c.cluster_id, MIN(a.title) AS title, COUNT(*) AS duplicates,
+           GROUP_CONCAT(a.platform, ',') AS platforms
+    FROM article_clusters c
+    JOIN articles a ON a.id = c.article_id
+    GROUP BY c.cluster_id
+    HAVING duplicates > 1
     ORDER BY duplicates DESC
     """
 
+    ARTICLE_CLUSTER_BY_DOI = """
+    SELECT cluster_id FROM article_clusters WHERE doi_key = ? ORDER BY article_id LIMIT 1
+    """
+
+    # Candidatos de `find_article_cluster`: artigos que dividem faixas LSH com o
+    # título procurado ({marks}: um '?' por faixa), os de mais faixas primeiro
+    ARTICLE_CLUSTER_CANDIDATES = """
+    SELECT c.cluster_id, c.doi_key, c.title_key, c.author_key, c.year, c.signature, a.platform, a.url
+    FROM article_cluster_bands b
+    JOIN article_clusters c ON c.article_id = b.article_id
+    JOIN articles a ON a.id = c.article_id
+    WHERE b.band_key IN ({marks})
+    GROUP BY b.article_id
+    ORDER BY COUNT(*) DESC, c.article_id
+    """
+
+    ARTICLE_CLUSTER_MEMBERS = """
+    SELECT a.* FROM article_clusters c
+    JOIN articles a ON a.id = c.article_id
+    WHERE c.cluster_id = ?
+    ORDER BY a.id
+    """
+
     # ==================== SEARCH HISTORY ====================
 
     SEARCH_HISTORY_BY_DATE_RANGE = """
@@ -80,6 +204,12 @@ class SearchQueries:
     ORDER BY search_date DESC
     """
 
+    SEARCH_HISTORY_RECENT = """
+    SELECT * FROM search_history
+    ORDER BY search_date DESC
+    LIMIT ?
+    """
+
     SEARCH_STATS_BY_PLATFORM = """
     SELECT platforms, COUNT(*) as total, AVG(results_count) as avg_results 
     FROM search_history 
@@ -95,6 +225,19 @@ class SearchQueries:
     LIMIT 10
     """
 
+    SEARCH_HISTORY_PAGE = """
+    SELECT * FROM search_history
+    ORDER BY search_date DESC, id DESC
+    LIMIT ?
+    """
+
+    SEARCH_HISTORY_PAGE_AFTER = """
+    SELECT * FROM search_history
+    WHERE (search_date, id) < (?, ?)
+    ORDER BY search_date DESC, id DESC
+    LIMIT ?
+    """
+
     # ==================== ERROR LOGS ====================
 
     ERROR_LOGS_BY_TYPE = """
@@ -116,12 +259,31 @@ class SearchQueries:
     ORDER BY created_at DESC
     """
 
+    ERROR_LOGS_RECENT = """
+    SELECT * FROM error_logs
+    ORDER BY created_at DESC
+    LIMIT ?
+    """
+
     ERROR_LOGS_BY_PLATFORM = """
     SELECT * FROM error_logs 
     WHERE platform = ?
     ORDER BY created_at DESC
     """
 
+    ERROR_LOGS_PAGE = """
+    SELECT * FROM error_logs
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+    """
+
+    ERROR_LOGS_PAGE_AFTER = """
+    SELECT * FROM error_logs
+    WHERE (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+    """
+
     # ==================== STATISTICS ====================
 
     TOTAL_ARTICLES_BY_PLATFORM = """
@@ -147,13 +309,24 @@ class SearchQueries:
     ORDER BY date DESC
     """
 
+    # Totais lidos da tabela agregada `stats` (gatilhos, migração 6): uma linha só
     DATABASE_STATS = """
     SELECT 
-        (SELECT COUNT(*) FROM affiliation_variations) as affiliations,
-        (SELECT COUNT(*) FROM articles) as articles,
-        (SELECT COUNT(*) FROM articles WHERE status = 'VALIDADO') as validated_articles,
-        (SELECT COUNT(*) FROM search_history) as searches,
-        (SELECT COUNT(*) FROM error_logs) as errors
+        COALESCE((SELECT count FROM stats WHERE scope = 'table' AND key = 'affiliation_variations'), 0) as affiliations,
+        COALESCE((SELECT count FROM stats WHERE scope = 'table' AND key = 'articles'), 0) as articles,
+        COALESCE((SELECT count FROM stats WHERE scope = 'status' AND key = 'VALIDADO'), 0) as validated_articles,
+        COALESCE((SELECT count FROM stats WHERE scope = 'table' AND key = 'search_history'), 0) as searches,
+        COALESCE((SELECT count FROM stats WHERE scope = 'table' AND key = 'error_logs'), 0) as errors
+    """
+
+    # Painel completo: totais e artigos por plataforma, status e ano
+    STATS_ROLLUP = """
+    SELECT scope, key, count FROM stats
+    WHERE scope IN ('table', 'platform', 'status', 'year') AND count <> 0
+    """
+
+    STATS_COUNT = """
+    SELECT count FROM stats WHERE scope = ? AND key = ?
     """
 
     # ==================== MAINTENANCE ====================
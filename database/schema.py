@@ -0,0 +1,422 @@
+"""
+Migrações versionadas do esquema SQLite do NEXUS Pesquisa.
+
+`create_base_tables` cria as tabelas originais (CREATE TABLE IF NOT EXISTS);
+as mudanças posteriores de esquema ficam aqui, numeradas, e são aplicadas uma
+única vez por banco. A versão atual fica em `PRAGMA user_version`; cada migração roda
+numa transação própria e só avança a versão se concluir.
+
+Para adicionar uma migração: escreva uma função `_vN_descricao(cursor)` e
+acrescente `(N, "descrição", função)` ao fim de `MIGRATIONS`.
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+# Marcadores de "sem DOI/URL" gravados por versões antigas da UI
+_PLACEHOLDER_KEYS = ('N/A', 'NA', '#', '-', 'NONE', 'NULL')
+
+
+def create_base_tables(connection: sqlite3.Connection):
+    """Cria as tabelas principais se não existirem (o esquema da versão 0)."""
+    cursor = connection.cursor()
+
+    # Tabela de Variações de Afiliação
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS affiliation_variations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_text TEXT NOT NULL,
+            normalized_text TEXT NOT NULL,
+            institution TEXT NOT NULL,
+            platform TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Tabela de Artigos
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            authors TEXT,
+            doi TEXT,
+            platform TEXT NOT NULL,
+            publication_date TEXT,
+            abstract TEXT,
+            url TEXT,
+            status TEXT DEFAULT 'NOVO',
+            collected_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Tabela de Histórico de Buscas
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS search_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            search_term TEXT NOT NULL,
+            platforms TEXT,
+            date_start TEXT,
+            date_end TEXT,
+            results_count INTEGER DEFAULT 0,
+            search_date TEXT
+        )
+    """)
+    # NOTA: O campo search_date foi alterado para TEXT para refletir o formato
+    # usado no INSERT e evitar conflitos.
+
+    # Tabela de Histórico de Erros
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS error_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            error_type TEXT NOT NULL,
+            search_term TEXT,
+            article_title TEXT,
+            article_doi TEXT,
+            platform TEXT,
+            error_reason TEXT,
+            error_date TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    connection.commit()
+
+
+def _v1_lookup_indexes(cursor: sqlite3.Cursor):
+    """Índices das colunas usadas em buscas, filtros e ORDER BY."""
+    statements = [
+        # articles
+        "CREATE INDEX IF NOT EXISTS idx_articles_platform_doi ON articles(platform, doi)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_platform_url ON articles(platform, url)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_platform_pubdate ON articles(platform, publication_date)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_status_created ON articles(status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_created ON articles(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_doi ON articles(doi)",
+        # affiliation_variations
+        "CREATE INDEX IF NOT EXISTS idx_affiliation_institution ON affiliation_variations(institution, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_affiliation_platform ON affiliation_variations(platform, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_affiliation_created ON affiliation_variations(created_at)",
+        # search_history
+        "CREATE INDEX IF NOT EXISTS idx_search_history_date ON search_history(search_date)",
+        "CREATE INDEX IF NOT EXISTS idx_search_history_term ON search_history(search_term)",
+        "CREATE INDEX IF NOT EXISTS idx_search_history_platforms ON search_history(platforms, results_count)",
+        # error_logs
+        "CREATE INDEX IF NOT EXISTS idx_error_logs_created ON error_logs(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_error_logs_type ON error_logs(error_type, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_error_logs_platform ON error_logs(platform, created_at)",
+    ]
+    for sql in statements:
+        cursor.execute(sql)
+
+
+def _create_article_unique_keys(cursor: sqlite3.Cursor) -> bool:
+    """Cria as chaves únicas de duplicata; False (e nada criado) se houver duplicatas."""
+    cursor.execute("SAVEPOINT article_keys")
+    try:
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_articles_platform_doi
+            ON articles(platform, doi)
+            WHERE doi IS NOT NULL AND doi <> ''
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_articles_platform_url
+            ON articles(platform, url)
+            WHERE (doi IS NULL OR doi = '') AND url IS NOT NULL AND url <> ''
+        """)
+    except sqlite3.IntegrityError:
+        cursor.execute("ROLLBACK TO article_keys")
+        cursor.execute("RELEASE article_keys")
+        return False
+    cursor.execute("RELEASE article_keys")
+    return True
+
+
+def _v2_article_unique_keys(cursor: sqlite3.Cursor):
+    """Chaves únicas de duplicata: (platform, doi) com DOI; (platform, url) sem DOI.
+
+    Antes, limpa os marcadores ('N/A', '#') gravados como DOI/URL. Se o banco
+    já tiver duplicatas as chaves não são criadas (nenhuma linha é apagada);
+    `ensure_article_unique_keys` tenta de novo a cada abertura.
+    """
+    marks = ",".join("?" * len(_PLACEHOLDER_KEYS))
+    cursor.execute(f"UPDATE articles SET doi = '' WHERE UPPER(TRIM(doi)) IN ({marks})", _PLACEHOLDER_KEYS)
+    cursor.execute(f"UPDATE articles SET url = '' WHERE UPPER(TRIM(url)) IN ({marks})", _PLACEHOLDER_KEYS)
+    _create_article_unique_keys(cursor)
+
+
+def fts5_available(connection: sqlite3.Connection) -> bool:
+    """True se o SQLite foi compilado com FTS5."""
+    options = {row[0] for row in connection.execute("PRAGMA compile_options")}
+    return 'ENABLE_FTS5' in options
+
+
+def _v3_articles_fulltext(cursor: sqlite3.Cursor):
+    """Índice FTS5 (conteúdo externo) sobre título, resumo e autores dos artigos.
+
+    Os gatilhos mantêm `articles_fts` sincronizada com `articles`; o
+    'rebuild' indexa os artigos já existentes. Sem suporte a FTS5 no SQLite
+    a tabela não é criada (a busca textual usa LIKE), mas a versão avança
+    para que as migrações seguintes sejam aplicadas.
+    """
+    if not fts5_available(cursor.connection):
+        print("[AVISO] SQLite sem FTS5: busca textual de artigos usará LIKE")
+        return
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, abstract, authors,
+            content='articles', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, abstract, authors)
+            VALUES (new.id, new.title, new.abstract, new.authors);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, abstract, authors)
+            VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, abstract, authors ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, abstract, authors)
+            VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+            INSERT INTO articles_fts(rowid, title, abstract, authors)
+            VALUES (new.id, new.title, new.abstract, new.authors);
+        END
+    """)
+    cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def _v4_article_affiliations(cursor: sqlite3.Cursor):
+    """Afiliações dos autores, normalizadas: cada texto distinto é gravado uma vez.
+
+    `affiliation_texts` guarda os textos (únicos entre autores e artigos) e
+    `article_affiliations` liga artigos a textos. A validação examina cada
+    texto distinto uma única vez e propaga o resultado para os artigos.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS affiliation_texts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL UNIQUE
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_affiliations (
+            article_id INTEGER NOT NULL,
+            affiliation_id INTEGER NOT NULL,
+            PRIMARY KEY (article_id, affiliation_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_affiliations_affiliation "
+                   "ON article_affiliations(affiliation_id)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS article_affiliations_ad AFTER DELETE ON articles BEGIN
+            DELETE FROM article_affiliations WHERE article_id = old.id;
+        END
+    """)
+
+
+def _v5_article_clusters(cursor: sqlite3.Cursor):
+    """Grupos de artigos duplicados entre plataformas (ver database/clusters.py).
+
+    `article_clusters` guarda a impressão digital de cada artigo e o grupo a
+    que pertence; `article_cluster_bands` indexa as chaves de faixa LSH do
+    título para achar candidatos sem varrer a tabela. Os artigos existentes
+    são agrupados aqui.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_clusters (
+            article_id INTEGER PRIMARY KEY,
+            cluster_id INTEGER NOT NULL,
+            doi_key TEXT NOT NULL DEFAULT '',
+            title_key TEXT NOT NULL DEFAULT '',
+            author_key TEXT NOT NULL DEFAULT '',
+            year TEXT NOT NULL DEFAULT '',
+            signature BLOB
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_clusters_cluster ON article_clusters(cluster_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_clusters_doi ON article_clusters(doi_key)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_cluster_bands (
+            band_key INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            PRIMARY KEY (band_key, article_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_cluster_bands_article "
+                   "ON article_cluster_bands(article_id)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS article_clusters_ad AFTER DELETE ON articles BEGIN
+            DELETE FROM article_cluster_bands WHERE article_id = old.id;
+            DELETE FROM article_clusters WHERE article_id = old.id;
+        END
+    """)
+    from .clusters import rebuild_article_clusters
+    rebuild_article_clusters(cursor)
+
+
+def _year_sql(column: str) -> str:
+    """Expressão SQL do ano de `column` ('2023', '2023-05-20' ou '20/05/2023'); '' se não houver."""
+    return (f"CASE WHEN substr({column}, 1, 4) GLOB '[12][0-9][0-9][0-9]' THEN substr({column}, 1, 4) "
+            f"WHEN substr({column}, -4) GLOB '[12][0-9][0-9][0-9]' THEN substr({column}, -4) "
+            f"ELSE '' END")
+
+
+def _article_stats_rows(row: str, delta: int) -> str:
+    """Linhas (scope, key, count) de um artigo (`new` ou `old`) para o UPSERT em `stats`."""
+    return (f"('table', 'articles', {delta}), "
+            f"('platform', COALESCE({row}.platform, ''), {delta}), "
+            f"('status', COALESCE({row}.status, ''), {delta}), "
+            f"('year', {_year_sql(row + '.publication_date')}, {delta})")
+
+
+_STATS_UPSERT = "ON CONFLICT(scope, key) DO UPDATE SET count = count + excluded.count"
+
+# Tabelas contadas em stats ('table', nome)
+_STATS_TABLES = ('affiliation_variations', 'articles', 'search_history', 'error_logs')
+
+
+def rebuild_stats(cursor: sqlite3.Cursor):
+    """Recalcula `stats` a partir das tabelas (a migração 6 usa; os gatilhos mantêm depois)."""
+    cursor.execute("DELETE FROM stats")
+    for table in _STATS_TABLES:
+        cursor.execute(f"INSERT INTO stats (scope, key, count) SELECT 'table', ?, COUNT(*) FROM {table}",
+                       (table,))
+    cursor.execute("INSERT INTO stats (scope, key, count) "
+                   "SELECT 'platform', COALESCE(platform, ''), COUNT(*) FROM articles GROUP BY 2")
+    cursor.execute("INSERT INTO stats (scope, key, count) "
+                   "SELECT 'status', COALESCE(status, ''), COUNT(*) FROM articles GROUP BY 2")
+    cursor.execute("INSERT INTO stats (scope, key, count) "
+                   f"SELECT 'year', {_year_sql('publication_date')}, COUNT(*) FROM articles GROUP BY 2")
+
+
+def _v6_stats_rollup(cursor: sqlite3.Cursor):
+    """Contagens agregadas do painel de estatísticas, mantidas por gatilhos.
+
+    `stats` guarda uma linha por (scope, key): o total de cada tabela
+    ('table'), e os artigos por plataforma ('platform'), status ('status') e
+    ano de publicação ('year'). Cada inserção, remoção ou mudança de
+    plataforma/status/data soma ou subtrai 1 nas linhas afetadas; ler o
+    painel não depende mais do tamanho das tabelas.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stats (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stats_articles_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO stats (scope, key, count) VALUES {_article_stats_rows('new', 1)} {_STATS_UPSERT};
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stats_articles_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO stats (scope, key, count) VALUES {_article_stats_rows('old', -1)} {_STATS_UPSERT};
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stats_articles_au AFTER UPDATE OF platform, status, publication_date
+        ON articles BEGIN
+            INSERT INTO stats (scope, key, count) VALUES {_article_stats_rows('old', -1)} {_STATS_UPSERT};
+            INSERT INTO stats (scope, key, count) VALUES {_article_stats_rows('new', 1)} {_STATS_UPSERT};
+        END
+    """)
+    for table in _STATS_TABLES:
+        if table == 'articles':
+            continue
+        for event, suffix, delta in (('INSERT', 'ai', 1), ('DELETE', 'ad', -1)):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS stats_{table}_{suffix} AFTER {event} ON {table} BEGIN
+                    INSERT INTO stats (scope, key, count) VALUES ('table', '{table}', {delta}) {_STATS_UPSERT};
+                END
+            """)
+    rebuild_stats(cursor)
+
+
+def _v7_drop_title_index(cursor: sqlite3.Cursor):
+    """Remove `idx_articles_title` (criado pela migração 1 em bancos antigos).
+
+    Os títulos só são buscados com LIKE '%…%' ou pela FTS5, e nenhum dos
+    dois usa um índice B-tree da coluna; o índice só encarecia as escritas.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_articles_title")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "índices de consulta", _v1_lookup_indexes),
+    (2, "chaves únicas de artigos", _v2_article_unique_keys),
+    (3, "busca textual FTS5 de artigos", _v3_articles_fulltext),
+    (4, "afiliações dos autores", _v4_article_affiliations),
+    (5, "grupos de artigos duplicados", _v5_article_clusters),
+    (6, "estatísticas agregadas", _v6_stats_rollup),
+    (7, "remoção do índice de títulos", _v7_drop_title_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(connection: sqlite3.Connection) -> int:
+    """Aplica as migrações pendentes, em ordem. Retorna a versão final do esquema.
+
+    Para na primeira migração que falhar (a transação dela é desfeita) e
+    mantém a versão anterior; ela será tentada de novo na próxima abertura.
+    """
+    version = get_schema_version(connection)
+    if connection.in_transaction:
+        connection.commit()
+    for number, description, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migrate(cursor)
+            # PRAGMA não aceita parâmetro; `number` vem da lista acima
+            cursor.execute(f"PRAGMA user_version = {int(number)}")
+            connection.commit()
+        except sqlite3.Error as e:
+            connection.rollback()
+            print(f"[AVISO] Migração {number} ({description}) não aplicada: {e}")
+            break
+        version = number
+        print(f"[OK] Esquema do banco atualizado para a versão {number} ({description})")
+    return version
+
+
+def has_article_unique_keys(connection: sqlite3.Connection) -> bool:
+    """True se os índices únicos de duplicata de artigos existem."""
+    rows = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND name IN ('ux_articles_platform_doi', 'ux_articles_platform_url')"
+    ).fetchall()
+    return len(rows) == 2
+
+
+def ensure_article_unique_keys(connection: sqlite3.Connection) -> bool:
+    """Garante as chaves únicas de artigos; False se duplicatas antigas impedirem."""
+    if has_article_unique_keys(connection):
+        return True
+    if connection.in_transaction:
+        connection.commit()
+    return _create_article_unique_keys(connection.cursor())
+
+
+def has_articles_fulltext(connection: sqlite3.Connection) -> bool:
+    """True se a tabela FTS5 `articles_fts` existe."""
+    row = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone()
+    return row is not None
@@ -0,0 +1,113 @@
+"""
+Testes da preparação do banco (database/bootstrap.py).
+Usa bancos SQLite temporários; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_bootstrap
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import config
+from database.bootstrap import bootstrap
+from database.connection import get_provider
+from database.db_manager import DatabaseManager
+from database.schema import SCHEMA_VERSION, get_schema_version
+
+
+def test_import_does_not_touch_the_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "import.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+        code = ("import time; t = time.perf_counter(); import database; "
+                "print((time.perf_counter() - t) * 1000)")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=str(config.BASE_DIR), env=env, check=True).stdout
+        created = os.path.exists(path)
+    print(f"\n   import database: {float(out.splitlines()[-1]):.1f} ms")
+    assert not created
+
+
+def test_schema_is_prepared_once_and_managers_run_no_sql():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "once.db")
+        start = time.perf_counter()
+        version = bootstrap(path)
+        first = time.perf_counter() - start
+
+        provider = get_provider(path)
+        opened = provider.opened
+        start = time.perf_counter()
+        managers = [DatabaseManager(path) for _ in range(200)]
+        per_manager = (time.perf_counter() - start) / 200
+        no_connection = provider.opened == opened  # nenhuma conexão aberta ao construir
+
+        db = managers[0]
+        stored = get_schema_version(db.connection)
+        for manager in managers:
+            manager.close()
+
+    print(f"\n   bootstrap: {first * 1000:.1f} ms; DatabaseManager(): {per_manager * 1e6:.0f} µs")
+    assert version == stored == SCHEMA_VERSION
+    assert no_connection
+    assert per_manager < 0.001
+
+
+def test_seed_runs_once_per_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seed.db")
+        bootstrap(path, seed=True)
+        with DatabaseManager(path) as db:
+            seeded = len(db.read_affiliation_variations_by_institution("HC-UFPE"))
+            db.connection.execute("DELETE FROM affiliation_variations")
+            db.connection.commit()
+            bootstrap(path, seed=True)  # já feito neste processo: não recarrega
+            remaining = len(db.read_affiliation_variations_by_institution("HC-UFPE"))
+    assert seeded > 0
+    assert remaining == 0
+
+
+def test_new_memory_database_gets_the_schema():
+    with DatabaseManager(':memory:') as db:
+        db.get_stats()
+    # o primeiro banco ':memory:' foi fechado; o segundo é um banco novo
+    with DatabaseManager(':memory:') as db:
+        stats = db.get_stats()
+        version = get_schema_version(db.connection)
+    assert stats['articles_total'] == 0
+    assert version == SCHEMA_VERSION
+
+
+def test_recreated_file_gets_the_schema():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recreated.db")
+        with DatabaseManager(path) as db:
+            db.get_stats()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        with DatabaseManager(path) as db:
+            stats = db.get_stats()
+            version = get_schema_version(db.connection)
+    assert stats['articles_total'] == 0
+    assert version == SCHEMA_VERSION
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: preparação do banco (bootstrap)")
+    print("=" * 60)
+    test_import_does_not_touch_the_database()
+    test_schema_is_prepared_once_and_managers_run_no_sql()
+    test_seed_runs_once_per_process()
+    test_new_memory_database_gets_the_schema()
+    test_recreated_file_gets_the_schema()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
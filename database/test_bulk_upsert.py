@@ -0,0 +1,182 @@
+"""
+Testes da inserção em lote de artigos (DatabaseManager.bulk_upsert_articles).
+Usa um banco SQLite temporário; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_bulk_upsert
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+from database.db_manager import DatabaseManager
+from database.models import Article
+
+
+def _harvest(count, platform="PubMed"):
+    """Artigos sintéticos: metade com DOI, metade só com URL."""
+    articles = []
+    for i in range(count):
+        has_doi = i % 2 == 0
+        articles.append(Article(
+            title=f"Artigo {i}",
+            authors="Silva A",
+            doi=f"10.5555/bulk.{i}" if has_doi else "N/A",
+            platform=platform,
+            publication_date="2023",
+            abstract="Resumo.",
+            url=f"https://pubmed.ncbi.nlm.nih.gov/{40000000 + i}/",
+            status="NOVO",
+        ))
+    return articles
+
+
+def test_bulk_upsert_inserts_once_and_skips_duplicates():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "bulk.db")) as db:
+            articles = _harvest(2000)
+            # duplicatas dentro do próprio lote e marcadores sem chave
+            articles += articles[:10]
+            articles.append(Article(title="Sem chave 1", doi="N/A", url="#", platform="PubMed"))
+            articles.append(Article(title="Sem chave 2", doi="", url="", platform="PubMed"))
+
+            start = time.perf_counter()
+            first = db.bulk_upsert_articles(articles)
+            elapsed = time.perf_counter() - start
+
+            again = db.bulk_upsert_articles(_harvest(2000))
+            other_platform = db.bulk_upsert_articles(_harvest(5, platform="Scielo"))
+            stored = db.connection.execute(
+                "SELECT COUNT(*) FROM articles WHERE doi = 'N/A' OR url = '#'"
+            ).fetchone()[0]
+
+    print(f"\n   2000 artigos em lote: {elapsed * 1000:.0f} ms")
+    assert first == {'inserted': 2002, 'skipped': 10}
+    assert again == {'inserted': 0, 'skipped': 2000}
+    assert other_platform == {'inserted': 5, 'skipped': 0}
+    assert stored == 0
+    assert elapsed < 1.0
+
+
+def test_bulk_upsert_without_unique_indexes_on_legacy_duplicates():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.db")
+        DatabaseManager(path).close()
+        conn = sqlite3.connect(path)
+        conn.execute("DROP INDEX ux_articles_platform_doi")
+        conn.executemany(
+            "INSERT INTO articles (title, doi, platform, url) VALUES (?, ?, ?, ?)",
+            [("Dup", "10.5555/dup", "PubMed", ""), ("Dup", "10.5555/dup", "PubMed", "")],
+        )
+        conn.commit()
+        conn.close()
+
+        with DatabaseManager(path) as db:
+            assert not db._article_keys_enabled
+            counts = db.bulk_upsert_articles([
+                Article(title="Dup", doi="10.5555/dup", platform="PubMed"),
+                Article(title="Novo", doi="10.5555/novo", platform="PubMed"),
+                Article(title="Novo", doi="10.5555/novo", platform="PubMed"),
+            ])
+            total = db.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    assert counts == {'inserted': 1, 'skipped': 2}
+    assert total == 3
+
+
+def test_bulk_upsert_counts_with_a_concurrent_writer():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "concurrent.db")
+        with DatabaseManager(path) as db:
+            other = sqlite3.connect(path, timeout=5)
+            fired = []
+
+            def other_writer(statement):
+                # outra conexão grava um artigo logo antes do primeiro INSERT do lote
+                if not fired and statement.lstrip().startswith("INSERT INTO articles"):
+                    fired.append(statement)
+                    other.execute("INSERT INTO articles (title, doi, platform) "
+                                  "VALUES ('Outro', '10.5555/outro', 'Scielo')")
+                    other.commit()
+
+            db.connection.set_trace_callback(other_writer)
+            try:
+                counts = db.bulk_upsert_articles(_harvest(3))
+            finally:
+                db.connection.set_trace_callback(None)
+                other.close()
+            clustered = db.connection.execute("""
+                SELECT COUNT(*) FROM articles a JOIN article_clusters c ON c.article_id = a.id
+                WHERE a.platform = 'PubMed'
+            """).fetchone()[0]
+            total = db.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    assert fired
+    assert counts == {'inserted': 3, 'skipped': 0}
+    assert total == 4
+    assert clustered == 3
+
+
+def test_create_article_returns_existing_id_on_duplicate():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "single.db")) as db:
+            art = Article(title="Único", doi="10.5555/unico", platform="PubMed")
+            first_id = db.create_article(art)
+            second_id = db.create_article(art)
+    assert first_id == second_id
+
+
+def test_affiliations_are_stored_once_and_validated_in_bulk():
+    from processing.validation import AffiliationMatcher, validate_stored_articles
+
+    hc = "Hospital das Clínicas, Universidade Federal de Pernambuco, Recife, Brazil."
+    other = "Department of Medicine, University of Somewhere."
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "affil.db")) as db:
+            articles = _harvest(6)
+            for i, art in enumerate(articles):
+                # afiliações repetidas entre autores e artigos
+                art.affiliations = [hc, other, hc] if i % 3 == 0 else [other]
+            counts = db.bulk_upsert_articles(articles + articles[:2])
+            texts = db.connection.execute("SELECT COUNT(*) FROM affiliation_texts").fetchone()[0]
+            ids = [row[0] for row in db.connection.execute("SELECT id FROM articles ORDER BY id")]
+            stored = db.read_article_affiliations(ids)
+
+            matcher = AffiliationMatcher(["Hospital das Clinicas - UFPE",
+                                          "Universidade Federal de Pernambuco"])
+            matches = validate_stored_articles(db, matcher, status="NOVO")
+            updated = db.update_articles_status(list(matches), "VALIDADO")
+            validated = db.connection.execute(
+                "SELECT id FROM articles WHERE status = 'VALIDADO' ORDER BY id").fetchall()
+
+            # excluir o artigo remove os vínculos, não os textos
+            db.connection.execute("DELETE FROM articles WHERE id = ?", (ids[0],))
+            links_left = db.connection.execute(
+                "SELECT COUNT(*) FROM article_affiliations WHERE article_id = ?", (ids[0],)
+            ).fetchone()[0]
+
+    assert counts == {'inserted': 6, 'skipped': 2}
+    assert texts == 2
+    assert stored[ids[0]] == [hc, other] and stored[ids[1]] == [other]
+    assert sorted(matches) == [ids[0], ids[3]]
+    assert {m.pattern for m in matches[ids[0]]} == {"Universidade Federal de Pernambuco"}
+    assert updated == 2 and [row[0] for row in validated] == [ids[0], ids[3]]
+    assert links_left == 0
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: inserção de artigos em lote")
+    print("=" * 60)
+    test_bulk_upsert_inserts_once_and_skips_duplicates()
+    test_bulk_upsert_without_unique_indexes_on_legacy_duplicates()
+    test_bulk_upsert_counts_with_a_concurrent_writer()
+    test_create_article_returns_existing_id_on_duplicate()
+    test_affiliations_are_stored_once_and_validated_in_bulk()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
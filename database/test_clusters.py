@@ -0,0 +1,125 @@
+"""
+Testes do agrupamento de duplicatas entre plataformas (tabela article_clusters).
+Usa um banco SQLite temporário; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_clusters
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from database.clusters import rebuild_article_clusters
+from database.db_manager import DatabaseManager
+from database.models import Article
+
+TITLE = "Sepse neonatal tardia em unidade de terapia intensiva: fatores de risco"
+
+
+def test_same_work_from_two_platforms_shares_a_cluster():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "clusters.db")) as db:
+            db.bulk_upsert_articles([
+                Article(title=TITLE, authors="Lima C, Rocha D", doi="10.1590/sepse.1",
+                        platform="PubMed", publication_date="2022"),
+                Article(title="Outro estudo sem relação com o primeiro artigo", authors="Lima C",
+                        doi="", url="https://pubmed.ncbi.nlm.nih.gov/2/", platform="PubMed"),
+            ])
+            db.bulk_upsert_articles([
+                # mesmo DOI em outro formato
+                Article(title=TITLE.upper(), authors="Lima, Carla", doi="https://doi.org/10.1590/SEPSE.1",
+                        platform="Scielo", publication_date="2022"),
+            ])
+            lilacs_id = db.create_article(
+                # sem DOI: casa pelo título, autor e ano
+                Article(title=TITLE + ".", authors="Carla Lima", doi="", url="https://lilacs/1",
+                        platform="Lilacs", publication_date="2023"))
+
+            groups = db.read_duplicate_clusters()
+            incoming = db.find_article_cluster({'titulo': TITLE, 'autores': "Lima C", 'publicacao': "2022 (Capes)"})
+            unrelated = db.find_article_cluster({'title': "Tema completamente diferente de todos os outros"})
+            members = db.read_article_cluster(groups[0]['cluster_id'])
+
+            db.connection.execute("DELETE FROM articles WHERE id = ?", (lilacs_id,))
+            bands_left = db.connection.execute(
+                "SELECT COUNT(*) FROM article_cluster_bands WHERE article_id = ?", (lilacs_id,)).fetchone()[0]
+
+    assert len(groups) == 1
+    assert groups[0]['duplicates'] == 3 and sorted(groups[0]['platforms']) == ["Lilacs", "PubMed", "Scielo"]
+    assert incoming == groups[0]['cluster_id'] == 1
+    assert unrelated is None
+    assert [m['publicacao'] for m in members] == ["2022 (PubMed)", "2022 (Scielo)", "2023 (Lilacs)"]
+    assert bands_left == 0
+
+
+def test_distinct_records_of_one_platform_get_their_own_clusters():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "parts.db")) as db:
+            db.bulk_upsert_articles([
+                Article(title=TITLE + f": parte {part}", authors="Lima C", doi="", platform="PubMed",
+                        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/", publication_date="2022")
+                for pmid, part in ((1, "I"), (2, "II"))
+            ])
+            clusters = [row[0] for row in db.connection.execute(
+                "SELECT cluster_id FROM article_clusters ORDER BY article_id")]
+            # o mesmo título em outra plataforma ainda entra no grupo
+            scielo = db.find_article_cluster({'title': TITLE + ": parte II", 'authors': "Lima C",
+                                              'publication_date': "2022", 'platform': "Scielo"})
+
+    assert clusters == [1, 2]
+    assert scielo in (1, 2)
+
+
+def test_rebuild_keeps_distinct_records_of_one_platform_apart():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "rebuild_parts.db")) as db:
+            db.bulk_upsert_articles([
+                Article(title=TITLE + f": parte {part}", authors="Lima C", doi="", platform="PubMed",
+                        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/", publication_date="2022")
+                for pmid, part in ((1, "I"), (2, "II"))
+            ])
+            # como na migração 5: o agrupamento é refeito a partir da tabela articles
+            rebuild_article_clusters(db.connection.cursor())
+            db.connection.commit()
+            clusters = [tuple(row) for row in db.connection.execute(
+                "SELECT article_id, cluster_id FROM article_clusters ORDER BY article_id")]
+            groups = db.read_duplicate_clusters()
+
+    assert clusters == [(1, 1), (2, 2)]
+    assert groups == []
+
+
+def test_rebuild_groups_existing_articles():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rebuild.db")
+        DatabaseManager(path).close()
+        conn = sqlite3.connect(path)
+        # artigos gravados por fora (como antes da migração 5)
+        conn.executemany("INSERT INTO articles (title, authors, doi, platform, url) VALUES (?, ?, ?, ?, ?)", [
+            (TITLE, "Lima C", "10.1590/sepse.1", "PubMed", ""),
+            (TITLE, "Lima C", "10.1590/SEPSE.1", "Scielo", ""),
+            ("Outro trabalho", "Rocha D", "", "Scielo", "https://scielo/2"),
+        ])
+        count = rebuild_article_clusters(conn.cursor())
+        conn.commit()
+        clusters = conn.execute("SELECT article_id, cluster_id FROM article_clusters ORDER BY article_id").fetchall()
+        conn.close()
+
+    assert count == 3
+    assert clusters == [(1, 1), (2, 1), (3, 3)]
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: grupos de artigos duplicados")
+    print("=" * 60)
+    test_same_work_from_two_platforms_shares_a_cluster()
+    test_distinct_records_of_one_platform_get_their_own_clusters()
+    test_rebuild_keeps_distinct_records_of_one_platform_apart()
+    test_rebuild_groups_existing_articles()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
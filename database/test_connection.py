@@ -0,0 +1,126 @@
+"""
+Testes da camada de conexões SQLite (database/connection.py).
+Usa bancos SQLite temporários; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_connection
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import config
+from database.connection import get_provider
+from database.db_manager import DatabaseManager
+from database.models import Article
+
+
+def _article(i):
+    return Article(title=f"Artigo {i}", doi=f"10.5555/wal.{i}", platform="PubMed",
+                   url=f"https://pubmed.ncbi.nlm.nih.gov/{50000000 + i}/")
+
+
+def _in_thread(func):
+    result = {}
+
+    def target():
+        try:
+            result['value'] = func()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join(10)
+    if 'error' in result:
+        raise result['error']
+    return result.get('value')
+
+
+def test_pragmas_are_applied():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "pragmas.db")) as db:
+            conn = db.connection
+            journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+            temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+            busy = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+
+    assert journal.upper() == config.SQLITE_JOURNAL_MODE.upper()
+    assert synchronous == 1           # NORMAL
+    assert cache_size == config.SQLITE_CACHE_SIZE
+    assert temp_store == 2            # MEMORY
+    assert busy == int(config.SQLITE_BUSY_TIMEOUT * 1000)
+
+
+def test_each_thread_gets_its_own_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "threads.db")
+        with DatabaseManager(path) as db, DatabaseManager(path) as other:
+            main_conn = db.connection
+            assert db.connection is main_conn is other.connection   # mesma thread: reaproveitada
+
+            # o gerenciador criado nesta thread funciona em outra, com outra conexão
+            worker_conn = _in_thread(lambda: db.connection)
+            inserted = _in_thread(lambda: db.bulk_upsert_articles([_article(i) for i in range(10)]))
+            assert worker_conn is not main_conn
+            assert inserted == {'inserted': 10, 'skipped': 0}
+            assert db.get_stats()['articles_total'] == 10
+
+            # fechar um dos gerenciadores não derruba as conexões do outro
+            db.close()
+            assert db.connection is None
+            assert other.get_stats()['articles_total'] == 10
+            provider = get_provider(path)
+        assert provider.stats()['open'] == 0
+
+
+def test_readers_do_not_block_writer():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "wal.db")) as db:
+            db.bulk_upsert_articles([_article(i) for i in range(5)])
+            reader_ready = threading.Event()
+            writer_done = threading.Event()
+            seen = {}
+
+            def reader():
+                conn = db.connection
+                conn.execute("BEGIN")
+                seen['before'] = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+                reader_ready.set()
+                writer_done.wait(10)
+                # a transação de leitura continua vendo o instantâneo inicial
+                seen['during'] = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+                conn.execute("COMMIT")
+                seen['after'] = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+            thread = threading.Thread(target=reader)
+            thread.start()
+            reader_ready.wait(10)
+            start = time.perf_counter()
+            result = db.bulk_upsert_articles([_article(i) for i in range(5, 505)])
+            elapsed = time.perf_counter() - start
+            writer_done.set()
+            thread.join(10)
+
+    print(f"\n   gravação com leitura aberta: {elapsed * 1000:.0f} ms")
+    assert result == {'inserted': 500, 'skipped': 0}
+    assert elapsed < 1.0  # no modo rollback journal esperaria o leitor (busy_timeout)
+    assert seen == {'before': 5, 'during': 5, 'after': 505}
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: conexões SQLite (WAL, por thread)")
+    print("=" * 60)
+    test_pragmas_are_applied()
+    test_each_thread_gets_its_own_connection()
+    test_readers_do_not_block_writer()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -103,6 +103,13 @@ def test_articles():
         new_articles = db.read_articles_by_status("NOVO")
         print(f"   Encontrados: {len(new_articles)} artigos novos")
 
+        print("\n3b. LENDO cabeçalhos e detalhes sob demanda...")
+        headers = db.read_article_headers_by_status("VALIDADO")
+        assert headers and 'resumo' not in headers[0]
+        details = db.read_article_details([id1, id1])
+        assert list(details) == [id1] and details[id1]['link'].startswith("https://pubmed")
+        print(f"   {len(headers)} cabeçalhos; detalhes do artigo {id1} carregados")
+
         # UPDATE
         print("\n4. ATUALIZANDO status de artigo...")
         db.update_article_status(id2, "VALIDADO")
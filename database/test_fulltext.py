@@ -0,0 +1,107 @@
+"""
+Testes da busca textual (FTS5) de artigos.
+Usa um banco SQLite temporário; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_fulltext
+"""
+
+import os
+import tempfile
+
+from database import schema
+from database.db_manager import DatabaseManager
+from database.fulltext import ArticleTextIndex, to_fts_query
+from database.models import Article
+from database.schema import SCHEMA_VERSION, get_schema_version, has_articles_fulltext
+
+
+def _articles():
+    return [
+        Article(title="Dengue em Recife", abstract="Perfil clínico de pacientes.",
+                authors="Marinho P", doi="10.5555/a", platform="PubMed", status="VALIDADO"),
+        Article(title="Polifarmácia em idosos", abstract="Casos de dengue grave em idosos.",
+                authors="Silva A", doi="10.5555/b", platform="Scielo", status="VALIDADO"),
+        Article(title="Cirurgia cardíaca", abstract="Resultados no Hospital das Clínicas.",
+                authors="Souza R", doi="10.5555/c", platform="PubMed", status="NOVO"),
+    ]
+
+
+def test_to_fts_query_quotes_words_and_prefixes_last():
+    assert to_fts_query('hosp "clinicas" OR') == '"hosp" "clinicas" "OR"*'
+    assert to_fts_query("  (  ) ") == ''
+
+
+def test_search_articles_fulltext_ranks_and_stays_in_sync():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "fts.db")) as db:
+            db.bulk_upsert_articles(_articles())
+
+            dengue = db.search_articles_fulltext("dengue")
+            # título pesa mais que resumo
+            assert [a['titulo'] for a in dengue] == ["Dengue em Recife", "Polifarmácia em idosos"]
+            assert "[dengue]" in dengue[1]['snippet'].lower()
+
+            # acentos ignorados e último termo como prefixo
+            assert [a['titulo'] for a in db.search_articles_fulltext("clinicas hosp")] == ["Cirurgia cardíaca"]
+            assert len(db.search_articles_fulltext("dengue", status="VALIDADO", limit=1)) == 1
+            assert db.search_articles_fulltext("dengue", limit=1, offset=1)[0]['titulo'] == "Polifarmácia em idosos"
+
+            # gatilhos: UPDATE e DELETE refletem no índice
+            target = dengue[0]['id']
+            db.connection.execute("UPDATE articles SET title = 'Zika em Recife' WHERE id = ?", (target,))
+            db.connection.commit()
+            assert [a['id'] for a in db.search_articles_fulltext("zika")] == [target]
+            db.connection.execute("DELETE FROM articles WHERE id = ?", (target,))
+            db.connection.commit()
+            assert db.search_articles_fulltext("zika") == []
+            assert db.search_articles_fulltext('"') == []
+
+
+def test_sqlite_without_fts5_still_migrates_and_searches_with_like():
+    available = schema.fts5_available
+    schema.fts5_available = lambda connection: False  # simula um SQLite compilado sem FTS5
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            with DatabaseManager(os.path.join(tmp, "no_fts.db")) as db:
+                version = get_schema_version(db.connection)
+                fulltext = has_articles_fulltext(db.connection)
+                db.bulk_upsert_articles(_articles())
+                found = {a['titulo'] for a in db.search_articles_fulltext("dengue")}
+                total = db.get_stats()['articles_total']
+    finally:
+        schema.fts5_available = available
+    # as migrações depois da 3 foram aplicadas
+    assert version == SCHEMA_VERSION
+    assert not fulltext
+    assert found == {"Dengue em Recife", "Polifarmácia em idosos"}
+    assert total == 3
+
+
+def test_article_text_index_filters_in_memory():
+    articles = [
+        {'titulo': "Dengue em Recife", 'resumo': "", 'autores': "Marinho P"},
+        {'titulo': "Outro tema", 'resumo': "Menção a dengue.", 'autores': ""},
+        {'titulo': "Sem relação", 'resumo': "", 'autores': ""},
+    ]
+    index = ArticleTextIndex(articles)
+    try:
+        assert [pos for pos, _ in index.search("deng")] == [0, 1]
+        assert [pos for pos, _ in index.search("marinho")] == [0]
+    finally:
+        index.close()
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: busca textual (FTS5)")
+    print("=" * 60)
+    test_to_fts_query_quotes_words_and_prefixes_last()
+    test_search_articles_fulltext_ranks_and_stays_in_sync()
+    test_sqlite_without_fts5_still_migrates_and_searches_with_like()
+    test_article_text_index_filters_in_memory()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Testes da paginação por chave (database/pagination.py).
+Usa bancos SQLite temporários; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_pagination
+"""
+
+import os
+import tempfile
+
+from database.db_manager import DatabaseManager
+from database.queries import SearchQueries
+
+
+def _fill(db, searches=250, errors=130, articles=310):
+    # datas repetidas de propósito: o desempate é pelo id
+    db.connection.executemany(
+        "INSERT INTO search_history (search_term, platforms, results_count, search_date) VALUES (?, ?, ?, ?)",
+        [(f"termo {i}", "PubMed", i, f"2024-01-{1 + i % 20:02d}T10:00:00") for i in range(searches)])
+    db.connection.executemany(
+        "INSERT INTO error_logs (error_type, platform, error_reason, created_at) VALUES (?, ?, ?, ?)",
+        [("Erro de Coleta", "Scielo", f"falha {i}", f"2024-02-{1 + i % 7:02d}T08:00:00") for i in range(errors)])
+    db.connection.executemany(
+        "INSERT INTO articles (title, doi, platform, status, created_at) VALUES (?, ?, ?, ?, ?)",
+        [(f"artigo {i}", f"10.5555/pag.{i}", "PubMed", "VALIDADO" if i % 3 else "NOVO",
+          f"2024-03-{1 + i % 11:02d}T09:00:00") for i in range(articles)])
+    db.connection.commit()
+
+
+def _walk(read, page_size, on_page=None):
+    ids, pages, cursor = [], 0, None
+    while True:
+        page = read(page_size=page_size, cursor=cursor)
+        ids.extend(item.id if hasattr(item, 'id') else item['id'] for item in page.items)
+        pages += 1
+        if on_page:
+            on_page(pages)
+        if not page.has_more:
+            return ids, pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_row_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "pages.db")) as db:
+            _fill(db)
+            history, history_pages = _walk(db.read_search_history_page, 40)
+            errors, error_pages = _walk(db.read_error_logs_page, 13)
+            validated, _ = _walk(lambda **kw: db.read_article_headers_page('VALIDADO', **kw), 50)
+            expected_history = [row[0] for row in db.connection.execute(
+                "SELECT id FROM search_history ORDER BY search_date DESC, id DESC")]
+            expected_validated = [row[0] for row in db.connection.execute(
+                "SELECT id FROM articles WHERE status = 'VALIDADO' ORDER BY created_at DESC, id DESC")]
+            first = db.read_search_history_page(page_size=5)
+
+    assert history == expected_history
+    assert history_pages == 7          # 250 linhas em páginas de 40
+    assert sorted(errors) == list(range(1, 131)) and error_pages == 10
+    assert validated == expected_validated
+    assert len(first.items) == 5 and first.has_more
+    assert first.items[0].search_date is not None
+
+
+def test_rows_written_while_paging_are_not_repeated():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "live.db")) as db:
+            _fill(db, searches=100)
+
+            def write_newer(page):
+                # uma busca nova chega entre as páginas (vai para o topo da lista)
+                db.connection.execute(
+                    "INSERT INTO search_history (search_term, platforms, search_date) VALUES (?, ?, ?)",
+                    (f"nova {page}", "PubMed", "2025-01-01T00:00:00"))
+                db.connection.commit()
+
+            ids, _ = _walk(db.read_search_history_page, 30, on_page=write_newer)
+
+    assert len(ids) == len(set(ids)) == 100
+
+
+def test_invalid_cursor_and_page_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "cursor.db")) as db:
+            for cursor in ("não-é-base64", "WzFd", ""):
+                try:
+                    db.read_error_logs_page(cursor=cursor)
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError(f"cursor aceito: {cursor!r}")
+            try:
+                db.read_error_logs_page(page_size=0)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("page_size=0 aceito")
+
+
+def test_page_queries_use_indexes_without_sorting():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "plans.db")) as db:
+            plans = {}
+            for name in ("SEARCH_HISTORY_PAGE", "SEARCH_HISTORY_PAGE_AFTER", "ERROR_LOGS_PAGE",
+                         "ERROR_LOGS_PAGE_AFTER", "ARTICLE_HEADERS_PAGE", "ARTICLE_HEADERS_PAGE_AFTER"):
+                sql = getattr(SearchQueries, name)
+                params = ("x",) * sql.count("?")
+                plans[name] = " | ".join(row[-1] for row in db.connection.execute(
+                    "EXPLAIN QUERY PLAN " + sql, params))
+
+    for name, plan in plans.items():
+        print(f"\n   {name}: {plan}")
+        assert "USING INDEX" in plan, name
+        assert "TEMP B-TREE" not in plan, name
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: paginação por chave")
+    print("=" * 60)
+    test_pages_cover_every_row_once()
+    test_rows_written_while_paging_are_not_repeated()
+    test_invalid_cursor_and_page_size()
+    test_page_queries_use_indexes_without_sorting()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Teste de regressão dos planos de consulta (EXPLAIN QUERY PLAN).
+
+Garante que cada consulta de `SearchQueries` (inclusive as que o
+`DatabaseManager` executa) e os filtros do `QueryBuilder` chegam às linhas
+por índice: cada tabela do plano é lida com SEARCH (índice ou chave
+primária) ou, só em consultas com LIMIT cuja ordem vem do próprio índice,
+com SCAN … USING INDEX. As exceções ficam em `FULL_WALKS`, com o motivo.
+Usa um banco SQLite temporário.
+
+Uso:
+    python -m database.test_query_plans
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from database.db_manager import DatabaseManager
+from database.queries import SearchQueries, QueryBuilder
+from database.schema import SCHEMA_VERSION, apply_migrations, create_base_tables, get_schema_version
+
+_LIKE = "LIKE '%…%' não pode usar índice B-tree"
+_AGGREGATE = "agregação sobre a tabela inteira (relatórios; o painel lê a tabela `stats`)"
+
+# Consultas que percorrem a tabela inteira de propósito, com o motivo
+FULL_WALKS = {
+    'SearchQueries.AFFILIATION_SEARCH_BY_TEXT': _LIKE,
+    'SearchQueries.ARTICLES_SEARCH_BY_TITLE': _LIKE + "; a busca da UI usa ARTICLES_FULLTEXT (FTS5)",
+    'SearchQueries.SEARCH_HISTORY_BY_TERM': _LIKE,
+    'SearchQueries.ERROR_LOGS_BY_SEARCH_TERM': _LIKE,
+    'SearchQueries.AFFILIATION_ALL': "lista todas as variações (tela de configuração)",
+    'SearchQueries.AFFILIATION_COUNT_BY_INSTITUTION': _AGGREGATE,
+    'SearchQueries.ARTICLES_BY_DATE_AND_STATUS': _AGGREGATE,
+    'SearchQueries.ARTICLES_COUNT_BY_STATUS': _AGGREGATE,
+    'SearchQueries.ARTICLES_DUPLICATES': _AGGREGATE,
+    'SearchQueries.ERROR_LOGS_BY_TYPE': _AGGREGATE,
+    'SearchQueries.MOST_USED_SEARCH_TERMS': _AGGREGATE + "; o LIMIT vem depois do GROUP BY",
+    'SearchQueries.SEARCH_STATS_BY_PLATFORM': _AGGREGATE,
+    'SearchQueries.TOTAL_ARTICLES_BY_PLATFORM': _AGGREGATE,
+    'SearchQueries.VALIDATION_RATE': _AGGREGATE,
+}
+
+
+def _statements():
+    """(nome, sql, parâmetros) de todas as consultas verificadas."""
+    for name in dir(SearchQueries):
+        if name.isupper():
+            sql = getattr(SearchQueries, name)
+            if "{marks}" in sql:
+                sql = sql.format(marks="?,?,?")
+            yield f"SearchQueries.{name}", sql, ("x",) * sql.count("?")
+    yield ("QueryBuilder.build_articles_filter",
+           *QueryBuilder.build_articles_filter(platform="PubMed", status="VALIDADO", date_start="2024-01-01"))
+    yield ("QueryBuilder.build_articles_filter (status)",
+           *QueryBuilder.build_articles_filter(status="NOVO"))
+    yield ("QueryBuilder.build_error_logs_filter",
+           *QueryBuilder.build_error_logs_filter(error_type="Erro de Conexão", date_start="2024-01-01"))
+
+
+def _full_scans(connection, sql, params):
+    """Passos do plano que percorrem uma tabela (ou um índice inteiro) em vez de buscar nele.
+
+    Aceitos: SEARCH com índice ou chave primária; a FTS5 com MATCH; e
+    SCAN … USING (COVERING) INDEX só se a consulta tem LIMIT e a ordem vem
+    do índice (sem TEMP B-TREE), porque aí a leitura para no LIMIT.
+    """
+    plan = connection.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    details = [row[3] for row in plan]
+    limited = "LIMIT" in sql.upper() and not any("TEMP B-TREE" in d for d in details)
+    scans = []
+    for d in details:
+        if d.startswith("SEARCH ") and " USING " in d:
+            continue
+        if not d.startswith("SCAN ") or d == "SCAN CONSTANT ROW":
+            continue
+        if " VIRTUAL TABLE INDEX " in d and ":M" in d:
+            continue  # MATCH na FTS5: o índice invertido
+        if limited and (" USING INDEX " in d or " USING COVERING INDEX " in d):
+            continue
+        scans.append(d)
+    return scans, details
+
+
+def test_every_query_uses_an_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "plans.db")) as db:
+            assert get_schema_version(db.connection) == SCHEMA_VERSION
+            failures, walks = [], set()
+            checked = 0
+            for name, sql, params in _statements():
+                scans, details = _full_scans(db.connection, sql, params)
+                checked += 1
+                if scans and name in FULL_WALKS:
+                    walks.add(name)
+                elif scans:
+                    failures.append(f"{name}: {details}")
+
+    print(f"\n   {checked} consultas verificadas ({len(walks)} varreduras justificadas)")
+    assert not failures, "Consultas sem índice:\n" + "\n".join(failures)
+    # uma exceção que passou a usar índice (ou foi removida) sai da lista
+    assert walks == set(FULL_WALKS), sorted(set(FULL_WALKS) - walks)
+
+
+def test_title_index_is_dropped_from_old_databases():
+    with tempfile.TemporaryDirectory() as tmp:
+        connection = sqlite3.connect(os.path.join(tmp, "v6.db"))
+        create_base_tables(connection)
+        # banco na versão 6, ainda com o índice criado pela migração 1 antiga
+        connection.execute("CREATE INDEX idx_articles_title ON articles(title)")
+        connection.execute("PRAGMA user_version = 6")
+        connection.commit()
+        version = apply_migrations(connection)
+        indexes = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'articles'")}
+        connection.close()
+    assert version == SCHEMA_VERSION
+    assert "idx_articles_title" not in indexes
+
+
+def test_migrations_are_applied_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "versions.db")
+        DatabaseManager(path).close()
+        with DatabaseManager(path) as db:
+            version = get_schema_version(db.connection)
+            keys_enabled = db._article_keys_enabled
+    assert version == SCHEMA_VERSION
+    assert keys_enabled
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: planos de consulta (EXPLAIN QUERY PLAN)")
+    print("=" * 60)
+    test_every_query_uses_an_index()
+    test_title_index_is_dropped_from_old_databases()
+    test_migrations_are_applied_once()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
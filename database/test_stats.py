@@ -0,0 +1,116 @@
+"""
+Testes da tabela agregada de estatísticas (`stats`, migração 6).
+Usa bancos SQLite temporários; o banco do projeto não é alterado.
+
+Uso:
+    python -m database.test_stats
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from database.db_manager import DatabaseManager
+from database.models import Article, ErrorLog, SearchHistory
+from database.schema import rebuild_stats
+
+
+_WORDS = ("sepse", "neonatal", "cardiopatia", "infecção", "hospitalar", "coorte", "ensaio", "clínico",
+          "pediatria", "oncologia", "renal", "hepática", "vacina", "dengue", "zika", "diabetes",
+          "obesidade", "gestação", "prematuro", "cirurgia", "trauma", "idosos", "mortalidade", "risco")
+
+
+def _articles(count, platform, date="2023-05-20", offset=0):
+    # títulos variados: títulos quase iguais cairiam todos no mesmo grupo de duplicatas
+    rng = random.Random(f"{platform}{offset}")
+    return [Article(title=" ".join(rng.sample(_WORDS, 8)) + f" {platform} {offset + i}",
+                    doi=f"10.5555/{platform}.{offset + i}", platform=platform, publication_date=date)
+            for i in range(count)]
+
+
+def _recount(connection):
+    """Contagens por varredura completa, para comparar com a tabela agregada."""
+    def grouped(expr):
+        return {k: n for k, n in connection.execute(
+            f"SELECT {expr}, COUNT(*) FROM articles GROUP BY 1")}
+    return {
+        'articles_total': connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+        'searches': connection.execute("SELECT COUNT(*) FROM search_history").fetchone()[0],
+        'errors': connection.execute("SELECT COUNT(*) FROM error_logs").fetchone()[0],
+        'articles_by_platform': grouped("platform"),
+        'articles_by_status': grouped("status"),
+    }
+
+
+def test_triggers_keep_counts_exact():
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "stats.db")) as db:
+            db.bulk_upsert_articles(_articles(30, "PubMed") + _articles(12, "Scielo", "20/05/2022"))
+            db.bulk_upsert_articles(_articles(5, "Lilacs", ""))
+            ids = [row[0] for row in db.connection.execute("SELECT id FROM articles ORDER BY id")]
+            db.update_article_status(ids[0], "VALIDADO")
+            db.update_article_status(ids[1], "VALIDADO")
+            db.update_article_status(ids[1], "REJEITADO")
+            db.connection.execute("UPDATE articles SET platform = 'Lilacs' WHERE id = ?", (ids[2],))
+            db.connection.execute("DELETE FROM articles WHERE id = ?", (ids[3],))
+            db.connection.commit()
+            db.create_search_history(SearchHistory(search_term="HC UFPE", platforms="PubMed"))
+            db.create_error_log(ErrorLog(error_type="Erro de Coleta", platform="Scielo",
+                                         error_reason="timeout", error_date=datetime.now()))
+
+            stats = db.get_stats()
+            expected = _recount(db.connection)
+            single = db.get_stat('platform', 'Scielo')
+
+    for key, value in expected.items():
+        assert stats[key] == value, key
+    assert stats['articles_total'] == 46
+    assert stats['articles_validated'] == 1
+    assert stats['articles_by_status'] == {'NOVO': 44, 'VALIDADO': 1, 'REJEITADO': 1}
+    assert stats['articles_by_year'] == {'2023': 29, '2022': 12, '': 5}
+    assert single == 12
+
+
+def test_rebuild_matches_triggers_and_reads_do_not_grow():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rollup.db")
+        with DatabaseManager(path) as db:
+            db.bulk_upsert_articles(_articles(200, "PubMed"))
+            start = time.perf_counter()
+            for _ in range(100):
+                db.get_stats()
+            small = (time.perf_counter() - start) / 100
+
+            db.bulk_upsert_articles(_articles(3000, "Scielo", "2021"))
+            start = time.perf_counter()
+            for _ in range(100):
+                stats = db.get_stats()
+            large = (time.perf_counter() - start) / 100
+
+        conn = sqlite3.connect(path)
+        maintained = sorted(conn.execute("SELECT scope, key, count FROM stats WHERE count <> 0"))
+        rebuild_stats(conn.cursor())
+        rebuilt = sorted(conn.execute("SELECT scope, key, count FROM stats WHERE count <> 0"))
+        conn.close()
+
+    print(f"\n   get_stats: {small * 1e6:.0f} µs com 200 artigos; {large * 1e6:.0f} µs com 3200")
+    assert stats['articles_total'] == 3200
+    assert stats['articles_by_platform'] == {'PubMed': 200, 'Scielo': 3000}
+    assert maintained == rebuilt
+    assert large < max(small * 3, 0.001)
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: estatísticas agregadas (tabela stats)")
+    print("=" * 60)
+    test_triggers_keep_counts_exact()
+    test_rebuild_matches_triggers_and_reads_do_not_grow()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
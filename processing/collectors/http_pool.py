@@ -0,0 +1,266 @@
+"""
+Pool de conexões HTTP persistentes (keep-alive) compartilhado pelos coletores.
+
+Cada requisição feita por `urllib.request.urlopen` abre uma conexão TCP/TLS
+nova. Este módulo mantém, por host, conexões `http.client` ociosas que são
+reaproveitadas entre requisições, evitando um handshake TLS a cada esearch/
+efetch. Também anuncia `Accept-Encoding: gzip` e descompacta a resposta de
+forma transparente.
+
+Uso:
+    pool = get_default_pool()
+    with pool.request("GET", url, params={...}) as resp:
+        data = resp.read()
+    print(pool.stats())
+"""
+
+import gzip
+import http.client
+import threading
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+DEFAULT_USER_AGENT = "NEXUS-Pesquisa/1.0 (Python)"
+MAX_REDIRECTS = 5
+
+# Erros que indicam que o servidor fechou uma conexão keep-alive ociosa
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+    ConnectionAbortedError,
+)
+
+# Métodos idempotentes: podem ser repetidos numa conexão nova sem efeito duplicado
+_RETRY_METHODS = ("GET", "HEAD")
+
+
+class HTTPStatusError(Exception):
+    """Resposta HTTP com status de erro (>= 400)."""
+
+    def __init__(self, status: int, url: str, reason: str = ""):
+        super().__init__(f"HTTP {status} {reason} em {url}")
+        self.status = status
+        self.url = url
+        self.reason = reason
+
+
+class PooledResponse:
+    """
+    Resposta file-like (read/close/context manager) ligada a uma conexão do pool.
+
+    Quando o corpo é lido até o fim a conexão volta ao pool; se a resposta for
+    fechada antes disso, a conexão é descartada (não dá para reaproveitá-la).
+    """
+
+    def __init__(self, pool: "ConnectionPool", key: Tuple[str, str, int],
+                 conn: http.client.HTTPConnection, raw: http.client.HTTPResponse):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.status = raw.status
+        self.headers = raw.headers
+        if (raw.getheader("Content-Encoding") or "").lower() == "gzip":
+            self._body = gzip.GzipFile(fileobj=raw, mode="rb")
+        else:
+            self._body = raw
+
+    def read(self, size: int = -1) -> bytes:
+        # HTTPResponse.read(-1) tentaria ler até o fim do socket (keep-alive)
+        if size is None or size < 0:
+            return self._body.read()
+        return self._body.read(size)
+
+    def close(self):
+        if self._conn is None:
+            return
+        reusable = self._raw.isclosed() and not self._raw.will_close
+        if not reusable:
+            self._raw.close()
+        self._pool._release(self._key, self._conn, reusable)
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Pool de conexões keep-alive por (esquema, host, porta), thread-safe."""
+
+    def __init__(self, max_idle_per_host: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.max_idle_per_host = max_idle_per_host or config.HTTP_POOL_MAX_IDLE_PER_HOST
+        self.connect_timeout = connect_timeout or config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or config.HTTP_READ_TIMEOUT
+        self.user_agent = user_agent
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'stale_retries': 0,
+        }
+
+    # ---------------------------------------------------------------
+    # Conexões
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def _key_for(parts: urllib.parse.SplitResult) -> Tuple[str, str, int]:
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        return scheme, parts.hostname, port
+
+    def _new_connection(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(host, port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self._stats['connections_created'] += 1
+        return conn
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._stats['connections_reused'] += 1
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection, reusable: bool):
+        if reusable:
+            if conn.sock is not None:
+                conn.sock.settimeout(self.read_timeout)
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    # ---------------------------------------------------------------
+    # Requisições
+    # ---------------------------------------------------------------
+
+    def request(self, method: str, url: str, params: Optional[dict] = None,
+                headers: Optional[dict] = None, body: Optional[bytes] = None,
+                timeout: Optional[float] = None) -> PooledResponse:
+        """Executa a requisição e devolve a resposta (corpo ainda não lido).
+
+        Segue redirecionamentos e levanta `HTTPStatusError` para status >= 400.
+        """
+        if params:
+            url = url + ("&" if "?" in url else "?") + urllib.parse.urlencode(params)
+
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._send(method, url, headers, body, timeout)
+            if resp.status in (301, 302, 303, 307, 308) and resp.headers.get("Location"):
+                location = urllib.parse.urljoin(url, resp.headers["Location"])
+                resp.read()
+                resp.close()
+                url = location
+                if resp.status == 303:
+                    method, body = "GET", None
+                continue
+            if resp.status >= 400:
+                reason = resp._raw.reason
+                resp.read()
+                resp.close()
+                raise HTTPStatusError(resp.status, url, reason)
+            return resp
+        raise HTTPStatusError(310, url, "Redirecionamentos em excesso")
+
+    def _send(self, method, url, headers, body, timeout) -> PooledResponse:
+        parts = urllib.parse.urlsplit(url)
+        key = self._key_for(parts)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        all_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        all_headers.update(headers or {})
+
+        with self._lock:
+            self._stats['requests'] += 1
+
+        conn, reused = self._acquire(key)
+        try:
+            return self._exchange(key, conn, method, path, body, all_headers, timeout)
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            # só repete o que não tem efeito colateral: um POST pode ter chegado ao servidor
+            if not reused or method.upper() not in _RETRY_METHODS:
+                raise
+        except Exception:
+            conn.close()
+            raise
+        # conexão ociosa fechada pelo servidor: tenta uma vez com conexão nova
+        with self._lock:
+            self._stats['stale_retries'] += 1
+        conn = self._new_connection(key)
+        try:
+            return self._exchange(key, conn, method, path, body, all_headers, timeout)
+        except Exception:
+            conn.close()
+            raise
+
+    def _exchange(self, key, conn, method, path, body, headers, timeout) -> PooledResponse:
+        if timeout is not None:
+            conn.sock.settimeout(timeout)
+        conn.request(method, path, body=body, headers=headers)
+        return PooledResponse(self, key, conn, conn.getresponse())
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            timeout: Optional[float] = None) -> bytes:
+        """Atalho: GET que retorna o corpo completo (já descompactado)."""
+        with self.request("GET", url, params=params, headers=headers, timeout=timeout) as resp:
+            return resp.read()
+
+    # ---------------------------------------------------------------
+    # Métricas e encerramento
+    # ---------------------------------------------------------------
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso; `connections_reused` = handshakes TCP/TLS evitados."""
+        with self._lock:
+            data = dict(self._stats)
+            data['idle_connections'] = sum(len(v) for v in self._idle.values())
+        total = data['connections_created'] + data['connections_reused']
+        data['reuse_ratio'] = data['connections_reused'] / total if total else 0.0
+        return data
+
+    def close(self):
+        """Fecha todas as conexões ociosas."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_default_pool: Optional[ConnectionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> ConnectionPool:
+    """Retorna o pool compartilhado pelos coletores (criado sob demanda)."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
@@ -0,0 +1,51 @@
+"""
+Coletores de outras bases: LILACS (portal da BVS).
+
+O portal de pesquisa da BVS (pesquisa.bvsalud.org) usa a mesma busca iAHx
+do SciELO Search, com saída XML no mesmo formato; o coletor LILACS
+reaproveita as janelas anuais, a paginação simultânea e o parsing
+incremental de `scielo.py`, acrescentando o filtro da base (db=LILACS) e o
+campo de afiliação do índice da BVS.
+
+Capes Periódicos não tem API pública de busca; a plataforma fica fora do
+registro (processing/collectors/registry.py) até existir um coletor.
+"""
+from typing import Dict, Iterator, List
+
+import config
+from processing.collectors import scielo
+from processing.collectors.plugin import (
+    CAP_ABSTRACT, CAP_AFFILIATION, CAP_AFFILIATIONS, CAP_DATE_RANGE, CollectorPlugin,
+    SearchRequest, stream_batches,
+)
+from processing.collectors.progress import NO_HOOKS, SearchHooks
+
+LILACS_SEARCH_BASE = "https://pesquisa.bvsalud.org/portal"
+
+# Campo de afiliação no índice da BVS
+LILACS_AFFILIATION_FIELD = "af"
+
+
+class LilacsCollector(CollectorPlugin):
+    """Plataforma 'Lilacs' do registro de coletores."""
+
+    name = 'Lilacs'
+    capabilities = frozenset({CAP_AFFILIATION, CAP_DATE_RANGE, CAP_ABSTRACT, CAP_AFFILIATIONS})
+
+    def __init__(self):
+        super().__init__()
+        self.rate_limit = config.LILACS_RATE
+        self.site = scielo.SearchSite(
+            'Lilacs', base_url=lambda: LILACS_SEARCH_BASE, limiter=self.limiter,
+            affiliation_field=LILACS_AFFILIATION_FIELD, params=(('filter[db][]', 'LILACS'),))
+
+    def fetch(self, request: SearchRequest, hooks: SearchHooks = NO_HOOKS) -> Iterator[List[Dict]]:
+        query = scielo._build_query(request.terms, self.site.affiliation_field)
+        if not query:
+            return iter(())
+        windows = scielo.date_windows(request.date_start, request.date_end)
+        return stream_batches(
+            lambda inner: scielo._harvest_windows(query, windows, request.max_results,
+                                                  scielo.SCIELO_PAGE_SIZE, config.LILACS_MAX_WORKERS,
+                                                  inner, site=self.site),
+            hooks)
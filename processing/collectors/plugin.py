@@ -0,0 +1,185 @@
+"""
+Contrato dos coletores (plugins) de plataformas de busca.
+
+Um coletor declara o nome exibido na interface, o limite de requisições por
+segundo e as capacidades, e implementa `fetch`: um gerador que entrega os
+artigos em lotes à medida que chegam (os mesmos dicionários do coletor
+PubMed). O restante vem da classe base:
+
+ - `collect(terms, date_start, date_end, max_results, hooks)`: o contrato do
+   orquestrador (core/orchestrator.py) — consome `fetch`, entrega os lotes
+   parciais pelos ganchos, para no cancelamento e conta as métricas;
+ - `search(request)`: a mesma busca como corrotina (asyncio), executada numa
+   thread do loop para não bloqueá-lo;
+ - `open(url, params)`: GET pelo cache em disco, pelo limitador de taxa do
+   coletor e pelo pool keep-alive compartilhado;
+ - `stats()`: buscas, lotes, registros, erros e tempo acumulado.
+
+Coletores escritos sobre funções com ganchos (como `pubmed.search_by_affiliation`)
+usam `stream_batches` para virar gerador.
+
+Uso:
+    class MinhaBase(CollectorPlugin):
+        name = 'Minha Base'
+        rate_limit = 2.0
+        capabilities = frozenset({CAP_AFFILIATION, CAP_DATE_RANGE})
+
+        def fetch(self, request, hooks):
+            for pagina in ...:
+                with self.open(URL, {...}) as resp:
+                    yield converter(resp)
+
+    registry.register('Minha Base', 'pacote.modulo:MinhaBase')
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Union
+
+from processing.collectors.http_pool import get_default_pool
+from processing.collectors.progress import NO_HOOKS, SearchHooks
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.response_cache import get_default_cache
+
+# Capacidades declaradas pelos coletores
+CAP_AFFILIATION = 'affiliation'      # a busca é feita no campo de afiliação
+CAP_DATE_RANGE = 'date_range'        # filtra pelo período informado
+CAP_ABSTRACT = 'abstract'            # registros trazem o resumo
+CAP_AFFILIATIONS = 'affiliations'    # registros trazem as afiliações dos autores
+CAP_INCREMENTAL = 'incremental'      # coleta incremental (só o que é novo)
+
+
+@dataclass(frozen=True)
+class SearchRequest:
+    """Parâmetros de uma busca, iguais para todas as plataformas."""
+    terms: Union[List[str], str]
+    date_start: Optional[str] = None   # 'dd/MM/yyyy'
+    date_end: Optional[str] = None
+    max_results: Optional[int] = None
+
+
+class CollectorPlugin:
+    """Base dos coletores; subclasses definem os atributos e `fetch`."""
+
+    name: str = ''
+    rate_limit: Optional[float] = None   # requisições por segundo (None: sem limite)
+    capabilities: FrozenSet[str] = frozenset()
+
+    def __init__(self):
+        self._limiter: Optional[TokenBucket] = None
+        self._lock = threading.Lock()
+        self._stats = {'searches': 0, 'batches': 0, 'records': 0, 'errors': 0, 'seconds': 0.0}
+
+    def supports(self, capability: str) -> bool:
+        return capability in self.capabilities
+
+    # --- Contrato ----------------------------------------------------------
+
+    def fetch(self, request: SearchRequest, hooks: SearchHooks = NO_HOOKS) -> Iterator[List[Dict]]:
+        """Gerador de lotes de artigos. `hooks` serve ao progresso e ao cancelamento."""
+        raise NotImplementedError
+
+    def collect(self, terms, date_start=None, date_end=None, max_results=None,
+                hooks: Optional[SearchHooks] = None) -> List[Dict]:
+        """Executa a busca inteira, entregando cada lote por `hooks.emit`."""
+        hooks = hooks or NO_HOOKS
+        request = SearchRequest(terms, date_start, date_end, max_results)
+        results: List[Dict] = []
+        started = time.perf_counter()
+        try:
+            for batch in self.fetch(request, hooks):
+                if not batch:
+                    continue
+                results.extend(batch)
+                self._count(batches=1, records=len(batch))
+                hooks.emit(batch)
+                if hooks.cancelled:
+                    break
+        except Exception:
+            self._count(errors=1)
+            raise
+        finally:
+            self._count(searches=1, seconds=time.perf_counter() - started)
+        return results
+
+    async def search(self, request: SearchRequest, hooks: Optional[SearchHooks] = None) -> List[Dict]:
+        """Corrotina: a busca roda no executor padrão do loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.collect(request.terms, request.date_start, request.date_end,
+                                       request.max_results, hooks))
+
+    # --- Infraestrutura compartilhada -------------------------------------
+
+    def limiter(self) -> Optional[TokenBucket]:
+        """Limitador do coletor, criado a partir de `rate_limit` (None sem limite)."""
+        if self.rate_limit is None:
+            return None
+        with self._lock:
+            if self._limiter is None:
+                self._limiter = TokenBucket(self.rate_limit)
+            return self._limiter
+
+    def open(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None):
+        """GET com cache em disco, limitador de taxa e pool keep-alive."""
+        def network():
+            limiter = self.limiter()
+            if limiter is not None:
+                limiter.acquire()
+            return get_default_pool().request("GET", url, params=params, timeout=timeout)
+
+        cache = get_default_cache()
+        if cache is None:
+            return network()
+        return cache.open(url, params, fetch=network)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, platform=self.name)
+
+
+# ==================== GANCHOS -> GERADOR ====================
+
+def stream_batches(run: Callable[[SearchHooks], List[Dict]],
+                   hooks: SearchHooks = NO_HOOKS) -> Iterator[List[Dict]]:
+    """Transforma uma busca com ganchos (`run(hooks) -> artigos`) num gerador de lotes.
+
+    `run` executa numa thread própria; cada lote entregue por `on_batch` sai
+    do gerador assim que chega, e ao final saem os artigos do resultado que
+    não vieram em lotes. Progresso e cancelamento passam direto para `hooks`.
+    """
+    events: "queue.Queue" = queue.Queue()
+    delivered: Dict[int, Dict] = {}  # id -> registro (a referência mantém o id válido)
+
+    def on_batch(batch):
+        events.put(('batch', list(batch)))
+
+    inner = SearchHooks(progress=hooks.progress, on_batch=on_batch, cancel_event=hooks.cancel_event)
+
+    def target():
+        try:
+            events.put(('done', run(inner)))
+        except BaseException as e:
+            events.put(('error', e))
+
+    threading.Thread(target=target, name="collector-stream", daemon=True).start()
+    while True:
+        kind, payload = events.get()
+        if kind == 'batch':
+            delivered.update((id(r), r) for r in payload)
+            yield payload
+        elif kind == 'error':
+            raise payload
+        else:
+            rest = [r for r in payload or [] if id(r) not in delivered]
+            if rest:
+                yield rest
+            return
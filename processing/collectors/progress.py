@@ -0,0 +1,55 @@
+"""
+Ganchos de progresso, resultados parciais e cancelamento para os coletores.
+
+Os coletores rodam fora da thread da interface (ver Interface/search_worker.py)
+e usam estes ganchos para informar o andamento sem depender do Qt:
+
+    hooks = SearchHooks(progress=lambda stage, done, total: ...,
+                        on_batch=lambda artigos: ...,
+                        cancel_event=threading.Event())
+    search_by_affiliation(terms, ..., hooks=hooks)
+
+Etapas informadas em `progress(stage, done, total)`:
+ - STAGE_IDS: IDs encontrados pelo esearch (done == total);
+ - STAGE_BATCHES: lotes/páginas efetch concluídos;
+ - STAGE_ARTICLES: artigos convertidos até agora.
+
+Quando `cancel_event` é acionado, o coletor para entre lotes e devolve o que
+já tinha coletado.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+STAGE_IDS = 'ids'
+STAGE_BATCHES = 'batches'
+STAGE_ARTICLES = 'articles'
+
+ProgressCallback = Callable[[str, int, int], None]
+BatchCallback = Callable[[List[Dict]], None]
+
+
+@dataclass
+class SearchHooks:
+    """Callbacks opcionais de uma busca; chamados na thread do coletor."""
+    progress: Optional[ProgressCallback] = None
+    on_batch: Optional[BatchCallback] = None
+    cancel_event: Optional[threading.Event] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def report(self, stage: str, done: int, total: int):
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+    def emit(self, articles: List[Dict]):
+        """Entrega um lote de artigos já convertidos (resultado parcial)."""
+        if self.on_batch is not None and articles:
+            self.on_batch(articles)
+
+
+# Ganchos vazios: evitam testes de None espalhados pelos coletores
+NO_HOOKS = SearchHooks()
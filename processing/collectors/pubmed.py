@@ -2,24 +2,73 @@
 Coletor simples para PubMed usando as E-utilities (esearch + efetch).
 
 Busca será feita no campo Affiliation conforme solicitado. Não depende de
-bibliotecas externas (usa urllib + xml.etree) para minimizar dependências.
+bibliotecas externas (usa http.client + xml.etree) para minimizar dependências;
+as requisições usam o pool keep-alive de `processing.collectors.http_pool` e
+o cache em disco de `processing.collectors.response_cache` (TTL por endpoint,
+modo offline com `HTTP_CACHE_OFFLINE=1`). Artigos já coletados ficam no
+armazenamento local de `processing.collectors.record_store`: buscas repetidas
+só fazem efetch dos PMIDs inéditos ou vencidos.
 
 Função pública:
- - search_by_affiliation(terms, date_start=None, date_end=None, max_results=100)
+ - search_by_affiliation(terms, date_start=None, date_end=None, max_results=100, max_workers=None,
+                         use_history=False, hooks=None)
+ - search_by_affiliation_history(terms, ..., cursor=None) -> (artigos, HistoryCursor)
+ - iter_efetch_summaries(id_list) -> gerador de artigos (parsing incremental)
+ - start_history_search / fetch_history_page_xml / parse_efetch_xml: esearch,
+   download e conversão em passos separados (pipeline de processing/harvest.py)
+
+Os lotes efetch são executados em paralelo (ThreadPoolExecutor) e todas as
+requisições passam por um limitador de taxa compartilhado que respeita o
+limite do NCBI (3 req/s, ou 10 req/s quando `config.NCBI_API_KEY` estiver
+definida).
 
 Retorna lista de dicionários com campos compatíveis com o restante da aplicação
-('title', 'authors', 'doi', 'platform', 'publication_date', 'abstract', 'url', 'id').
-Se DOI existir, ele será usado como 'id' externo; caso contrário, usa o PMID.
+('title', 'authors', 'doi', 'platform', 'publication_date', 'abstract', 'url', 'id',
+'pmid', 'affiliations'). Se DOI existir, ele será usado como 'id' externo; caso contrário,
+usa o PMID. 'affiliations' traz as afiliações distintas dos autores (AffiliationInfo).
 """
-from typing import List, Union, Optional, Dict
-import urllib.parse
-import urllib.request
+from typing import List, Union, Optional, Dict, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import io
 import json
 import xml.etree.ElementTree as ET
+import urllib.parse
 from datetime import datetime
 
+import config
+from processing.collectors.http_pool import PooledResponse, get_default_pool
+from processing.collectors.plugin import (
+    CAP_ABSTRACT, CAP_AFFILIATION, CAP_AFFILIATIONS, CAP_DATE_RANGE, CAP_INCREMENTAL, CollectorPlugin,
+    SearchRequest, stream_batches,
+)
+from processing.collectors.progress import (
+    NO_HOOKS, STAGE_ARTICLES, STAGE_BATCHES, STAGE_IDS, SearchHooks,
+)
+from processing.collectors.rate_limit import TokenBucket, ncbi_rate
+from processing.collectors.record_store import get_default_store
+from processing.collectors.response_cache import get_default_cache
+
 PUBMED_EUTILS_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
+# Modo history server: registros por página efetch e teto de registros que o
+# PubMed permite paginar a partir de um esearch.
+PUBMED_HISTORY_PAGE_SIZE = 200
+PUBMED_HISTORY_MAX = 10000
+
+# Limitador compartilhado por todas as threads do coletor (criado sob demanda)
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def _get_rate_limiter() -> TokenBucket:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(ncbi_rate(config.NCBI_API_KEY))
+        return _rate_limiter
+
 
 def _build_affiliation_term_from_list(terms: List[str]) -> str:
     """Transforma uma lista de termos em query que pesquisa cada termo no campo Affiliation.
@@ -46,21 +95,14 @@ def _build_affiliation_term_from_list(terms: List[str]) -> str:
     return "(" + " OR ".join(quoted) + ")"
 
 
-def _http_get(url: str, params: dict = None, timeout: int = 15) -> str:
-    if params:
-        url = url + "?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers={"User-Agent": "NEXUS-Pesquisa/1.0 (Python)"})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
+def _http_get(url: str, params: dict = None, timeout: Optional[float] = None) -> str:
+    with _http_open(url, params=params, timeout=timeout) as resp:
         return resp.read().decode('utf-8')
 
 
-def _esearch_affiliation(query: str, date_start: Optional[str] = None, date_end: Optional[str] = None, retmax: int = 100) -> List[str]:
-    params = {
-        'db': 'pubmed',
-        'term': query,
-        'retmode': 'json',
-        'retmax': str(retmax)
-    }
+def _date_params(date_start: Optional[str] = None, date_end: Optional[str] = None) -> Dict[str, str]:
+    """Converte datas 'dd/MM/YYYY' nos parâmetros datetype/mindate/maxdate do esearch."""
+    params = {}
     # usar datetype=pdat e mindate/maxdate no formato YYYY/MM/DD quando fornecido
     if date_start:
         try:
@@ -76,6 +118,17 @@ def _esearch_affiliation(query: str, date_start: Optional[str] = None, date_end:
             params['maxdate'] = de
         except Exception:
             pass
+    return params
+
+
+def _esearch_affiliation(query: str, date_start: Optional[str] = None, date_end: Optional[str] = None, retmax: int = 100) -> List[str]:
+    params = {
+        'db': 'pubmed',
+        'term': query,
+        'retmode': 'json',
+        'retmax': str(retmax)
+    }
+    params.update(_date_params(date_start, date_end))
 
     url = PUBMED_EUTILS_BASE + "/esearch.fcgi"
     body = _http_get(url, params=params)
@@ -84,149 +137,604 @@ def _esearch_affiliation(query: str, date_start: Optional[str] = None, date_end:
     return idlist
 
 
-def _efetch_summaries(id_list: List[str]) -> List[Dict]:
+def _esearch_history(query: str, date_start: Optional[str] = None, date_end: Optional[str] = None,
+                     retmax: int = 0) -> Dict:
+    """Executa o esearch com usehistory=y e retorna count, WebEnv, query_key e ids.
+
+    Com retmax=0 nenhum PMID é trafegado: o conjunto de resultados fica no
+    history server do NCBI e é paginado depois pelo efetch. Um retmax maior
+    traz também os primeiros PMIDs (usado para consultar o armazenamento local).
+    """
+    params = {
+        'db': 'pubmed',
+        'term': query,
+        'retmode': 'json',
+        'retmax': str(retmax),
+        'usehistory': 'y'
+    }
+    params.update(_date_params(date_start, date_end))
+
+    url = PUBMED_EUTILS_BASE + "/esearch.fcgi"
+    body = _http_get(url, params=params)
+    result = json.loads(body).get('esearchresult', {})
+    if not result.get('webenv'):
+        raise ValueError("esearch não retornou WebEnv")
+    return {
+        'count': int(result.get('count', 0)),
+        'webenv': result['webenv'],
+        'query_key': str(result.get('querykey', '1')),
+        'ids': result.get('idlist', []),
+    }
+
+
+def _http_open(url: str, params: dict = None, timeout: Optional[float] = None, method: str = "GET"):
+    """Faz a requisição e devolve a resposta (objeto file-like).
+
+    Consulta antes o cache em disco; só em caso de ausência a requisição
+    passa pelo limitador de taxa e pelo pool keep-alive. No modo offline uma
+    ausência levanta `CacheMiss`. Com method="POST" os parâmetros vão no
+    corpo (formulário), como o NCBI recomenda para listas longas de PMIDs;
+    a chave do cache é a mesma do GET equivalente.
+    """
+    cache = get_default_cache()
+    if cache is None:
+        return _network_open(url, params, timeout, method)
+    return cache.open(url, params, fetch=lambda: _network_open(url, params, timeout, method))
+
+
+def _network_open(url: str, params: dict = None, timeout: Optional[float] = None,
+                  method: str = "GET") -> PooledResponse:
+    params = dict(params or {})
+    if config.NCBI_API_KEY:
+        params['api_key'] = config.NCBI_API_KEY
+    _get_rate_limiter().acquire()
+    if method == "POST":
+        return get_default_pool().request(
+            "POST", url, body=urllib.parse.urlencode(params).encode('ascii'),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'}, timeout=timeout)
+    return get_default_pool().request(method, url, params=params, timeout=timeout)
+
+
+def connection_stats() -> Dict[str, float]:
+    """Contadores do pool HTTP (conexões criadas x reutilizadas)."""
+    return get_default_pool().stats()
+
+
+def cache_stats() -> Dict[str, int]:
+    """Contadores do cache de respostas (vazio se o cache estiver desativado)."""
+    cache = get_default_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def iter_efetch_summaries(id_list: List[str], method: str = "GET") -> Iterator[Dict]:
+    """Gerador: busca os PMIDs via efetch e produz cada artigo assim que chega.
+
+    O XML é lido diretamente da resposta HTTP com `iterparse`; cada
+    <PubmedArticle> é convertido em dicionário no fechamento da tag e
+    descartado em seguida, então a memória usada não cresce com o lote.
+    Com method="POST" a lista de PMIDs vai no corpo, não na URL.
+    """
     if not id_list:
-        return []
+        return
     url = PUBMED_EUTILS_BASE + "/efetch.fcgi"
     params = {
         'db': 'pubmed',
         'id': ",".join(id_list),
         'retmode': 'xml'
     }
-    body = _http_get(url, params=params)
-    root = ET.fromstring(body)
-    articles = []
-    for article in root.findall('.//PubmedArticle'):
-        try:
-            medline = article.find('MedlineCitation')
-            article_elem = medline.find('Article') if medline is not None else None
-            # título
-            title = ''
-            if article_elem is not None:
-                t = article_elem.find('ArticleTitle')
-                if t is not None and t.text:
-                    title = ''.join(t.itertext()).strip()
-
-            # abstract
-            abstract = ''
-            if article_elem is not None:
-                abstract_elem = article_elem.find('Abstract')
-                if abstract_elem is not None:
-                    parts = ["".join(p.itertext()).strip() for p in abstract_elem.findall('AbstractText')]
-                    abstract = "\n".join([p for p in parts if p])
-
-            # autores
-            authors = []
-            if article_elem is not None:
-                author_list = article_elem.find('AuthorList')
-                if author_list is not None:
-                    for a in author_list.findall('Author'):
-                        last = a.find('LastName')
-                        initials = a.find('Initials')
-                        name = ''
-                        if last is not None and last.text:
-                            name = last.text
-                            if initials is not None and initials.text:
-                                name = f"{name} {initials.text}"
-                        else:
-                            # names like CollectiveName
-                            coll = a.find('CollectiveName')
-                            if coll is not None and coll.text:
-                                name = coll.text
-                        if name:
-                            authors.append(name)
-
-            # ids (PMID, DOI)
-            pmid = None
-            doi = None
-            aidlist = article.find('.//ArticleIdList')
-            if aidlist is not None:
-                for aid in aidlist.findall('ArticleId'):
-                    idtype = aid.attrib.get('IdType', '').lower()
-                    if idtype == 'pubmed' and (aid.text or '').strip():
-                        pmid = aid.text.strip()
-                    if idtype == 'doi' and (aid.text or '').strip():
-                        doi = aid.text.strip()
-
-            # data de publicação (ano)
-            pub_date = None
-            if article_elem is not None:
-                journal = article_elem.find('Journal')
-                if journal is not None:
-                    jissue = journal.find('JournalIssue')
-                    if jissue is not None:
-                        pubdate = jissue.find('PubDate')
-                        if pubdate is not None:
-                            year = pubdate.find('Year')
-                            med_year = None
-                            if year is not None and year.text:
-                                med_year = year.text
-                            else:
-                                # alguns registros usam MedlineDate
-                                md = pubdate.find('MedlineDate')
-                                if md is not None and md.text:
-                                    med_year = md.text.split()[0]
-                            pub_date = med_year
-
-            # url via DOI quando disponível
-            url_link = ''
-            if doi:
-                url_link = f"https://doi.org/{doi}"
-            elif pmid:
-                url_link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-
-            articles.append({
-                'title': title,
-                'authors': ", ".join(authors),
-                'doi': doi or '',
-                'platform': 'PubMed',
-                'publication_date': pub_date,
-                'abstract': abstract,
-                'url': url_link,
-                'id': doi or pmid or ''
-            })
-        except Exception:
-            # ignorar artigo que falhar no parsing e continuar
+    with _http_open(url, params=params, method=method) as resp:
+        yield from _iter_parse_efetch(resp)
+
+
+def _efetch_summaries(id_list: List[str], method: str = "GET") -> List[Dict]:
+    return list(iter_efetch_summaries(id_list, method))
+
+
+def _history_page_params(webenv: str, query_key: str, retstart: int, retmax: int) -> Dict[str, str]:
+    return {
+        'db': 'pubmed',
+        'WebEnv': webenv,
+        'query_key': query_key,
+        'retstart': str(retstart),
+        'retmax': str(retmax),
+        'retmode': 'xml'
+    }
+
+
+def iter_efetch_history_page(webenv: str, query_key: str, retstart: int, retmax: int) -> Iterator[Dict]:
+    """Gerador: página do conjunto salvo no history server (WebEnv/query_key)."""
+    url = PUBMED_EUTILS_BASE + "/efetch.fcgi"
+    with _http_open(url, params=_history_page_params(webenv, query_key, retstart, retmax)) as resp:
+        yield from _iter_parse_efetch(resp)
+
+
+def _efetch_history_page(webenv: str, query_key: str, retstart: int, retmax: int) -> List[Dict]:
+    return list(iter_efetch_history_page(webenv, query_key, retstart, retmax))
+
+
+def fetch_history_page_xml(webenv: str, query_key: str, retstart: int, retmax: int) -> bytes:
+    """XML bruto de uma página do history server (sem converter).
+
+    Separa a espera de rede da conversão: no pipeline de coleta
+    (processing/harvest.py) o download e o parsing rodam em etapas distintas.
+    """
+    url = PUBMED_EUTILS_BASE + "/efetch.fcgi"
+    with _http_open(url, params=_history_page_params(webenv, query_key, retstart, retmax)) as resp:
+        return resp.read()
+
+
+def parse_efetch_xml(data: bytes) -> Iterator[Dict]:
+    """Gerador: artigos de um PubmedArticleSet já baixado (ver `fetch_history_page_xml`)."""
+    return _iter_parse_efetch(io.BytesIO(data))
+
+
+def _iter_parse_efetch(stream) -> Iterator[Dict]:
+    """Percorre um PubmedArticleSet incrementalmente, liberando cada artigo após o uso."""
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = elem
             continue
-    return articles
+        if event == 'end' and elem.tag == 'PubmedArticle':
+            article = _parse_pubmed_article(elem)
+            # libera o elemento processado e o remove da raiz
+            elem.clear()
+            root.clear()
+            if article is not None:
+                yield article
+
+
+def _parse_pubmed_article(article: ET.Element) -> Optional[Dict]:
+    """Converte um elemento <PubmedArticle> no dicionário de artigo (None se falhar)."""
+    try:
+        medline = article.find('MedlineCitation')
+        article_elem = medline.find('Article') if medline is not None else None
+        # título
+        title = ''
+        if article_elem is not None:
+            t = article_elem.find('ArticleTitle')
+            if t is not None and t.text:
+                title = ''.join(t.itertext()).strip()
+
+        # abstract
+        abstract = ''
+        if article_elem is not None:
+            abstract_elem = article_elem.find('Abstract')
+            if abstract_elem is not None:
+                parts = ["".join(p.itertext()).strip() for p in abstract_elem.findall('AbstractText')]
+                abstract = "\n".join([p for p in parts if p])
+
+        # autores e afiliações (Author/AffiliationInfo/Affiliation), sem repetir
+        # a mesma afiliação compartilhada por vários autores
+        authors = []
+        affiliations = []
+        if article_elem is not None:
+            author_list = article_elem.find('AuthorList')
+            if author_list is not None:
+                for a in author_list.findall('Author'):
+                    last = a.find('LastName')
+                    initials = a.find('Initials')
+                    name = ''
+                    if last is not None and last.text:
+                        name = last.text
+                        if initials is not None and initials.text:
+                            name = f"{name} {initials.text}"
+                    else:
+                        # names like CollectiveName
+                        coll = a.find('CollectiveName')
+                        if coll is not None and coll.text:
+                            name = coll.text
+                    if name:
+                        authors.append(name)
+                    for info in a.findall('AffiliationInfo'):
+                        aff = info.find('Affiliation')
+                        text = " ".join("".join(aff.itertext()).split()) if aff is not None else ''
+                        if text and text not in affiliations:
+                            affiliations.append(text)
+
+        # ids (PMID, DOI)
+        pmid = None
+        doi = None
+        aidlist = article.find('.//ArticleIdList')
+        if aidlist is not None:
+            for aid in aidlist.findall('ArticleId'):
+                idtype = aid.attrib.get('IdType', '').lower()
+                if idtype == 'pubmed' and (aid.text or '').strip():
+                    pmid = aid.text.strip()
+                if idtype == 'doi' and (aid.text or '').strip():
+                    doi = aid.text.strip()
+
+        # data de publicação (ano)
+        pub_date = None
+        if article_elem is not None:
+            journal = article_elem.find('Journal')
+            if journal is not None:
+                jissue = journal.find('JournalIssue')
+                if jissue is not None:
+                    pubdate = jissue.find('PubDate')
+                    if pubdate is not None:
+                        year = pubdate.find('Year')
+                        med_year = None
+                        if year is not None and year.text:
+                            med_year = year.text
+                        else:
+                            # alguns registros usam MedlineDate
+                            md = pubdate.find('MedlineDate')
+                            if md is not None and md.text:
+                                med_year = md.text.split()[0]
+                        pub_date = med_year
+
+        # url via DOI quando disponível
+        url_link = ''
+        if doi:
+            url_link = f"https://doi.org/{doi}"
+        elif pmid:
+            url_link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+
+        return {
+            'title': title,
+            'authors': ", ".join(authors),
+            'doi': doi or '',
+            'platform': 'PubMed',
+            'publication_date': pub_date,
+            'abstract': abstract,
+            'affiliations': affiliations,
+            'url': url_link,
+            'id': doi or pmid or '',
+            'pmid': pmid or ''
+        }
+    except Exception:
+        # ignorar artigo que falhar no parsing e continuar
+        return None
+
+
+def _efetch_batch_safe(batch: List[str], method: str = "GET") -> List[Dict]:
+    """Executa um lote efetch; falhas de rede/parsing resultam em lista vazia."""
+    try:
+        return _efetch_summaries(batch, method)
+    except Exception:
+        return []
+
+
+def _build_query(terms: Union[List[str], str]) -> str:
+    if isinstance(terms, str):
+        # se for uma string contendo OR/() assumimos que já está formatada
+        return terms
+    return _build_affiliation_term_from_list(terms)
+
+
+@dataclass
+class HistoryCursor:
+    """Estado de uma coleta paginada pelo history server do NCBI.
+
+    `retstart` aponta para a próxima página ainda não coletada; todas as
+    páginas anteriores foram recebidas com sucesso. Para retomar uma coleta
+    interrompida basta passar o cursor de volta a `search_by_affiliation_history`.
+    """
+    query: str
+    webenv: str
+    query_key: str
+    total: int
+    retstart: int = 0
+    date_start: Optional[str] = None
+    date_end: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.retstart >= self.total
+
+
+def _efetch_page(cursor: HistoryCursor, retstart: int, page_size: int) -> List[Dict]:
+    """Busca uma página do history server."""
+    return _efetch_history_page(cursor.webenv, cursor.query_key, retstart, page_size)
+
+
+def _efetch_page_or_none(cursor: HistoryCursor, retstart: int, page_size: int) -> Optional[List[Dict]]:
+    """Como `_efetch_page`; None sinaliza falha."""
+    try:
+        return _efetch_page(cursor, retstart, page_size)
+    except Exception:
+        return None
+
+
+def _harvest_history_pages(cursor: HistoryCursor, page_size: int, workers: int,
+                           hooks: SearchHooks = NO_HOOKS, raise_errors: bool = False) -> List[Dict]:
+    """Coleta as páginas a partir de cursor.retstart até a primeira falha.
+
+    Só páginas contíguas são aceitas; assim o cursor sempre indica o ponto
+    exato de retomada, sem lacunas nem duplicatas. Um cancelamento também
+    para a coleta na página corrente (o cursor permite retomar). Com
+    `raise_errors` a falha é propagada depois das páginas já entregues.
+    """
+    results = []
+    starts = list(range(cursor.retstart, cursor.total, page_size))
+    if not starts:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(starts))),
+                                  thread_name_prefix="pubmed-history")
+    try:
+        fetch_page = _efetch_page if raise_errors else _efetch_page_or_none
+        pages = executor.map(lambda rs: fetch_page(cursor, rs, page_size), starts)
+        for done, (retstart, page) in enumerate(zip(starts, pages), start=1):
+            if page is None:
+                break
+            results.extend(page)
+            cursor.retstart = min(retstart + page_size, cursor.total)
+            _remember(page)
+            hooks.emit(page)
+            hooks.report(STAGE_BATCHES, done, len(starts))
+            hooks.report(STAGE_ARTICLES, len(results), cursor.total)
+            if hooks.cancelled:
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def start_history_search(terms: Union[List[str], str], date_start: Optional[str] = None,
+                         date_end: Optional[str] = None,
+                         max_results: Optional[int] = None) -> Optional[HistoryCursor]:
+    """Executa o esearch no history server e devolve o cursor da coleta (None se a query for vazia)."""
+    query = _build_query(terms)
+    if not query:
+        return None
+    info = _esearch_history(query, date_start=date_start, date_end=date_end)
+    limit = min(info['count'], PUBMED_HISTORY_MAX)
+    if max_results is not None:
+        limit = min(limit, max_results)
+    return HistoryCursor(query=query, webenv=info['webenv'], query_key=info['query_key'],
+                         total=limit, date_start=date_start, date_end=date_end)
+
+
+def search_by_affiliation_history(terms: Union[List[str], str], date_start: Optional[str] = None,
+                                  date_end: Optional[str] = None, max_results: Optional[int] = None,
+                                  page_size: int = PUBMED_HISTORY_PAGE_SIZE,
+                                  max_workers: Optional[int] = None,
+                                  cursor: Optional[HistoryCursor] = None,
+                                  hooks: Optional[SearchHooks] = None,
+                                  raise_errors: bool = False) -> Tuple[List[Dict], Optional[HistoryCursor]]:
+    """Busca no PubMed via history server (usehistory=y + WebEnv/query_key).
+
+    O esearch não devolve PMIDs; o efetch pagina o conjunto salvo no NCBI com
+    retstart/retmax, o que elimina as listas de IDs das URLs e permite coletar
+    mais resultados do que o modo por lista de IDs.
+
+    Args:
+        terms/date_start/date_end: iguais a `search_by_affiliation`.
+        max_results: limite de registros (None = todos, até PUBMED_HISTORY_MAX).
+        page_size: registros por requisição efetch.
+        max_workers: páginas buscadas em paralelo (padrão: config.PUBMED_MAX_WORKERS).
+        cursor: cursor devolvido por uma chamada anterior para retomar a coleta
+            a partir do último retstart bem-sucedido.
+        hooks: progresso, resultados parciais e cancelamento (ver progress.py).
+        raise_errors: propaga a falha de uma página em vez de parar a coleta
+            em silêncio (o cursor continua indicando o ponto de retomada).
+
+    Returns:
+        Tupla (artigos, cursor). `cursor.done` indica se a coleta terminou;
+        cursor é None se a query estiver vazia.
+    """
+    if max_workers is None:
+        max_workers = config.PUBMED_MAX_WORKERS
+    hooks = hooks or NO_HOOKS
+
+    resuming = cursor is not None
+    if cursor is None:
+        cursor = start_history_search(terms, date_start=date_start, date_end=date_end,
+                                      max_results=max_results)
+        if cursor is None:
+            return [], None
+    hooks.report(STAGE_IDS, cursor.total, cursor.total)
+
+    position = cursor.retstart
+    results = _harvest_history_pages(cursor, page_size, max_workers, hooks, raise_errors)
+
+    # O WebEnv expira no NCBI após algumas horas: ao retomar, se nenhuma página
+    # veio, refaz o esearch e continua do mesmo retstart.
+    if resuming and not cursor.done and cursor.retstart == position and not hooks.cancelled:
+        info = _esearch_history(cursor.query, date_start=cursor.date_start, date_end=cursor.date_end)
+        cursor.webenv = info['webenv']
+        cursor.query_key = info['query_key']
+        results = _harvest_history_pages(cursor, page_size, max_workers, hooks, raise_errors)
+
+    return results, cursor
+
+
+def _remember(articles: List[Dict]):
+    """Grava os artigos coletados no armazenamento local (se ativo)."""
+    store = get_default_store()
+    if store is not None and articles:
+        store.put_many('PubMed', ((a.get('pmid'), a) for a in articles))
+
+
+def _fetch_pmids(pmids: List[str], max_workers: Optional[int] = None,
+                 hooks: SearchHooks = NO_HOOKS,
+                 cursor: Optional[HistoryCursor] = None,
+                 raise_errors: bool = False) -> List[Dict]:
+    """Artigos dos PMIDs, na ordem do esearch.
+
+    PMIDs presentes e válidos no armazenamento local não vão à rede; só os
+    inéditos ou vencidos são buscados via efetch (em lotes paralelos).
+
+    Com `cursor` (esearch feito no history server), se nenhum PMID for
+    conhecido o conjunto é paginado pelo WebEnv; senão os lotes de PMIDs
+    ausentes vão no corpo de um POST, nunca na URL. Com `raise_errors` a
+    falha de um lote é propagada (depois dos lotes já entregues).
+    """
+    hooks.report(STAGE_IDS, len(pmids), len(pmids))
+    store = get_default_store()
+    known, missing = store.partition('PubMed', pmids) if store is not None else ({}, list(pmids))
+    if not known and cursor is not None:
+        if max_workers is None:
+            max_workers = config.PUBMED_MAX_WORKERS
+        return _harvest_history_pages(cursor, PUBMED_HISTORY_PAGE_SIZE, max_workers, hooks,
+                                      raise_errors)
+    if known:
+        hooks.emit([known[p] for p in dict.fromkeys(pmids) if p in known])
+        hooks.report(STAGE_ARTICLES, len(known), len(pmids))
+
+    fetched = _efetch_in_batches(missing, max_workers, hooks,
+                                 articles_done=len(known), articles_total=len(pmids),
+                                 method="GET" if cursor is None else "POST",
+                                 raise_errors=raise_errors)
+    if store is None or not known:
+        return fetched
+
+    by_pmid = dict(known)
+    by_pmid.update((a['pmid'], a) for a in fetched if a.get('pmid'))
+    results = [by_pmid[p] for p in dict.fromkeys(pmids) if p in by_pmid]
+    # artigos sem PMID no XML (raro) não entram no índice: mantém-os no fim
+    results.extend(a for a in fetched if not a.get('pmid'))
+    return results
+
+
+def _efetch_in_batches(pmids: List[str], max_workers: Optional[int] = None,
+                       hooks: SearchHooks = NO_HOOKS, articles_done: int = 0,
+                       articles_total: Optional[int] = None, method: str = "GET",
+                       raise_errors: bool = False) -> List[Dict]:
+    # efetch em lotes (limitar tamanho do URL)
+    fetch_batch = _efetch_summaries if raise_errors else _efetch_batch_safe
+    batch_size = 100
+    batches = [pmids[i:i+batch_size] for i in range(0, len(pmids), batch_size)]
+    if max_workers is None:
+        max_workers = config.PUBMED_MAX_WORKERS
+    workers = max(1, min(max_workers, len(batches)))
+    if articles_total is None:
+        articles_total = len(pmids)
+
+    results = []
+
+    def batch_done(number, fetched):
+        # grava cada lote ao chegar: a UI pode pedir os detalhes antes do fim da busca
+        _remember(fetched)
+        results.extend(fetched)
+        hooks.emit(fetched)
+        hooks.report(STAGE_BATCHES, number, len(batches))
+        hooks.report(STAGE_ARTICLES, articles_done + len(results), articles_total)
+
+    if workers == 1:
+        for number, batch in enumerate(batches, start=1):
+            if hooks.cancelled:
+                break
+            batch_done(number, fetch_batch(batch, method))
+        return results
+
+    # executor.map preserva a ordem dos lotes (mesma ordem do esearch); ao
+    # cancelar, os lotes ainda não iniciados são descartados
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pubmed-efetch")
+    try:
+        for number, fetched in enumerate(executor.map(lambda batch: fetch_batch(batch, method), batches), start=1):
+            batch_done(number, fetched)
+            if hooks.cancelled:
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return results
+
+
+def _search_history_with_store(query: str, date_start: Optional[str], date_end: Optional[str],
+                               max_results: int, max_workers: Optional[int],
+                               hooks: SearchHooks, raise_errors: bool = False) -> List[Dict]:
+    """Modo history server com o armazenamento local ativo.
+
+    O esearch continua com usehistory=y, mas traz também os PMIDs (retmax =
+    limite), comparados com o armazenamento; o efetch recebe só os ausentes
+    (ver `_fetch_pmids`).
+    """
+    limit = min(max_results, PUBMED_HISTORY_MAX)
+    info = _esearch_history(query, date_start=date_start, date_end=date_end, retmax=limit)
+    pmids = info['ids'][:limit]
+    cursor = HistoryCursor(query=query, webenv=info['webenv'], query_key=info['query_key'],
+                           total=len(pmids), date_start=date_start, date_end=date_end)
+    return _fetch_pmids(pmids, max_workers=max_workers, hooks=hooks, cursor=cursor,
+                        raise_errors=raise_errors)
 
 
 def search_by_affiliation(terms: Union[List[str], str], date_start: Optional[str] = None,
-                          date_end: Optional[str] = None, max_results: int = 100) -> List[Dict]:
+                          date_end: Optional[str] = None, max_results: int = 100,
+                          max_workers: Optional[int] = None, use_history: bool = False,
+                          hooks: Optional[SearchHooks] = None, raise_errors: bool = False) -> List[Dict]:
     """Busca artigos no PubMed usando termos aplicados ao campo Affiliation.
 
     Args:
         terms: Lista de termos ou string (quando for string será usada tal qual no term)
         date_start/date_end: strings no formato 'dd/MM/YYYY' (opcionais)
         max_results: número máximo de ids a recuperar via esearch
+        max_workers: lotes efetch simultâneos (padrão: config.PUBMED_MAX_WORKERS;
+            1 executa os lotes em sequência)
+        use_history: pagina os resultados pelo history server do NCBI
+            (WebEnv/query_key) em vez de enviar listas de PMIDs no efetch;
+            indicado para consultas com milhares de resultados. Com o
+            armazenamento local ativo (config.RECORD_STORE_ENABLED) o esearch
+            no history server traz também a lista de PMIDs (até
+            PUBMED_HISTORY_MAX), para que só os artigos inéditos ou vencidos
+            sejam buscados (ver `_search_history_with_store`).
+        hooks: progresso (IDs encontrados, lotes buscados, artigos convertidos),
+            resultados parciais por lote e cancelamento; ver
+            `processing.collectors.progress.SearchHooks`. Se cancelada, a busca
+            devolve os artigos coletados até então.
+        raise_errors: propaga as falhas de rede/HTTP (esearch ou efetch) em vez
+            de devolver uma lista vazia ou incompleta; usado pelo plugin, para
+            que a falha chegue a `PlatformResult.error` no orquestrador.
 
     Returns:
         Lista de dicionários representando artigos.
     """
-    # construir query
-    if isinstance(terms, str):
-        # se for uma string contendo OR/() assumimos que já está formatada
-        query = terms
-    else:
-        query = _build_affiliation_term_from_list(terms)
-
+    query = _build_query(terms)
     if not query:
         return []
 
+    # o WebEnv do history server não pode ser cacheado: offline usa listas de PMIDs
+    cache = get_default_cache()
+    offline = cache is not None and cache.offline
+    if use_history and not offline:
+        try:
+            if get_default_store() is not None:
+                return _search_history_with_store(query, date_start, date_end, max_results,
+                                                  max_workers, hooks or NO_HOOKS, raise_errors)
+            results, _cursor = search_by_affiliation_history(query, date_start=date_start, date_end=date_end,
+                                                             max_results=max_results, max_workers=max_workers,
+                                                             hooks=hooks, raise_errors=raise_errors)
+        except Exception:
+            if raise_errors:
+                raise
+            return []
+        return results
+
+    if use_history:
+        max_results = min(max_results, PUBMED_HISTORY_MAX)
     try:
         pmids = _esearch_affiliation(query, date_start=date_start, date_end=date_end, retmax=max_results)
     except Exception:
+        if raise_errors:
+            raise
         return []
+    return _fetch_pmids(pmids, max_workers=max_workers, hooks=hooks or NO_HOOKS,
+                        raise_errors=raise_errors)
 
-    # efetch em lotes (limitar tamanho do URL)
-    batch_size = 100
-    results = []
-    for i in range(0, len(pmids), batch_size):
-        batch = pmids[i:i+batch_size]
-        try:
-            fetched = _efetch_summaries(batch)
-            results.extend(fetched)
-        except Exception:
-            continue
 
-    return results
+class PubMedCollector(CollectorPlugin):
+    """Plataforma 'PubMed' do registro de coletores (processing/collectors/registry.py)."""
+
+    name = 'PubMed'
+    capabilities = frozenset({CAP_AFFILIATION, CAP_DATE_RANGE, CAP_ABSTRACT, CAP_AFFILIATIONS,
+                              CAP_INCREMENTAL})
+
+    @property
+    def rate_limit(self) -> float:
+        return ncbi_rate(config.NCBI_API_KEY)
+
+    def limiter(self) -> TokenBucket:
+        return _get_rate_limiter()
+
+    def fetch(self, request: SearchRequest, hooks: SearchHooks = NO_HOOKS) -> Iterator[List[Dict]]:
+        max_results = request.max_results if request.max_results is not None else config.PUBMED_MAX_RESULTS
+        # Modo history server: o NCBI pagina os resultados (WebEnv); as falhas
+        # de rede/HTTP chegam ao orquestrador (PlatformResult.error)
+        return stream_batches(
+            lambda inner: search_by_affiliation(request.terms, date_start=request.date_start,
+                                                date_end=request.date_end, max_results=max_results,
+                                                use_history=True, hooks=inner, raise_errors=True),
+            hooks)
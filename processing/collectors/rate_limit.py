@@ -0,0 +1,63 @@
+"""
+Limitador de taxa (token bucket) compartilhado pelos coletores.
+
+As E-utilities do NCBI aceitam no máximo 3 requisições por segundo sem chave
+de API e 10 por segundo com `api_key`. O limitador é thread-safe: várias
+threads de coleta podem chamar `acquire()` ao mesmo tempo e as requisições
+são espaçadas de forma uniforme respeitando a taxa configurada.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+# Limites documentados pelo NCBI (requisições por segundo)
+NCBI_RATE_WITHOUT_KEY = 3.0
+NCBI_RATE_WITH_KEY = 10.0
+
+
+class TokenBucket:
+    """
+    Token bucket com reserva de fichas.
+
+    Cada chamada a `acquire()` reserva uma ficha; se o balde estiver vazio a
+    ficha fica "devendo" e a thread dorme o tempo necessário fora do lock,
+    de modo que as demais threads continuam reservando a sua vez em ordem.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Fichas repostas por segundo (requisições por segundo).
+            capacity: Tamanho máximo de rajada. O padrão 1 espaça as
+                requisições em 1/rate segundos, garantindo que nenhuma janela
+                de 1 segundo ultrapasse o limite.
+        """
+        if rate <= 0:
+            raise ValueError("rate deve ser maior que zero")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last = clock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Aguarda até haver fichas disponíveis. Retorna o tempo esperado (s)."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+def ncbi_rate(api_key: Optional[str]) -> float:
+    """Retorna a taxa permitida pelo NCBI conforme a presença de chave de API."""
+    return NCBI_RATE_WITH_KEY if api_key else NCBI_RATE_WITHOUT_KEY
@@ -0,0 +1,146 @@
+"""
+Armazenamento local de registros já coletados, por (plataforma, ID externo).
+
+Cada chamada a `search_by_affiliation` baixava e reprocessava todos os
+artigos, mesmo os coletados na semana anterior. Este módulo guarda o
+dicionário do artigo já convertido (JSON) com o instante da coleta, num
+arquivo SQLite próprio (`nexus_records.db`, ao lado de `nexus_pesquisa.db`).
+O coletor compara a lista de IDs do esearch com o armazenamento e só busca
+os registros inéditos ou vencidos (mais antigos que `max_age`).
+
+Complementa o cache HTTP (`response_cache`): o cache é por requisição (um
+lote com um PMID a mais já é outra chave), o armazenamento é por registro e
+também dispensa o parsing do XML.
+
+Uso:
+    store = get_default_store()          # None se desativado no config
+    fresh, missing = store.partition('PubMed', pmids)
+    store.put_many('PubMed', ((a['pmid'], a) for a in fetched))
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+# Limite de parâmetros por consulta IN (abaixo do máximo padrão do SQLite)
+_CHUNK = 500
+
+
+class RecordStore:
+    """Registros convertidos por (plataforma, ID externo), com data da coleta."""
+
+    def __init__(self, path: str, max_age: float,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Arquivo SQLite do armazenamento (criado se não existir).
+            max_age: Idade máxima (s) para um registro ser reaproveitado.
+        """
+        self.path = str(path)
+        self.max_age = float(max_age)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                platform TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (platform, external_id)
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, platform: str, ids: Iterable[str],
+                 max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """Registros ainda válidos dentre `ids` ({id: artigo})."""
+        ids = list(dict.fromkeys(ids))
+        max_age = self.max_age if max_age is None else max_age
+        oldest = self._clock() - max_age
+        found = {}
+        with self._lock:
+            for i in range(0, len(ids), _CHUNK):
+                chunk = ids[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT external_id, data FROM records "
+                    f"WHERE platform = ? AND fetched_at >= ? AND external_id IN ({marks})",
+                    [platform, oldest, *chunk],
+                ).fetchall()
+                for external_id, data in rows:
+                    found[external_id] = json.loads(data)
+        return found
+
+    def partition(self, platform: str, ids: List[str],
+                  max_age: Optional[float] = None) -> Tuple[Dict[str, Dict], List[str]]:
+        """Separa `ids` em (registros válidos {id: artigo}, IDs a buscar na ordem original)."""
+        fresh = self.get_many(platform, ids, max_age=max_age)
+        missing = [i for i in dict.fromkeys(ids) if i not in fresh]
+        return fresh, missing
+
+    def put_many(self, platform: str, records: Iterable[Tuple[str, Dict]]) -> int:
+        """Grava/atualiza registros (id, artigo) numa transação. Retorna quantos."""
+        now = self._clock()
+        rows = [(platform, str(external_id), json.dumps(record, ensure_ascii=False), now)
+                for external_id, record in records if external_id]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (platform, external_id, data, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def count(self, platform: Optional[str] = None) -> int:
+        with self._lock:
+            if platform is None:
+                return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE platform = ?", (platform,)
+            ).fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM records")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_UNSET = object()
+_default_store = _UNSET
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> Optional[RecordStore]:
+    """Armazenamento compartilhado pelos coletores, conforme o config (None se desativado)."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is _UNSET:
+            if config.RECORD_STORE_ENABLED:
+                _default_store = RecordStore(config.RECORD_STORE_PATH,
+                                             max_age=config.RECORD_STORE_MAX_AGE)
+            else:
+                _default_store = None
+        return _default_store
+
+
+def set_default_store(store: Optional[RecordStore]):
+    """Substitui o armazenamento compartilhado (ex.: testes). Retorna o anterior."""
+    global _default_store
+    with _default_store_lock:
+        previous, _default_store = _default_store, store
+    return previous
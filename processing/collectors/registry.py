@@ -0,0 +1,103 @@
+"""
+Registro das plataformas de busca e dos seus coletores.
+
+A interface (botões de plataforma) e o orquestrador (core/orchestrator.py)
+descobrem as plataformas aqui. Cada entrada aponta para a classe do coletor
+como texto ('módulo:Classe'); o módulo só é importado na primeira vez que o
+coletor é pedido, então listar as plataformas na abertura da janela não
+carrega nenhum coletor.
+
+Uma plataforma nova só precisa de uma subclasse de
+`processing.collectors.plugin.CollectorPlugin` e de uma chamada a `register`:
+a busca simultânea, o tempo limite, a remoção de duplicatas, o cache HTTP, o
+limitador de taxa e as métricas vêm da infraestrutura comum.
+
+Uso:
+    for nome in platforms():
+        ...
+    coletor = get_collector('Scielo')      # importa processing.collectors.scielo
+    artigos = coletor.collect(["HC UFPE"], "01/01/2023", "31/12/2023", 200)
+"""
+
+import importlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from processing.collectors.plugin import CollectorPlugin
+
+
+@dataclass
+class _Entry:
+    target: Union[str, type, CollectorPlugin]
+    plugin: Optional[CollectorPlugin] = None
+    error: Optional[str] = None
+
+
+_entries: Dict[str, _Entry] = {}  # ordem de registro = ordem na interface
+_lock = threading.Lock()
+
+
+def register(name: str, target: Union[str, type, CollectorPlugin]):
+    """Registra (ou substitui) a plataforma `name`.
+
+    Args:
+        target: 'módulo:Classe' (importado sob demanda), a classe ou uma instância.
+    """
+    with _lock:
+        _entries[name] = _Entry(target)
+
+
+def unregister(name: str):
+    with _lock:
+        _entries.pop(name, None)
+
+
+def platforms(capability: Optional[str] = None) -> List[str]:
+    """Plataformas registradas, sem importar os coletores.
+
+    Com `capability`, só as que a declaram (nesse caso os coletores são carregados).
+    """
+    with _lock:
+        names = list(_entries)
+    if capability is None:
+        return names
+    return [n for n in names if (p := get_collector(n)) is not None and p.supports(capability)]
+
+
+def _load(target: Union[str, type, CollectorPlugin]) -> CollectorPlugin:
+    if isinstance(target, CollectorPlugin):
+        return target
+    if isinstance(target, str):
+        module_name, _, attr = target.partition(':')
+        target = getattr(importlib.import_module(module_name), attr)
+    return target()
+
+
+def get_collector(name: str) -> Optional[CollectorPlugin]:
+    """Coletor da plataforma (importado na primeira chamada); None se indisponível."""
+    with _lock:
+        entry = _entries.get(name)
+        if entry is None:
+            return None
+        if entry.plugin is None and entry.error is None:
+            try:
+                entry.plugin = _load(entry.target)
+                if not entry.plugin.name:
+                    entry.plugin.name = name
+            except Exception as e:
+                entry.error = str(e) or type(e).__name__
+                print(f"[AVISO] Coletor '{name}' indisponível: {entry.error}")
+        return entry.plugin
+
+
+def loaded_collectors() -> List[CollectorPlugin]:
+    """Coletores já importados (ex.: para exibir as métricas ao fim da busca)."""
+    with _lock:
+        return [e.plugin for e in _entries.values() if e.plugin is not None]
+
+
+# Plataformas embutidas (na ordem dos botões da interface)
+register('Scielo', 'processing.collectors.scielo:ScieloCollector')
+register('PubMed', 'processing.collectors.pubmed:PubMedCollector')
+register('Lilacs', 'processing.collectors.other_bases:LilacsCollector')
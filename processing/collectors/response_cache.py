@@ -0,0 +1,342 @@
+"""
+Cache em disco das respostas HTTP dos coletores (esearch/efetch).
+
+As mesmas buscas por afiliação são repetidas várias vezes por semana com
+intervalos de datas sobrepostos; sem cache, cada execução volta ao NCBI.
+Este módulo guarda o corpo das respostas num arquivo SQLite próprio
+(`nexus_http_cache.db`, ao lado de `nexus_pesquisa.db`), comprimido com zlib
+e endereçado pelo SHA-256 da URL normalizada + parâmetros ordenados.
+
+- TTL por endpoint (ex.: esearch curto, efetch por PMID longo), vindo do config;
+- despejo LRU quando o total de bytes passa de `max_bytes`;
+- modo offline ("somente cache"): nada vai à rede, respostas vencidas ainda
+  são servidas e uma ausência levanta `CacheMiss`;
+- requisições ligadas a uma sessão do history server (WebEnv/usehistory) não
+  são cacheadas, pois o WebEnv expira no NCBI.
+
+A resposta de rede é gravada à medida que é lida (tee para um compressor
+incremental), então o parsing com iterparse continua em streaming; só é
+armazenada se o corpo for lido até o fim.
+
+Uso:
+    cache = get_default_cache()          # None se desativado no config
+    with cache.open(url, params, fetch=lambda: pool.request("GET", url, params=params)) as resp:
+        ...
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import config
+
+# Parâmetros que amarram a resposta a uma sessão temporária no servidor
+DEFAULT_UNCACHEABLE_PARAMS = ('WebEnv', 'usehistory', 'query_key')
+
+# Parâmetros que não mudam o conteúdo da resposta (ficam fora da chave)
+IGNORED_KEY_PARAMS = ('api_key',)
+
+
+class CacheMiss(Exception):
+    """Resposta ausente do cache no modo offline (somente cache)."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Resposta não encontrada no cache (modo offline): {url}")
+        self.url = url
+
+
+class _CachedResponse:
+    """Resposta file-like servida do cache, descompactada sob demanda."""
+
+    status = 200
+
+    def __init__(self, compressed: bytes):
+        self._pending = compressed
+        self._decompressor = zlib.decompressobj()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._decompressor.decompress(self._pending) + self._decompressor.flush()
+            self._pending = b""
+            return data
+        chunks = []
+        while size > 0 and not self._decompressor.eof:
+            chunk = self._decompressor.decompress(self._pending, size)
+            self._pending = self._decompressor.unconsumed_tail
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        self._pending = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _TeeResponse:
+    """Repassa a resposta de rede e comprime uma cópia do que foi lido.
+
+    Ao fechar, se o corpo foi lido até o fim, entrega o blob comprimido a
+    `on_complete` (que grava no cache).
+    """
+
+    def __init__(self, resp, on_complete: Callable[[bytes], None]):
+        self._resp = resp
+        self._on_complete = on_complete
+        self._compressor = zlib.compressobj()
+        self._chunks = []
+        self._complete = False
+        self.status = getattr(resp, 'status', 200)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._resp.read(size)
+        if data:
+            self._chunks.append(self._compressor.compress(data))
+        if size is None or size < 0 or not data:
+            self._complete = True
+        return data
+
+    def close(self):
+        if self._resp is None:
+            return
+        try:
+            if self._complete:
+                self._chunks.append(self._compressor.flush())
+                self._on_complete(b"".join(self._chunks))
+        finally:
+            self._chunks = []
+            self._resp.close()
+            self._resp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ResponseCache:
+    """Cache de respostas HTTP em SQLite, com TTL por endpoint e despejo LRU."""
+
+    def __init__(self, path: str, max_bytes: int, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 86400.0, offline: bool = False,
+                 uncacheable_params: Iterable[str] = DEFAULT_UNCACHEABLE_PARAMS,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Arquivo SQLite do cache (criado se não existir).
+            max_bytes: Limite do total de bytes armazenados (comprimidos).
+            ttls: TTL em segundos por endpoint (último segmento do caminho,
+                ex.: {'esearch.fcgi': 21600}).
+            default_ttl: TTL dos endpoints não listados em `ttls`.
+            offline: Se True, nunca acessa a rede (modo somente cache).
+        """
+        self.path = str(path)
+        self.max_bytes = int(max_bytes)
+        self.ttls = dict(ttls or {})
+        self.default_ttl = float(default_ttl)
+        self.offline = offline
+        self.uncacheable_params = tuple(uncacheable_params)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bypassed': 0}
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._conn.commit()
+
+    # ---------------------------------------------------------------
+    # Chaves e políticas
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def normalize_url(url: str, params: Optional[dict] = None) -> str:
+        """URL canônica: esquema/host em minúsculas e parâmetros ordenados."""
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        query += [(k, str(v)) for k, v in (params or {}).items()]
+        query = sorted((k, v) for k, v in query if k not in IGNORED_KEY_PARAMS)
+        path = parts.path.rstrip('/') or '/'
+        return urllib.parse.urlunsplit((
+            parts.scheme.lower(), parts.netloc.lower(), path,
+            urllib.parse.urlencode(query), '',
+        ))
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[dict] = None) -> str:
+        return hashlib.sha256(cls.normalize_url(url, params).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        return urllib.parse.urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+    def ttl_for(self, url: str) -> float:
+        return float(self.ttls.get(self.endpoint_of(url), self.default_ttl))
+
+    def cacheable(self, params: Optional[dict]) -> bool:
+        return not any(p in (params or {}) for p in self.uncacheable_params)
+
+    # ---------------------------------------------------------------
+    # Leitura e escrita
+    # ---------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Blob comprimido da chave, ou None se ausente/vencido.
+
+        No modo offline entradas vencidas continuam válidas (melhor que nada).
+        """
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] < now and not self.offline):
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, url: str, compressed: bytes, ttl: Optional[float] = None):
+        """Grava um blob já comprimido (zlib) e aplica o limite de bytes."""
+        now = self._clock()
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, url, endpoint, body, size, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, self.endpoint_of(url), sqlite3.Binary(compressed),
+                 len(compressed), now, now + ttl, now),
+            )
+            self._stats['stores'] += 1
+            self._evict_locked(now)
+            self._conn.commit()
+
+    def _evict_locked(self, now: float):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # primeiro descarta o que já venceu, depois os menos usados recentemente
+        cur = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+        self._stats['evictions'] += max(cur.rowcount, 0)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._stats['evictions'] += len(victims)
+
+    def open(self, url: str, params: Optional[dict], fetch: Callable[[], object]):
+        """Resposta file-like do cache ou, na falta dela, de `fetch()`.
+
+        `fetch` só é chamado em caso de ausência (nem consome o limitador de
+        taxa nos acertos). A resposta de rede é gravada ao ser lida até o fim.
+        """
+        if not self.cacheable(params):
+            if self.offline:
+                raise CacheMiss(url)
+            with self._lock:
+                self._stats['bypassed'] += 1
+            return fetch()
+
+        key = self.make_key(url, params)
+        blob = self.get(key)
+        with self._lock:
+            self._stats['hits' if blob is not None else 'misses'] += 1
+        if blob is not None:
+            return _CachedResponse(blob)
+        if self.offline:
+            raise CacheMiss(url)
+        return _TeeResponse(fetch(), lambda data: self.put(key, url, data))
+
+    # ---------------------------------------------------------------
+    # Métricas e manutenção
+    # ---------------------------------------------------------------
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            data = dict(self._stats)
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        data['entries'] = entries
+        data['bytes'] = total
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_UNSET = object()
+_default_cache = _UNSET
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Cache compartilhado pelos coletores, conforme o config (None se desativado)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is _UNSET:
+            if config.HTTP_CACHE_ENABLED or config.HTTP_CACHE_OFFLINE:
+                _default_cache = ResponseCache(
+                    config.HTTP_CACHE_PATH,
+                    max_bytes=config.HTTP_CACHE_MAX_BYTES,
+                    ttls={
+                        'esearch.fcgi': config.HTTP_CACHE_TTL_ESEARCH,
+                        'efetch.fcgi': config.HTTP_CACHE_TTL_EFETCH,
+                    },
+                    default_ttl=config.HTTP_CACHE_TTL_DEFAULT,
+                    offline=config.HTTP_CACHE_OFFLINE,
+                )
+            else:
+                _default_cache = None
+        return _default_cache
+
+
+def set_default_cache(cache: Optional[ResponseCache]):
+    """Substitui o cache compartilhado (ex.: testes). Retorna o anterior."""
+    global _default_cache
+    with _default_cache_lock:
+        previous, _default_cache = _default_cache, cache
+    return previous
@@ -0,0 +1,516 @@
+"""
+Coletor SciELO usando a busca do SciELO Search (search.scielo.org, saída XML).
+
+Devolve os mesmos dicionários do coletor PubMed ('title', 'authors', 'doi',
+'platform', 'publication_date', 'abstract', 'url', 'id', 'pmid',
+'affiliations'), com platform='Scielo' e 'pmid' vazio; o 'id' é o DOI ou,
+sem DOI, o PID SciELO.
+
+A busca é dividida em janelas de datas (um ano por janela, pelo filtro
+`year_cluster`). A primeira página de cada janela informa o total
+(numFound); as demais páginas de todas as janelas são buscadas em paralelo
+(ThreadPoolExecutor), e todas as requisições passam por um limitador de
+taxa compartilhado (config.SCIELO_RATE) e pelo mesmo pool keep-alive e
+cache em disco do coletor PubMed. Cada resposta é convertida com
+`iterparse` à medida que é lida, liberando cada <doc> após o uso.
+
+Funções públicas:
+ - search_by_affiliation(terms, date_start=None, date_end=None, max_results=100,
+                         max_workers=None, page_size=SCIELO_PAGE_SIZE, hooks=None)
+   páginas com falha (rede/HTTP) não interrompem as demais: ao final a
+   busca levanta `HarvestError`, com as falhas e os artigos coletados.
+ - harvest_date_windows(terms, date_start, date_end, ..., cursor=None) -> (artigos, WindowCursor)
+   coleta incremental: janelas já fechadas e coletadas por completo não são
+   buscadas de novo.
+ - date_windows(date_start, date_end) -> janelas anuais do intervalo
+
+A mesma busca (iAHx, sobre Solr) atende o portal da BVS: `SearchSite`
+descreve o endereço, os filtros fixos e a plataforma, e o coletor LILACS
+(other_bases.py) reaproveita as janelas, a paginação e o parsing daqui.
+
+Testes: processing/collectors/test_scielo_collector.py, contra o servidor
+local de stub_server.py (rotas e respostas sintéticas).
+"""
+from typing import Callable, List, Union, Optional, Dict, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import chain
+import threading
+import xml.etree.ElementTree as ET
+
+import config
+from processing.collectors.http_pool import PooledResponse, get_default_pool
+from processing.collectors.plugin import (
+    CAP_ABSTRACT, CAP_AFFILIATION, CAP_AFFILIATIONS, CAP_DATE_RANGE, CollectorPlugin,
+    SearchRequest, stream_batches,
+)
+from processing.collectors.progress import (
+    NO_HOOKS, STAGE_ARTICLES, STAGE_BATCHES, STAGE_IDS, SearchHooks,
+)
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.response_cache import get_default_cache
+
+SCIELO_SEARCH_BASE = "https://search.scielo.org"
+
+# Campo do índice pesquisado por cada termo (afiliação dos autores)
+SCIELO_AFFILIATION_FIELD = "aff"
+
+# Registros por página e teto de registros paginados por janela
+SCIELO_PAGE_SIZE = 100
+SCIELO_WINDOW_MAX = 10000
+
+# Janelas do ano corrente e dos SCIELO_OPEN_YEARS - 1 anteriores continuam
+# "abertas": a indexação atrasa, então são sempre buscadas de novo
+SCIELO_OPEN_YEARS = 2
+
+# Idiomas preferidos para título e resumo
+_LANGUAGES = ('pt', 'en', 'es')
+
+# Limitador compartilhado por todas as threads do coletor (criado sob demanda)
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def _get_rate_limiter() -> TokenBucket:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(config.SCIELO_RATE)
+        return _rate_limiter
+
+
+@dataclass(frozen=True)
+class SearchSite:
+    """Um portal de busca iAHx: endereço, filtros fixos e plataforma dos registros."""
+    platform: str
+    base_url: Callable[[], str]             # lido a cada requisição (testes trocam o endereço)
+    limiter: Callable[[], TokenBucket]
+    affiliation_field: str = SCIELO_AFFILIATION_FIELD
+    params: Tuple[Tuple[str, str], ...] = ()
+
+
+def _build_query(terms: Union[List[str], str], field: str = SCIELO_AFFILIATION_FIELD) -> str:
+    """Lista de termos -> query no campo de afiliação.
+
+    Ex: ['HC UFPE', 'Hospital das Clinicas'] -> '(aff:"HC UFPE" OR aff:"Hospital das Clinicas")'
+    Uma string é usada tal qual.
+    """
+    if isinstance(terms, str):
+        return terms
+    quoted = []
+    for t in terms or []:
+        t = t.strip()
+        if not t:
+            continue
+        q = t if '"' in t else f'"{t}"'
+        quoted.append(f"{field}:{q}")
+    if not quoted:
+        return ""
+    if len(quoted) == 1:
+        return quoted[0]
+    return "(" + " OR ".join(quoted) + ")"
+
+
+# ==================== JANELAS DE DATAS ====================
+
+@dataclass(frozen=True)
+class DateWindow:
+    """Um ano do intervalo buscado; `first`/`last` ('YYYYMM') recortam anos parciais."""
+    year: Optional[int]         # None: sem filtro de ano (intervalo não informado)
+    first: str = ''
+    last: str = ''
+
+    @property
+    def key(self) -> str:
+        if self.year is None:
+            return '*'
+        return f"{self.year}:{self.first}-{self.last}" if (self.first or self.last) else str(self.year)
+
+    def params(self) -> Dict[str, str]:
+        return {'filter[year_cluster][]': str(self.year)} if self.year is not None else {}
+
+    def contains(self, published: str) -> bool:
+        """True se a data do registro ('YYYY-MM', 'YYYYMM' ou 'YYYY') está na janela."""
+        month = "".join(c for c in (published or '') if c.isdigit())[:6]
+        if len(month) < 6:
+            return True  # sem mês: o filtro de ano já basta
+        return (not self.first or month >= self.first) and (not self.last or month <= self.last)
+
+    def closed(self, today: Optional[date] = None) -> bool:
+        today = today or date.today()
+        return self.year is not None and self.year <= today.year - SCIELO_OPEN_YEARS
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+def date_windows(date_start: Optional[str] = None, date_end: Optional[str] = None,
+                 today: Optional[date] = None) -> List[DateWindow]:
+    """Janelas anuais de 'dd/MM/YYYY' a 'dd/MM/YYYY', da mais recente para a mais antiga.
+
+    Sem data inicial a busca não é dividida (uma janela sem filtro). Anos
+    parciais nas pontas levam o recorte por mês.
+    """
+    start = _parse_date(date_start)
+    if start is None:
+        return [DateWindow(None)]
+    end = _parse_date(date_end) or today or date.today()
+    windows = []
+    for year in range(end.year, start.year - 1, -1):
+        first = start.strftime("%Y%m") if year == start.year and start.month > 1 else ''
+        last = end.strftime("%Y%m") if year == end.year and end.month < 12 else ''
+        windows.append(DateWindow(year, first, last))
+    return windows
+
+
+# ==================== HTTP ====================
+
+def _search_params(query: str, window: DateWindow, start: int, count: int,
+                   site: Optional[SearchSite] = None) -> Dict[str, str]:
+    params = {
+        'q': query,
+        'lang': 'pt',
+        'output': 'xml',
+        'sort': 'YEAR_DESC',
+        'from': str(start + 1),   # a paginação do SciELO Search começa em 1
+        'count': str(count),
+    }
+    params.update(window.params())
+    if site is not None:
+        params.update(site.params)
+    return params
+
+
+def _http_open(params: dict, site: SearchSite, timeout: Optional[float] = None):
+    """GET na busca; consulta antes o cache em disco (como o coletor PubMed)."""
+    url = site.base_url() + "/"
+    cache = get_default_cache()
+    if cache is None:
+        return _network_open(url, params, site, timeout)
+    return cache.open(url, params, fetch=lambda: _network_open(url, params, site, timeout))
+
+
+def _network_open(url: str, params: dict, site: SearchSite,
+                  timeout: Optional[float] = None) -> PooledResponse:
+    site.limiter().acquire()
+    return get_default_pool().request("GET", url, params=params, timeout=timeout)
+
+
+SCIELO = SearchSite('Scielo', base_url=lambda: SCIELO_SEARCH_BASE, limiter=_get_rate_limiter)
+
+
+# ==================== PARSING ====================
+
+def _iter_parse_search(stream, window: DateWindow, meta: Dict,
+                       site: SearchSite = SCIELO) -> Iterator[Dict]:
+    """Percorre uma resposta XML da busca incrementalmente.
+
+    `meta['total']` recebe o numFound assim que o elemento <result> abre,
+    antes do primeiro registro. Registros fora da janela (meses recortados)
+    são descartados.
+    """
+    parent = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'result':
+                meta['total'] = int(elem.attrib.get('numFound', 0))
+                parent = elem
+            continue
+        if elem.tag == 'doc':
+            fields = _doc_fields(elem)
+            # libera o registro processado e o remove do <result>
+            elem.clear()
+            if parent is not None:
+                parent.clear()
+            if not window.contains(_first(fields, 'da')):
+                continue
+            article = _doc_to_article(fields, site)
+            if article is not None:
+                yield article
+
+
+def _doc_fields(doc: ET.Element) -> Dict[str, List[str]]:
+    """<doc> -> {nome do campo: [valores]} (campos simples viram lista de um item)."""
+    fields: Dict[str, List[str]] = {}
+    for child in doc:
+        name = child.attrib.get('name')
+        if not name:
+            continue
+        values = [child] if child.tag != 'arr' else list(child)
+        texts = [" ".join("".join(v.itertext()).split()) for v in values]
+        fields.setdefault(name, []).extend(t for t in texts if t)
+    return fields
+
+
+def _first(fields: Dict[str, List[str]], name: str) -> str:
+    values = fields.get(name)
+    return values[0] if values else ''
+
+
+def _localized(fields: Dict[str, List[str]], prefix: str) -> str:
+    """Primeiro valor de `prefix_pt`, `prefix_en`, `prefix_es` ou outro idioma qualquer."""
+    for lang in _LANGUAGES:
+        value = _first(fields, f"{prefix}_{lang}")
+        if value:
+            return value
+    for name in sorted(fields):
+        if name.startswith(prefix + "_") and fields[name]:
+            return fields[name][0]
+    return _first(fields, prefix)
+
+
+def _doc_to_article(fields: Dict[str, List[str]], site: SearchSite = SCIELO) -> Optional[Dict]:
+    """Converte os campos de um registro no dicionário de artigo (None se inválido)."""
+    pid = _first(fields, 'id')
+    title = _localized(fields, 'ti')
+    if not pid and not title:
+        return None
+
+    doi = _first(fields, 'doi')
+    affiliations = []
+    for text in fields.get('aff', []) + fields.get('aff_institution', []) + fields.get('af', []):
+        if text not in affiliations:
+            affiliations.append(text)
+    published = "".join(c for c in _first(fields, 'da') if c.isdigit())
+    year = published[:4] or _first(fields, 'year_cluster') or None
+
+    if doi:
+        url_link = f"https://doi.org/{doi}"
+    else:
+        url_link = _first(fields, 'ur')
+        if not url_link and pid:
+            url_link = f"{site.base_url()}/?q=id:{pid}"
+
+    return {
+        'title': title,
+        # nomes vêm como 'Sobrenome, Nome': ';' separa os autores
+        'authors': "; ".join(fields.get('au', [])),
+        'doi': doi,
+        'platform': site.platform,
+        'publication_date': year,
+        'abstract': _localized(fields, 'ab'),
+        'affiliations': affiliations,
+        'url': url_link,
+        'id': doi or pid,
+        'pmid': ''
+    }
+
+
+# ==================== PÁGINAS ====================
+
+def _fetch_page(query: str, window: DateWindow, start: int, count: int,
+                site: SearchSite = SCIELO) -> Tuple[int, List[Dict]]:
+    """Uma página da janela: (total da janela, artigos)."""
+    meta = {'total': 0}
+    with _http_open(_search_params(query, window, start, count, site), site) as resp:
+        articles = list(_iter_parse_search(resp, window, meta, site))
+    return meta['total'], articles
+
+
+def _fetch_page_or_error(query: str, window: DateWindow, start: int, count: int,
+                         site: SearchSite = SCIELO) -> Union[Tuple[int, List[Dict]], Exception]:
+    """Como `_fetch_page`, mas devolve a exceção da falha (as demais páginas seguem)."""
+    try:
+        return _fetch_page(query, window, start, count, site)
+    except Exception as e:
+        return e
+
+
+class HarvestError(Exception):
+    """Páginas da coleta falharam; as demais foram coletadas e entregues.
+
+    `failures` lista (janela, from, exceção) de cada página com falha;
+    `articles` traz os artigos coletados e `cursor`, em `harvest_date_windows`,
+    o cursor da coleta (as janelas com falha ficam de fora de `completed`).
+    """
+
+    def __init__(self, platform: str, failures: List[Tuple[str, int, Exception]], articles: List[Dict]):
+        self.failures = failures
+        self.articles = articles
+        self.cursor: Optional["WindowCursor"] = None
+        window, start, error = failures[0]
+        super().__init__(f"{platform}: {len(failures)} página(s) com falha "
+                         f"(janela {window}, from {start}: {error})")
+
+
+@dataclass
+class WindowCursor:
+    """Estado de uma coleta incremental por janelas de datas.
+
+    `completed` guarda as janelas fechadas (ver SCIELO_OPEN_YEARS) que foram
+    coletadas por inteiro, com a quantidade de registros. Passar o cursor de
+    volta a `harvest_date_windows` busca só as janelas abertas, as que
+    falharam e as que ainda não tinham sido coletadas.
+    """
+    query: str
+    completed: Dict[str, int] = field(default_factory=dict)
+
+    def pending(self, windows: List[DateWindow]) -> List[DateWindow]:
+        return [w for w in windows if w.key not in self.completed]
+
+
+def _harvest_windows(query: str, windows: List[DateWindow], max_results: Optional[int],
+                     page_size: int, workers: int, hooks: SearchHooks = NO_HOOKS,
+                     cursor: Optional[WindowCursor] = None,
+                     today: Optional[date] = None, site: SearchSite = SCIELO) -> List[Dict]:
+    """Coleta as janelas em ordem (da mais recente), com as páginas em paralelo.
+
+    1. primeiras páginas de todas as janelas ao mesmo tempo (dão os totais);
+    2. demais páginas, respeitando `max_results` na ordem das janelas;
+    3. entrega das páginas em ordem, com progresso e cancelamento entre páginas.
+
+    Uma página com falha é pulada (e a janela não entra no cursor); depois
+    de entregar as demais, a coleta levanta `HarvestError` com as falhas.
+    """
+    results: List[Dict] = []
+    failures: List[Tuple[str, int, Exception]] = []
+    if not windows:
+        return results
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="scielo")
+    try:
+        firsts = list(executor.map(lambda w: _fetch_page_or_error(query, w, 0, page_size, site), windows))
+
+        budget = max_results
+        plans = []  # (janela, primeira página, (from, future) das demais, registros previstos)
+        for window, first in zip(windows, firsts):
+            if isinstance(first, Exception):
+                plans.append((window, first, [], 0))
+                continue
+            total = min(first[0], SCIELO_WINDOW_MAX)
+            if budget is not None:
+                total = min(total, budget)
+                budget -= total
+            futures = [(start, executor.submit(_fetch_page_or_error, query, window, start, page_size, site))
+                       for start in range(page_size, total, page_size)]
+            plans.append((window, first, futures, total))
+
+        expected = sum(plan[3] for plan in plans)
+        pages_total = sum(1 + len(plan[2]) for plan in plans)
+        hooks.report(STAGE_IDS, expected, expected)
+
+        pages_done = 0
+        for window, first, futures, total in plans:
+            complete = True
+            # páginas em ordem, cada uma entregue assim que chega
+            pages = chain([(0, first)], ((start, f.result()) for start, f in futures))
+            collected = 0
+            for start, page in pages:
+                pages_done += 1
+                if isinstance(page, Exception):
+                    complete = False
+                    failures.append((window.key, start + 1, page))  # from começa em 1
+                    continue
+                articles = page[1][:max(0, total - collected)]
+                collected += len(articles)
+                results.extend(articles)
+                hooks.emit(articles)
+                hooks.report(STAGE_BATCHES, pages_done, pages_total)
+                hooks.report(STAGE_ARTICLES, len(results), expected)
+                if hooks.cancelled:
+                    return results
+            if cursor is not None and complete and window.closed(today):
+                cursor.completed[window.key] = collected
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    if failures:
+        raise HarvestError(site.platform, failures, results)
+    return results
+
+
+def harvest_date_windows(terms: Union[List[str], str], date_start: Optional[str] = None,
+                         date_end: Optional[str] = None, max_results: Optional[int] = None,
+                         max_workers: Optional[int] = None, page_size: int = SCIELO_PAGE_SIZE,
+                         cursor: Optional[WindowCursor] = None, hooks: Optional[SearchHooks] = None,
+                         today: Optional[date] = None) -> Tuple[List[Dict], Optional[WindowCursor]]:
+    """Coleta incremental por janelas anuais.
+
+    Args:
+        terms/date_start/date_end: iguais a `search_by_affiliation`.
+        max_results: limite de registros (None = todos, até SCIELO_WINDOW_MAX por janela).
+        cursor: cursor de uma coleta anterior da mesma query; as janelas já
+            concluídas são puladas e as novas entram nele.
+        today: data de referência para janelas abertas/fechadas (testes).
+
+    Returns:
+        Tupla (artigos das janelas buscadas, cursor); cursor é None se a query for vazia.
+
+    Raises:
+        HarvestError: alguma página falhou; `articles` e `cursor` trazem o que
+            foi coletado, e as janelas com falha são buscadas de novo na
+            próxima chamada com o mesmo cursor.
+    """
+    if max_workers is None:
+        max_workers = config.SCIELO_MAX_WORKERS
+    query = cursor.query if cursor is not None else _build_query(terms)
+    if not query:
+        return [], None
+    if cursor is None:
+        cursor = WindowCursor(query)
+    windows = cursor.pending(date_windows(date_start, date_end, today=today))
+    try:
+        results = _harvest_windows(query, windows, max_results, page_size, max_workers,
+                                   hooks or NO_HOOKS, cursor=cursor, today=today)
+    except HarvestError as e:
+        e.cursor = cursor
+        raise
+    return results, cursor
+
+
+def search_by_affiliation(terms: Union[List[str], str], date_start: Optional[str] = None,
+                          date_end: Optional[str] = None, max_results: int = 100,
+                          max_workers: Optional[int] = None, page_size: int = SCIELO_PAGE_SIZE,
+                          hooks: Optional[SearchHooks] = None) -> List[Dict]:
+    """Busca artigos no SciELO com os termos aplicados à afiliação dos autores.
+
+    Args:
+        terms: Lista de termos ou string (quando for string será usada tal qual na query)
+        date_start/date_end: strings no formato 'dd/MM/YYYY' (opcionais)
+        max_results: número máximo de registros (somando as janelas)
+        max_workers: páginas buscadas em paralelo (padrão: config.SCIELO_MAX_WORKERS)
+        page_size: registros por requisição
+        hooks: progresso, resultados parciais por página e cancelamento; ver
+            `processing.collectors.progress.SearchHooks`.
+
+    Returns:
+        Lista de dicionários representando artigos (mais recentes primeiro).
+
+    Raises:
+        HarvestError: alguma página falhou (rede/HTTP); as demais foram
+            entregues pelos hooks e estão em `articles`. No plugin a falha
+            chega a `PlatformResult.error` no orquestrador.
+    """
+    query = _build_query(terms)
+    if not query:
+        return []
+    if max_workers is None:
+        max_workers = config.SCIELO_MAX_WORKERS
+    return _harvest_windows(query, date_windows(date_start, date_end), max_results,
+                            page_size, max_workers, hooks or NO_HOOKS)
+
+
+class ScieloCollector(CollectorPlugin):
+    """Plataforma 'Scielo' do registro de coletores (processing/collectors/registry.py)."""
+
+    name = 'Scielo'
+    capabilities = frozenset({CAP_AFFILIATION, CAP_DATE_RANGE, CAP_ABSTRACT, CAP_AFFILIATIONS})
+
+    @property
+    def rate_limit(self) -> float:
+        return config.SCIELO_RATE
+
+    def limiter(self) -> TokenBucket:
+        return _get_rate_limiter()
+
+    def fetch(self, request: SearchRequest, hooks: SearchHooks = NO_HOOKS) -> Iterator[List[Dict]]:
+        return stream_batches(
+            lambda inner: search_by_affiliation(request.terms, date_start=request.date_start,
+                                                date_end=request.date_end,
+                                                max_results=request.max_results, hooks=inner),
+            hooks)
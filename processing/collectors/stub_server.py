@@ -0,0 +1,295 @@
+"""
+Servidor HTTP local para testes e benchmarks dos coletores.
+
+Sobe um `ThreadingHTTPServer` em 127.0.0.1 (porta livre) que responde a rotas
+configuráveis, com latência artificial opcional para simular a rede e
+compressão gzip opcional. Conta as conexões TCP aceitas, o que permite medir
+o reaproveitamento de conexões keep-alive. Inclui
+rotas sintéticas das E-utilities (esearch/efetch) para exercitar o coletor
+PubMed sem acessar o NCBI, rotas sintéticas da busca do SciELO e rotas que
+servem respostas fixas salvas em disco (`replay_routes`).
+
+Uso:
+    with StubHTTPServer(eutils_routes(total_hits=500), latency=0.2) as server:
+        pubmed.PUBMED_EUTILS_BASE = server.base_url
+        ...
+    with StubHTTPServer(replay_routes(FIXTURES_DIR / "scielo_synthetic")) as server:
+        scielo.SCIELO_SEARCH_BASE = server.base_url
+"""
+
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Uma rota recebe (path, query) e devolve (status, content_type, corpo)
+Route = Callable[[str, Dict[str, str]], Tuple[int, str, bytes]]
+
+# Respostas fixas usadas pelos testes (um subdiretório por conjunto). As de
+# scielo_synthetic/ foram escritas à mão no formato da busca do SciELO
+# (campos, QTime e URLs inventados); não são capturas do servidor real.
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Parâmetros ignorados ao comparar uma requisição com as do índice
+REPLAY_IGNORED_PARAMS = ('api_key',)
+
+
+class StubHTTPServer:
+    """Servidor HTTP de teste com rotas fixas e contador de requisições."""
+
+    def __init__(self, routes: Dict[str, Route], latency: float = 0.0, gzip_responses: bool = False):
+        self.routes = routes
+        self.latency = latency
+        self.gzip_responses = gzip_responses
+        self.connections = 0
+        self.requests: List[str] = []
+        # (caminho, formulário) de cada POST; em `requests` entra só o caminho
+        self.posts: List[Tuple[str, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return len(self.requests)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                with server._lock:
+                    server.requests.append(self.path)
+                self._respond(parsed, query)
+
+            def do_POST(self):
+                # formulário no corpo (application/x-www-form-urlencoded), como no efetch/epost
+                parsed = urllib.parse.urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                form = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode("utf-8")))
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                query.update(form)
+                with server._lock:
+                    server.requests.append(self.path)
+                    server.posts.append((parsed.path, form))
+                self._respond(parsed, query)
+
+            def _respond(self, parsed, query):
+                if server.latency:
+                    time.sleep(server.latency)
+                route = server.routes.get(parsed.path)
+                if route is None:
+                    status, ctype, body = 404, "text/plain", b"not found"
+                else:
+                    status, ctype, body = route(parsed.path, query)
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                if server.gzip_responses and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+# ==================== ROTAS SINTÉTICAS: E-UTILITIES ====================
+
+def _pubmed_article_xml(pmid: str) -> str:
+    return (
+        "<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+        "<Journal><JournalIssue><PubDate><Year>2023</Year></PubDate></JournalIssue></Journal>"
+        "<ArticleTitle>Artigo sintético {pmid}</ArticleTitle>"
+        "<Abstract><AbstractText>Resumo do artigo {pmid}.</AbstractText></Abstract>"
+        "<AuthorList><Author><LastName>Silva</LastName><Initials>A</Initials>"
+        "<AffiliationInfo><Affiliation>Hospital das Clinicas, Universidade Federal de Pernambuco, Recife, Brazil.</Affiliation></AffiliationInfo>"
+        "</Author></AuthorList>"
+        "</Article></MedlineCitation><PubmedData><ArticleIdList>"
+        "<ArticleId IdType=\"pubmed\">{pmid}</ArticleId>"
+        "<ArticleId IdType=\"doi\">10.5555/stub.{pmid}</ArticleId>"
+        "</ArticleIdList></PubmedData></PubmedArticle>"
+    ).format(pmid=pmid)
+
+
+def eutils_routes(total_hits: int = 200, first_pmid: int = 30000000,
+                  fail_once: Iterable[int] = ()) -> Dict[str, Route]:
+    """Rotas /esearch.fcgi e /efetch.fcgi com `total_hits` PMIDs sintéticos.
+
+    Suporta o modo history server (usehistory=y / WebEnv + retstart). Os
+    retstart listados em `fail_once` respondem HTTP 500 na primeira vez,
+    para simular falhas transitórias e testar a retomada da coleta.
+    """
+    all_ids = [str(first_pmid + i) for i in range(total_hits)]
+    pending_failures = set(fail_once)
+    lock = threading.Lock()
+
+    def esearch(path, query):
+        retmax = int(query.get("retmax", 20))
+        retstart = int(query.get("retstart", 0))
+        data = {"esearchresult": {
+            "count": str(total_hits),
+            "retmax": str(retmax),
+            "retstart": str(retstart),
+            "idlist": all_ids[retstart:retstart + retmax],
+        }}
+        if query.get("usehistory") == "y":
+            data["esearchresult"]["webenv"] = "MCID_STUB"
+            data["esearchresult"]["querykey"] = "1"
+        return 200, "application/json", json.dumps(data).encode("utf-8")
+
+    def efetch(path, query):
+        if "WebEnv" in query:
+            retstart = int(query.get("retstart", 0))
+            retmax = int(query.get("retmax", 20))
+            with lock:
+                if retstart in pending_failures:
+                    pending_failures.discard(retstart)
+                    return 500, "text/plain", b"stub failure"
+            ids = all_ids[retstart:retstart + retmax]
+        else:
+            ids = [i for i in query.get("id", "").split(",") if i]
+        body = "<?xml version=\"1.0\" ?><PubmedArticleSet>"
+        body += "".join(_pubmed_article_xml(pmid) for pmid in ids)
+        body += "</PubmedArticleSet>"
+        return 200, "text/xml", body.encode("utf-8")
+
+    return {"/esearch.fcgi": esearch, "/efetch.fcgi": efetch}
+
+
+# ==================== ROTAS SINTÉTICAS: SciELO ====================
+
+def _scielo_doc_xml(year: int, n: int) -> str:
+    pid = f"S0100-{year}{n:06d}"
+    return (
+        "<doc><str name=\"id\">{pid}-scl</str>"
+        "<arr name=\"ti_pt\"><str>Artigo SciELO sintético {year} {n}</str></arr>"
+        "<arr name=\"ti_en\"><str>Synthetic SciELO article {year} {n}</str></arr>"
+        "<arr name=\"au\"><str>Souza, Beatriz</str><str>Lima, Carlos</str></arr>"
+        "<arr name=\"aff\"><str>Hospital das Clínicas, Universidade Federal de Pernambuco, Recife, Brasil</str></arr>"
+        "<str name=\"doi\">10.1590/stub.{year}.{n}</str>"
+        "<str name=\"da\">{year}-{month:02d}</str>"
+        "<arr name=\"ab_pt\"><str>Resumo do artigo {n}.</str></arr>"
+        "</doc>"
+    ).format(pid=pid, year=year, n=n, month=n % 12 + 1)
+
+
+def scielo_routes(hits_per_year: Dict[int, int],
+                  fail_once: Iterable[Tuple[int, int]] = ()) -> Dict[str, Route]:
+    """Rota / da busca do SciELO (output=xml) com `hits_per_year` registros por ano.
+
+    Pagina com from (a partir de 1) e count; filtra por `filter[year_cluster][]`
+    (sem filtro, devolve todos os anos, do mais recente). Os pares (ano, from)
+    de `fail_once` respondem HTTP 500 na primeira vez.
+    """
+    pending_failures = set(fail_once)
+    lock = threading.Lock()
+
+    def search(path, query):
+        year = query.get("filter[year_cluster][]")
+        start = int(query.get("from", 1))
+        count = int(query.get("count", 10))
+        with lock:
+            if (int(year or 0), start) in pending_failures:
+                pending_failures.discard((int(year or 0), start))
+                return 500, "text/plain", b"stub failure"
+        years = [int(year)] if year else sorted(hits_per_year, reverse=True)
+        docs = [(y, n) for y in years for n in range(hits_per_year.get(y, 0))]
+        page = docs[start - 1:start - 1 + count]
+        body = "<?xml version=\"1.0\" encoding=\"UTF-8\"?><response>"
+        body += f"<result name=\"response\" numFound=\"{len(docs)}\" start=\"{start - 1}\">"
+        body += "".join(_scielo_doc_xml(y, n) for y, n in page)
+        body += "</result></response>"
+        return 200, "text/xml; charset=utf-8", body.encode("utf-8")
+
+    return {"/": search}
+
+
+# ==================== RESPOSTAS FIXAS ====================
+
+def _replay_key(query: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in query.items() if k not in REPLAY_IGNORED_PARAMS))
+
+
+def replay_routes(directory) -> Dict[str, Route]:
+    """Rotas que devolvem as respostas salvas em `directory`.
+
+    `directory/index.json` lista as requisições conhecidas:
+        [{"path": "/", "query": {...}, "status": 200,
+          "content_type": "text/xml", "body": "pagina1.xml"}, ...]
+    Uma requisição sem entrada com a mesma rota e os mesmos parâmetros
+    (em qualquer ordem) recebe 404. As respostas podem ser sintéticas
+    (ex.: FIXTURES_DIR / "scielo_synthetic") ou capturadas com `save_recording`.
+    """
+    directory = Path(directory)
+    entries = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+    responses: Dict[str, Dict] = {}
+    for entry in entries:
+        body = (directory / entry["body"]).read_bytes()
+        responses.setdefault(entry["path"], {})[_replay_key(entry["query"])] = (
+            entry.get("status", 200), entry.get("content_type", "application/octet-stream"), body)
+
+    def route(path, query):
+        recorded = responses.get(path, {}).get(_replay_key(query))
+        if recorded is None:
+            return 404, "text/plain", b"no fixture for request"
+        return recorded
+
+    return {path: route for path in responses}
+
+
+def save_recording(directory, path: str, query: Dict[str, str], body: bytes,
+                   status: int = 200, content_type: str = "text/xml",
+                   name: Optional[str] = None) -> Path:
+    """Acrescenta a `directory` uma resposta capturada de um servidor real."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    index_path = directory / "index.json"
+    entries = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else []
+    name = name or f"response_{len(entries) + 1}.xml"
+    (directory / name).write_bytes(body)
+    entries.append({"path": path, "query": dict(query), "status": status,
+                    "content_type": content_type, "body": name})
+    index_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+    return directory / name
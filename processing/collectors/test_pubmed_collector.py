@@ -0,0 +1,358 @@
+"""
+Testes e benchmark do coletor PubMed contra um servidor E-utilities local.
+
+Uso:
+    python -m processing.collectors.test_pubmed_collector
+"""
+
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from contextlib import contextmanager
+
+from processing.collectors import http_pool, pubmed, record_store, response_cache
+from processing.collectors.progress import STAGE_ARTICLES, STAGE_BATCHES, STAGE_IDS, SearchHooks
+from processing.collectors.record_store import RecordStore
+from processing.collectors.response_cache import CacheMiss, ResponseCache
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.stub_server import StubHTTPServer, eutils_routes, _pubmed_article_xml
+
+
+@contextmanager
+def _stub_eutils(latency=0.0, rate=50.0, gzip_responses=False, cache=None, store=None,
+                 **route_options):
+    """Aponta o coletor para um stub local (com pool HTTP novo) durante o bloco.
+
+    O cache de respostas e o armazenamento de registros ficam desativados, a
+    menos que `cache`/`store` sejam informados.
+    """
+    original_base = pubmed.PUBMED_EUTILS_BASE
+    original_limiter = pubmed._rate_limiter
+    original_pool = http_pool._default_pool
+    original_cache = response_cache.set_default_cache(cache)
+    original_store = record_store.set_default_store(store)
+    try:
+        with StubHTTPServer(eutils_routes(**route_options), latency=latency,
+                            gzip_responses=gzip_responses) as server:
+            pubmed.PUBMED_EUTILS_BASE = server.base_url
+            pubmed._rate_limiter = TokenBucket(rate)
+            http_pool._default_pool = http_pool.ConnectionPool()
+            yield server
+    finally:
+        response_cache.set_default_cache(original_cache)
+        record_store.set_default_store(original_store)
+        if http_pool._default_pool is not original_pool:
+            http_pool._default_pool.close()
+        http_pool._default_pool = original_pool
+        pubmed.PUBMED_EUTILS_BASE = original_base
+        pubmed._rate_limiter = original_limiter
+
+
+def _timed_search(total_hits, latency, max_workers):
+    with _stub_eutils(latency=latency, total_hits=total_hits):
+        start = time.perf_counter()
+        results = pubmed.search_by_affiliation(["HC UFPE"], max_results=total_hits,
+                                               max_workers=max_workers)
+        return results, time.perf_counter() - start
+
+
+def test_token_bucket_respects_rate():
+    """11 fichas a 20/s precisam de pelo menos ~0,5 s."""
+    bucket = TokenBucket(20.0)
+    start = time.perf_counter()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+    assert elapsed >= 0.45, elapsed
+
+
+def test_concurrent_matches_serial_and_is_faster():
+    serial, t_serial = _timed_search(total_hits=800, latency=0.15, max_workers=1)
+    concurrent, t_concurrent = _timed_search(total_hits=800, latency=0.15, max_workers=4)
+
+    print(f"\n   Serial:     {len(serial)} artigos em {t_serial:.2f}s")
+    print(f"   Concorrente: {len(concurrent)} artigos em {t_concurrent:.2f}s")
+
+    assert len(serial) == 800
+    assert concurrent == serial  # mesma forma e mesma ordem
+    assert set(serial[0]) >= {'title', 'authors', 'doi', 'platform', 'publication_date',
+                              'abstract', 'url', 'id', 'affiliations'}
+    assert serial[0]['affiliations'] == [
+        "Hospital das Clinicas, Universidade Federal de Pernambuco, Recife, Brazil."]
+    assert t_concurrent < t_serial
+
+
+def test_history_mode_pages_without_id_lists():
+    with _stub_eutils(total_hits=1200) as server:
+        results = pubmed.search_by_affiliation(["HC UFPE"], max_results=5000, use_history=True)
+        efetch_paths = [p for p in server.requests if p.startswith("/efetch.fcgi")]
+
+    assert len(results) == 1200  # passa do antigo teto de 200 da interface
+    assert all("WebEnv=" in p and "id=" not in p for p in efetch_paths)
+    assert len(efetch_paths) == 1200 // pubmed.PUBMED_HISTORY_PAGE_SIZE
+
+
+def test_history_mode_resumes_from_last_retstart():
+    with _stub_eutils(total_hits=300, fail_once=[150]):
+        first, cursor = pubmed.search_by_affiliation_history(["HC UFPE"], page_size=50, max_workers=1)
+        assert cursor.retstart == 150 and not cursor.done
+        rest, cursor = pubmed.search_by_affiliation_history(None, page_size=50, cursor=cursor)
+
+    assert cursor.done
+    pmids = [r['url'] for r in first + rest]
+    assert len(pmids) == 300 and len(set(pmids)) == 300
+
+
+class _LazyEfetchStream:
+    """Arquivo que gera o XML do efetch sob demanda (sem materializar o corpo)."""
+
+    def __init__(self, count):
+        self._chunks = self._generate(count)
+
+    @staticmethod
+    def _generate(count):
+        yield b"<PubmedArticleSet>"
+        for i in range(count):
+            yield _pubmed_article_xml(str(40000000 + i)).encode("utf-8")
+        yield b"</PubmedArticleSet>"
+
+    def read(self, size=-1):
+        return next(self._chunks, b"")
+
+
+def _peak_memory_streaming(count):
+    tracemalloc.start()
+    parsed = 0
+    for _article in pubmed._iter_parse_efetch(_LazyEfetchStream(count)):
+        parsed += 1
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert parsed == count
+    return peak
+
+
+def test_streaming_parser_matches_list_and_keeps_memory_flat():
+    with _stub_eutils(total_hits=50):
+        ids = [str(30000000 + i) for i in range(50)]
+        streamed = list(pubmed.iter_efetch_summaries(ids))
+        assert streamed == pubmed._efetch_summaries(ids)
+        assert len(streamed) == 50
+
+    small = _peak_memory_streaming(200)
+    large = _peak_memory_streaming(4000)
+    print(f"\n   Pico de memória: 200 artigos={small/1024:.0f} KiB, 4000 artigos={large/1024:.0f} KiB")
+    assert large < small * 2
+
+
+def test_connection_pool_reuses_connections_and_decodes_gzip():
+    with _stub_eutils(total_hits=500, gzip_responses=True) as server:
+        results = pubmed.search_by_affiliation(["HC UFPE"], max_results=500, max_workers=1)
+        stats = pubmed.connection_stats()
+        accepted = server.connections
+
+    print(f"\n   Pool HTTP: {stats['requests']} requisições, "
+          f"{stats['connections_created']} conexões criadas, {stats['connections_reused']} reutilizadas")
+    assert len(results) == 500 and results[0]['title'].startswith("Artigo sintético")
+    assert stats['requests'] == 6  # 1 esearch + 5 efetch
+    assert stats['connections_created'] == 1 and accepted == 1
+    assert stats['connections_reused'] == 5
+
+
+class _DeadConnection:
+    """Conexão falsa cujo envio falha como uma conexão keep-alive fechada pelo servidor."""
+
+    def __init__(self):
+        self.sock = None
+        self.closed = False
+
+    def request(self, method, path, body=None, headers=None):
+        raise ConnectionResetError("conexão fechada pelo servidor")
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_pool_retry_closes_connections_and_skips_post():
+    key = ("http", "127.0.0.1", 80)
+    created = []
+
+    class Pool(http_pool.ConnectionPool):
+        def _new_connection(self, key):
+            created.append(_DeadConnection())
+            return created[-1]
+
+    for method, retried in (("GET", True), ("POST", False)):
+        created.clear()
+        pool = Pool()
+        idle = _DeadConnection()
+        pool._idle[key] = [idle]
+        try:
+            pool.request(method, "http://127.0.0.1/efetch.fcgi", body=b"id=1")
+        except ConnectionResetError:
+            pass
+        else:
+            raise AssertionError("a falha deveria chegar a quem chamou")
+        # a conexão da nova tentativa também é fechada quando falha
+        assert idle.closed and all(conn.closed for conn in created)
+        assert len(created) == (1 if retried else 0), method
+        assert pool.stats()['stale_retries'] == (1 if retried else 0)
+
+
+@contextmanager
+def _temp_cache(**options):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.db"), **options)
+        try:
+            yield cache
+        finally:
+            cache.close()
+
+
+def test_response_cache_serves_repeated_searches_and_offline_mode():
+    with _temp_cache(max_bytes=10 * 1024 * 1024) as cache:
+        with _stub_eutils(total_hits=300, cache=cache) as server:
+            first = pubmed.search_by_affiliation(["HC UFPE"], max_results=300)
+            requests_first = server.request_count
+            second = pubmed.search_by_affiliation(["HC UFPE"], max_results=300)
+            requests_second = server.request_count - requests_first
+
+            # modo somente cache: nada vai ao servidor, nem a busca em modo history
+            cache.offline = True
+            offline = pubmed.search_by_affiliation(["HC UFPE"], max_results=300, use_history=True)
+            try:
+                pubmed._esearch_affiliation("termo nunca buscado")
+                raise AssertionError("esperado CacheMiss")
+            except CacheMiss:
+                pass
+            requests_offline = server.request_count - requests_first - requests_second
+            stats = cache.stats()
+
+    print(f"\n   Cache: {requests_first} requisições na 1ª busca, {requests_second} na 2ª; "
+          f"{stats['entries']} entradas, {stats['bytes'] / 1024:.0f} KiB")
+    assert requests_first == 4 and requests_second == 0 and requests_offline == 0
+    assert [a['id'] for a in first] == [a['id'] for a in second] == [a['id'] for a in offline]
+    assert stats['hits'] >= 8
+
+
+def test_response_cache_ttl_and_lru_eviction():
+    now = [1000.0]
+    with _temp_cache(max_bytes=2500, ttls={'esearch.fcgi': 60}, default_ttl=3600,
+                     clock=lambda: now[0]) as cache:
+        url = "https://example.org/eutils/esearch.fcgi"
+        key = cache.make_key(url, {'term': 'a', 'db': 'pubmed'})
+        assert key == cache.make_key(url + "/", {'db': 'pubmed', 'term': 'a', 'api_key': 'x'})
+        cache.put(key, url, zlib.compress(b"resultado"))
+        now[0] += 59
+        assert cache.get(key) is not None
+        now[0] += 2
+        assert cache.get(key) is None  # TTL do esearch venceu
+
+        # blobs de 1000 bytes (incompressíveis): o terceiro despeja o menos usado
+        efetch = "https://example.org/eutils/efetch.fcgi"
+        for name in ("a", "b"):
+            now[0] += 1
+            cache.put(name, efetch, os.urandom(1000))
+        now[0] += 1
+        cache.get("a")  # "a" passa a ser o mais recente
+        now[0] += 1
+        cache.put("c", efetch, os.urandom(1000))
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.get("b") is None
+        assert cache.stats()['bytes'] <= 2500
+
+
+def test_record_store_fetches_only_new_and_stale_pmids():
+    now = [1000.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RecordStore(os.path.join(tmp, "records.db"), max_age=3600, clock=lambda: now[0])
+        try:
+            with _stub_eutils(total_hits=1000, latency=0.1, store=store) as server:
+                start = time.perf_counter()
+                first = pubmed.search_by_affiliation(["HC UFPE"], max_results=1000, max_workers=1)
+                t_first = time.perf_counter() - start
+                requests_first = server.request_count
+
+                start = time.perf_counter()
+                again = pubmed.search_by_affiliation(["HC UFPE"], max_results=1000, max_workers=1)
+                t_again = time.perf_counter() - start
+                requests_again = server.request_count - requests_first
+
+            # 50 PMIDs novos no topo do esearch (history server): só eles vão ao
+            # efetch, num POST, sem lista de PMIDs na URL
+            with _stub_eutils(total_hits=1050, first_pmid=29999950, store=store) as server:
+                grown = pubmed.search_by_affiliation(["HC UFPE"], max_results=1050, use_history=True)
+                grown_paths = list(server.requests)
+                posted = list(server.posts)
+
+            # registros vencidos são buscados de novo; sem nenhum conhecido, pelo WebEnv
+            now[0] += 3601
+            with _stub_eutils(total_hits=1000, store=store) as server:
+                stale = pubmed.search_by_affiliation(["HC UFPE"], max_results=1000, use_history=True)
+                stale_paths = list(server.requests)
+        finally:
+            store.close()
+
+    print(f"\n   Armazenamento: 1ª busca {requests_first} req/{t_first:.2f}s, "
+          f"repetida {requests_again} req/{t_again:.2f}s")
+    assert requests_first == 11 and requests_again == 1  # repetida: só o esearch
+    assert [a['id'] for a in again] == [a['id'] for a in first]
+    assert t_again * 5 < t_first
+    assert len(grown) == 1050 and grown[0]['pmid'] == "29999950"
+    assert "usehistory=y" in grown_paths[0] and "id=" not in "".join(grown_paths)
+    assert [path for path, _form in posted] == ["/efetch.fcgi"]
+    assert posted[0][1]['id'].split(",") == [str(29999950 + i) for i in range(50)]
+    assert len(stale) == 1000 and [a['pmid'] for a in stale] == [a['pmid'] for a in first]
+    assert len(stale_paths) == 1 + 1000 // pubmed.PUBMED_HISTORY_PAGE_SIZE
+    assert all("WebEnv=" in p for p in stale_paths[1:])
+
+
+def test_hooks_report_progress_partial_results_and_cancel():
+    events, batches = [], []
+    hooks = SearchHooks(progress=lambda *event: events.append(event), on_batch=batches.append)
+    with _stub_eutils(total_hits=500):
+        results = pubmed.search_by_affiliation(["HC UFPE"], max_results=500, max_workers=2, hooks=hooks)
+
+    assert events[0] == (STAGE_IDS, 500, 500)
+    assert (STAGE_BATCHES, 5, 5) in events and events[-1] == (STAGE_ARTICLES, 500, 500)
+    assert [a for batch in batches for a in batch] == results
+
+    # cancelamento no 2º lote: a busca devolve o que já foi coletado
+    cancel = threading.Event()
+    partial = []
+
+    def on_batch(articles):
+        partial.extend(articles)
+        if len(partial) >= 200:
+            cancel.set()
+
+    hooks = SearchHooks(on_batch=on_batch, cancel_event=cancel)
+    with _stub_eutils(total_hits=1000, latency=0.05) as server:
+        cancelled = pubmed.search_by_affiliation(["HC UFPE"], max_results=1000, max_workers=1, hooks=hooks)
+        requests = server.request_count
+    assert len(cancelled) == 200 and cancelled == partial
+    assert requests == 3  # esearch + 2 lotes efetch
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: coletor PubMed (servidor local)")
+    print("=" * 60)
+    test_token_bucket_respects_rate()
+    test_concurrent_matches_serial_and_is_faster()
+    test_history_mode_pages_without_id_lists()
+    test_history_mode_resumes_from_last_retstart()
+    test_streaming_parser_matches_list_and_keeps_memory_flat()
+    test_connection_pool_reuses_connections_and_decodes_gzip()
+    test_connection_pool_retry_closes_connections_and_skips_post()
+    test_response_cache_serves_repeated_searches_and_offline_mode()
+    test_response_cache_ttl_and_lru_eviction()
+    test_record_store_fetches_only_new_and_stale_pmids()
+    test_hooks_report_progress_partial_results_and_cancel()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Testes do registro de coletores e do contrato CollectorPlugin (servidor local).
+
+Uso:
+    python -m processing.collectors.test_registry
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import config
+from core.orchestrator import run_search
+from processing.collectors import other_bases, pubmed, registry, response_cache
+from processing.collectors.plugin import CAP_DATE_RANGE, CollectorPlugin, SearchRequest
+from processing.collectors.progress import SearchHooks
+from processing.collectors.response_cache import ResponseCache
+from processing.collectors.stub_server import StubHTTPServer, scielo_routes
+from processing.collectors.test_pubmed_collector import _stub_eutils
+
+
+class _PagedBase(CollectorPlugin):
+    """Base fictícia: 5 páginas de 10 registros por `open`."""
+
+    name = 'Base Teste'
+    rate_limit = 20.0
+    capabilities = frozenset({CAP_DATE_RANGE})
+    base_url = ''
+
+    def fetch(self, request, hooks):
+        for page in range(5):
+            with self.open(self.base_url + "/pagina", {'q': request.terms, 'p': page}) as resp:
+                count = int(resp.read())
+            yield [{'title': f"Registro {page}-{n}", 'doi': f"10.1/{page}.{n}", 'platform': self.name}
+                   for n in range(count)]
+
+
+def _page_route(path, query):
+    return 200, "text/plain", b"10"
+
+
+@contextmanager
+def _registered(name, target):
+    registry.register(name, target)
+    try:
+        yield
+    finally:
+        registry.unregister(name)
+
+
+def test_listing_platforms_does_not_import_collectors():
+    code = ("import sys; from processing.collectors import registry; print(registry.platforms()); "
+            "print([m for m in ('processing.collectors.pubmed', 'processing.collectors.scielo', "
+            "'processing.collectors.other_bases') if m in sys.modules])")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=str(config.BASE_DIR), check=True).stdout.splitlines()
+    assert out == ["['Scielo', 'PubMed', 'Lilacs']", "[]"]
+
+    with _registered('Quebrada', 'processing.collectors.nao_existe:Coletor'):
+        assert registry.get_collector('Quebrada') is None
+        assert 'Quebrada' in registry.platforms()
+    assert registry.platforms(CAP_DATE_RANGE) == ['Scielo', 'PubMed', 'Lilacs']
+
+
+def test_plugin_gets_rate_limit_cache_and_metrics():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.db"), max_bytes=1024 * 1024)
+        previous = response_cache.set_default_cache(cache)
+        try:
+            with StubHTTPServer({"/pagina": _page_route}) as server:
+                plugin = _PagedBase()
+                plugin.base_url = server.base_url
+                batches = []
+                start = time.perf_counter()
+                first = plugin.collect("HC UFPE", hooks=SearchHooks(on_batch=batches.append))
+                elapsed = time.perf_counter() - start
+                second = plugin.collect("HC UFPE")
+                requests = server.request_count
+        finally:
+            response_cache.set_default_cache(previous)
+            cache.close()
+
+    assert len(first) == 50 and [a for b in batches for a in b] == first == second
+    assert elapsed >= 0.18          # 5 requisições a 20/s
+    assert requests == 5            # a 2ª busca veio do cache
+    stats = plugin.stats()
+    assert (stats['searches'], stats['batches'], stats['records'], stats['errors']) == (2, 10, 100, 0)
+
+
+def test_async_search_runs_platforms_concurrently():
+    class _Slow(CollectorPlugin):
+        def fetch(self, request, hooks):
+            for n in range(3):
+                time.sleep(0.1)
+                yield [{'title': f"{self.name} {n}"}]
+
+    plugins = []
+    for name in ('A', 'B', 'C'):
+        plugin = _Slow()
+        plugin.name = name
+        plugins.append(plugin)
+
+    async def gather():
+        request = SearchRequest(["HC UFPE"])
+        return await asyncio.gather(*(p.search(request) for p in plugins))
+
+    start = time.perf_counter()
+    results = asyncio.run(gather())
+    elapsed = time.perf_counter() - start
+    assert [len(r) for r in results] == [3, 3, 3]
+    assert elapsed < 0.6  # em sequência seriam 0,9s
+
+
+def test_orchestrator_discovers_registered_platforms():
+    with StubHTTPServer({"/pagina": _page_route}) as server:
+        plugin = _PagedBase()
+        plugin.base_url = server.base_url
+        previous = response_cache.set_default_cache(None)
+        try:
+            with _registered('Base Teste', plugin):
+                outcome = run_search(["HC UFPE"], ['Base Teste', 'Capes Periódicos'])
+        finally:
+            response_cache.set_default_cache(previous)
+
+    assert outcome.platforms['Base Teste'].added == 50
+    assert outcome.platforms['Capes Periódicos'].error == "coletor indisponível"
+
+
+def test_builtin_collectors_share_the_contract():
+    streamed = []
+    with _stub_eutils(total_hits=300):
+        collected = registry.get_collector('PubMed').collect(
+            ["HC UFPE"], max_results=300, hooks=SearchHooks(on_batch=streamed.extend))
+        direct = pubmed.search_by_affiliation(["HC UFPE"], max_results=300, use_history=True)
+    assert collected == direct == streamed and len(collected) == 300
+
+    lilacs = registry.get_collector('Lilacs')
+    original = other_bases.LILACS_SEARCH_BASE
+    previous = response_cache.set_default_cache(None)
+    try:
+        with StubHTTPServer(scielo_routes({2023: 150, 2024: 30})) as server:
+            other_bases.LILACS_SEARCH_BASE = server.base_url
+            records = lilacs.collect(["HC UFPE"], "01/01/2023", "31/12/2024", 500)
+            paths = list(server.requests)
+    finally:
+        other_bases.LILACS_SEARCH_BASE = original
+        response_cache.set_default_cache(previous)
+    assert len(records) == 180 and {r['platform'] for r in records} == {'Lilacs'}
+    assert all("filter%5Bdb%5D%5B%5D=LILACS" in p and "af%3A" in p for p in paths)
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: registro de coletores")
+    print("=" * 60)
+    test_listing_platforms_does_not_import_collectors()
+    test_plugin_gets_rate_limit_cache_and_metrics()
+    test_async_search_runs_platforms_concurrently()
+    test_orchestrator_discovers_registered_platforms()
+    test_builtin_collectors_share_the_contract()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Testes e benchmark do coletor SciELO contra um servidor de busca local.
+
+Uso:
+    python -m processing.collectors.test_scielo_collector
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date
+
+from processing.collectors import http_pool, record_store, response_cache, scielo
+from processing.collectors.progress import STAGE_ARTICLES, STAGE_IDS, SearchHooks
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.stub_server import (
+    FIXTURES_DIR, StubHTTPServer, _scielo_doc_xml, replay_routes, scielo_routes,
+)
+
+TODAY = date(2026, 10, 17)
+
+
+@contextmanager
+def _stub_scielo(routes, latency=0.0, rate=50.0):
+    """Aponta o coletor para um servidor local (pool HTTP novo, sem cache) durante o bloco."""
+    original_base = scielo.SCIELO_SEARCH_BASE
+    original_limiter = scielo._rate_limiter
+    original_pool = http_pool._default_pool
+    original_cache = response_cache.set_default_cache(None)
+    original_store = record_store.set_default_store(None)
+    try:
+        with StubHTTPServer(routes, latency=latency) as server:
+            scielo.SCIELO_SEARCH_BASE = server.base_url
+            scielo._rate_limiter = TokenBucket(rate)
+            http_pool._default_pool = http_pool.ConnectionPool()
+            yield server
+    finally:
+        response_cache.set_default_cache(original_cache)
+        record_store.set_default_store(original_store)
+        if http_pool._default_pool is not original_pool:
+            http_pool._default_pool.close()
+        http_pool._default_pool = original_pool
+        scielo.SCIELO_SEARCH_BASE = original_base
+        scielo._rate_limiter = original_limiter
+
+
+def _years_requested(server):
+    return sorted(int(p.split("year_cluster%5D%5B%5D=")[1].split("&")[0])
+                  for p in server.requests if "year_cluster" in p)
+
+
+def test_synthetic_fixtures_match_pubmed_record_shape():
+    # respostas escritas à mão no formato da busca do SciELO (não capturadas)
+    with _stub_scielo(replay_routes(FIXTURES_DIR / "scielo_synthetic")) as server:
+        results = scielo.search_by_affiliation(["Hospital das Clinicas", "HC UFPE"], "01/01/2023",
+                                               "31/12/2023", page_size=2)
+        requests = server.request_count
+
+    assert requests == 2 and len(results) == 3
+    first, no_doi, spanish = results
+    assert set(first) == {'title', 'authors', 'doi', 'platform', 'publication_date', 'abstract',
+                          'url', 'id', 'pmid', 'affiliations'}
+    assert first['title'].startswith("Mortalidade neonatal") and first['platform'] == 'Scielo'
+    assert first['authors'] == "Silva, Ana Paula; Souza, Bruno"
+    assert first['id'] == first['doi'] == "10.1590/0102-311X00123422"
+    assert first['url'] == "https://doi.org/10.1590/0102-311X00123422"
+    assert first['publication_date'] == "2023" and first['abstract'].startswith("Estudo de coorte")
+    assert len(first['affiliations']) == 2 and first['pmid'] == ''
+    assert no_doi['id'] == "S1519-38292023000100045-scl" and no_doi['doi'] == ''
+    assert no_doi['url'] == "https://www.scielo.br/j/rbsmi/a/def456/"
+    assert no_doi['affiliations'] == ["HC UFPE"]
+    assert spanish['title'] == "Cuidados paliativos em oncologia pediátrica"
+
+
+def test_date_windows_split_by_year_and_trim_months():
+    windows = scielo.date_windows("15/06/2022", "10/03/2024")
+    assert [w.key for w in windows] == ["2024:-202403", "2023", "2022:202206-"]
+    assert windows[0].contains("2024-03") and not windows[0].contains("2024-04")
+    assert windows[2].contains("2022") and not windows[2].contains("202205")
+    assert scielo.date_windows(None, None) == [scielo.DateWindow(None)]
+
+    # registros fora dos meses da janela são descartados
+    with _stub_scielo(scielo_routes({2024: 24})):
+        trimmed = scielo.search_by_affiliation(["HC UFPE"], "01/01/2024", "31/03/2024", max_results=100)
+    assert len(trimmed) == 6  # 2 registros por mês no stub
+
+
+def test_concurrent_paging_matches_serial_and_is_faster():
+    hits = {2022: 250, 2023: 300, 2024: 150}
+
+    def timed(workers):
+        with _stub_scielo(scielo_routes(hits), latency=0.1):
+            start = time.perf_counter()
+            results = scielo.search_by_affiliation(["HC UFPE"], "01/01/2022", "31/12/2024",
+                                                   max_results=1000, max_workers=workers)
+            return results, time.perf_counter() - start
+
+    serial, t_serial = timed(1)
+    concurrent, t_concurrent = timed(4)
+    print(f"\n   Serial:      {len(serial)} artigos em {t_serial:.2f}s")
+    print(f"   Concorrente: {len(concurrent)} artigos em {t_concurrent:.2f}s")
+
+    assert len(serial) == 700 and concurrent == serial  # mesma ordem: janela mais recente primeiro
+    assert [a['publication_date'] for a in (serial[0], serial[-1])] == ["2024", "2022"]
+    assert t_concurrent * 2 < t_serial
+
+    # o teto vale para a soma das janelas, na ordem (as mais recentes primeiro)
+    with _stub_scielo(scielo_routes(hits)) as server:
+        capped = scielo.search_by_affiliation(["HC UFPE"], "01/01/2022", "31/12/2024", max_results=220)
+    assert len(capped) == 220 and {a['publication_date'] for a in capped} == {"2024", "2023"}
+    # primeira página das 3 janelas + 2ª página de 2024; 2023 para na primeira
+    assert server.request_count == 4
+
+
+def test_rate_limiter_spaces_requests():
+    with _stub_scielo(scielo_routes({2023: 500}), rate=20.0):
+        start = time.perf_counter()
+        results = scielo.search_by_affiliation(["HC UFPE"], "01/01/2023", "31/12/2023",
+                                               max_results=500, page_size=50, max_workers=8)
+        elapsed = time.perf_counter() - start
+    assert len(results) == 500
+    assert elapsed >= 0.4  # 10 requisições a 20/s, mesmo com 8 threads
+
+
+def test_incremental_harvest_skips_closed_windows():
+    hits = {2021: 120, 2022: 80, 2023: 60, 2025: 40, 2026: 30}
+    with _stub_scielo(scielo_routes(hits, fail_once=[(2022, 1)])) as server:
+        try:
+            scielo.harvest_date_windows(["HC UFPE"], "01/01/2021", "31/12/2026", today=TODAY)
+        except scielo.HarvestError as e:
+            first, cursor, failures = e.articles, e.cursor, e.failures
+        else:
+            raise AssertionError("a falha de 2022 deveria ser levantada")
+        years_first = _years_requested(server)
+        completed_first = dict(cursor.completed)
+
+        del server.requests[:]
+        again, cursor = scielo.harvest_date_windows(None, "01/01/2021", "31/12/2026",
+                                                    cursor=cursor, today=TODAY)
+        years_again = _years_requested(server)
+
+    assert len(first) == 250  # 2022 falhou
+    assert [(window, start) for window, start, _error in failures] == [("2022", 1)]
+    assert years_first == [2021, 2021, 2022, 2023, 2024, 2025, 2026]
+    assert completed_first == {"2021": 120, "2023": 60, "2024": 0}  # 2025 e 2026 estão abertas
+    # 2ª coleta: só a janela que falhou e as abertas
+    assert years_again == [2022, 2025, 2026]
+    assert cursor.completed["2022"] == 80
+    assert len(again) == 80 + 40 + 30
+
+
+def test_outage_and_page_failures_are_raised():
+    # porta fechada: a busca não devolve [] como se não houvesse resultados
+    with StubHTTPServer({}) as server:
+        down = server.base_url
+    original_base = scielo.SCIELO_SEARCH_BASE
+    scielo.SCIELO_SEARCH_BASE = down
+    try:
+        scielo.search_by_affiliation(["HC UFPE"], "01/01/2023", "31/12/2024")
+    except scielo.HarvestError as e:
+        outage = e
+    else:
+        raise AssertionError("a busca com o servidor fora do ar deveria falhar")
+    finally:
+        scielo.SCIELO_SEARCH_BASE = original_base
+    assert outage.articles == [] and [w for w, _s, _e in outage.failures] == ["2024", "2023"]
+    assert all(isinstance(error, ConnectionError) for _w, _s, error in outage.failures)
+
+    # a 2ª página de 2024 falha: as demais chegam pelos hooks antes do erro
+    batches = []
+    with _stub_scielo(scielo_routes({2023: 150, 2024: 150}, fail_once=[(2024, 101)])):
+        try:
+            scielo.search_by_affiliation(["HC UFPE"], "01/01/2023", "31/12/2024", max_results=300,
+                                         hooks=SearchHooks(on_batch=batches.append))
+        except scielo.HarvestError as e:
+            partial = e
+        else:
+            raise AssertionError("a página com falha deveria ser levantada")
+    print(f"\n   Falha parcial: {partial}")
+    assert len(partial.articles) == 250 == sum(len(b) for b in batches)  # 300 - 50 da página
+    assert [(w, s) for w, s, _e in partial.failures] == [("2024", 101)]
+
+
+def test_streaming_parser_keeps_memory_flat_and_hooks_cancel():
+    class _LazyResponse:
+        def __init__(self, count):
+            self._chunks = self._generate(count)
+
+        @staticmethod
+        def _generate(count):
+            yield b"<response><result numFound=\"%d\">" % count
+            for n in range(count):
+                yield _scielo_doc_xml(2023, n).encode()
+            yield b"</result></response>"
+
+        def read(self, size=-1):
+            return next(self._chunks, b"")
+
+    def peak(count):
+        tracemalloc.start()
+        meta = {}
+        parsed = sum(1 for _ in scielo._iter_parse_search(_LazyResponse(count), scielo.DateWindow(2023), meta))
+        _current, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert parsed == count == meta['total']
+        return peak_bytes
+
+    small, large = peak(200), peak(4000)
+    print(f"\n   Pico de memória: 200 registros={small/1024:.0f} KiB, 4000 registros={large/1024:.0f} KiB")
+    assert large < small * 2
+
+    events, cancel, partial = [], threading.Event(), []
+
+    def on_batch(articles):
+        partial.extend(articles)
+        cancel.set()
+
+    hooks = SearchHooks(progress=lambda *e: events.append(e), on_batch=on_batch, cancel_event=cancel)
+    with _stub_scielo(scielo_routes({2023: 500})):
+        cancelled = scielo.search_by_affiliation(["HC UFPE"], "01/01/2023", "31/12/2023",
+                                                 max_results=500, max_workers=1, hooks=hooks)
+    assert events[0] == (STAGE_IDS, 500, 500) and events[-1] == (STAGE_ARTICLES, 100, 500)
+    assert cancelled == partial and len(cancelled) == 100
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: coletor SciELO (servidor local)")
+    print("=" * 60)
+    test_synthetic_fixtures_match_pubmed_record_shape()
+    test_date_windows_split_by_year_and_trim_months()
+    test_concurrent_paging_matches_serial_and_is_faster()
+    test_rate_limiter_spaces_requests()
+    test_incremental_harvest_skips_closed_windows()
+    test_outage_and_page_failures_are_raised()
+    test_streaming_parser_keeps_memory_flat_and_hooks_cancel()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
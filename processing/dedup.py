@@ -0,0 +1,296 @@
+"""
+Detecção de artigos duplicados entre plataformas.
+
+O mesmo trabalho aparece no PubMed e na SciELO com DOI em formatos
+diferentes ('https://doi.org/10.1/X' x '10.1/x'), sem DOI numa delas, ou com
+o título em caixa, acentuação e pontuação diferentes. A identidade de um
+artigo é resumida numa impressão digital (`Fingerprint`):
+
+ - DOI normalizado: quando os dois artigos têm DOI, ele decide sozinho;
+ - título normalizado (como em processing.validation.normalize_text) e sua
+   assinatura MinHash sobre palavras e pares de palavras: estima a
+   semelhança de Jaccard entre títulos sem compará-los diretamente;
+ - sobrenome do primeiro autor e ano, que precisam ser compatíveis;
+ - plataforma e id do registro nela (a URL, ou o PMID): dois registros da
+   mesma plataforma com ids diferentes nunca são o mesmo trabalho, por mais
+   parecidos que sejam os títulos ("... parte I" x "... parte II").
+
+O casamento por título é probabilístico; só o DOI igual ou o mesmo registro
+da mesma plataforma é identidade certa (`DedupMatch.exact`).
+
+Para achar candidatos sem percorrer todos os artigos, a assinatura é
+dividida em faixas (LSH): títulos parecidos coincidem em ao menos uma faixa
+com alta probabilidade, então cada artigo novo só é comparado aos que
+compartilham alguma chave de faixa (busca por índice, custo sublinear).
+
+ - `DedupIndex`: índice em memória para um fluxo de artigos (orquestrador);
+ - database/clusters.py: o mesmo critério sobre a tabela `article_clusters`.
+
+Uso:
+    index = DedupIndex()
+    for artigo in fluxo:
+        cluster, novo = index.resolve(artigo)
+        match = index.resolve_match(artigo)   # também diz se o casamento é exato
+"""
+
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# MinHash: NUM_PERM permutações divididas em BANDS faixas de ROWS linhas.
+# Com 8 x 4, títulos com Jaccard >= 0,75 viram candidatos com chance > 95%.
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+# Semelhança estimada mínima entre títulos para considerar o mesmo trabalho
+TITLE_SIMILARITY = 0.7
+# Títulos curtos ("Editorial", "Carta ao editor") só casam se forem idênticos
+# e tiverem primeiro autor e ano iguais
+SHORT_TITLE_WORDS = 4
+
+# Cada "permutação" é um XOR com uma máscara aleatória sobre o hash de 64 bits
+# do shingle; semente fixa: assinaturas gravadas no banco continuam válidas
+_rng = random.Random(20240611)
+_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+_SIGNATURE_FORMAT = f"<{NUM_PERM}Q"
+
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_SEPARATORS = re.compile(r"[\W_]+")
+_YEAR_RE = re.compile(r"(1[89]|20)\d\d")
+_DOI_PREFIXES = ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/',
+                 'http://dx.doi.org/', 'doi:')
+
+
+def normalize_doi(doi: Optional[str]) -> str:
+    """'https://doi.org/10.1000/ABC' -> '10.1000/abc'; vazio se não houver DOI."""
+    value = (doi or '').strip().lower()
+    for prefix in _DOI_PREFIXES:
+        if value.startswith(prefix):
+            value = value[len(prefix):].strip()
+    return value if value.startswith('10.') else ''
+
+
+def _normalize(text: str) -> str:
+    """Mesmo resultado de processing.validation.normalize_text, sem o mapa de posições."""
+    text = _COMBINING.sub('', unicodedata.normalize('NFKD', (text or '').casefold()))
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def title_shingles(title_key: str) -> set:
+    """Palavras e pares de palavras consecutivas do título normalizado."""
+    words = title_key.split()
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash(shingles) -> Tuple[int, ...]:
+    """Assinatura MinHash (NUM_PERM valores); vazia se não houver shingles."""
+    if not shingles:
+        return ()
+    hashes = [_shingle_hash(s) for s in shingles]
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+
+def band_keys(signature: Tuple[int, ...]) -> List[int]:
+    """Uma chave inteira (64 bits com sinal, cabe no SQLite) por faixa da assinatura."""
+    if not signature:
+        return []
+    keys = []
+    for band in range(BANDS):
+        chunk = struct.pack(f"<B{ROWS}Q", band, *signature[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'big', signed=True))
+    return keys
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Jaccard estimado: fração de posições iguais nas assinaturas."""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def pack_signature(signature: Tuple[int, ...]) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature) if signature else b''
+
+
+def unpack_signature(data: Optional[bytes]) -> Tuple[int, ...]:
+    return struct.unpack(_SIGNATURE_FORMAT, data) if data else ()
+
+
+def first_author_key(authors: Optional[str]) -> str:
+    """Palavras (2+ letras) do primeiro autor: 'Silva A, Souza B' e 'Silva, Ana; ...' -> 'silva' / 'ana silva'."""
+    first = re.split(r"[,;]", authors or '', maxsplit=1)[0]
+    words = sorted({w for w in _normalize(first).split() if len(w) > 1})
+    return " ".join(words)
+
+
+def publication_year(value: Any) -> str:
+    match = _YEAR_RE.search(str(value or ''))
+    return match.group(0) if match else ''
+
+
+_NO_SOURCE_ID = {'', 'n/a', '#', 'none', '-'}
+
+
+def source_key(record_id: Any) -> str:
+    """Id de um registro na sua plataforma (URL ou PMID), sem espaços; vazio se não houver."""
+    value = str(record_id).strip() if isinstance(record_id, (str, int)) else ''
+    return '' if value.casefold() in _NO_SOURCE_ID else value
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Identidade de um artigo para a detecção de duplicatas."""
+    doi: str
+    title_key: str
+    author_key: str
+    year: str
+    signature: Tuple[int, ...]
+    platform: str = ''
+    source_id: str = ''   # id do registro na plataforma (a URL, ou o PMID)
+
+    @property
+    def bands(self) -> List[int]:
+        return band_keys(self.signature)
+
+
+def fingerprint(record: Any) -> Fingerprint:
+    """Impressão digital de um artigo (dicionário do coletor/UI ou objeto Article)."""
+    if isinstance(record, dict):
+        get = record.get
+    else:
+        get = lambda key, default=None: getattr(record, key, default)
+    title_key = _normalize(get('title') or get('titulo') or '')
+    return Fingerprint(
+        doi=normalize_doi(get('doi')),
+        title_key=title_key,
+        author_key=first_author_key(get('authors') or get('autores')),
+        year=publication_year(get('publication_date') or get('publicacao')),
+        signature=minhash(title_shingles(title_key)),
+        platform=(get('platform') or '').strip().casefold(),
+        # a URL é o que o banco guarda (chave platform + URL); o PMID fica para registros sem URL
+        source_id=next(filter(None, (source_key(get(k)) for k in ('url', 'link', 'pmid'))), ''),
+    )
+
+
+def _authors_compatible(a: str, b: str) -> bool:
+    return not a or not b or bool(set(a.split()) & set(b.split()))
+
+
+def _years_compatible(a: str, b: str) -> bool:
+    # versão online e impressa costumam diferir em um ano
+    return not a or not b or abs(int(a) - int(b)) <= 1
+
+
+def _distinct_records(a: Fingerprint, b: Fingerprint) -> bool:
+    """Registros diferentes da mesma plataforma (ids diferentes): nunca o mesmo trabalho."""
+    return (a.platform != '' and a.platform == b.platform
+            and a.source_id != '' and b.source_id != '' and a.source_id != b.source_id)
+
+
+def is_same_record(a: Fingerprint, b: Fingerprint) -> bool:
+    """True se é certo que são o mesmo artigo: mesmo DOI, ou o mesmo registro da mesma plataforma."""
+    if _distinct_records(a, b):
+        return False
+    if a.doi and b.doi:
+        return a.doi == b.doi
+    return a.platform != '' and a.platform == b.platform and a.source_id != '' and a.source_id == b.source_id
+
+
+def is_same_work(a: Fingerprint, b: Fingerprint) -> bool:
+    """True se as impressões digitais descrevem o mesmo trabalho."""
+    if _distinct_records(a, b):
+        return False
+    if a.doi and b.doi:
+        return a.doi == b.doi
+    if not a.title_key or not b.title_key:
+        return False
+    if not _years_compatible(a.year, b.year) or not _authors_compatible(a.author_key, b.author_key):
+        return False
+    if min(len(a.title_key.split()), len(b.title_key.split())) < SHORT_TITLE_WORDS:
+        return (a.title_key == b.title_key and a.author_key == b.author_key != ''
+                and a.year == b.year != '')
+    return a.title_key == b.title_key or similarity(a.signature, b.signature) >= TITLE_SIMILARITY
+
+
+class DedupMatch(NamedTuple):
+    """Resultado de `DedupIndex.resolve_match`."""
+    cluster: int
+    is_new: bool    # primeiro artigo do cluster
+    exact: bool     # mesmo DOI ou mesmo registro de um artigo anterior (não só título parecido)
+
+
+class DedupIndex:
+    """Índice em memória: resolve cada artigo de um fluxo contra os anteriores.
+
+    Cada artigo custa uma consulta por DOI, uma pelo id na plataforma e BANDS
+    consultas às faixas LSH, mais a comparação com os poucos candidatos
+    encontrados.
+    """
+
+    def __init__(self):
+        self._by_doi: Dict[str, List[int]] = defaultdict(list)
+        self._by_source: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._bands: Dict[int, List[int]] = defaultdict(list)
+        self._entries: List[Tuple[int, Fingerprint]] = []  # (cluster, impressão digital)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _find(self, fp: Fingerprint, bands: List[int]) -> Tuple[Optional[int], bool]:
+        exact_keys = []
+        if fp.doi:
+            exact_keys.append(self._by_doi.get(fp.doi, ()))
+        if fp.platform and fp.source_id:
+            exact_keys.append(self._by_source.get((fp.platform, fp.source_id), ()))
+        for positions in exact_keys:
+            for position in positions:
+                cluster, other = self._entries[position]
+                if is_same_record(fp, other):
+                    return cluster, True
+        seen = set()
+        for key in bands:
+            for position in self._bands.get(key, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                cluster, other = self._entries[position]
+                if is_same_work(fp, other):
+                    return cluster, False
+        return None, False
+
+    def find(self, fp: Fingerprint, bands: Optional[List[int]] = None) -> Optional[int]:
+        """Cluster de um artigo já indexado que seja o mesmo trabalho, ou None."""
+        return self._find(fp, fp.bands if bands is None else bands)[0]
+
+    def resolve_match(self, record: Any) -> DedupMatch:
+        """Indexa o artigo e diz a que cluster ele pertence e se o casamento foi exato."""
+        fp = fingerprint(record)
+        bands = fp.bands
+        cluster, exact = self._find(fp, bands)
+        is_new = cluster is None
+        position = len(self._entries)
+        if is_new:
+            cluster = position
+        self._entries.append((cluster, fp))
+        if fp.doi:
+            self._by_doi[fp.doi].append(position)
+        if fp.platform and fp.source_id:
+            self._by_source[(fp.platform, fp.source_id)].append(position)
+        for key in bands:
+            self._bands[key].append(position)
+        return DedupMatch(cluster, is_new, exact)
+
+    def resolve(self, record: Any) -> Tuple[int, bool]:
+        """Indexa o artigo e devolve (cluster, True se é o primeiro do cluster)."""
+        match = self.resolve_match(record)
+        return match.cluster, match.is_new
@@ -0,0 +1,128 @@
+"""
+Coleta PubMed em pipeline: download, conversão, validação e gravação simultâneos.
+
+A busca da interface passa listas completas de uma etapa à seguinte
+(coletor -> artigos da UI -> janela de resultados -> banco). Para coletas
+grandes, `harvest_pubmed` usa o pipeline de `processing/pipeline.py`:
+
+    páginas do history server -> fetch (XML bruto, N workers)
+                              -> parse (artigos)
+                              -> validate (afiliações, em lotes)
+                              -> persist (bulk_upsert_articles, um escritor)
+
+Cada etapa tem fila de entrada limitada: a memória fica proporcional ao
+tamanho das filas, e a rede, o parsing e a gravação se sobrepõem.
+
+Uso:
+    result = harvest_pubmed(["HC UFPE"], date_start="01/01/2020", matcher=get_affiliation_matcher())
+    print(result.inserted, result.stats.summary())
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import config
+from processing.collectors import pubmed
+from processing.collectors.progress import NO_HOOKS, STAGE_ARTICLES, STAGE_IDS, SearchHooks
+from processing.pipeline import Pipeline, PipelineStats, Stage
+
+# Tamanho dos lotes das etapas de validação e gravação
+HARVEST_VALIDATE_BATCH = 200
+HARVEST_PERSIST_BATCH = 500
+
+
+@dataclass
+class HarvestResult:
+    total: int              # registros previstos pelo esearch (após o teto)
+    inserted: int
+    skipped: int
+    validated: int
+    stats: PipelineStats
+
+
+def pubmed_harvest_stages(cursor: "pubmed.HistoryCursor", db_path: Optional[str] = None, matcher=None,
+                          fetch_workers: Optional[int] = None, parse_workers: int = 1,
+                          counts: Optional[Dict[str, int]] = None,
+                          hooks: SearchHooks = NO_HOOKS) -> List[Stage]:
+    """Etapas do pipeline de coleta para as páginas de `cursor`.
+
+    `counts` recebe os totais de 'inserted', 'skipped' e 'validated'.
+    """
+    if fetch_workers is None:
+        fetch_workers = config.PUBMED_MAX_WORKERS
+    counts = counts if counts is not None else {}
+    counts.update(inserted=0, skipped=0, validated=0)
+    lock = threading.Lock()
+
+    def fetch(retstart):
+        retmax = min(pubmed.PUBMED_HISTORY_PAGE_SIZE, cursor.total - retstart)
+        return [pubmed.fetch_history_page_xml(cursor.webenv, cursor.query_key, retstart, retmax)]
+
+    def parse(data):
+        return pubmed.parse_efetch_xml(data)
+
+    def validate(records):
+        if matcher is None:
+            statuses = ['NOVO'] * len(records)
+        else:
+            statuses = ['VALIDADO' if r.valid else 'NOVO' for r in matcher.validate_batch(records)]
+        for record, status in zip(records, statuses):
+            record['status'] = status
+        with lock:
+            counts['validated'] += statuses.count('VALIDADO')
+        return records
+
+    def open_database():
+        # a conexão SQLite pertence à thread que a criou: uma por worker da etapa
+        from database.db_manager import DatabaseManager
+        return DatabaseManager(db_path) if db_path else DatabaseManager()
+
+    def persist(db, records):
+        result = db.bulk_upsert_articles(records)
+        with lock:
+            counts['inserted'] += result['inserted']
+            counts['skipped'] += result['skipped']
+            done = counts['inserted'] + counts['skipped']
+        hooks.report(STAGE_ARTICLES, done, cursor.total)
+        return None
+
+    return [
+        Stage('fetch', fetch, workers=fetch_workers),
+        Stage('parse', parse, workers=parse_workers),
+        Stage('validate', validate, batch_size=HARVEST_VALIDATE_BATCH),
+        Stage('persist', persist, batch_size=HARVEST_PERSIST_BATCH,
+              setup=open_database, teardown=lambda db: db.close()),
+    ]
+
+
+def harvest_pubmed(terms: Union[List[str], str], date_start: Optional[str] = None,
+                   date_end: Optional[str] = None, max_results: Optional[int] = None,
+                   db_path: Optional[str] = None, matcher=None,
+                   fetch_workers: Optional[int] = None, parse_workers: int = 1,
+                   queue_size: int = 8, hooks: Optional[SearchHooks] = None) -> HarvestResult:
+    """Coleta os artigos do PubMed direto para o banco, em pipeline.
+
+    Args:
+        terms/date_start/date_end/max_results: como em `pubmed.search_by_affiliation`
+        db_path: banco de destino (padrão: o do projeto)
+        matcher: AffiliationMatcher; artigos com ocorrência são gravados como 'VALIDADO'
+        fetch_workers: downloads simultâneos (padrão: config.PUBMED_MAX_WORKERS)
+        parse_workers: workers de conversão do XML
+        queue_size: tamanho máximo de cada fila entre etapas
+        hooks: progresso (artigos gravados) e cancelamento
+    """
+    hooks = hooks or NO_HOOKS
+    cursor = pubmed.start_history_search(terms, date_start=date_start, date_end=date_end,
+                                         max_results=max_results)
+    counts: Dict[str, int] = {}
+    if cursor is None:
+        return HarvestResult(0, 0, 0, 0, PipelineStats([]))
+    hooks.report(STAGE_IDS, cursor.total, cursor.total)
+
+    stages = pubmed_harvest_stages(cursor, db_path=db_path, matcher=matcher,
+                                   fetch_workers=fetch_workers, parse_workers=parse_workers,
+                                   counts=counts, hooks=hooks)
+    pipeline = Pipeline(stages, queue_size=queue_size, cancel_event=hooks.cancel_event)
+    stats = pipeline.run(range(0, cursor.total, pubmed.PUBMED_HISTORY_PAGE_SIZE))
+    return HarvestResult(cursor.total, counts['inserted'], counts['skipped'], counts['validated'], stats)
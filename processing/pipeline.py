@@ -0,0 +1,271 @@
+"""
+Pipeline em etapas com filas limitadas (contrapressão).
+
+Cada etapa tem seus próprios workers (threads) e uma fila de entrada com
+tamanho máximo: quando uma etapa posterior fica para trás, a fila dela
+enche e as anteriores esperam, então a memória usada fica limitada pelo
+tamanho das filas, não pelo tamanho da coleta. Como as etapas rodam ao
+mesmo tempo, espera de rede (download), CPU (parsing) e disco (gravação)
+se sobrepõem.
+
+Uma etapa recebe um item e devolve um iterável de saídas (ou None), que
+seguem para a próxima etapa; com `batch_size`, recebe listas de até
+`batch_size` itens (ex.: gravação em lote). Recursos por worker (como a
+conexão SQLite, que pertence à thread que a criou) vêm de `setup` e são
+liberados por `teardown`; nesse caso a função recebe (recurso, item).
+
+Uso:
+    pipeline = Pipeline([
+        Stage('fetch', baixar, workers=4),
+        Stage('parse', converter, workers=2),
+        Stage('persist', gravar, batch_size=500, setup=abrir_banco, teardown=fechar_banco),
+    ], queue_size=8)
+    stats = pipeline.run(origem)
+    for stage in stats.stages:
+        print(stage.name, stage.items_in, f"{stage.throughput:.0f} itens/s")
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+
+# Intervalo para verificar cancelamento/erro enquanto espera nas filas
+_POLL_INTERVAL = 0.05
+
+
+class _EndOfStream:
+    """Marca o fim dos itens numa fila (um por worker da etapa)."""
+
+
+_END = _EndOfStream()
+
+
+@dataclass
+class Stage:
+    """Etapa do pipeline."""
+    name: str
+    func: Callable[..., Optional[Iterable[Any]]]
+    workers: int = 1
+    batch_size: int = 0          # > 0: func recebe listas de até batch_size itens
+    queue_size: Optional[int] = None  # fila de entrada (padrão: o do Pipeline)
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[Any], None]] = None
+
+
+@dataclass
+class StageStats:
+    """Contadores de uma etapa (atualizados pelos workers durante a execução)."""
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0      # soma do tempo dos workers processando
+    blocked_seconds: float = 0.0   # esperando vaga na fila seguinte (contrapressão)
+    max_queue: int = 0             # maior ocupação observada da fila de entrada
+    elapsed: float = 0.0           # do início do pipeline ao fim da etapa
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def throughput(self) -> float:
+        """Itens de entrada processados por segundo de execução da etapa."""
+        return self.items_in / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class PipelineStats:
+    stages: List[StageStats]
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    def __getitem__(self, name: str) -> StageStats:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def summary(self) -> str:
+        lines = [f"Pipeline: {self.elapsed:.2f}s" + (" (cancelado)" if self.cancelled else "")]
+        for s in self.stages:
+            lines.append(f"  {s.name:<10} {s.workers} worker(s)  entrada {s.items_in:>7}  "
+                         f"saída {s.items_out:>7}  {s.throughput:>9.1f}/s  "
+                         f"ocupado {s.busy_seconds:.2f}s  bloqueado {s.blocked_seconds:.2f}s  "
+                         f"fila máx {s.max_queue}")
+        return "\n".join(lines)
+
+
+class Pipeline:
+    """Conecta as etapas por filas limitadas e executa tudo em threads."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 16,
+                 cancel_event: Optional[threading.Event] = None):
+        if not stages:
+            raise ValueError("pipeline sem etapas")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.cancel_event = cancel_event or threading.Event()
+        self._queues: List[queue.Queue] = []
+        self._stats: List[StageStats] = []
+        self._remaining: List[int] = []
+        self._remaining_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._start = 0.0
+
+    # --- Filas -------------------------------------------------------------
+
+    def _stopped(self) -> bool:
+        return self._error is not None or self.cancel_event.is_set()
+
+    def _put(self, index: int, item: Any, force: bool = False) -> bool:
+        """Coloca na fila `index` esperando vaga; False se o pipeline parou.
+
+        `force` é usado para os marcadores de fim, que precisam chegar mesmo
+        após um cancelamento para os workers terminarem.
+        """
+        target = self._queues[index]
+        full_since = None   # quando a fila foi encontrada cheia (contrapressão)
+        while True:
+            if self._stopped() and not force:
+                return False
+            try:
+                if full_since is None:
+                    target.put_nowait(item)
+                else:
+                    target.put(item, timeout=_POLL_INTERVAL)
+            except queue.Full:
+                if full_since is None:
+                    full_since = time.perf_counter()
+                if self._error is not None:
+                    return False
+                continue
+            if full_since is not None and index > 0:
+                # só a espera por vaga conta como bloqueio da etapa que produz
+                producer = self._stats[index - 1]
+                with producer._lock:
+                    producer.blocked_seconds += time.perf_counter() - full_since
+            stats = self._stats[index]
+            size = target.qsize()
+            if size > stats.max_queue:
+                with stats._lock:
+                    stats.max_queue = max(stats.max_queue, size)
+            return True
+
+    def _emit(self, index: int, outputs: Optional[Iterable[Any]]) -> int:
+        """Envia as saídas da etapa `index` para a seguinte; devolve quantas foram."""
+        if outputs is None:
+            return 0
+        count = 0
+        last = index + 1 >= len(self.stages)
+        for output in outputs:
+            count += 1
+            if last:
+                continue
+            if not self._put(index + 1, output):
+                break
+        return count
+
+    # --- Workers -----------------------------------------------------------
+
+    def _process(self, index: int, resource: Any, payload: Any, items: int):
+        stage, stats = self.stages[index], self._stats[index]
+        started = time.perf_counter()
+        args = (resource, payload) if stage.setup is not None else (payload,)
+        outputs = stage.func(*args)
+        produced = self._emit(index, outputs)
+        busy = time.perf_counter() - started
+        with stats._lock:
+            stats.items_in += items
+            stats.items_out += produced
+            stats.busy_seconds += busy
+
+    def _worker(self, index: int):
+        stage = self.stages[index]
+        source = self._queues[index]
+        resource = None
+        batch: List[Any] = []
+        try:
+            if stage.setup is not None:
+                resource = stage.setup()
+            while True:
+                try:
+                    item = source.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if self._error is not None:
+                        break
+                    continue
+                if item is _END:
+                    if batch and not self._stopped():
+                        self._process(index, resource, batch, len(batch))
+                    break
+                if self._stopped():
+                    continue  # descarta até o marcador de fim
+                if stage.batch_size > 0:
+                    batch.append(item)
+                    if len(batch) >= stage.batch_size:
+                        payload, batch = batch, []
+                        self._process(index, resource, payload, len(payload))
+                else:
+                    self._process(index, resource, item, 1)
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+        finally:
+            if stage.teardown is not None and resource is not None:
+                try:
+                    stage.teardown(resource)
+                except Exception as e:
+                    print(f"[AVISO] Erro ao finalizar a etapa '{stage.name}': {e}")
+            self._worker_done(index)
+
+    def _worker_done(self, index: int):
+        with self._remaining_lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if not last:
+            return
+        self._stats[index].elapsed = time.perf_counter() - self._start
+        if index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                self._put(index + 1, _END, force=True)
+
+    # --- Execução ----------------------------------------------------------
+
+    def run(self, source: Iterable[Any]) -> PipelineStats:
+        """Alimenta o pipeline com `source` (na thread chamadora) e espera o fim.
+
+        Levanta a primeira exceção ocorrida em qualquer etapa (as demais
+        etapas são interrompidas). Um cancelamento (`cancel_event`) para o
+        pipeline e devolve os contadores do que foi feito.
+        """
+        self._queues = [queue.Queue(maxsize=max(1, s.queue_size or self.queue_size)) for s in self.stages]
+        self._stats = [StageStats(s.name, max(1, s.workers)) for s in self.stages]
+        self._remaining = [max(1, s.workers) for s in self.stages]
+        self._error = None
+        self._start = time.perf_counter()
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(max(1, stage.workers)):
+                thread = threading.Thread(target=self._worker, args=(index,),
+                                          name=f"pipeline-{stage.name}-{n}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in source:
+                if not self._put(0, item):
+                    break
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+        finally:
+            for _ in range(max(1, self.stages[0].workers)):
+                self._put(0, _END, force=True)
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return PipelineStats(self._stats, elapsed=time.perf_counter() - self._start,
+                             cancelled=self.cancel_event.is_set())
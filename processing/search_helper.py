@@ -2,10 +2,13 @@
 Módulo auxiliar para integração de busca com variações de afiliação.
 
 Fornece funções para recuperar e usar os termos padrão cadastrados
-na tabela affiliation_variations durante buscas no PubMed.
+na tabela affiliation_variations durante buscas no PubMed. Os termos vêm do
+registro em memória (processing/term_registry.py), lido do banco uma vez e
+invalidado quando a ConfigWindow altera os termos.
 """
 
-from database import DatabaseManager
+from processing.term_registry import get_term_registry
+from processing.validation import get_affiliation_matcher
 
 
 def get_search_terms_for_affiliation(institution: str = "HC-UFPE") -> list:
@@ -23,10 +26,8 @@ def get_search_terms_for_affiliation(institution: str = "HC-UFPE") -> list:
         # Retorna: ["Hospital das Clinicas - UFPE", "HC UFPE", ...]
     """
     try:
-        with DatabaseManager() as db:
-            variations = db.read_affiliation_variations_by_institution(institution)
-            # Retornar os textos originais (como aparecem em artigos)
-            return [v.original_text for v in variations]
+        # Textos originais (como aparecem em artigos), do registro em memória
+        return get_term_registry().terms(institution)
     except Exception as e:
         print(f"⚠️ Erro ao recuperar termos de afiliação: {e}")
         return []
@@ -55,11 +56,32 @@ def format_search_query_for_pubmed(terms: list) -> str:
     return "(" + " OR ".join(formatted) + ")"
 
 
+def get_pubmed_query_for_affiliation(institution: str = "HC-UFPE") -> str:
+    """
+    Query PubMed com todas as variações da instituição, montada uma vez por
+    versão do registro de termos.
+
+    Returns:
+        String como em `format_search_query_for_pubmed` ("" se não houver termos).
+    """
+    registry = get_term_registry()
+    try:
+        return registry.derived('pubmed_query', institution,
+                                lambda: format_search_query_for_pubmed(registry.terms(institution)))
+    except Exception as e:
+        print(f"⚠️ Erro ao montar query de afiliação: {e}")
+        return ""
+
+
 def validate_article_has_affiliation(article_abstract: str, article_affiliations: str = None,
                                      institution: str = "HC-UFPE") -> bool:
     """
     Verifica se um artigo contém alguma variação de afiliação cadastrada.
 
+    Mantida por compatibilidade: delega ao `AffiliationMatcher` de
+    processing/validation.py, compilado uma vez por instituição. Para validar
+    vários artigos use `matcher.validate_batch(artigos)`.
+
     Args:
         article_abstract: Texto do abstract do artigo.
         article_affiliations: Campo de afiliações do artigo (se disponível).
@@ -75,20 +97,16 @@ def validate_article_has_affiliation(article_abstract: str, article_affiliations
             institution="HC-UFPE"
         )
     """
-    search_terms = get_search_terms_for_affiliation(institution)
-
-    if not search_terms:
+    try:
+        matcher = get_affiliation_matcher(institution)
+    except Exception as e:
+        print(f"⚠️ Erro ao carregar variações de afiliação: {e}")
         return False
 
-    # Juntar abstract e affiliations para buscar
-    full_text = f"{article_abstract or ''} {article_affiliations or ''}".lower()
-
-    # Verificar se algum termo está presente (case-insensitive)
-    for term in search_terms:
-        if term.lower() in full_text:
-            return True
-
-    return False
+    # Afiliações estruturadas têm precedência; o resumo só é usado na falta delas
+    if article_affiliations:
+        return matcher.search(article_affiliations)
+    return matcher.search(article_abstract or '')
 
 
 # =====================================================================
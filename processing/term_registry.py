@@ -0,0 +1,105 @@
+"""
+Registro em memória das variações de afiliação, por instituição.
+
+As variações (tabela affiliation_variations) mudam raramente, mas eram lidas
+do banco a cada busca/validação, cada leitura abrindo um DatabaseManager
+novo. O registro carrega as variações de uma instituição uma única vez e
+mantém um contador de versão: toda alteração dos termos (ConfigWindow) chama
+`invalidate()`, que incrementa a versão e descarta o que foi carregado.
+
+Valores derivados do conjunto de termos (query PubMed, AffiliationMatcher)
+são memoizados com `derived(nome, instituição, construir)` e reconstruídos
+automaticamente quando a versão muda.
+
+Uso:
+    registry = get_term_registry()
+    termos = registry.terms("HC-UFPE")
+    query = registry.derived('pubmed_query', "HC-UFPE", lambda: montar(termos))
+    registry.invalidate("HC-UFPE")   # após incluir/editar/excluir termos
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from database.models import AffiliationVariation
+
+Loader = Callable[[str], List[AffiliationVariation]]
+
+
+def _load_from_database(institution: str) -> List[AffiliationVariation]:
+    from database import DatabaseManager
+    with DatabaseManager() as db:
+        return db.read_affiliation_variations_by_institution(institution)
+
+
+class AffiliationTermRegistry:
+    """Variações por instituição, carregadas sob demanda e versionadas."""
+
+    def __init__(self, loader: Optional[Loader] = None):
+        self._loader = loader or _load_from_database
+        self._lock = threading.RLock()
+        self._version = 0
+        self._variations: Dict[str, List[AffiliationVariation]] = {}
+        self._derived: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self.loads = 0  # leituras feitas no banco (diagnóstico)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def variations(self, institution: str) -> List[AffiliationVariation]:
+        """Variações da instituição (lidas do banco só na primeira vez após cada mudança)."""
+        with self._lock:
+            cached = self._variations.get(institution)
+            if cached is None:
+                cached = list(self._loader(institution))
+                self.loads += 1
+                self._variations[institution] = cached
+            return list(cached)
+
+    def terms(self, institution: str) -> List[str]:
+        """Textos originais das variações (como aparecem nos artigos)."""
+        return [v.original_text for v in self.variations(institution)]
+
+    def derived(self, name: str, institution: str, build: Callable[[], Any]) -> Any:
+        """Valor derivado dos termos, memoizado enquanto a versão não mudar."""
+        key = (name, institution)
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry[0] == self._version:
+                return entry[1]
+            version = self._version
+            value = build()
+            if version == self._version:
+                self._derived[key] = (version, value)
+            return value
+
+    def invalidate(self, institution: Optional[str] = None):
+        """Descarta as variações carregadas (de uma instituição ou todas) e avança a versão."""
+        with self._lock:
+            if institution is None:
+                self._variations.clear()
+            else:
+                self._variations.pop(institution, None)
+            self._version += 1
+
+
+_default_registry: Optional[AffiliationTermRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_term_registry() -> AffiliationTermRegistry:
+    """Registro compartilhado pelo processo."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = AffiliationTermRegistry()
+        return _default_registry
+
+
+def set_term_registry(registry: Optional[AffiliationTermRegistry]) -> Optional[AffiliationTermRegistry]:
+    """Troca o registro compartilhado (ex.: testes); devolve o anterior."""
+    global _default_registry
+    with _default_lock:
+        previous, _default_registry = _default_registry, registry
+        return previous
@@ -0,0 +1,91 @@
+"""
+Testes da detecção de duplicatas entre plataformas (DOI, MinHash/LSH).
+
+Uso:
+    python -m processing.test_dedup
+"""
+
+import random
+import time
+
+from processing.dedup import DedupIndex, fingerprint, is_same_record, is_same_work, normalize_doi
+
+TITLE = "Mortalidade neonatal em unidade de terapia intensiva do Recife: estudo de coorte retrospectivo"
+
+
+def test_doi_normalization():
+    assert normalize_doi("https://doi.org/10.1590/S0102-311X2021") == "10.1590/s0102-311x2021"
+    assert normalize_doi(" DOI: 10.1000/ABC ") == "10.1000/abc"
+    assert normalize_doi("http://dx.doi.org/10.1000/abc") == "10.1000/abc"
+    assert normalize_doi("N/A") == "" and normalize_doi(None) == ""
+
+
+def test_same_work_across_platforms():
+    pubmed = fingerprint({'title': TITLE, 'authors': "Silva A, Souza B", 'doi': "10.1590/abc",
+                          'publication_date': "2021"})
+    scielo = fingerprint({'titulo': TITLE.upper().replace(":", " -") + ".", 'autores': "Silva, Ana; Souza, B",
+                          'doi': "https://doi.org/10.1590/ABC", 'publicacao': "2022 (Scielo)"})
+    no_doi = fingerprint({'title': TITLE.replace("retrospectivo", "retrospectivo."),
+                          'authors': "Ana Silva", 'publication_date': "2021"})
+    assert is_same_work(pubmed, scielo) and is_same_work(pubmed, no_doi)
+    assert set(pubmed.bands) & set(no_doi.bands)
+
+    # um título quase igual, mas sem DOI e com subtítulo a mais, ainda casa
+    longer = fingerprint({'title': TITLE + " em hospital universitario", 'authors': "Silva A"})
+    assert is_same_work(pubmed, longer)
+
+    # DOIs diferentes, autor ou ano incompatíveis: trabalhos distintos
+    other_doi = fingerprint({'title': TITLE, 'doi': "10.1590/xyz"})
+    other_author = fingerprint({'title': TITLE, 'authors': "Pereira C", 'publication_date': "2021"})
+    other_year = fingerprint({'title': TITLE, 'authors': "Silva A", 'publication_date': "2015"})
+    assert not any(is_same_work(pubmed, fp) for fp in (other_doi, other_author, other_year))
+
+    # mesma plataforma, registros diferentes (PMID/URL): nunca o mesmo trabalho
+    part = {'title': TITLE + ": parte I", 'authors': "Silva A", 'publication_date': "2021",
+            'platform': 'PubMed', 'pmid': "1"}
+    part_two = dict(part, title=TITLE + ": parte II", pmid="2")
+    assert not is_same_work(fingerprint(part), fingerprint(part_two))
+    assert is_same_work(fingerprint(part), fingerprint(dict(part_two, platform='Scielo')))
+    assert is_same_record(fingerprint(part), fingerprint(dict(part)))
+    assert not is_same_record(fingerprint(part), fingerprint(dict(part_two, platform='Scielo')))
+    assert not is_same_record(fingerprint(dict(part, pmid="N/A")), fingerprint(dict(part_two, pmid="N/A")))
+
+    # títulos curtos só casam com autor e ano iguais
+    editorial = {'title': "Editorial", 'authors': "Souza B", 'publication_date': "2020"}
+    assert is_same_work(fingerprint(editorial), fingerprint(dict(editorial)))
+    assert not is_same_work(fingerprint(editorial), fingerprint({'title': "Editorial"}))
+
+
+def test_index_resolves_in_sublinear_time():
+    rng = random.Random(11)
+    vocabulary = [f"termo{i}" for i in range(3000)]
+    titles = [" ".join(rng.choice(vocabulary) for _ in range(10)) for _ in range(12000)]
+
+    index = DedupIndex()
+    timings = []
+    for start in range(0, len(titles), 2000):
+        began = time.perf_counter()
+        for title in titles[start:start + 2000]:
+            index.resolve({'title': title, 'authors': "Silva A"})
+        timings.append(time.perf_counter() - began)
+
+    cluster, is_new = index.resolve({'title': titles[500].upper() + ".", 'authors': "A Silva"})
+    print(f"\n   lotes de 2000 títulos: " + ", ".join(f"{t:.2f}s" for t in timings))
+    assert not is_new and cluster == 500
+    assert len(index) == 12001
+    # o custo por artigo não cresce com o tamanho do índice
+    assert timings[-1] < timings[0] * 2 + 0.1
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: detecção de duplicatas")
+    print("=" * 60)
+    test_doi_normalization()
+    test_same_work_across_platforms()
+    test_index_resolves_in_sublinear_time()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Testes do pipeline em etapas e da coleta PubMed em pipeline (servidor local).
+
+Uso:
+    python -m processing.test_pipeline
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from processing.collectors import http_pool, pubmed, record_store, response_cache
+from processing.collectors.rate_limit import TokenBucket
+from processing.collectors.stub_server import StubHTTPServer, eutils_routes
+from processing.harvest import harvest_pubmed
+from processing.pipeline import Pipeline, Stage
+from processing.validation import AffiliationMatcher
+
+
+def _sleepy(delay):
+    def step(item):
+        time.sleep(delay)
+        return [item]
+    return step
+
+
+def test_stages_overlap_and_report_throughput():
+    items = list(range(40))
+    stages = [Stage('fetch', _sleepy(0.01), workers=4),
+              Stage('parse', _sleepy(0.005)),
+              Stage('persist', _sleepy(0.005))]
+    serial = len(items) * (0.01 + 0.005 + 0.005)
+    stats = Pipeline(stages, queue_size=4).run(items)
+    print("\n" + stats.summary())
+
+    assert stats.elapsed < serial * 0.6, (stats.elapsed, serial)
+    assert [s.items_in for s in stats.stages] == [40, 40, 40]
+    assert stats['fetch'].items_out == 40 and stats['fetch'].workers == 4
+    assert all(s.throughput > 0 for s in stats.stages)
+
+
+def test_bounded_queues_apply_backpressure():
+    lock = threading.Lock()
+    counters = {'produced': 0, 'consumed': 0, 'in_flight': 0}
+
+    def source():
+        for i in range(200):
+            with lock:
+                counters['produced'] += 1
+                counters['in_flight'] = max(counters['in_flight'],
+                                            counters['produced'] - counters['consumed'])
+            yield i
+
+    def slow_sink(item):
+        time.sleep(0.002)
+        with lock:
+            counters['consumed'] += 1
+
+    stages = [Stage('parse', lambda item: [item, item]), Stage('persist', slow_sink)]
+    stats = Pipeline(stages, queue_size=5).run(source())
+
+    # filas de 5 + itens em mãos dos workers: nunca a coleta inteira em memória
+    assert counters['consumed'] == 400
+    assert counters['in_flight'] <= 16, counters['in_flight']
+    assert stats['parse'].blocked_seconds > 0
+    assert stats['persist'].max_queue <= 5
+
+    # fila que nunca enche: nenhuma espera é contada como contrapressão
+    roomy = Pipeline([Stage('parse', lambda item: [item, item]), Stage('persist', lambda item: None)],
+                     queue_size=10000).run(range(200))
+    assert roomy['parse'].blocked_seconds == 0
+
+
+def test_batches_resources_and_errors():
+    opened, closed, batches = [], [], []
+
+    def setup():
+        opened.append(threading.get_ident())
+        return "recurso"
+
+    def persist(resource, batch):
+        assert resource == "recurso"
+        batches.append(len(batch))
+
+    stats = Pipeline([Stage('persist', persist, workers=2, batch_size=10,
+                            setup=setup, teardown=closed.append)]).run(range(45))
+    assert sum(batches) == 45 and max(batches) == 10
+    assert len(opened) == 2 and closed == ["recurso", "recurso"]
+    assert stats['persist'].items_in == 45
+
+    def broken(item):
+        if item == 7:
+            raise ValueError("registro inválido")
+        return [item]
+
+    start = time.perf_counter()
+    try:
+        Pipeline([Stage('parse', broken), Stage('persist', _sleepy(0.001))],
+                 queue_size=2).run(range(10000))
+    except ValueError as e:
+        assert str(e) == "registro inválido"
+    else:
+        raise AssertionError("erro da etapa não foi propagado")
+    assert time.perf_counter() - start < 2.0
+
+
+def test_cancel_stops_the_pipeline():
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    stats = Pipeline([Stage('fetch', _sleepy(0.01), workers=2)], queue_size=4,
+                     cancel_event=cancel).run(range(10000))
+    assert stats.cancelled
+    assert 0 < stats['fetch'].items_in < 200
+
+
+def test_pubmed_harvest_persists_validated_articles():
+    original = (pubmed.PUBMED_EUTILS_BASE, pubmed._rate_limiter, http_pool._default_pool)
+    original_cache = response_cache.set_default_cache(None)
+    original_store = record_store.set_default_store(None)
+    matcher = AffiliationMatcher(["Universidade Federal de Pernambuco"])
+    try:
+        with StubHTTPServer(eutils_routes(total_hits=1000), latency=0.02) as server, \
+                tempfile.TemporaryDirectory() as tmp:
+            pubmed.PUBMED_EUTILS_BASE = server.base_url
+            pubmed._rate_limiter = TokenBucket(100)
+            http_pool._default_pool = http_pool.ConnectionPool()
+            db_path = os.path.join(tmp, "harvest.db")
+
+            first = harvest_pubmed(["HC UFPE"], max_results=900, db_path=db_path, matcher=matcher)
+            again = harvest_pubmed(["HC UFPE"], max_results=900, db_path=db_path)
+            http_pool._default_pool.close()
+    finally:
+        response_cache.set_default_cache(original_cache)
+        record_store.set_default_store(original_store)
+        pubmed.PUBMED_EUTILS_BASE, pubmed._rate_limiter, http_pool._default_pool = original
+
+    print("\n" + first.stats.summary())
+    assert first.total == 900
+    assert (first.inserted, first.skipped, first.validated) == (900, 0, 900)
+    assert (again.inserted, again.skipped) == (0, 900)
+    assert first.stats['fetch'].items_in == 900 // pubmed.PUBMED_HISTORY_PAGE_SIZE + 1
+    assert first.stats['parse'].items_out == 900
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: pipeline em etapas")
+    print("=" * 60)
+    test_stages_overlap_and_report_throughput()
+    test_bounded_queues_apply_backpressure()
+    test_batches_resources_and_errors()
+    test_cancel_stops_the_pipeline()
+    test_pubmed_harvest_persists_validated_articles()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Testes do registro em memória de termos de afiliação.
+
+Uso:
+    python -m processing.test_term_registry
+"""
+
+from database.models import AffiliationVariation
+from processing import search_helper, term_registry
+from processing.term_registry import AffiliationTermRegistry
+from processing.validation import get_affiliation_matcher
+
+
+def _fake_database():
+    table = {"HC-UFPE": ["HC UFPE", "Hospital das Clinicas - UFPE"]}
+    calls = []
+
+    def loader(institution):
+        calls.append(institution)
+        return [AffiliationVariation(id=i, original_text=t, institution=institution)
+                for i, t in enumerate(table.get(institution, []), start=1)]
+    return table, calls, loader
+
+
+def test_registry_loads_once_and_reloads_after_invalidate():
+    table, calls, loader = _fake_database()
+    registry = AffiliationTermRegistry(loader)
+
+    for _ in range(5):
+        assert registry.terms("HC-UFPE") == ["HC UFPE", "Hospital das Clinicas - UFPE"]
+    assert calls == ["HC-UFPE"] and registry.version == 0
+
+    table["HC-UFPE"].append("HC EBSERH")
+    registry.invalidate("HC-UFPE")
+    assert registry.version == 1
+    assert registry.terms("HC-UFPE")[-1] == "HC EBSERH"
+    assert calls == ["HC-UFPE", "HC-UFPE"]
+
+
+def test_derived_values_are_memoized_per_version():
+    table, calls, loader = _fake_database()
+    registry = AffiliationTermRegistry(loader)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return ",".join(registry.terms("HC-UFPE"))
+
+    assert registry.derived('joined', "HC-UFPE", build) is registry.derived('joined', "HC-UFPE", build)
+    assert len(builds) == 1
+    table["HC-UFPE"] = ["HC EBSERH"]
+    registry.invalidate()
+    assert registry.derived('joined', "HC-UFPE", build) == "HC EBSERH"
+    assert len(builds) == 2
+
+
+def test_search_helpers_use_the_shared_registry():
+    table, calls, loader = _fake_database()
+    previous = term_registry.set_term_registry(AffiliationTermRegistry(loader))
+    try:
+        query = search_helper.get_pubmed_query_for_affiliation("HC-UFPE")
+        assert query == '("HC UFPE" OR "Hospital das Clinicas - UFPE")'
+        assert search_helper.get_search_terms_for_affiliation("HC-UFPE") == table["HC-UFPE"]
+        matcher = get_affiliation_matcher("HC-UFPE")
+        assert matcher is get_affiliation_matcher("HC-UFPE")
+        assert search_helper.validate_article_has_affiliation("Estudo no HC-UFPE")
+        assert calls == ["HC-UFPE"]
+
+        table["HC-UFPE"] = ["HC EBSERH"]
+        term_registry.get_term_registry().invalidate("HC-UFPE")
+        assert get_affiliation_matcher("HC-UFPE") is not matcher
+        assert not search_helper.validate_article_has_affiliation("Estudo no HC-UFPE")
+        assert search_helper.get_pubmed_query_for_affiliation("HC-UFPE") == '("HC EBSERH")'
+    finally:
+        term_registry.set_term_registry(previous)
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: registro de termos de afiliação")
+    print("=" * 60)
+    test_registry_loads_once_and_reloads_after_invalidate()
+    test_derived_values_are_memoized_per_version()
+    test_search_helpers_use_the_shared_registry()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
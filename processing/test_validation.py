@@ -0,0 +1,110 @@
+"""
+Testes do motor de validação de afiliação (Aho-Corasick).
+
+Uso:
+    python -m processing.test_validation
+"""
+
+import random
+import time
+
+from database.models import AffiliationVariation
+from processing.validation import AffiliationMatcher, normalize_text, normalize_with_offsets
+
+
+def test_normalization_strips_accents_case_and_punctuation():
+    assert normalize_text("Hospital das Clínicas - UFPE") == "hospital das clinicas ufpe"
+    assert normalize_text("  HC/EBSERH,  Recife. ") == "hc ebserh recife"
+    text = "Clínicas, UFPE"
+    normalized, offsets = normalize_with_offsets(text)
+    assert len(normalized) == len(offsets)
+    assert text[offsets[normalized.index("ufpe")]:] == "UFPE"
+
+
+def test_overlapping_patterns_match_like_naive_scan():
+    patterns = ["he", "she", "his", "hers"]
+    matcher = AffiliationMatcher(patterns, whole_words=False)
+    found = sorted((m.pattern, m.start) for m in matcher.find_all("ushers"))
+    assert found == [("he", 2), ("hers", 2), ("she", 1)]
+
+    rng = random.Random(7)
+    alphabet = "abc "
+    patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    matcher = AffiliationMatcher(patterns, whole_words=False)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(40))
+        naive = sorted((p, i) for p in set(patterns) for i in range(len(text)) if text.startswith(p, i))
+        fast = sorted(set((m.pattern, m.start) for m in matcher.find_all(text)))
+        assert fast == naive, text
+
+
+def test_match_reports_variation_and_original_position():
+    variations = [
+        AffiliationVariation(id=1, original_text="Hospital das Clinicas - UFPE", institution="HC-UFPE"),
+        AffiliationVariation(id=2, original_text="HC UFPE", institution="HC-UFPE"),
+    ]
+    matcher = AffiliationMatcher(variations)
+    text = "Serviço de Cardiologia, HOSPITAL DAS CLÍNICAS, UFPE, Recife"
+    [match] = matcher.find_all(text, "affiliations")
+    assert match.variation_id == 1 and match.field == "affiliations"
+    assert text[match.start:match.end] == "HOSPITAL DAS CLÍNICAS, UFPE"
+
+    # palavras inteiras: "hc ufpe" não casa dentro de "thc ufpel"
+    assert not matcher.search("Lab THC UFPEL")
+    assert AffiliationMatcher(["HC UFPE"], whole_words=False).search("Lab THC UFPEL")
+
+
+def test_validate_batch_over_article_fields():
+    matcher = AffiliationMatcher(["HC UFPE", "Universidade Federal de Pernambuco"])
+    articles = [
+        {'title': "A", 'abstract': "Estudo no HC-UFPE.", 'affiliations': ""},
+        {'title': "B", 'abstract': "", 'affiliations': ["Depto X", "Universidade Federal de Pernambuco"]},
+        {'title': "C", 'resumo': "Sem afiliação relevante."},
+    ]
+    results = matcher.validate_batch(articles)
+    assert [r.valid for r in results] == [True, True, False]
+    assert results[0].matches[0].field == "abstract"
+    assert results[1].matched_patterns == ["Universidade Federal de Pernambuco"]
+
+
+def test_structured_affiliations_take_precedence_over_abstract():
+    matcher = AffiliationMatcher(["HC UFPE"])
+    # com afiliações, o resumo não é examinado (citação de outro serviço no texto)
+    cited = {'abstract': "Comparado ao HC-UFPE.", 'affiliations': ["Hospital X, São Paulo"]}
+    assert not matcher.match_article(cited)
+    assert matcher.match_article({'abstract': "Comparado ao HC-UFPE.", 'affiliations': []})
+
+
+def test_batch_cost_does_not_grow_with_variation_count():
+    rng = random.Random(3)
+    words = ["hospital", "clinicas", "ufpe", "recife", "servico", "cardiologia", "pernambuco", "de", "das"]
+    texts = [" ".join(rng.choice(words) for _ in range(60)) for _ in range(300)]
+    few = AffiliationMatcher([f"instituto {i} zz" for i in range(5)])
+    many = AffiliationMatcher([f"instituto {i} zz" for i in range(2000)])
+
+    def timed(matcher):
+        start = time.perf_counter()
+        for text in texts:
+            matcher.search(text)
+        return time.perf_counter() - start
+
+    t_few, t_many = timed(few), timed(many)
+    print(f"\n   300 textos: 5 variações {t_few:.3f}s, 2000 variações {t_many:.3f}s")
+    assert t_many < t_few * 3 + 0.05
+
+
+def main():
+    print("=" * 60)
+    print("TESTES: validação de afiliação (Aho-Corasick)")
+    print("=" * 60)
+    test_normalization_strips_accents_case_and_punctuation()
+    test_overlapping_patterns_match_like_naive_scan()
+    test_match_reports_variation_and_original_position()
+    test_validate_batch_over_article_fields()
+    test_structured_affiliations_take_precedence_over_abstract()
+    test_batch_cost_does_not_grow_with_variation_count()
+    print("\n[OK] Testes concluídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Validação de afiliação dos artigos (motor canônico).
+
+`AffiliationMatcher` compila as variações cadastradas em `affiliation_variations`
+num autômato de Aho-Corasick: cada texto é percorrido uma única vez,
+independentemente do número de variações, e cada ocorrência informa qual
+variação casou e em que posição do texto original.
+
+Padrões e textos são normalizados do mesmo jeito antes da busca:
+minúsculas (casefold), sem acentos e com qualquer sequência de pontuação ou
+espaços reduzida a um espaço. Assim "Hospital das Clínicas - UFPE" casa com
+"HOSPITAL DAS CLINICAS, UFPE".
+
+A validação usa as afiliações estruturadas dos autores (PubMed
+AffiliationInfo, campo 'affiliations'); o resumo só é examinado quando o
+artigo não traz afiliações. Para artigos já salvos, `validate_stored_articles`
+examina cada texto distinto de `affiliation_texts` uma única vez.
+
+Uso:
+    matcher = get_affiliation_matcher("HC-UFPE")   # memoizado (term_registry)
+    for result in matcher.validate_batch(artigos):
+        if result.valid:
+            print(result.matches[0].pattern, result.matches[0].field)
+"""
+
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from database.models import AffiliationVariation
+
+# Afiliações estruturadas (coletor: inglês; UI: português)
+AFFILIATION_FIELDS = ('affiliations', 'afiliacoes')
+# Examinados só quando o artigo não tem afiliações
+FALLBACK_FIELDS = ('abstract', 'resumo')
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """Texto normalizado e, para cada caractere dele, o índice correspondente no original."""
+    chars: List[str] = []
+    offsets: List[int] = []
+    for index, char in enumerate(text or ''):
+        for piece in unicodedata.normalize('NFKD', char.casefold()):
+            if unicodedata.combining(piece):
+                continue
+            if not piece.isalnum():
+                # pontuação e espaços viram um único separador
+                if not chars or chars[-1] == ' ':
+                    continue
+                piece = ' '
+            chars.append(piece)
+            offsets.append(index)
+    if chars and chars[-1] == ' ':
+        chars.pop()
+        offsets.pop()
+    return ''.join(chars), offsets
+
+
+def normalize_text(text: str) -> str:
+    """'Hospital das Clínicas - UFPE' -> 'hospital das clinicas ufpe'."""
+    return normalize_with_offsets(text)[0]
+
+
+@dataclass(frozen=True)
+class AffiliationMatch:
+    """Ocorrência de uma variação num campo do artigo; start/end no texto original."""
+    pattern: str
+    institution: str
+    variation_id: Optional[int]
+    field: str
+    start: int
+    end: int
+
+
+@dataclass
+class ValidationResult:
+    """Resultado da validação de um artigo."""
+    article: Any
+    matches: List[AffiliationMatch] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.matches)
+
+    @property
+    def matched_patterns(self) -> List[str]:
+        return list(dict.fromkeys(m.pattern for m in self.matches))
+
+
+class AffiliationMatcher:
+    """Autômato de Aho-Corasick sobre as variações de afiliação (normalizadas)."""
+
+    def __init__(self, variations: Iterable[Union[AffiliationVariation, str]], whole_words: bool = True):
+        """
+        Args:
+            variations: objetos AffiliationVariation (usa `original_text`) ou strings.
+            whole_words: só aceita ocorrências delimitadas por início/fim do texto
+                ou separadores (evita "hc" dentro de "which").
+        """
+        self.whole_words = whole_words
+        self.variations: List[AffiliationVariation] = []
+        # Autômato: transições, função de falha e saídas (índices de variação) por estado
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+        for variation in variations:
+            if isinstance(variation, str):
+                variation = AffiliationVariation(original_text=variation)
+            pattern = normalize_text(variation.original_text)
+            if not pattern:
+                continue
+            self._add(pattern, len(self.variations))
+            self.variations.append(variation)
+            self._lengths.append(len(pattern))
+        self._build_failure_links()
+
+    @classmethod
+    def from_database(cls, db_manager, institution: Optional[str] = None, **options) -> "AffiliationMatcher":
+        """Compila as variações do banco (todas ou só as de `institution`)."""
+        if institution:
+            variations = db_manager.read_affiliation_variations_by_institution(institution)
+        else:
+            variations = db_manager.read_all_affiliation_variations()
+        return cls(variations, **options)
+
+    def __len__(self) -> int:
+        return len(self.variations)
+
+    # --- Construção --------------------------------------------------------
+
+    def _add(self, pattern: str, variation_index: int):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(variation_index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                # filhos da raiz: o único sufixo próprio é a raiz
+                self._fail[child] = target if target != child else 0
+                # herda as saídas do sufixo mais longo que também é padrão
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    # --- Busca -------------------------------------------------------------
+
+    def _scan(self, normalized: str):
+        """Gera (variação, início, fim) no texto normalizado, numa única passada."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for variation_index in out[state]:
+                end = position + 1
+                yield variation_index, end - self._lengths[variation_index], end
+
+    def _bounded(self, normalized: str, start: int, end: int) -> bool:
+        return ((start == 0 or normalized[start - 1] == ' ')
+                and (end == len(normalized) or normalized[end] == ' '))
+
+    def find_all(self, text: str, field_name: str = '') -> List[AffiliationMatch]:
+        """Todas as ocorrências de variações em `text`, em ordem de término."""
+        if not self.variations or not text:
+            return []
+        normalized, offsets = normalize_with_offsets(text)
+        matches = []
+        for variation_index, start, end in self._scan(normalized):
+            if self.whole_words and not self._bounded(normalized, start, end):
+                continue
+            variation = self.variations[variation_index]
+            matches.append(AffiliationMatch(
+                pattern=variation.original_text,
+                institution=variation.institution,
+                variation_id=variation.id,
+                field=field_name,
+                start=offsets[start],
+                end=offsets[end - 1] + 1,
+            ))
+        return matches
+
+    def search(self, text: str) -> bool:
+        """True se alguma variação ocorre em `text` (para na primeira ocorrência)."""
+        if not self.variations or not text:
+            return False
+        normalized, _offsets = normalize_with_offsets(text)
+        for _variation_index, start, end in self._scan(normalized):
+            if not self.whole_words or self._bounded(normalized, start, end):
+                return True
+        return False
+
+    # --- Artigos -----------------------------------------------------------
+
+    @staticmethod
+    def _field_values(article: Any, name: str) -> List[str]:
+        """Textos do campo; listas (uma afiliação por item) são examinadas item a item."""
+        value = article.get(name) if isinstance(article, dict) else getattr(article, name, None)
+        if isinstance(value, (list, tuple)):
+            return [str(v) for v in value if v]
+        return [value] if value else []
+
+    def match_article(self, article: Any, fields: Sequence[str] = AFFILIATION_FIELDS,
+                      fallback_fields: Sequence[str] = FALLBACK_FIELDS) -> List[AffiliationMatch]:
+        """Ocorrências nas afiliações do artigo (dicionário ou objeto Article).
+
+        Se o artigo não tiver nenhuma afiliação, examina `fallback_fields` (resumo).
+        """
+        matches = []
+        has_affiliations = False
+        for name in fields:
+            for value in self._field_values(article, name):
+                has_affiliations = True
+                matches.extend(self.find_all(value, name))
+        if not has_affiliations:
+            for name in fallback_fields:
+                for value in self._field_values(article, name):
+                    matches.extend(self.find_all(value, name))
+        return matches
+
+    def validate_batch(self, articles: Iterable[Any], fields: Sequence[str] = AFFILIATION_FIELDS,
+                       fallback_fields: Sequence[str] = FALLBACK_FIELDS) -> List[ValidationResult]:
+        """Valida um lote de artigos: uma passada linear por campo de cada artigo."""
+        return [ValidationResult(article, self.match_article(article, fields, fallback_fields))
+                for article in articles]
+
+
+def validate_stored_articles(db_manager, matcher: AffiliationMatcher,
+                             status: Optional[str] = None) -> Dict[int, List[AffiliationMatch]]:
+    """Valida os artigos salvos pelas afiliações dos autores, em lote.
+
+    Lê todos os vínculos artigo-afiliação numa consulta e examina cada texto
+    distinto uma única vez (afiliações se repetem muito entre autores e artigos).
+
+    Returns:
+        {article_id: ocorrências}, só para os artigos com alguma ocorrência.
+    """
+    by_text: Dict[int, List[AffiliationMatch]] = {}
+    results: Dict[int, List[AffiliationMatch]] = {}
+    for article_id, affiliation_id, text in db_manager.read_affiliation_links(status):
+        if affiliation_id not in by_text:
+            by_text[affiliation_id] = matcher.find_all(text, 'affiliations')
+        if by_text[affiliation_id]:
+            results.setdefault(article_id, []).extend(by_text[affiliation_id])
+    return results
+
+
+def get_affiliation_matcher(institution: str = "HC-UFPE") -> AffiliationMatcher:
+    """Matcher da instituição, compilado uma vez por versão do registro de termos.
+
+    Alterações nos termos (`get_term_registry().invalidate()`) fazem o
+    próximo pedido recompilar o autômato.
+    """
+    from processing.term_registry import get_term_registry
+    registry = get_term_registry()
+    return registry.derived('affiliation_matcher', institution,
+                            lambda: AffiliationMatcher(registry.variations(institution)))